@@ -5,6 +5,7 @@
 Usage:
     python run.py backend  # Запуск Backend API (FastAPI)
     python run.py bot      # Запуск Telegram Bot клиента
+    python run.py arena    # Запуск ARQ воркера матчмейкера арены
 
 Автоматически добавляет корень проекта в PYTHONPATH.
 """
@@ -25,6 +26,7 @@ def main():
         print("\nUsage:")
         print("  python run.py backend  # Start Backend API (FastAPI)")
         print("  python run.py bot      # Start Telegram Bot client")
+        print("  python run.py arena    # Start Arena matchmaker worker (ARQ)")
         sys.exit(1)
 
     service = sys.argv[1].lower()
@@ -49,11 +51,20 @@ def main():
             print(f"\n❌ Critical error: {e}")
             sys.exit(1)
 
+    elif service == "arena":
+        print("⚔️ Starting Arena matchmaker worker...")
+        from arq import run_worker
+
+        from src.backend.domains.user_features.arena.workers.arena_arq import ArenaArqSettings
+
+        run_worker(ArenaArqSettings)  # type: ignore[arg-type]
+
     else:
         print(f"❌ Error: Unknown service '{service}'")
         print("\nAvailable services:")
         print("  - backend  (Backend API)")
         print("  - bot      (Telegram Bot)")
+        print("  - arena    (Arena matchmaker worker)")
         sys.exit(1)
 
 
@@ -0,0 +1,246 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from unittest.mock import MagicMock
+
+# Корень проекта в sys.path (скрипт лежит в /scripts)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from loguru import logger as log  # noqa: E402
+
+from src.backend.domains.user_features.combat.combat_engine.logic.combat_pipeline import CombatPipeline  # noqa: E402
+from src.backend.domains.user_features.combat.combat_engine.logic.combat_resolver import (  # noqa: E402
+    _EVENT_SECTIONS,
+    CombatResolver,
+)
+from src.backend.domains.user_features.combat.combat_engine.logic.context_builder import ContextBuilder  # noqa: E402
+from src.backend.domains.user_features.combat.combat_engine.processors.collector import CombatCollector  # noqa: E402
+from src.backend.domains.user_features.combat.dto.combat_action_dto import CombatMoveDTO  # noqa: E402
+from src.backend.domains.user_features.combat.dto.combat_actor_dto import (  # noqa: E402
+    ActorLoadoutDTO,
+    ActorMetaDTO,
+    ActorRawDTO,
+    ActorSnapshot,
+    ActorStats,
+)
+from src.backend.domains.user_features.combat.dto.combat_pipeline_dto import PipelineContextDTO  # noqa: E402
+from src.backend.domains.user_features.scenario.engine.evaluator import ScenarioEvaluator  # noqa: E402
+from src.backend.services.calculators.stats_waterfall_calculator import StatsWaterfallCalculator  # noqa: E402
+from src.shared.schemas.modifier_dto import CombatModifiersDTO  # noqa: E402
+from tests.unit.game_core.scenario.test_evaluator_compiled import (  # noqa: E402
+    EXTRA_MATH,
+    _contexts,
+    _LegacyEvaluator,
+    _scenario_expressions,
+)
+
+
+def _best_of(func: Callable[[], object], repeats: int) -> float:
+    """Лучшее время (сек) из repeats запусков."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _build_moves_map(team_size: int, moves_per_actor: int, seed: int = 42) -> dict:
+    """Пул exchange-мувов боя team_size x team_size: каждый актор бьет случайных врагов."""
+    rng = random.Random(seed)
+    team_a = list(range(1, team_size + 1))
+    team_b = list(range(1001, 1001 + team_size))
+
+    moves_map: dict = {}
+    counter = 0
+    for own, enemies in ((team_a, team_b), (team_b, team_a)):
+        for char_id in own:
+            exchange = {}
+            for _ in range(moves_per_actor):
+                counter += 1
+                move_id = f"m{counter}"
+                exchange[move_id] = {
+                    "move_id": move_id,
+                    "char_id": char_id,
+                    "strategy": "exchange",
+                    "payload": {"target_id": rng.choice(enemies)},
+                    "created_at": rng.random(),
+                }
+            moves_map[str(char_id)] = {"exchange": exchange}
+    return moves_map
+
+
+def bench_matchmaking(repeats: int) -> None:
+    """Матчмейкинг коллектора по размерам пула (5v5 .. 50v50, 4 мува на актора)."""
+    collector = CombatCollector(data_service=MagicMock())
+    for team_size in (5, 10, 25, 50):
+        parsed = collector._parse_moves(_build_moves_map(team_size=team_size, moves_per_actor=4))
+        best = _best_of(lambda parsed=parsed: collector._matchmake_exchange(parsed), repeats)
+        print(f"matchmake {team_size}v{team_size}: pool={team_size * 8} best={best * 1000:.3f}ms")
+
+
+def bench_waterfall(repeats: int) -> None:
+    """Числовой путь водопада статов против сборки формулы + simpleeval на типичных источниках."""
+    rng = random.Random(42)
+    pipelines = [
+        ([f"+{rng.randint(1, 20)}", f"+{rng.uniform(0, 3)!r}", "*1.1", "-2"], float(rng.randint(5, 20)))
+        for _ in range(200)
+    ]
+
+    def run_slow() -> None:
+        for commands, base in pipelines:
+            StatsWaterfallCalculator._evaluate_expression(commands, base)
+
+    def run_fast() -> None:
+        for commands, base in pipelines:
+            StatsWaterfallCalculator._evaluate_pipeline(commands, base, explain=False)
+
+    slow, fast = _best_of(run_slow, repeats), _best_of(run_fast, repeats)
+    print(f"waterfall pipeline x{len(pipelines)}: simpleeval={slow * 1000:.3f}ms fast={fast * 1000:.3f}ms")
+
+
+def bench_triggers(repeats: int) -> None:
+    """Все хуки триггеров одного удара x500 (без флагов и с парой флагов)."""
+    flag_sets = {"no_flags": [], "two_flags": [("crit", "piercing_crit"), ("control", "evasive_shot")]}
+    for name, flags in flag_sets.items():
+        ctx = PipelineContextDTO()
+        for section, flag in flags:
+            setattr(getattr(ctx.triggers, section), flag, True)
+
+        def run(ctx: PipelineContextDTO = ctx) -> None:
+            for _ in range(500):
+                for step_key in _EVENT_SECTIONS:
+                    CombatResolver._resolve_triggers(ctx, ctx.result, step_key)
+
+        print(f"triggers per-hit x500 [{name}]: dispatch={_best_of(run, repeats) * 1000:.3f}ms")
+
+
+def _duel_actor(char_id: int) -> ActorSnapshot:
+    """Актор с "бесконечным" HP/EN, чтобы размены не заканчивались смертью."""
+    mods = CombatModifiersDTO(
+        main_hand_accuracy=0.9,
+        main_hand_damage_base=100.0,
+        main_hand_crit_chance=0.2,
+        dodge_chance=0.1,
+        parry_chance=0.1,
+    )
+    meta = ActorMetaDTO(
+        id=char_id,
+        name=f"Actor {char_id}",
+        type="player",
+        team="blue" if char_id == 1 else "red",
+        hp=10**9,
+        max_hp=10**9,
+        en=10**6,
+        max_en=10**6,
+    )
+    return ActorSnapshot(
+        meta=meta,
+        raw=ActorRawDTO(),
+        stats=ActorStats(mods=mods),
+        loadout=ActorLoadoutDTO(layout={"main_hand": "skill_swords"}),
+    )
+
+
+def bench_pipeline(repeats: int) -> None:
+    """Размен A -> B и B -> A через CombatPipeline.calculate: время и аллокации."""
+    pipeline = CombatPipeline()
+    source, target = _duel_actor(1), _duel_actor(2)
+    move_a = CombatMoveDTO(move_id="a", char_id=1, strategy="exchange", payload={"target_id": 2})
+    move_b = CombatMoveDTO(move_id="b", char_id=2, strategy="exchange", payload={"target_id": 1})
+
+    async def exchange() -> None:
+        await pipeline.calculate(source, target, move_a)
+        await pipeline.calculate(target, source, move_b)
+
+    async def run(rounds: int) -> None:
+        for _ in range(rounds):
+            await exchange()
+
+    asyncio.run(run(50))
+    rounds = 500
+    per_exchange_us = _best_of(lambda: asyncio.run(run(rounds)), repeats) / rounds * 1e6
+
+    tracemalloc.start()
+    try:
+        contexts = [ContextBuilder.build_context(source, target, move_a) for _ in range(100)]
+        ctx_bytes = tracemalloc.get_traced_memory()[0] / len(contexts)
+
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        asyncio.run(run(1))
+        exchange_peak = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+    print(
+        f"pipeline exchange: time={per_exchange_us:.1f}us/exchange "
+        f"ctx_alloc={ctx_bytes / 1024:.1f}KiB peak_alloc={exchange_peak / 1024:.1f}KiB"
+    )
+
+
+def bench_evaluator(repeats: int) -> None:
+    """Шаг сценария x300: условия веток + математика с кубиками (SimpleEval по тексту против компиляции)."""
+    conditions, maths = _scenario_expressions()
+    maths = maths + EXTRA_MATH[:3]
+    ctx = _contexts(1)[0]
+    rounds = 300
+
+    def run(evaluator: ScenarioEvaluator) -> None:
+        for _ in range(rounds):
+            for expression in conditions:
+                evaluator.check_condition(expression, ctx)
+            for math in maths:
+                evaluator.apply_math(math, ctx)
+
+    legacy, compiled = _LegacyEvaluator(1), ScenarioEvaluator(1)
+    # Синтетика намеренно содержит ошибочные выражения: их логирование не должно попадать в замер
+    log.disable("src.backend.domains.user_features.scenario")
+    try:
+        legacy_us = _best_of(lambda: run(legacy), repeats) / rounds * 1e6
+        compiled_us = _best_of(lambda: run(compiled), repeats) / rounds * 1e6
+    finally:
+        log.enable("src.backend.domains.user_features.scenario")
+    print(
+        f"scenario step [{len(conditions)} conditions, {len(maths)} math]: "
+        f"legacy={legacy_us:.1f}us compiled={compiled_us:.1f}us x{legacy_us / compiled_us:.1f}"
+    )
+
+
+BENCHMARKS: dict[str, Callable[[int], None]] = {
+    "matchmaking": bench_matchmaking,
+    "waterfall": bench_waterfall,
+    "triggers": bench_triggers,
+    "pipeline": bench_pipeline,
+    "evaluator": bench_evaluator,
+}
+
+
+def main():
+    """
+    Микробенчмарки горячих путей боевого движка и вычислителя сценариев (вне pytest: время зависит от машины).
+
+    Пример:
+        python scripts/benchmark_combat.py --only matchmaking --repeats 10
+    """
+    parser = argparse.ArgumentParser(description="Микробенчмарки боевого движка")
+    parser.add_argument("--only", action="append", choices=sorted(BENCHMARKS), help="Запустить только указанные")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    log.remove()
+    log.add(sys.stderr, level="WARNING")
+
+    for name in args.only or BENCHMARKS:
+        print(f"⏱️ {name}")
+        BENCHMARKS[name](args.repeats)
+
+
+if __name__ == "__main__":
+    main()
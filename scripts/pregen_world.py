@@ -0,0 +1,71 @@
+import argparse
+import asyncio
+import os
+import sys
+
+# Корень проекта в sys.path (скрипт лежит в /scripts)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from loguru import logger as log  # noqa: E402
+
+from src.backend.core.config import settings  # noqa: E402
+from src.backend.core.database import async_engine, async_session_factory  # noqa: E402
+from src.backend.database.postgres.models import WorldGenProgress  # noqa: E402
+from src.backend.database.redis import RedisService  # noqa: E402
+from src.backend.database.redis.manager.world_manager import WorldManager  # noqa: E402
+from src.backend.domains.internal_systems.factories.world.pregen_pipeline import (  # noqa: E402
+    PregenConfig,
+    WorldPregenPipeline,
+)
+from src.shared.core.client import get_redis_client  # noqa: E402
+
+
+async def run(config: PregenConfig, use_redis: bool) -> None:
+    # Таблица прогресса появилась позже схемы мира — создаем, если ее нет
+    async with async_engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: WorldGenProgress.__table__.create(sync_conn, checkfirst=True))
+
+    # Redis нужен только для дедупликации кланов между несколькими процессами прегенерации
+    redis = await get_redis_client(settings) if use_redis else None
+    world_manager = WorldManager(RedisService(redis)) if redis else None
+
+    report = await WorldPregenPipeline(async_session_factory, config, world_manager=world_manager).run()
+    print(report.model_dump_json(indent=2))
+    if redis:
+        await redis.aclose()
+    await async_engine.dispose()
+
+
+def main():
+    """
+    Прегенерация всей карты по чанкам (после seed_world_gen.py).
+    Повторный запуск продолжает с места остановки (таблица world_gen_progress).
+
+    Пример:
+        python scripts/pregen_world.py --concurrency 6 --limit 50
+    """
+    parser = argparse.ArgumentParser(description="Параллельная возобновляемая прегенерация мира")
+    parser.add_argument("--concurrency", type=int, default=4, help="Глобальный лимит запросов к LLM")
+    parser.add_argument("--queue-size", type=int, default=8)
+    parser.add_argument("--max-attempts", type=int, default=3)
+    parser.add_argument("--limit", type=int, default=None, help="Не больше N чанков за запуск")
+    parser.add_argument("--redis", action="store_true", help="Лок генерации кланов в Redis (несколько процессов)")
+    args = parser.parse_args()
+
+    log.remove()
+    log.add(sys.stderr, level="INFO")
+
+    config = PregenConfig(
+        llm_concurrency=args.concurrency,
+        queue_size=args.queue_size,
+        max_attempts=args.max_attempts,
+        limit=args.limit,
+    )
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    asyncio.run(run(config, args.redis))
+
+
+if __name__ == "__main__":
+    main()
@@ -27,7 +27,7 @@ from src.backend.domains.internal_systems import (
 )
 from src.backend.domains.internal_systems.factories.monster.clan_factory import ClanFactory  # noqa: E402
 from src.backend.domains.internal_systems.factories.world.gen_utils.path_finder import PathFinder  # noqa: E402
-from src.backend.domains.internal_systems.factories.world.threat_service import ThreatService  # noqa: E402
+from src.backend.domains.internal_systems.factories.world.threat_field import ThreatField  # noqa: E402
 from src.backend.resources import (  # noqa: E402
     BIOME_DEFINITIONS,
     HUB_CENTER,
@@ -109,6 +109,7 @@ class WorldGenerator:
 
     def _generate_world_matrix(self) -> dict:
         matrix = {}
+        threat_field = ThreatField.get()
         for wx in range(WORLD_WIDTH):
             for wy in range(WORLD_HEIGHT):
                 col = (wx // REGION_SIZE) + 1
@@ -136,8 +137,7 @@ class WorldGenerator:
                 env_tags = terrain_meta.get("visual_tags", []) + [biome_id]
 
                 # --- ИЗМЕНЕНО: Только Threat Tier, без автоматического Safe Zone ---
-                threat_val = ThreatService.calculate_threat(wx, wy)
-                threat_tier = ThreatService.get_tier_from_threat(threat_val)
+                threat_tier = threat_field.get_tier(wx, wy)
 
                 # is_safe_zone здесь НЕ ставим, он придет из статики или зоны
                 flags = {
@@ -0,0 +1,64 @@
+import argparse
+import os
+import sys
+
+# Корень проекта в sys.path (скрипт лежит в /scripts)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from loguru import logger as log  # noqa: E402
+
+from src.backend.domains.user_features.combat.combat_engine.simulation.simulator import CombatSimulator  # noqa: E402
+from src.backend.domains.user_features.combat.dto import SimulationConfigDTO  # noqa: E402
+
+
+def _parse_overrides(pairs: list[str]) -> dict[str, float]:
+    overrides: dict[str, float] = {}
+    for pair in pairs:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise SystemExit(f"❌ Неверный --override '{pair}', ожидается key=value")
+        overrides[key.strip()] = float(value)
+    return overrides
+
+
+def main():
+    """
+    Офлайн Monte Carlo симуляция боев монстров.
+
+    Пример:
+        python scripts/simulate_combat.py --blue goblin_sneak,goblin_spearman --red goblin_slinger \\
+            --battles 10000 --workers 8 --override main_hand_accuracy=0.8 --override main_hand_damage_base=8
+    """
+    parser = argparse.ArgumentParser(description="Monte Carlo симуляция боев (CombatExecutor.process_batch)")
+    parser.add_argument("--blue", required=True, help="ID вариантов монстров синей команды через запятую")
+    parser.add_argument("--red", required=True, help="ID вариантов монстров красной команды через запятую")
+    parser.add_argument("--tier", type=int, default=1)
+    parser.add_argument("--battles", type=int, default=1000)
+    parser.add_argument("--max-rounds", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--override", action="append", default=[], help="Фикс. значение модификатора: key=value")
+    args = parser.parse_args()
+
+    log.remove()
+    log.add(sys.stderr, level="WARNING")
+
+    config = SimulationConfigDTO(
+        blue=[v.strip() for v in args.blue.split(",") if v.strip()],
+        red=[v.strip() for v in args.red.split(",") if v.strip()],
+        tier=args.tier,
+        battles=args.battles,
+        max_rounds=args.max_rounds,
+        seed=args.seed,
+        workers=args.workers,
+        mod_overrides=_parse_overrides(args.override),
+    )
+    print(f"⚔️ {config.blue} vs {config.red}: battles={config.battles} workers={config.workers} seed={config.seed}")
+
+    report = CombatSimulator(config).run()
+    print(report.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
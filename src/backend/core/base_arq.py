@@ -4,6 +4,7 @@ from arq.connections import ArqRedis, RedisSettings, create_pool
 from loguru import logger as log
 
 from src.backend.core.config import settings
+from src.backend.database.redis.redis_metrics import redis_metrics
 from src.backend.database.redis.redis_service import RedisService
 from src.shared.core.client import get_redis_client
 
@@ -23,6 +24,7 @@ async def base_startup(ctx: dict) -> None:
 
         # Оборачиваем в сервис
         redis_service = RedisService(redis_client)
+        redis_metrics.enabled = settings.redis_metrics_enabled
 
         ctx["redis_client_internal"] = redis_client
         ctx["redis_service"] = redis_service
@@ -1,5 +1,5 @@
 import json
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import field_validator
 
@@ -34,6 +34,16 @@ class BackendSettings(CommonSettings):
     # --- Game Logic ---
     system_char_id: int = 999
 
+    # --- LLM Response Cache ---
+    # on — кэш ответов gemini_answer; replay — только из кэша (без сети); off — выключен
+    llm_cache_mode: Literal["on", "replay", "off"] = "on"
+    llm_cache_ttl_days: int = 30
+    llm_cache_max_mb: int = 256
+
+    # --- Redis Metrics ---
+    # Латентность/ошибки RedisService по менеджерам (GET /metrics); выключено — почти без накладных расходов
+    redis_metrics_enabled: bool = False
+
     @field_validator("allowed_origins", mode="before")
     @classmethod
     def parse_allowed_origins(cls, v: Any) -> Any:
@@ -57,6 +57,22 @@ class IInventoryRepo(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_items_by_locations_batch(
+        self, character_ids: list[int], locations: list[str]
+    ) -> dict[int, list[InventoryItemDTO]]:
+        """
+        Возвращает предметы для списка персонажей в нескольких локациях одним запросом.
+
+        Args:
+            character_ids: Список ID персонажей.
+            locations: Локации предметов; в результате предметы идут в порядке локаций.
+
+        Returns:
+            Словарь {character_id: [items]}.
+        """
+        pass
+
     @abstractmethod
     async def get_equipped_items(self, character_id: int) -> list[InventoryItemDTO]:
         """
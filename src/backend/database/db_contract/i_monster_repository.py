@@ -10,6 +10,13 @@ class IMonsterRepository(ABC):
     async def get_clan_by_unique_hash(self, unique_hash: str) -> GeneratedClanORM | None:
         pass
 
+    @abstractmethod
+    async def get_existing_unique_hashes(self, unique_hashes: list[str]) -> set[str]:
+        """
+        Возвращает подмножество unique_hash, для которых кланы уже есть в БД (один запрос IN).
+        """
+        pass
+
     @abstractmethod
     async def create_clan_with_members(
         self, clan_orm: GeneratedClanORM, monsters_orm: list[GeneratedMonsterORM]
@@ -18,6 +18,13 @@ class IWalletRepo(ABC):
     async def get_wallet(self, char_id: int) -> "ResourceWallet":
         pass
 
+    @abstractmethod
+    async def get_wallets_batch(self, character_ids: list[int]) -> list["ResourceWallet"]:
+        """
+        Возвращает существующие кошельки для списка персонажей (без создания отсутствующих).
+        """
+        pass
+
     @abstractmethod
     async def get_resource_amount(
         self,
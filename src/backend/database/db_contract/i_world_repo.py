@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from typing import Any
 
-from src.backend.database.postgres.models import WorldGrid, WorldRegion, WorldZone
+from src.backend.database.postgres.models import WorldGenProgress, WorldGrid, WorldRegion, WorldZone
 
 
 class IWorldRepo(ABC):
@@ -50,6 +51,13 @@ class IWorldRepo(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_zones(self, zone_ids: list[str]) -> list[WorldZone]:
+        """
+        Получает несколько зон одним запросом (отсутствующие ID пропускаются).
+        """
+        pass
+
     @abstractmethod
     async def get_zones_by_region(self, region_id: str) -> list[WorldZone]:
         """
@@ -122,9 +130,47 @@ class IWorldRepo(ABC):
         """
         pass
 
+    @abstractmethod
+    def iter_active_nodes(self, chunk_size: int = 1000) -> AsyncIterator[list[WorldGrid]]:
+        """
+        Стримит активные клетки чанками, отсортированными по (x, y).
+        """
+        pass
+
     @abstractmethod
     async def get_nodes_in_rect(self, x: int, y: int, width: int, height: int) -> list[WorldGrid]:
         """
         Возвращает все клетки в прямоугольнике (для чанков).
         """
         pass
+
+    # --- ПРОГРЕСС ПРЕГЕНЕРАЦИИ (world_gen_progress) ---
+
+    @abstractmethod
+    async def ensure_gen_chunks(self, chunks: list[tuple[int, int]]) -> None:
+        """
+        Регистрирует чанки (центры) в статусе pending. Уже существующие не трогает.
+        """
+        pass
+
+    @abstractmethod
+    async def get_gen_progress(self) -> list[WorldGenProgress]:
+        """
+        Возвращает состояние всех чанков прегенерации.
+        """
+        pass
+
+    @abstractmethod
+    async def update_gen_chunk(
+        self,
+        chunk_x: int,
+        chunk_y: int,
+        status: str,
+        zones: dict | None = None,
+        error: str | None = None,
+        failed: bool = False,
+    ) -> None:
+        """
+        Обновляет статус чанка. failed=True увеличивает счетчик попыток.
+        """
+        pass
@@ -8,7 +8,7 @@ from .scenario import CharacterScenarioState, ScenarioMaster, ScenarioNode
 from .skill import CharacterSkillProgress
 from .symbiote import CharacterSymbiote
 from .user import User
-from .world import WorldGrid, WorldRegion, WorldZone
+from .world import WorldGenProgress, WorldGrid, WorldRegion, WorldZone
 
 # Экспортируем Base и все модели для Alembic
 # Важно: Alembic должен импортировать этот файл, чтобы увидеть все модели в Base.metadata
@@ -23,6 +23,7 @@ __all__ = [
     "WorldRegion",
     "WorldZone",
     "WorldGrid",
+    "WorldGenProgress",
     "GeneratedClanORM",
     "GeneratedMonsterORM",
     "ScenarioMaster",
@@ -72,3 +72,28 @@ class WorldGrid(Base, TimestampMixin):
 
     def __repr__(self) -> str:
         return f"<Node ({self.x}, {self.y}) Type={self.terrain_type}>"
+
+
+# ----------------------------------------------------------------------
+# ПРОГРЕСС ПРЕГЕНЕРАЦИИ МИРА (чанки 5x5)
+# ----------------------------------------------------------------------
+class WorldGenProgress(Base, TimestampMixin):
+    """
+    Состояние чанка в WorldPregenPipeline (возобновление после падения).
+    Статусы: pending -> persisted (клетки сохранены) -> done (кланы заселены); failed — повтор до max_attempts.
+    """
+
+    __tablename__ = "world_gen_progress"
+
+    chunk_x: Mapped[int] = mapped_column(Integer, primary_key=True)
+    chunk_y: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending", index=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # Контексты зон для стадии заселения (чтобы persisted-чанк дозаселялся без повторного LLM)
+    zones: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
+    error: Mapped[str | None] = mapped_column(String(500), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<GenChunk ({self.chunk_x}, {self.chunk_y}) Status={self.status}>"
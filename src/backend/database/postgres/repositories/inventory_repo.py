@@ -235,6 +235,41 @@ class InventoryRepo(IInventoryRepo):
             log.exception(f"InventoryRepo | action=get_items_by_location_batch status=failed error={e}")
             raise
 
+    async def get_items_by_locations_batch(
+        self, character_ids: list[int], locations: list[str]
+    ) -> dict[int, list[InventoryItemDTO]]:
+        """
+        Получает предметы для списка персонажей в нескольких локациях одним запросом.
+
+        Args:
+            character_ids: Список ID персонажей.
+            locations: Локации; предметы каждого персонажа идут в порядке локаций.
+
+        Returns:
+            dict[int, list[InventoryItemDTO]]: Словарь {char_id: [items]}.
+        """
+        log.debug(
+            f"InventoryRepo | action=get_items_by_locations_batch count={len(character_ids)} locations={locations}"
+        )
+        if not character_ids or not locations:
+            return {}
+        stmt = select(InventoryItem).where(
+            InventoryItem.character_id.in_(character_ids), InventoryItem.location.in_(locations)
+        )
+        try:
+            result = await self.session.execute(stmt)
+            items = result.scalars().all()
+
+            order = {location: i for i, location in enumerate(locations)}
+            grouped_items = defaultdict(list)
+            for item in sorted(items, key=lambda i: order[i.location]):
+                grouped_items[item.character_id].append(self._to_dto(item))
+
+            return dict(grouped_items)
+        except SQLAlchemyError as e:
+            log.exception(f"InventoryRepo | action=get_items_by_locations_batch status=failed error={e}")
+            raise
+
     async def get_equipped_items(self, character_id: int) -> list[InventoryItemDTO]:
         """Хелпер для получения надетой экипировки."""
         return await self.get_items_by_location(character_id, "equipped")
@@ -36,6 +36,23 @@ class MonsterRepository(IMonsterRepository):
             )
             raise
 
+    async def get_existing_unique_hashes(self, unique_hashes: list[str]) -> set[str]:
+        """
+        Возвращает подмножество unique_hash, для которых кланы уже есть в БД (один запрос IN).
+        """
+        if not unique_hashes:
+            return set()
+        log.debug(f"MonsterRepository | action=get_existing_unique_hashes count={len(unique_hashes)}")
+        query = select(GeneratedClanORM.unique_hash).where(GeneratedClanORM.unique_hash.in_(unique_hashes))
+        try:
+            result = await self.session.execute(query)
+            return set(result.scalars().all())
+        except SQLAlchemyError as e:
+            log.exception(
+                f"MonsterRepository | action=get_existing_unique_hashes status=failed count={len(unique_hashes)} error={e}"
+            )
+            raise
+
     async def create_clan_with_members(
         self, clan_orm: GeneratedClanORM, monsters_orm: list[GeneratedMonsterORM]
     ) -> GeneratedClanORM:
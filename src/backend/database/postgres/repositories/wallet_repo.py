@@ -55,6 +55,30 @@ class WalletRepoORM(IWalletRepo):
             log.exception(f"WalletRepoORM | action=get_wallet status=failed char_id={char_id} error={e}")
             raise
 
+    async def get_wallets_batch(self, character_ids: list[int]) -> list[ResourceWallet]:
+        """
+        Получает кошельки для списка персонажей одним запросом.
+        Отсутствующие кошельки не создаются (чтение без записи).
+
+        Args:
+            character_ids: Список ID персонажей.
+
+        Returns:
+            list[ResourceWallet]: Найденные кошельки.
+        """
+        if not character_ids:
+            return []
+        try:
+            result = await self.session.scalars(
+                select(ResourceWallet).where(ResourceWallet.character_id.in_(character_ids))
+            )
+            return list(result.all())
+        except SQLAlchemyError as e:
+            log.exception(
+                f"WalletRepoORM | action=get_wallets_batch status=failed count={len(character_ids)} error={e}"
+            )
+            raise
+
     async def get_resource_amount(
         self,
         char_id: int,
@@ -1,13 +1,14 @@
+from collections.abc import AsyncIterator
 from typing import Any
 
 from loguru import logger as log
-from sqlalchemy import select, update
+from sqlalchemy import select, tuple_, update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.backend.database.db_contract.i_world_repo import IWorldRepo
-from src.backend.database.postgres.models import WorldGrid, WorldRegion, WorldZone
+from src.backend.database.postgres.models import WorldGenProgress, WorldGrid, WorldRegion, WorldZone
 
 
 class WorldRepoORM(IWorldRepo):
@@ -190,6 +191,18 @@ class WorldRepoORM(IWorldRepo):
             log.exception(f"WorldRepo | get_zone failed id={zone_id} error={e}")
             raise
 
+    async def get_zones(self, zone_ids: list[str]) -> list[WorldZone]:
+        """Получает зоны по списку ID одним запросом."""
+        if not zone_ids:
+            return []
+        stmt = select(WorldZone).where(WorldZone.id.in_(zone_ids))
+        try:
+            result = await self.session.execute(stmt)
+            return list(result.scalars().all())
+        except SQLAlchemyError as e:
+            log.exception(f"WorldRepo | get_zones failed count={len(zone_ids)} error={e}")
+            raise
+
     async def get_zones_by_region(self, region_id: str) -> list[WorldZone]:
         """Получает зоны региона."""
         stmt = select(WorldZone).where(WorldZone.region_id == region_id)
@@ -221,3 +234,76 @@ class WorldRepoORM(IWorldRepo):
         except SQLAlchemyError as e:
             log.exception(f"WorldRepo | get_active_nodes failed error={e}")
             raise
+
+    async def iter_active_nodes(self, chunk_size: int = 1000) -> AsyncIterator[list[WorldGrid]]:
+        """
+        Стримит активные ноды чанками по (x, y) (порядок первичного ключа).
+        Keyset-пагинация: каждый чанк — короткий запрос, без OFFSET и без держания курсора.
+        """
+        last: tuple[int, int] | None = None
+        while True:
+            stmt = select(WorldGrid).where(WorldGrid.is_active).order_by(WorldGrid.x, WorldGrid.y).limit(chunk_size)
+            if last is not None:
+                stmt = stmt.where(tuple_(WorldGrid.x, WorldGrid.y) > last)
+            try:
+                result = await self.session.execute(stmt)
+                chunk = list(result.scalars().all())
+            except SQLAlchemyError as e:
+                log.exception(f"WorldRepo | iter_active_nodes failed after={last} error={e}")
+                raise
+
+            if not chunk:
+                return
+            yield chunk
+            if len(chunk) < chunk_size:
+                return
+            last = (chunk[-1].x, chunk[-1].y)
+
+    async def ensure_gen_chunks(self, chunks: list[tuple[int, int]]) -> None:
+        """Регистрирует чанки прегенерации (INSERT ... ON CONFLICT DO NOTHING)."""
+        if not chunks:
+            return
+        stmt = pg_insert(WorldGenProgress).values(
+            [{"chunk_x": x, "chunk_y": y, "status": "pending", "attempts": 0, "zones": {}} for x, y in chunks]
+        )
+        try:
+            await self.session.execute(stmt.on_conflict_do_nothing(index_elements=["chunk_x", "chunk_y"]))
+        except SQLAlchemyError as e:
+            log.error(f"WorldRepo | ensure_gen_chunks failed count={len(chunks)} error={e}")
+            raise
+
+    async def get_gen_progress(self) -> list[WorldGenProgress]:
+        """Состояние всех чанков прегенерации."""
+        stmt = select(WorldGenProgress).order_by(WorldGenProgress.chunk_x, WorldGenProgress.chunk_y)
+        try:
+            result = await self.session.execute(stmt)
+            return list(result.scalars().all())
+        except SQLAlchemyError as e:
+            log.exception(f"WorldRepo | get_gen_progress failed error={e}")
+            raise
+
+    async def update_gen_chunk(
+        self,
+        chunk_x: int,
+        chunk_y: int,
+        status: str,
+        zones: dict | None = None,
+        error: str | None = None,
+        failed: bool = False,
+    ) -> None:
+        """Обновляет статус чанка прегенерации."""
+        values: dict[str, Any] = {"status": status, "error": error[:500] if error else None}
+        if zones is not None:
+            values["zones"] = zones
+        if failed:
+            values["attempts"] = WorldGenProgress.attempts + 1
+        stmt = (
+            update(WorldGenProgress)
+            .where(WorldGenProgress.chunk_x == chunk_x, WorldGenProgress.chunk_y == chunk_y)
+            .values(**values)
+        )
+        try:
+            await self.session.execute(stmt)
+        except SQLAlchemyError as e:
+            log.error(f"WorldRepo | update_gen_chunk failed chunk={chunk_x}:{chunk_y} error={e}")
+            raise
@@ -0,0 +1,107 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any
+
+from loguru import logger as log
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.backend.database.redis.redis_key import RedisKeys as Rk
+
+# Сообщение канала инвалидации "сбросить все" (переключение версии карты)
+INVALIDATE_ALL = "*"
+
+
+class LocationMetaCache:
+    """
+    In-process LRU распарсенных метаданных локаций (process-wide, как script_registry).
+
+    Метаданные меняются только генератором/загрузчиком мира: WorldManager после записи
+    публикует loc_id в канал `world:loc_invalidate`, слушатель (listen) выкидывает запись во всех процессах.
+    Ключ записи — (version, loc_id): после переключения версии карты старые записи просто перестают совпадать.
+
+    Кэш работает только пока процесс подписан на канал (enabled): в процессах без слушателя
+    (воркеры, скрипты) он прозрачно выключен и не может отдать устаревшие данные.
+    Значения отдаются без копирования — вызывающий код не должен их мутировать.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str | None, str], dict[str, Any]] = OrderedDict()
+        # Растет при каждой инвалидации: put с устаревшим токеном (чтение шло параллельно записи) игнорируется
+        self._generation = 0
+        self.enabled = False
+        self.hits = 0
+        self.misses = 0
+
+    def token(self) -> int:
+        """Токен, который нужно взять ДО чтения из Redis и передать в put."""
+        return self._generation
+
+    def get(self, version: str | None, loc_id: str) -> dict[str, Any] | None:
+        if not self.enabled:
+            return None
+
+        key = (version, loc_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, version: str | None, loc_id: str, data: dict[str, Any], token: int) -> None:
+        if not self.enabled or token != self._generation:
+            return
+
+        key = (version, loc_id)
+        self._entries[key] = data
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, loc_id: str) -> None:
+        """Удаляет локацию (во всех версиях). INVALIDATE_ALL — полный сброс."""
+        self._generation += 1
+        if loc_id == INVALIDATE_ALL:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if k[1] == loc_id]:
+            del self._entries[key]
+
+    def stats(self) -> dict[str, int]:
+        """Счетчики попаданий/промахов для метрик и логов."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    async def listen(self, client: Redis, reconnect_delay: float = 1.0) -> None:
+        """
+        Слушает канал инвалидации до отмены задачи.
+        После обрыва подписки кэш сбрасывается целиком: сообщения за время обрыва потеряны.
+        """
+        channel = Rk.get_world_location_invalidate_channel()
+        while True:
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(channel)
+                    self.enabled = True
+                    log.info(f"LocationMetaCache | action=subscribe status=success channel={channel}")
+                    while True:
+                        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                        if message and message.get("type") == "message":
+                            self.invalidate(str(message["data"]))
+            except (RedisError, OSError) as e:
+                self._disable()
+                log.warning(f"LocationMetaCache | action=listen status=reconnect error='{e}'")
+                await asyncio.sleep(reconnect_delay)
+            except asyncio.CancelledError:
+                self._disable()
+                raise
+
+    def _disable(self) -> None:
+        self.enabled = False
+        self.invalidate(INVALIDATE_ALL)
+
+
+location_meta_cache = LocationMetaCache()
@@ -4,15 +4,85 @@ from typing import Any
 from loguru import logger as log
 
 from src.backend.database.redis.redis_key import RedisKeys as Rk
+from src.backend.database.redis.redis_scripts import script_registry
 from src.backend.database.redis.redis_service import RedisService
 
+# Захват пары матчмейкером: оба игрока еще в очереди и их заявки живы -> снимаем обоих из ZSET
+# и записываем каждому ID соперника в слот матча. Игрок, отменивший поиск между снимком очереди
+# и захватом, в пару не попадет.
+_CLAIM_PAIR_SCRIPT = script_registry.register(
+    "arena.claim_pair",
+    """
+local queue_key = KEYS[1]
+if not redis.call('ZSCORE', queue_key, ARGV[1]) or not redis.call('ZSCORE', queue_key, ARGV[2]) then
+    return 0
+end
+if redis.call('EXISTS', KEYS[2]) == 0 or redis.call('EXISTS', KEYS[3]) == 0 then
+    return 0
+end
+redis.call('ZREM', queue_key, ARGV[1], ARGV[2])
+redis.call('SET', KEYS[4], ARGV[2], 'EX', ARGV[3])
+redis.call('SET', KEYS[5], ARGV[1], 'EX', ARGV[3])
+return 1
+""",
+)
+
+# Забор матча одним из двух игроков пары: слоты смотрят друг на друга -> удаляем оба слота и обе заявки
+# (поиск пары закончен). Бой создает только тот, кто забрал матч первым; второй получит 0
+# (его уже переводят в бой).
+_CLAIM_MATCH_SCRIPT = script_registry.register(
+    "arena.claim_match",
+    """
+if redis.call('GET', KEYS[1]) ~= ARGV[2] or redis.call('GET', KEYS[2]) ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1], KEYS[2], KEYS[3], KEYS[4])
+return 1
+""",
+)
+
+# Возврат в очередь игрока, чей матч истек незабранным: заявка жива, слота нет, в очереди нет.
+# Забранный матч удаляет заявки пары (claim_match), поэтому игрока, которого уже переводят в бой, не вернет.
+_REQUEUE_UNMATCHED_SCRIPT = script_registry.register(
+    "arena.requeue_unmatched",
+    """
+local raw = redis.call('GET', KEYS[2])
+if not raw or redis.call('EXISTS', KEYS[3]) == 1 or redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+    return 0
+end
+local request = cjson.decode(raw)
+redis.call('ZADD', KEYS[1], tonumber(request.gs) or 0, ARGV[1])
+return 1
+""",
+)
+
+
+# Отказ от найденного матча (отмена поиска до забора): слоты пары удаляются, соперник
+# с живой заявкой возвращается в очередь со своим GS (время ожидания сохраняется в заявке).
+_RELEASE_MATCH_SCRIPT = script_registry.register(
+    "arena.release_match",
+    """
+if redis.call('GET', KEYS[1]) ~= ARGV[2] or redis.call('GET', KEYS[2]) ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1], KEYS[2])
+local raw = redis.call('GET', KEYS[4])
+if raw then
+    local request = cjson.decode(raw)
+    redis.call('ZADD', KEYS[3], tonumber(request.gs) or 0, ARGV[2])
+end
+return 1
+""",
+)
+
 
 class ArenaManager:
     """
     Менеджер для управления очередями и заявками на арену в Redis.
 
     Предоставляет методы для создания, получения, удаления заявок,
-    а также для добавления, удаления и поиска игроков в очередях арены.
+    для добавления и удаления игроков в очередях арены, а также атомарные операции
+    над парами, найденными матчмейкером (слоты матчей `arena:match:{char_id}`).
     """
 
     def __init__(self, redis_service: RedisService):
@@ -92,31 +162,160 @@ class ArenaManager:
             log.info(f"ArenaManager | action=remove_from_queue status=success mode={mode} char_id={char_id}")
         return result
 
-    async def get_candidates(self, mode: str, min_score: float, max_score: float) -> list[str]:
+    async def get_score(self, mode: str, char_id: int) -> float | None:
         """
-        Ищет кандидатов в очереди арены, чьи очки находятся в заданном диапазоне.
+        Получает очки (score) персонажа в указанной очереди арены.
 
         Args:
             mode: Режим арены.
-            min_score: Минимальное значение очков для поиска (включительно).
-            max_score: Максимальное значение очков для поиска (включительно).
+            char_id: Уникальный идентификатор персонажа.
 
         Returns:
-            Список строковых идентификаторов персонажей, соответствующих критериям.
+            Очки персонажа в виде float, если найден, иначе None.
         """
         key = Rk.get_arena_queue_key(mode)
-        return await self.redis_service.get_zset_range_by_score(key, min_score, max_score)
+        return await self.redis_service.get_zset_score(key, str(char_id))
 
-    async def get_score(self, mode: str, char_id: int) -> float | None:
+    async def get_queue(self, mode: str) -> list[tuple[int, float]]:
         """
-        Получает очки (score) персонажа в указанной очереди арены.
+        Возвращает снимок очереди арены целиком.
 
         Args:
             mode: Режим арены.
-            char_id: Уникальный идентификатор персонажа.
 
         Returns:
-            Очки персонажа в виде float, если найден, иначе None.
+            Список пар (char_id, очки) по возрастанию очков.
         """
         key = Rk.get_arena_queue_key(mode)
-        return await self.redis_service.get_zset_score(key, str(char_id))
+        return [(int(member), score) for member, score in await self.redis_service.get_zset_with_scores(key)]
+
+    async def get_requests(self, char_ids: list[int]) -> list[dict[str, Any] | None]:
+        """
+        Получает заявки нескольких персонажей одним запросом (MGET).
+
+        Args:
+            char_ids: Список идентификаторов персонажей.
+
+        Returns:
+            Метаданные заявок в порядке char_ids (None — заявки нет или она повреждена).
+        """
+        raws = await self.redis_service.get_values([Rk.get_arena_request_key(cid) for cid in char_ids])
+        requests: list[dict[str, Any] | None] = []
+        for char_id, raw in zip(char_ids, raws, strict=True):
+            try:
+                requests.append(json.loads(raw) if raw else None)
+            except json.JSONDecodeError:
+                log.warning(f"ArenaManager | action=get_requests status=failed reason=json_error char_id={char_id}")
+                requests.append(None)
+        return requests
+
+    async def claim_pair(self, mode: str, char_a: int, char_b: int, ttl: int) -> bool:
+        """
+        Атомарно снимает пару из очереди и записывает каждому игроку соперника в слот матча.
+
+        Args:
+            mode: Режим арены.
+            char_a: ID первого игрока.
+            char_b: ID второго игрока.
+            ttl: Время жизни слотов матча в секундах.
+
+        Returns:
+            True, если пара захвачена (оба были в очереди с живыми заявками), иначе False.
+        """
+        res = await self.redis_service.run_script(
+            _CLAIM_PAIR_SCRIPT,
+            keys=[
+                Rk.get_arena_queue_key(mode),
+                Rk.get_arena_request_key(char_a),
+                Rk.get_arena_request_key(char_b),
+                Rk.get_arena_match_key(char_a),
+                Rk.get_arena_match_key(char_b),
+            ],
+            args=[str(char_a), str(char_b), ttl],
+        )
+        if res:
+            log.info(f"ArenaManager | action=claim_pair status=success mode={mode} pair={char_a},{char_b}")
+        return bool(res)
+
+    async def claim_match(self, char_id: int) -> int | None:
+        """
+        Забирает матч, найденный для персонажа матчмейкером. Заявки обоих игроков удаляются.
+
+        Args:
+            char_id: Уникальный идентификатор персонажа.
+
+        Returns:
+            ID соперника, если матч забран этим вызовом (создавать бой должен вызывающий), иначе None.
+        """
+        raw = await self.redis_service.get_value(Rk.get_arena_match_key(char_id))
+        if not raw:
+            return None
+        opponent_id = int(raw)
+        res = await self.redis_service.run_script(
+            _CLAIM_MATCH_SCRIPT,
+            keys=[
+                Rk.get_arena_match_key(char_id),
+                Rk.get_arena_match_key(opponent_id),
+                Rk.get_arena_request_key(char_id),
+                Rk.get_arena_request_key(opponent_id),
+            ],
+            args=[str(char_id), str(opponent_id)],
+        )
+        if not res:
+            return None
+        log.info(f"ArenaManager | action=claim_match status=success char_id={char_id} opponent_id={opponent_id}")
+        return opponent_id
+
+    async def release_match(self, mode: str, char_id: int) -> bool:
+        """
+        Отказывается от найденного, но еще не забранного матча: соперник возвращается в очередь.
+
+        Args:
+            mode: Режим арены.
+            char_id: Уникальный идентификатор отказавшегося персонажа.
+
+        Returns:
+            True, если матч был и он освобожден, иначе False.
+        """
+        raw = await self.redis_service.get_value(Rk.get_arena_match_key(char_id))
+        if not raw:
+            return False
+        opponent_id = int(raw)
+        res = await self.redis_service.run_script(
+            _RELEASE_MATCH_SCRIPT,
+            keys=[
+                Rk.get_arena_match_key(char_id),
+                Rk.get_arena_match_key(opponent_id),
+                Rk.get_arena_queue_key(mode),
+                Rk.get_arena_request_key(opponent_id),
+            ],
+            args=[str(char_id), str(opponent_id)],
+        )
+        if res:
+            log.info(f"ArenaManager | action=release_match status=success char_id={char_id} opponent_id={opponent_id}")
+        return bool(res)
+
+    async def requeue_unmatched(self, mode: str, char_id: int) -> bool:
+        """
+        Возвращает в очередь игрока с живой заявкой, у которого нет ни места в очереди, ни слота матча
+        (матчмейкер нашел пару, но слот истек незабранным).
+
+        Args:
+            mode: Режим арены.
+            char_id: Уникальный идентификатор персонажа.
+
+        Returns:
+            True, если игрок возвращен в очередь, иначе False.
+        """
+        res = await self.redis_service.run_script(
+            _REQUEUE_UNMATCHED_SCRIPT,
+            keys=[
+                Rk.get_arena_queue_key(mode),
+                Rk.get_arena_request_key(char_id),
+                Rk.get_arena_match_key(char_id),
+            ],
+            args=[str(char_id)],
+        )
+        if res:
+            log.info(f"ArenaManager | action=requeue_unmatched status=success mode={mode} char_id={char_id}")
+        return bool(res)
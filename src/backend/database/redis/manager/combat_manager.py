@@ -1,13 +1,266 @@
 import json
+import time
 from typing import Any
 
 from loguru import logger as log
 from redis.asyncio.client import Pipeline
 
 from src.backend.database.redis.redis_key import RedisKeys as Rk
+from src.backend.database.redis.redis_scripts import script_registry
 from src.backend.database.redis.redis_service import RedisService
 from src.backend.domains.user_features.combat.dto import SessionDataDTO
 
+# ==========================================================================
+# LUA SCRIPTS (EVALSHA via ScriptRegistry)
+# ==========================================================================
+
+_POP_TARGET_SCRIPT = script_registry.register(
+    "combat.pop_player_target",
+    "return redis.call('JSON.ARRPOP', KEYS[1], '$.' .. ARGV[1], 0)",
+)
+
+_HOT_JOIN_SCRIPT = script_registry.register(
+    "combat.universal_hot_join",
+    """
+local meta_key = KEYS[1]
+local targets_key = KEYS[2]
+local char_id = ARGV[1]
+local team_name = ARGV[2]
+local is_ai = ARGV[3]
+
+-- A. Обновляем actors_info
+local info_raw = redis.call("HGET", meta_key, "actors_info")
+local info = cjson.decode(info_raw or "{}")
+info[char_id] = (is_ai == "1") and "ai" or "player"
+redis.call("HSET", meta_key, "actors_info", cjson.encode(info))
+
+-- B. Обновляем teams
+local teams_raw = redis.call("HGET", meta_key, "teams")
+local teams = cjson.decode(teams_raw or "{}")
+if not teams[team_name] then teams[team_name] = {} end
+
+-- Проверка на дубликат в команде (на всякий случай)
+local exists = false
+for _, id in ipairs(teams[team_name]) do
+    if tostring(id) == char_id then exists = true break end
+end
+if not exists then
+    table.insert(teams[team_name], tonumber(char_id) or char_id)
+    redis.call("HSET", meta_key, "teams", cjson.encode(teams))
+end
+
+-- C. РЕЗОЛВИНГ ЦЕЛЕЙ (Targets)
+-- Мы берем ВСЕ текущие списки целей и добавляем туда нового врага
+local targets_raw = redis.call("JSON.GET", targets_key, "$")
+local all_targets = {}
+if targets_raw then
+    all_targets = cjson.decode(targets_raw)[1] or {}
+end
+
+local new_actor_targets = {}
+
+for actor_id, target_list in pairs(all_targets) do
+    -- Определяем команду этого актера (нужно найти его в teams)
+
+    local is_enemy = true
+    -- Проверяем, есть ли он в нашей команде
+    if teams[team_name] then
+        for _, member_id in ipairs(teams[team_name]) do
+            if tostring(member_id) == actor_id then 
+                is_enemy = false 
+                break 
+            end
+        end
+    end
+
+    if is_enemy then
+        -- Мы добавляем себя ему в список целей (если еще нет)
+        local already_target = false
+        for _, tid in ipairs(target_list) do
+            if tostring(tid) == char_id then already_target = true break end
+        end
+        if not already_target then
+            table.insert(target_list, tonumber(char_id) or char_id)
+        end
+
+        -- Он добавляется к нам в список целей
+        table.insert(new_actor_targets, tonumber(actor_id) or actor_id)
+    end
+end
+
+-- Записываем обновленные списки обратно
+all_targets[char_id] = new_actor_targets
+redis.call("JSON.SET", targets_key, "$", cjson.encode(all_targets))
+
+return 1
+""",
+)
+
+_REGISTER_EXCHANGE_SCRIPT = script_registry.register(
+    "combat.register_exchange_move",
+    """
+local targets = redis.call('JSON.GET', KEYS[1], '$.' .. ARGV[1])
+if not targets then return 0 end
+
+-- ARGV[2] (target_id) can be string or int. JSON.ARRINDEX handles types strictly.
+-- We try both number and string if needed, but usually we pass string here.
+
+local idx_res = redis.call('JSON.ARRINDEX', KEYS[1], '$.' .. ARGV[1], tonumber(ARGV[2]) or ARGV[2])
+
+if not idx_res or idx_res[1] == -1 then
+    return 0
+end
+
+local real_idx = idx_res[1]
+
+-- 1. Удаляем цель (POP по индексу)
+redis.call('JSON.ARRPOP', KEYS[1], '$.' .. ARGV[1], real_idx)
+
+-- 2. Добавляем ход (JSON.SET в словарь)
+-- Путь: $.exchange.move_id
+local path = '$.exchange.' .. ARGV[4]
+redis.call('JSON.SET', KEYS[2], path, ARGV[3])
+
+return 1
+""",
+)
+
+_REGISTER_MOVES_BATCH_SCRIPT = script_registry.register(
+    "combat.register_moves_batch",
+    """
+local success_count = 0
+local moves = cjson.decode(ARGV[2])
+local char_id = ARGV[1]
+
+for _, move_item in ipairs(moves) do
+    local target_id = move_item.target_id
+    local move_json = move_item.move_json
+    local strategy = move_item.strategy
+    local move_id = move_item.move_id
+
+    -- 1. Ищем цель (try number then string)
+    local idx_res = redis.call('JSON.ARRINDEX', KEYS[1], '$.' .. char_id, tonumber(target_id) or target_id)
+
+    if idx_res and idx_res[1] ~= -1 then
+        local real_idx = idx_res[1]
+
+        -- 2. Удаляем цель
+        redis.call('JSON.ARRPOP', KEYS[1], '$.' .. char_id, real_idx)
+
+        -- 3. Записываем мув
+        local path = '$.' .. strategy .. '.' .. move_id
+        redis.call('JSON.SET', KEYS[2], path, move_json)
+
+        success_count = success_count + 1
+    end
+end
+
+return success_count
+""",
+)
+
+_ACQUIRE_LOCK_SCRIPT = script_registry.register(
+    "combat.acquire_worker_lock",
+    """
+local val = redis.call('GET', KEYS[1])
+if val == 'pending' or not val then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', 60)
+    return 1
+end
+return 0
+""",
+)
+
+_RELEASE_LOCK_SCRIPT = script_registry.register(
+    "combat.release_worker_lock",
+    """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+else
+    return 0
+end
+""",
+)
+
+# 1. Check if feint exists in $.meta.feints.hand
+# 2. If yes, get cost, delete feint, return cost
+# 3. If no, return nil
+_CONSUME_FEINT_SCRIPT = script_registry.register(
+    "combat.consume_feint",
+    """
+local key = KEYS[1]
+local feint_id = ARGV[1]
+
+-- Get hand
+local hand_raw = redis.call("JSON.GET", key, "$.meta.feints.hand")
+if not hand_raw then return nil end
+
+local hand = cjson.decode(hand_raw)[1]
+if not hand or not hand[feint_id] then return nil end
+
+local cost = hand[feint_id]
+
+-- Delete feint
+redis.call("JSON.DEL", key, "$.meta.feints.hand." .. feint_id)
+
+return cjson.encode(cost)
+""",
+)
+
+
+# Колесо таймаутов сессии (ZSET) + "armed" — время уже заведенной отложенной задачи.
+# Все времена — целые миллисекунды (Lua tostring округляет дробные секунды).
+# ARGV[1]=now_ms, ARGV[2]=op ('add' | 'ack'), ARGV[3]=due_ms (для add), ARGV[4..]=members
+# add: ZADD NX (первый таймер мува/батча не сдвигается), ack: ZREM обработанных.
+# Возвращает время, на которое нужно завести новую задачу (строкой), или nil, если уже заведено.
+_TIMER_WHEEL_SCRIPT = script_registry.register(
+    "combat.timer_wheel_update",
+    """
+local now = tonumber(ARGV[1])
+local op = ARGV[2]
+
+for i = 4, #ARGV do
+    if op == 'add' then
+        redis.call('ZADD', KEYS[1], 'NX', ARGV[3], ARGV[i])
+    else
+        redis.call('ZREM', KEYS[1], ARGV[i])
+    end
+end
+
+local head = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+if #head == 0 then
+    redis.call('DEL', KEYS[2])
+    return nil
+end
+
+local head_due = tonumber(head[2])
+local armed = tonumber(redis.call('GET', KEYS[2]) or '0')
+if armed > now and armed <= head_due then
+    return nil
+end
+
+local due_str = string.format('%d', head_due)
+redis.call('SET', KEYS[2], due_str, 'PX', math.max(head_due - now, 0) + 60000)
+return due_str
+""",
+)
+
+
+# Снятие "armed", если задача на это время так и не поставлена (не трогает более новый завод)
+_TIMER_DISARM_SCRIPT = script_registry.register(
+    "combat.timer_wheel_disarm",
+    """
+if tonumber(redis.call('GET', KEYS[1]) or '0') == tonumber(ARGV[1]) then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+""",
+)
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
 
 class CombatManager:
     """
@@ -32,9 +285,7 @@ class CombatManager:
         """
         key = Rk.get_rbc_targets_key(session_id)
         # JSON.ARRPOP позволяет атомарно забрать ID цели из массива по пути $.char_id
-        res = await self.redis.eval_script(
-            "return redis.call('JSON.ARRPOP', KEYS[1], '$.' .. ARGV[1], 0)", keys=[key], args=[str(char_id)]
-        )
+        res = await self.redis.run_script(_POP_TARGET_SCRIPT, keys=[key], args=[str(char_id)])
         return int(res[0]) if res and res[0] else None
 
     async def peek_player_target(self, session_id: str, char_id: int | str) -> int | None:
@@ -71,6 +322,7 @@ class CombatManager:
 
                 # Unified JSON Key
                 pipe.json().set(base_key, "$", actor_data)  # type: ignore
+                pipe.json().set(base_key, "$.version", self._initial_actor_version())  # type: ignore
                 pipe.expire(base_key, ttl)
 
                 # :moves (JSON) - Init with empty dicts
@@ -95,6 +347,7 @@ class CombatManager:
 
             # Unified JSON Key
             pipe.json().set(base, "$", actor_data)  # type: ignore
+            pipe.json().set(base, "$.version", self._initial_actor_version())  # type: ignore
 
             moves_key = Rk.get_combat_moves_key(session_id, str(char_id))
             pipe.json().set(moves_key, "$", {"exchange": {}, "item": {}, "instant": {}})  # type: ignore
@@ -102,82 +355,8 @@ class CombatManager:
         await self.redis.execute_pipeline(_fill_pipe)
 
         # 2. Lua-скрипт для "склейки" социальных связей
-        script = """
-        local meta_key = KEYS[1]
-        local targets_key = KEYS[2]
-        local char_id = ARGV[1]
-        local team_name = ARGV[2]
-        local is_ai = ARGV[3]
-        
-        -- A. Обновляем actors_info
-        local info_raw = redis.call("HGET", meta_key, "actors_info")
-        local info = cjson.decode(info_raw or "{}")
-        info[char_id] = (is_ai == "1") and "ai" or "player"
-        redis.call("HSET", meta_key, "actors_info", cjson.encode(info))
-        
-        -- B. Обновляем teams
-        local teams_raw = redis.call("HGET", meta_key, "teams")
-        local teams = cjson.decode(teams_raw or "{}")
-        if not teams[team_name] then teams[team_name] = {} end
-        
-        -- Проверка на дубликат в команде (на всякий случай)
-        local exists = false
-        for _, id in ipairs(teams[team_name]) do
-            if tostring(id) == char_id then exists = true break end
-        end
-        if not exists then
-            table.insert(teams[team_name], tonumber(char_id) or char_id)
-            redis.call("HSET", meta_key, "teams", cjson.encode(teams))
-        end
-        
-        -- C. РЕЗОЛВИНГ ЦЕЛЕЙ (Targets)
-        -- Мы берем ВСЕ текущие списки целей и добавляем туда нового врага
-        local targets_raw = redis.call("JSON.GET", targets_key, "$")
-        local all_targets = {}
-        if targets_raw then
-            all_targets = cjson.decode(targets_raw)[1] or {}
-        end
-        
-        local new_actor_targets = {}
-        
-        for actor_id, target_list in pairs(all_targets) do
-            -- Определяем команду этого актера (нужно найти его в teams)
-            
-            local is_enemy = true
-            -- Проверяем, есть ли он в нашей команде
-            if teams[team_name] then
-                for _, member_id in ipairs(teams[team_name]) do
-                    if tostring(member_id) == actor_id then 
-                        is_enemy = false 
-                        break 
-                    end
-                end
-            end
-            
-            if is_enemy then
-                -- Мы добавляем себя ему в список целей (если еще нет)
-                local already_target = false
-                for _, tid in ipairs(target_list) do
-                    if tostring(tid) == char_id then already_target = true break end
-                end
-                if not already_target then
-                    table.insert(target_list, tonumber(char_id) or char_id)
-                end
-                
-                -- Он добавляется к нам в список целей
-                table.insert(new_actor_targets, tonumber(actor_id) or actor_id)
-            end
-        end
-        
-        -- Записываем обновленные списки обратно
-        all_targets[char_id] = new_actor_targets
-        redis.call("JSON.SET", targets_key, "$", cjson.encode(all_targets))
-        
-        return 1
-        """
-
-        await self.redis.eval_script(
-            script,
+        await self.redis.run_script(
+            _HOT_JOIN_SCRIPT,
             keys=[Rk.get_rbc_meta_key(session_id), Rk.get_rbc_targets_key(session_id)],
             args=[str(char_id), team_name, "1" if is_ai else "0"],
         )
@@ -185,8 +364,6 @@ class CombatManager:
 
     async def add_log(self, session_id: str, text: str, tags: list[str] | None = None) -> None:
         """Добавляет запись в лог боя."""
-        import time
-
         log_msg = {"text": text, "timestamp": time.time(), "tags": tags or []}
         await self.redis.push_to_list(Rk.get_combat_log_key(session_id), json.dumps(log_msg))
 
@@ -212,47 +389,112 @@ class CombatManager:
             actor_data = raw_results[idx]
             moves_data = raw_results[idx + 1]
 
-            if not actor_data:
-                # Fallback if actor not found
-                structured_data[cid_str] = {
-                    "state": {},
-                    "raw": {},
-                    "loadout": {},
-                    "meta": {},
-                    "statuses": {"abilities": [], "effects": []},  # NEW: Default statuses
-                    "xp": {},
-                    "move": {},
-                }
-                continue
-
-            # Extract fields from unified JSON
-            # Note: state is now inside meta
-            meta = actor_data.get("meta", {})
-            state = {
-                "hp": meta.get("hp", 0),
-                "max_hp": meta.get("max_hp", 0),
-                "en": meta.get("en", 0),
-                "max_en": meta.get("max_en", 0),
-                "tactics": meta.get("tactics", 0),
-                "afk_level": meta.get("afk_level", 0),
-                "is_dead": meta.get("is_dead", False),
-                "tokens": meta.get("tokens", {}),
-            }
+            structured_data[cid_str] = self._structure_actor_data(actor_data)
+            structured_data[cid_str]["move"] = moves_data if moves_data else {}
+
+        structured_data["global_queue"] = raw_results[-1]
+        return structured_data
+
+    async def load_actor_versions_batch(self, session_id: str, char_ids: list[int | str]) -> dict[str, Any]:
+        """
+        Легкая загрузка для инкрементального контекста: версии акторов + moves + очередь.
+        Возвращает {char_id: {"version": int | None, "move": dict}, "global_queue": [...]}.
+        """
 
-            structured_data[cid_str] = {
-                "state": state,
-                "raw": actor_data.get("raw", {}),
-                "loadout": actor_data.get("loadout", {}),
-                "meta": meta,
-                "statuses": actor_data.get("statuses", {"abilities": [], "effects": []}),  # NEW: Read statuses
-                "xp": actor_data.get("xp_buffer", {}),
-                "skills": actor_data.get("skills", {}),
+        def _load(pipe: Pipeline) -> None:
+            for cid in char_ids:
+                pipe.json().get(Rk.get_rbc_actor_key(session_id, str(cid)), "$.version")  # type: ignore
+                pipe.json().get(Rk.get_combat_moves_key(session_id, str(cid)))  # type: ignore
+
+            pipe.lrange(Rk.get_rbc_queue_key(session_id), 0, -1)
+
+        results = await self.redis.execute_pipeline(_load)
+        if not results:
+            return {}
+
+        structured_data: dict[str, Any] = {}
+        for i, cid in enumerate(char_ids):
+            version_raw = results[i * 2]
+            moves_data = results[i * 2 + 1]
+
+            # JSONPath возвращает список совпадений: [version] или []
+            version = version_raw[0] if isinstance(version_raw, list) and version_raw else None
+
+            structured_data[str(cid)] = {
+                "version": int(version) if version is not None else None,
                 "move": moves_data if moves_data else {},
             }
 
-        structured_data["global_queue"] = raw_results[-1]
+        structured_data["global_queue"] = results[-1]
         return structured_data
 
+    async def load_actors_json_batch(self, session_id: str, char_ids: list[int | str]) -> dict[str, Any]:
+        """
+        Загружает unified JSON только для указанных акторов (без moves и очереди).
+        Возвращает {char_id: {state, raw, loadout, meta, statuses, xp, skills, version}}.
+        """
+        if not char_ids:
+            return {}
+
+        def _load(pipe: Pipeline) -> None:
+            for cid in char_ids:
+                pipe.json().get(Rk.get_rbc_actor_key(session_id, str(cid)))  # type: ignore
+
+        results = await self.redis.execute_pipeline(_load)
+        return {
+            str(cid): self._structure_actor_data(actor_data) for cid, actor_data in zip(char_ids, results, strict=False)
+        }
+
+    @staticmethod
+    def _structure_actor_data(actor_data: dict[str, Any] | None) -> dict[str, Any]:
+        """
+        Раскладывает unified JSON актора на секции (state, raw, loadout, ...).
+        """
+        if not actor_data:
+            # Fallback if actor not found
+            return {
+                "state": {},
+                "raw": {},
+                "loadout": {},
+                "meta": {},
+                "statuses": {"abilities": [], "effects": []},  # NEW: Default statuses
+                "xp": {},
+                "version": None,
+            }
+
+        # Extract fields from unified JSON
+        # Note: state is now inside meta
+        meta = actor_data.get("meta", {})
+        state = {
+            "hp": meta.get("hp", 0),
+            "max_hp": meta.get("max_hp", 0),
+            "en": meta.get("en", 0),
+            "max_en": meta.get("max_en", 0),
+            "tactics": meta.get("tactics", 0),
+            "afk_level": meta.get("afk_level", 0),
+            "is_dead": meta.get("is_dead", False),
+            "tokens": meta.get("tokens", {}),
+        }
+
+        return {
+            "state": state,
+            "raw": actor_data.get("raw", {}),
+            "loadout": actor_data.get("loadout", {}),
+            "meta": meta,
+            "statuses": actor_data.get("statuses", {"abilities": [], "effects": []}),  # NEW: Read statuses
+            "xp": actor_data.get("xp_buffer", {}),
+            "skills": actor_data.get("skills", {}),
+            "version": actor_data.get("version"),
+        }
+
+    @staticmethod
+    def _initial_actor_version() -> int:
+        """
+        Начальная версия JSON актора.
+        Берем timestamp (ms), чтобы пересозданный актор не совпал по версии со старым кэшем воркера.
+        """
+        return int(time.time() * 1000)
+
     async def load_actors_data_batch(self, session_id: str, char_ids: list[int | str]) -> list[Any]:
         """
         Пакетная загрузка всех данных актеров (2 ключа на каждого).
@@ -372,37 +614,8 @@ class CombatManager:
         if not move_id:
             return False
 
-        # LUA Script
-        script = """
-        local targets = redis.call('JSON.GET', KEYS[1], '$.' .. ARGV[1])
-        if not targets then return 0 end
-        
-        -- ARGV[2] (target_id) can be string or int. JSON.ARRINDEX handles types strictly.
-        -- We try both number and string if needed, but usually we pass string here.
-        
-        local idx_res = redis.call('JSON.ARRINDEX', KEYS[1], '$.' .. ARGV[1], tonumber(ARGV[2]) or ARGV[2])
-        
-        if not idx_res or idx_res[1] == -1 then
-            return 0
-        end
-        
-        local real_idx = idx_res[1]
-        
-        -- 1. Удаляем цель (POP по индексу)
-        redis.call('JSON.ARRPOP', KEYS[1], '$.' .. ARGV[1], real_idx)
-        
-        -- 2. Добавляем ход (JSON.SET в словарь)
-        -- Путь: $.exchange.move_id
-        local path = '$.exchange.' .. ARGV[4]
-        redis.call('JSON.SET', KEYS[2], path, ARGV[3])
-        
-        return 1
-        """
-
-        import json
-
-        res = await self.redis.eval_script(
-            script,
+        res = await self.redis.run_script(
+            _REGISTER_EXCHANGE_SCRIPT,
             keys=[targets_key, moves_key],
             args=[str(char_id), str(target_id), json.dumps(move_dto), str(move_id)],
         )
@@ -420,42 +633,8 @@ class CombatManager:
         targets_key = Rk.get_rbc_targets_key(session_id)
         moves_key = Rk.get_combat_moves_key(session_id, str(char_id))
 
-        # LUA Script
-        script = """
-        local success_count = 0
-        local moves = cjson.decode(ARGV[2])
-        local char_id = ARGV[1]
-        
-        for _, move_item in ipairs(moves) do
-            local target_id = move_item.target_id
-            local move_json = move_item.move_json
-            local strategy = move_item.strategy
-            local move_id = move_item.move_id
-            
-            -- 1. Ищем цель (try number then string)
-            local idx_res = redis.call('JSON.ARRINDEX', KEYS[1], '$.' .. char_id, tonumber(target_id) or target_id)
-            
-            if idx_res and idx_res[1] ~= -1 then
-                local real_idx = idx_res[1]
-                
-                -- 2. Удаляем цель
-                redis.call('JSON.ARRPOP', KEYS[1], '$.' .. char_id, real_idx)
-                
-                -- 3. Записываем мув
-                local path = '$.' .. strategy .. '.' .. move_id
-                redis.call('JSON.SET', KEYS[2], path, move_json)
-                
-                success_count = success_count + 1
-            end
-        end
-        
-        return success_count
-        """
-
-        import json
-
-        res = await self.redis.eval_script(
-            script, keys=[targets_key, moves_key], args=[str(char_id), json.dumps(moves_data)]
+        res = await self.redis.run_script(
+            _REGISTER_MOVES_BATCH_SCRIPT, keys=[targets_key, moves_key], args=[str(char_id), json.dumps(moves_data)]
         )
         return int(res) if res else 0
 
@@ -527,15 +706,7 @@ class CombatManager:
         [WORKER] Захват лока (перезапись pending).
         """
         key = f"combat:rbc:{session_id}:sys:busy"
-        script = """
-        local val = redis.call('GET', KEYS[1])
-        if val == 'pending' or not val then
-            redis.call('SET', KEYS[1], ARGV[1], 'EX', 60)
-            return 1
-        end
-        return 0
-        """
-        res = await self.redis.eval_script(script, keys=[key], args=[worker_id])
+        res = await self.redis.run_script(_ACQUIRE_LOCK_SCRIPT, keys=[key], args=[worker_id])
         return bool(res)
 
     async def check_worker_lock(self, session_id: str, worker_id: str) -> bool:
@@ -551,14 +722,65 @@ class CombatManager:
         [WORKER] Снятие лока только если он наш.
         """
         key = f"combat:rbc:{session_id}:sys:busy"
-        script = """
-        if redis.call('GET', KEYS[1]) == ARGV[1] then
-            return redis.call('DEL', KEYS[1])
-        else
-            return 0
-        end
+        await self.redis.run_script(_RELEASE_LOCK_SCRIPT, keys=[key], args=[worker_id])
+
+    # ==========================================================================
+    # 4.1. СИГНАЛЫ КОЛЛЕКТОРА (COALESCING + TIMER WHEEL)
+    # ==========================================================================
+
+    async def mark_collector_pending(self, session_id: str, ttl_ms: int = 5000) -> bool:
+        """
+        Помечает, что проход коллектора запланирован.
+        True — флаг поставлен нами (нужно ставить задачу), False — проход уже в очереди.
+        TTL страхует от потерянной задачи: флаг истечет, и следующий сигнал поставит новую.
+        """
+        key = Rk.get_rbc_collector_pending_key(session_id)
+        return bool(await self.redis.redis_client.set(key, "1", nx=True, px=ttl_ms))  # type: ignore
+
+    async def clear_collector_pending(self, session_id: str) -> None:
+        """
+        Снимает флаг в начале прохода коллектора: сигналы, пришедшие во время прохода, поставят следующий.
         """
-        await self.redis.eval_script(script, keys=[key], args=[worker_id])
+        await self.redis.delete_key(Rk.get_rbc_collector_pending_key(session_id))
+
+    async def schedule_timers(self, session_id: str, members: list[str], due_at: float) -> float | None:
+        """
+        Добавляет таймауты в колесо сессии.
+
+        Returns:
+            float | None: Время, на которое нужно завести отложенную задачу коллектора
+            (None — уже заведена на более раннее время).
+        """
+        if not members:
+            return None
+        keys = [Rk.get_rbc_timers_key(session_id), Rk.get_rbc_timers_armed_key(session_id)]
+        res = await self.redis.run_script(
+            _TIMER_WHEEL_SCRIPT, keys=keys, args=[_now_ms(), "add", int(due_at * 1000), *members]
+        )
+        return int(res) / 1000 if res else None
+
+    async def disarm_timers(self, session_id: str, due_at: float) -> None:
+        """
+        Снимает отметку заведенной задачи на due_at (постановка задачи не удалась):
+        следующий schedule_timers/ack_timers заведет задачу заново, а не будет ждать истечения отметки.
+        """
+        await self.redis.run_script(
+            _TIMER_DISARM_SCRIPT, keys=[Rk.get_rbc_timers_armed_key(session_id)], args=[round(due_at * 1000)]
+        )
+
+    async def get_due_timers(self, session_id: str, now: float | None = None) -> list[str]:
+        """Возвращает сработавшие таймеры ("{char_id}:{move_id}") без удаления."""
+        key = Rk.get_rbc_timers_key(session_id)
+        now_ms = int(now * 1000) if now is not None else _now_ms()
+        return await self.redis.redis_client.zrangebyscore(key, "-inf", now_ms)  # type: ignore
+
+    async def ack_timers(self, session_id: str, members: list[str]) -> float | None:
+        """
+        Удаляет обработанные таймеры и возвращает время следующего завода задачи (если нужно).
+        """
+        keys = [Rk.get_rbc_timers_key(session_id), Rk.get_rbc_timers_armed_key(session_id)]
+        res = await self.redis.run_script(_TIMER_WHEEL_SCRIPT, keys=keys, args=[_now_ms(), "ack", "", *members])
+        return int(res) / 1000 if res else None
 
     # ==========================================================================
     # 5. КОММИТ (BATCH SAVING)
@@ -577,7 +799,7 @@ class CombatManager:
         Массовое сохранение итогов раунда через Pipeline.
 
         АТОМАРНО выполняет:
-        - Обновление состояний акторов (HP, EN, XP, статусы)
+        - Обновление состояний акторов (HP, EN, XP, статусы) и инкремент их `version`
         - Запись логов
         - Удаление обработанных действий из очереди
         - Возврат целей в очереди участников (если target_returns передан)
@@ -604,6 +826,9 @@ class CombatManager:
                 if "raw_temp" in data:
                     pipe.json().set(base, "$.raw.temp", data["raw_temp"])  # type: ignore
 
+                # Версия для инкрементальной загрузки (кэш снапшотов воркера)
+                pipe.json().numincrby(base, "$.version", 1)  # type: ignore
+
             # 2. Логи
             if logs:
                 pipe.rpush(Rk.get_combat_log_key(session_id), *logs)
@@ -670,6 +895,9 @@ class CombatManager:
         def _cleanup(pipe: Pipeline) -> None:
             pipe.delete(Rk.get_rbc_targets_key(session_id))
             pipe.delete(Rk.get_rbc_queue_key(session_id))
+            pipe.delete(Rk.get_rbc_timers_key(session_id))
+            pipe.delete(Rk.get_rbc_timers_armed_key(session_id))
+            pipe.delete(Rk.get_rbc_collector_pending_key(session_id))
             pipe.expire(Rk.get_rbc_meta_key(session_id), history_ttl)
             pipe.expire(Rk.get_combat_log_key(session_id), history_ttl)
 
@@ -686,32 +914,7 @@ class CombatManager:
         Возвращает стоимость финта (если он был), иначе None.
         """
         key = Rk.get_rbc_actor_key(session_id, str(char_id))
-
-        # Lua Script:
-        # 1. Check if feint exists in $.meta.feints.hand
-        # 2. If yes, get cost, delete feint, return cost
-        # 3. If no, return nil
-
-        script = """
-        local key = KEYS[1]
-        local feint_id = ARGV[1]
-        
-        -- Get hand
-        local hand_raw = redis.call("JSON.GET", key, "$.meta.feints.hand")
-        if not hand_raw then return nil end
-        
-        local hand = cjson.decode(hand_raw)[1]
-        if not hand or not hand[feint_id] then return nil end
-        
-        local cost = hand[feint_id]
-        
-        -- Delete feint
-        redis.call("JSON.DEL", key, "$.meta.feints.hand." .. feint_id)
-        
-        return cjson.encode(cost)
-        """
-
-        res = await self.redis.eval_script(script, keys=[key], args=[feint_id])
+        res = await self.redis.run_script(_CONSUME_FEINT_SCRIPT, keys=[key], args=[feint_id])
 
         if res:
             return json.loads(res)
@@ -14,6 +14,9 @@ class ScenarioManager:
     Отвечает за:
     1. Хранение сессии (scenario:session:{char_id}).
     2. Кэширование статических данных квеста (scenario:static:{quest_key}).
+
+    В хэше квеста кроме master и node:{id} лежит индекс пулов: pool:{tag} — JSON-список node_key
+    с этим тегом, pools — список всех тегов (признак того, что индекс построен).
     """
 
     STATIC_TTL = 3600  # Время жизни кэша квеста (1 час)
@@ -109,15 +112,25 @@ class ScenarioManager:
             "master": json.dumps(master_data, ensure_ascii=False, default=str),
         }
 
+        pools: dict[str, list[str]] = {}
         for node in nodes_data:
             n_id = node.get("node_key") or node.get("id")
             if n_id:
                 data[f"node:{n_id}"] = json.dumps(node, ensure_ascii=False, default=str)
+                tags = node.get("tags")
+                if tags and isinstance(tags, list):
+                    for tag in dict.fromkeys(tags):
+                        pools.setdefault(str(tag), []).append(str(n_id))
+
+        # Индекс пулов: выбор из пула читает только свои ноды, а не весь квест
+        for tag, node_ids in pools.items():
+            data[f"pool:{tag}"] = json.dumps(node_ids, ensure_ascii=False)
+        data["pools"] = json.dumps(list(pools), ensure_ascii=False)
 
         if data:
             await self.redis.set_hash_fields(key, data)
             await self.redis.expire(key, self.STATIC_TTL)
-            log.info(f"ScenarioManager | action=cache_quest status=success quest={quest_key}")
+            log.info(f"ScenarioManager | action=cache_quest status=success quest={quest_key} pools={len(pools)}")
 
     async def get_cached_node(self, quest_key: str, node_key: str) -> dict[str, Any] | None:
         """
@@ -164,18 +177,41 @@ class ScenarioManager:
                 pass
         return None
 
-    async def get_all_cached_data(self, quest_key: str) -> dict[str, str] | None:
+    async def get_cached_pool_nodes(self, quest_key: str, pool_tag: str) -> list[dict[str, Any]] | None:
         """
-        Получает весь хэш квеста (для поиска по тегам).
+        Получает ноды пула по индексу (HMGET индекса, затем HMGET только нод пула).
 
         Args:
             quest_key: Ключ квеста.
+            pool_tag: Тег пула.
 
         Returns:
-            dict | None: Все данные квеста.
+            list | None: Ноды пула; None — кэша квеста (или индекса пулов в нем) нет.
         """
         key = f"scenario:static:{quest_key}"
-        return await self.redis.get_all_hash(key)
+        pools_raw, pool_raw = await self.redis.get_hash_fields(key, ["pools", f"pool:{pool_tag}"])
+        if pools_raw is None:
+            return None
+        if pool_raw is None:
+            return []
+
+        try:
+            node_ids = json.loads(pool_raw)
+        except json.JSONDecodeError:
+            log.warning(
+                f"ScenarioManager | action=get_pool status=failed reason=json_error quest={quest_key} pool={pool_tag}"
+            )
+            return None
+
+        nodes = []
+        for raw in await self.redis.get_hash_fields(key, [f"node:{n_id}" for n_id in node_ids]):
+            if not raw:
+                continue
+            try:
+                nodes.append(json.loads(raw))
+            except json.JSONDecodeError:
+                continue
+        return nodes
 
     async def has_static_cache(self, quest_key: str) -> bool:
         """
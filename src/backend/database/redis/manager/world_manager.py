@@ -1,8 +1,109 @@
+import json
+import time
+from typing import Any
+
 from loguru import logger as log
 
+from src.backend.database.redis.location_meta_cache import INVALIDATE_ALL, location_meta_cache
 from src.backend.database.redis.redis_key import RedisKeys as Rk
+from src.backend.database.redis.redis_scripts import script_registry
 from src.backend.database.redis.redis_service import RedisService
 
+# Перемещение игрока за один EVALSHA: валидация выхода, перенос между SET'ами локаций,
+# обновление $.location аккаунта и снимок локации для навигации.
+# Все ключи передаются через KEYS: текущая локация известна вызывающему заранее (ARGV[3]).
+# Если аккаунт успел переместиться, скрипт ничего не меняет и возвращает 'stale' с актуальной локацией.
+_MOVE_PLAYER_SCRIPT = script_registry.register(
+    "world.move_player",
+    """
+local account_key = KEYS[1]
+local char_id = ARGV[1]
+local target = ARGV[2]
+local current = ARGV[3]
+local cached_loc = ARGV[4]
+
+local function snapshot(status, loc_id, from_id, meta_key, players_key, battles_key, skill)
+    local players = redis.call('SCARD', players_key) - redis.call('SISMEMBER', players_key, char_id)
+    local battles = redis.call('HLEN', battles_key)
+    -- Метаданные, которые уже есть в кэше процесса, не гоняем по сети
+    local meta = {}
+    if loc_id ~= cached_loc then
+        meta = redis.call('HGETALL', meta_key)
+    end
+    return {status, loc_id, from_id, meta, players, battles, skill or false}
+end
+
+-- Без аккаунта ничего не меняем (JSON.SET упал бы после SREM/SADD)
+if redis.call('EXISTS', account_key) == 0 then
+    return snapshot('no_account', current, current, KEYS[2], KEYS[4], KEYS[6], false)
+end
+
+local actual = ARGV[5]
+local loc_raw = redis.call('JSON.GET', account_key, '$.location')
+if loc_raw then
+    local loc = cjson.decode(loc_raw)[1]
+    if type(loc) == 'table' and type(loc.current) == 'string' and loc.current ~= '' then
+        actual = loc.current
+    end
+end
+if actual ~= current then
+    return {'stale', actual}
+end
+local skill = redis.call('JSON.GET', account_key, '$.skills.survival')
+
+if target == '' then
+    return snapshot('look', current, current, KEYS[2], KEYS[4], KEYS[6], skill)
+end
+
+local exits_raw = redis.call('HGET', KEYS[2], 'exits')
+if not exits_raw then
+    return snapshot('location_not_found', current, current, KEYS[2], KEYS[4], KEYS[6], skill)
+end
+
+local exits = cjson.decode(exits_raw)
+if exits['nav:' .. target] == nil and exits[target] == nil then
+    return snapshot('invalid_exit', current, current, KEYS[2], KEYS[4], KEYS[6], skill)
+end
+if redis.call('EXISTS', KEYS[3]) == 0 then
+    return snapshot('target_not_found', current, current, KEYS[2], KEYS[4], KEYS[6], skill)
+end
+
+redis.call('SREM', KEYS[4], char_id)
+redis.call('SADD', KEYS[5], char_id)
+redis.call('JSON.SET', account_key, '$.location', cjson.encode({current = target, previous = current}))
+return snapshot('moved', target, current, KEYS[3], KEYS[5], KEYS[7], skill)
+""",
+)
+
+
+# Завершение генерации клана: только владелец лока (токен) снимает его (ARGV[2] == "")
+# или помечает результат ("done" с TTL), чтобы ожидающие процессы не генерировали клан повторно.
+_FINISH_CLAN_GEN_SCRIPT = script_registry.register(
+    "world.finish_clan_gen",
+    """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+if ARGV[2] == '' then
+    return redis.call('DEL', KEYS[1])
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+""",
+)
+
+
+# Продление лока генерации клана владельцем (пока он ждет семафор LLM или генерирует)
+_EXTEND_CLAN_GEN_SCRIPT = script_registry.register(
+    "world.extend_clan_gen",
+    """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+return redis.call('EXPIRE', KEYS[1], ARGV[2])
+""",
+)
+
 
 class WorldManager:
     """
@@ -12,20 +113,174 @@ class WorldManager:
     находящихся в каждой локации.
     """
 
+    # Указатель активной версии карты кэшируется на процесс (менеджер создается на каждый запрос)
+    VERSION_CACHE_TTL = 5.0
+    # Старая версия после переключения живет дольше кэша указателя — читатели успеют переключиться
+    RETIRED_VERSION_TTL = 60
+    # Значение лока генерации клана после успешной генерации
+    CLAN_GEN_DONE = "done"
+    # Повторы перемещения, если игрок успел сменить локацию между чтением и скриптом
+    MOVE_ATTEMPTS = 3
+
+    _active_version: str | None = None
+    _version_expires_at: float = 0.0
+
     def __init__(self, redis_service: RedisService):
         self.redis_service = redis_service
 
+    # --- Versioned Map Cache ---
+
+    async def get_active_version(self) -> str | None:
+        """
+        Возвращает активную версию кэша карты (None — legacy-ключи без версии).
+        """
+        if time.monotonic() >= WorldManager._version_expires_at:
+            self._remember_version(await self.redis_service.get_value(Rk.get_world_version_key()))
+        return WorldManager._active_version
+
+    def _remember_version(self, version: str | None) -> None:
+        WorldManager._active_version = version
+        WorldManager._version_expires_at = time.monotonic() + self.VERSION_CACHE_TTL
+
+    async def write_location_meta_batch(self, version: str, locations: dict[str, dict]) -> bool:
+        """
+        Пакетная запись метаданных локаций в пространство версии одним пайплайном.
+
+        Args:
+            version: Версия карты (пространство ключей прогрева).
+            locations: Словарь {loc_id: data}.
+
+        Returns:
+            True, если все HSET выполнены.
+        """
+        if not locations:
+            return True
+
+        def _builder(pipe):
+            for loc_id, data in locations.items():
+                pipe.hset(Rk.get_world_location_meta_key(loc_id, version), mapping=data)
+
+        results = await self.redis_service.execute_pipeline(_builder)
+        ok = len(results) == len(locations)
+        log.debug(
+            f"WorldManager | action=write_meta_batch status={'success' if ok else 'failed'} count={len(locations)}"
+        )
+        return ok
+
+    async def activate_version(self, version: str) -> str | None:
+        """
+        Атомарно переключает указатель на новую версию карты.
+
+        Returns:
+            Предыдущая активная версия (None — были legacy-ключи).
+        """
+        previous = await self.redis_service.redis_client.set(Rk.get_world_version_key(), version, get=True)  # type: ignore
+        self._remember_version(version)
+        await self._invalidate_location_cache(INVALIDATE_ALL)
+        log.info(f"WorldManager | action=activate_version status=success version={version} previous={previous}")
+        return str(previous) if previous is not None else None
+
+    async def retire_version(self, version: str | None) -> int:
+        """
+        Ставит TTL ключам неактивной версии карты (None — legacy-ключи без версии).
+        """
+        if version:
+            await self.redis_service.expire(Rk.get_world_graph_key(version), self.RETIRED_VERSION_TTL)
+        return await self.redis_service.expire_by_pattern(
+            Rk.get_world_location_meta_pattern(version), self.RETIRED_VERSION_TTL
+        )
+
+    async def write_world_graph(self, version: str, graph: dict[str, dict]) -> None:
+        """
+        Сохраняет снапшот графа переходов версии карты.
+
+        Args:
+            version: Версия карты.
+            graph: {loc_id: {"name": str, "nav": {target_loc_id: time_duration}, "services": [...], "hub": bool}}
+        """
+        await self.redis_service.set_value(Rk.get_world_graph_key(version), json.dumps(graph, ensure_ascii=False))
+        log.debug(f"WorldManager | action=write_graph status=success version={version} nodes={len(graph)}")
+
+    async def get_world_graph(self, version: str) -> dict[str, dict] | None:
+        """
+        Получает снапшот графа переходов версии карты (см. write_world_graph).
+        """
+        raw = await self.redis_service.get_value(Rk.get_world_graph_key(version))
+        return json.loads(raw) if raw else None
+
+    # --- Clan Generation Locks ---
+
+    async def acquire_clan_gen_lock(self, unique_hash: str, token: str, ttl: int) -> bool:
+        """
+        Захватывает генерацию клана между процессами (SET NX EX).
+
+        Raises:
+            RedisError: Если Redis недоступен (вызывающий решает, генерировать ли без лока).
+        """
+        key = Rk.get_clan_gen_lock_key(unique_hash)
+        return bool(await self.redis_service.redis_client.set(key, token, nx=True, ex=ttl))
+
+    async def get_clan_gen_state(self, unique_hash: str) -> str | None:
+        """
+        Состояние генерации клана: токен владельца, CLAN_GEN_DONE или None (никто не генерирует).
+        """
+        return await self.redis_service.get_value(Rk.get_clan_gen_lock_key(unique_hash))
+
+    async def extend_clan_gen_lock(self, unique_hash: str, token: str, ttl: int) -> bool:
+        """
+        Продлевает лок генерации клана, если его все еще держит token. False — лок потерян.
+        """
+        res = await self.redis_service.run_script(
+            _EXTEND_CLAN_GEN_SCRIPT, keys=[Rk.get_clan_gen_lock_key(unique_hash)], args=[token, ttl]
+        )
+        return bool(res)
+
+    async def finish_clan_gen(self, unique_hash: str, token: str, done: bool, done_ttl: int) -> None:
+        """
+        Завершает генерацию клана владельцем лока: done=True — помечает клан готовым на done_ttl,
+        иначе снимает лок (генерацию подхватит следующий ожидающий).
+        """
+        await self.redis_service.run_script(
+            _FINISH_CLAN_GEN_SCRIPT,
+            keys=[Rk.get_clan_gen_lock_key(unique_hash)],
+            args=[token, self.CLAN_GEN_DONE if done else "", done_ttl],
+        )
+
+    # --- Location Meta ---
+
+    async def _location_meta_key(self, loc_id: str) -> str:
+        return Rk.get_world_location_meta_key(loc_id, await self.get_active_version())
+
     async def write_location_meta(self, loc_id: str, data: dict) -> None:
         """
-        Записывает или обновляет метаданные для указанной мировой локации.
+        Записывает или обновляет метаданные для указанной мировой локации (в активной версии карты).
 
         Args:
             loc_id: Уникальный идентификатор локации.
             data: Словарь с метаданными локации (например, название, описание, выходы).
         """
-        key = Rk.get_world_location_meta_key(loc_id)
-        await self.redis_service.set_hash_fields(key, data)
-        log.debug(f"WorldManager | action=write_meta status=success loc_id={loc_id}")
+        # Указатель версии читается внутри транзакции (WATCH): закэшированный в процессе указатель
+        # мог устареть, и запись ушла бы в выведенное из оборота пространство (TTL) и пропала
+        versions: list[str | None] = []
+
+        def _builder(pipe, values: list[str | None]) -> None:
+            versions.append(values[0])
+            pipe.hset(Rk.get_world_location_meta_key(loc_id, values[0]), mapping=data)
+
+        if not await self.redis_service.execute_watched([Rk.get_world_version_key()], _builder):
+            log.error(f"WorldManager | action=write_meta status=failed loc_id={loc_id}")
+            return
+
+        version = versions[-1]
+        if version != WorldManager._active_version:
+            self._remember_version(version)
+        await self._invalidate_location_cache(loc_id)
+        log.debug(f"WorldManager | action=write_meta status=success loc_id={loc_id} version={version}")
+
+    async def _invalidate_location_cache(self, loc_id: str) -> None:
+        """Сброс LocationMetaCache: локально сразу, в остальных процессах — через Pub/Sub."""
+        location_meta_cache.invalidate(loc_id)
+        await self.redis_service.publish(Rk.get_world_location_invalidate_channel(), loc_id)
 
     async def get_location_meta(self, loc_id: str) -> dict | None:
         """
@@ -37,7 +292,7 @@ class WorldManager:
         Returns:
             Словарь с метаданными локации, или None, если метаданные не найдены.
         """
-        key = Rk.get_world_location_meta_key(loc_id)
+        key = await self._location_meta_key(loc_id)
         return await self.redis_service.get_all_hash(key)
 
     async def location_meta_exists(self, loc_id: str) -> bool:
@@ -50,9 +305,98 @@ class WorldManager:
         Returns:
             True, если метаданные локации существуют, иначе False.
         """
-        key = Rk.get_world_location_meta_key(loc_id)
+        key = await self._location_meta_key(loc_id)
         return await self.redis_service.key_exists(key)
 
+    async def move_player(
+        self,
+        char_id: int,
+        target_loc_id: str | None,
+        default_loc_id: str,
+        cached_loc_id: str | None = None,
+        current_loc_id: str | None = None,
+    ) -> dict[str, Any] | None:
+        """
+        Атомарно перемещает игрока в соседнюю локацию (один EVALSHA).
+
+        Проверяет, что target_loc_id есть среди выходов текущей локации и существует,
+        переносит игрока между SET'ами локаций и обновляет $.location аккаунта (current -> previous).
+        Ключи текущей локации строятся заранее: если игрок успел переместиться (status 'stale'),
+        вызов повторяется с актуальной локацией (до MOVE_ATTEMPTS раз).
+
+        Args:
+            char_id: ID персонажа.
+            target_loc_id: ID целевой локации (None/"" — без перемещения, только снимок текущей).
+            default_loc_id: Локация, если в аккаунте она не задана.
+            cached_loc_id: Локация, метаданные которой у вызывающего уже есть (для нее meta не возвращается).
+            current_loc_id: Известная вызывающему текущая локация (None — читается из аккаунта).
+
+        Returns:
+            Словарь {status, loc_id, previous_loc_id, meta, players_count, battles_count, survival}
+            для локации, где игрок оказался, или None при ошибке Redis.
+            status: moved | look | invalid_exit | target_not_found | location_not_found | no_account.
+        """
+        account_key = Rk.get_account_key(char_id)
+        if current_loc_id is None:
+            location = await self.redis_service.json_get(account_key, "$.location")
+            loc = location[0] if location else None
+            current_loc_id = loc.get("current") if isinstance(loc, dict) else None
+        current = current_loc_id or default_loc_id
+
+        version = await self.get_active_version()
+        for _ in range(self.MOVE_ATTEMPTS):
+            target = target_loc_id or current
+            res = await self.redis_service.run_script(
+                _MOVE_PLAYER_SCRIPT,
+                keys=[
+                    account_key,
+                    Rk.get_world_location_meta_key(current, version),
+                    Rk.get_world_location_meta_key(target, version),
+                    Rk.get_world_location_players_key(current),
+                    Rk.get_world_location_players_key(target),
+                    Rk.get_world_location_battles_key(current),
+                    Rk.get_world_location_battles_key(target),
+                ],
+                args=[str(char_id), target_loc_id or "", current, cached_loc_id or "", default_loc_id],
+            )
+            if not res:
+                return None
+            if res[0] != "stale":
+                break
+            current = res[1]
+        else:
+            log.warning(f"WorldManager | action=move_player status=stale char_id={char_id} to={target_loc_id}")
+            return None
+
+        status, loc_id, previous_loc_id, meta_flat, players_count, battles_count, survival_raw = res
+        survival = json.loads(survival_raw) if survival_raw else []
+
+        log.debug(
+            f"WorldManager | action=move_player status={status} char_id={char_id} from={previous_loc_id} to={loc_id}"
+        )
+        return {
+            "status": status,
+            "loc_id": loc_id,
+            "previous_loc_id": previous_loc_id,
+            "meta": dict(zip(meta_flat[::2], meta_flat[1::2], strict=True)),
+            "players_count": int(players_count),
+            "battles_count": int(battles_count),
+            "survival": survival[0] if survival else None,
+        }
+
+    async def start_travel(self, char_id: int, duration: float) -> float:
+        """
+        Помечает персонажа "в пути" на duration секунд (SET NX PX), если он сейчас не в пути.
+
+        Returns:
+            0.0 — перемещение начато, иначе сколько секунд (> 0) осталось до конца текущего.
+        """
+        key = Rk.get_world_travel_key(char_id)
+        if await self.redis_service.redis_client.set(key, "1", nx=True, px=max(1, int(duration * 1000))):
+            return 0.0
+        remaining_ms = await self.redis_service.redis_client.pttl(key)
+        return max(remaining_ms, 1) / 1000
+
     async def add_player_to_location(self, loc_id: str, char_id: int) -> None:
         """
         Добавляет игрока в множество игроков, находящихся в указанной локации.
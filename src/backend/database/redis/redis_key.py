@@ -68,6 +68,28 @@ class RedisKeys:
         """
         return f"combat:rbc:{session_id}:targets"
 
+    @staticmethod
+    def get_rbc_collector_pending_key(session_id: str) -> str:
+        """
+        RBC: Флаг "проход коллектора уже запланирован" (STRING с TTL).
+        Коалесцирует сигналы: пачка ходов дает один проход коллектора.
+        """
+        return f"combat:rbc:{session_id}:sys:collector"
+
+    @staticmethod
+    def get_rbc_timers_key(session_id: str) -> str:
+        """
+        RBC: Колесо таймаутов сессии (ZSET). Member: "{char_id}:{move_id}", Score: время срабатывания (unix ms).
+        """
+        return f"combat:rbc:{session_id}:timers"
+
+    @staticmethod
+    def get_rbc_timers_armed_key(session_id: str) -> str:
+        """
+        RBC: Время, на которое заведена отложенная задача колеса таймаутов (STRING с TTL).
+        """
+        return f"combat:rbc:{session_id}:sys:timer_armed"
+
     # --- Session Keys (Scenario, Inventory, etc.) ---
 
     @staticmethod
@@ -111,12 +133,45 @@ class RedisKeys:
         return f"ac:{char_id}"
 
     @staticmethod
-    def get_world_location_meta_key(loc_id: str) -> str:
+    def get_world_location_meta_key(loc_id: str, version: str | None = None) -> str:
         """
         Генерирует ключ для хранения статичных метаданных мировой локации (тип HASH).
+        С версией — ключ в пространстве прогрева `world:loc:v{version}:*` (см. get_world_version_key).
         """
+        if version:
+            return f"world:loc:v{version}:{loc_id}"
         return f"world:loc:{loc_id}"
 
+    @staticmethod
+    def get_world_location_meta_pattern(version: str | None = None) -> str:
+        """
+        Паттерн SCAN для всех метаданных локаций одной версии (без версии — legacy-ключи "world:loc:X_Y").
+        """
+        if version:
+            return f"world:loc:v{version}:*"
+        return "world:loc:[0-9-]*"
+
+    @staticmethod
+    def get_world_location_invalidate_channel() -> str:
+        """
+        Канал Pub/Sub инвалидации кэша метаданных локаций (сообщение — loc_id или "*").
+        """
+        return "world:loc_invalidate"
+
+    @staticmethod
+    def get_world_graph_key(version: str) -> str:
+        """
+        Генерирует ключ снапшота графа переходов версии карты (тип STRING/JSON) для авто-навигации.
+        """
+        return f"world:graph:v{version}"
+
+    @staticmethod
+    def get_world_version_key() -> str:
+        """
+        Генерирует ключ указателя на активную версию кэша карты (тип STRING).
+        """
+        return "world:loc_version"
+
     @staticmethod
     def get_world_location_players_key(loc_id: str) -> str:
         """
@@ -131,6 +186,20 @@ class RedisKeys:
         """
         return f"world:battles_loc:{loc_id}"
 
+    @staticmethod
+    def get_world_travel_key(char_id: int) -> str:
+        """
+        Генерирует ключ авто-перемещения персонажа (тип STRING с TTL = время маршрута).
+        """
+        return f"world:travel:{char_id}"
+
+    @staticmethod
+    def get_clan_gen_lock_key(unique_hash: str) -> str:
+        """
+        Генерирует ключ блокировки генерации клана по unique_hash (тип STRING: токен владельца или "done").
+        """
+        return f"world:clan_gen:{unique_hash}"
+
     @staticmethod
     def get_solo_dungeon_key(char_id: int) -> str:
         """
@@ -194,6 +263,13 @@ class RedisKeys:
         """
         return f"arena:req:{char_id}"
 
+    @staticmethod
+    def get_arena_match_key(char_id: int) -> str:
+        """
+        Генерирует ключ слота найденного матча персонажа (тип STRING: ID соперника, с TTL).
+        """
+        return f"arena:match:{char_id}"
+
     @staticmethod
     def get_player_status_key(char_id: int) -> str:
         """
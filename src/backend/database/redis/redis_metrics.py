@@ -0,0 +1,194 @@
+import sys
+import time
+from bisect import bisect_left
+from collections.abc import Awaitable, Callable
+from functools import wraps
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any, ParamSpec, TypeVar
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# Границы бакетов латентности (мс) и размера пайплайна (команд); последний бакет — +Inf
+LATENCY_BUCKETS_MS = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 1000.0)
+PIPELINE_SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+# Кадры этих файлов пропускаются при определении вызывающего менеджера
+_SERVICE_FILES = {__file__, str(Path(__file__).with_name("redis_service.py"))}
+
+
+class Histogram:
+    """Гистограмма с фиксированными бакетами (счетчики по бакетам + сумма + количество)."""
+
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """Накопительные счетчики по бакетам (le, count) в формате Prometheus."""
+        result: list[tuple[str, int]] = []
+        running = 0
+        for bound, count in zip((*self.bounds, float("inf")), self.counts, strict=True):
+            running += count
+            result.append(("+Inf" if bound == float("inf") else f"{bound:g}", running))
+        return result
+
+
+class RedisMetrics:
+    """
+    Метрики вызовов RedisService (process-wide): латентность по командам и Lua-скриптам,
+    размеры пайплайнов и счетчики ошибок, которые RedisService проглатывает (возвращая None / [] / 0).
+
+    Метка `component` — менеджер, из которого пришел вызов (combat, world, inventory...):
+    определяется по стеку вызовов (класс вызывающего метода) и кэшируется на объект кода,
+    поэтому менеджеры и их тестовые заглушки не меняются.
+
+    Выключено по умолчанию (REDIS_METRICS_ENABLED): тогда обертка методов — одна проверка флага.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._latency: dict[tuple[str, str], Histogram] = {}
+        self._pipeline_sizes: dict[str, Histogram] = {}
+        self._errors: dict[tuple[str, str], int] = {}
+        self._components: dict[CodeType, str | None] = {}
+
+    def reset(self) -> None:
+        self._latency.clear()
+        self._pipeline_sizes.clear()
+        self._errors.clear()
+
+    # =========================================================================
+    # Recording
+    # =========================================================================
+
+    def observe(self, component: str, op: str, elapsed_ms: float) -> None:
+        hist = self._latency.get((component, op))
+        if hist is None:
+            hist = self._latency[(component, op)] = Histogram(LATENCY_BUCKETS_MS)
+        hist.observe(elapsed_ms)
+
+    def observe_pipeline_size(self, component: str, size: int) -> None:
+        hist = self._pipeline_sizes.get(component)
+        if hist is None:
+            hist = self._pipeline_sizes[component] = Histogram(PIPELINE_SIZE_BUCKETS)
+        hist.observe(size)
+
+    def record_error(self, op: str, component: str | None = None) -> None:
+        """Учитывает проглоченную ошибку Redis (вызывается из except-блоков RedisService)."""
+        if not self.enabled:
+            return
+        component = component or self.caller_component()
+        self._errors[(component, op)] = self._errors.get((component, op), 0) + 1
+
+    def caller_component(self) -> str:
+        """Метка первого вызывающего кода за пределами RedisService (класс менеджера или модуль)."""
+        frame: FrameType | None = sys._getframe(1)
+        while frame is not None:
+            code = frame.f_code
+            if code not in self._components:
+                self._components[code] = self._component_of(frame)
+            label = self._components[code]
+            if label is not None:
+                return label
+            frame = frame.f_back
+        return "unknown"
+
+    @staticmethod
+    def _component_of(frame: FrameType) -> str | None:
+        code = frame.f_code
+        if code.co_filename in _SERVICE_FILES:
+            return None
+        owner, _, method = code.co_qualname.partition(".")
+        if not method or method.startswith("<locals>"):
+            # Функция модуля (таска, скрипт): метка — имя модуля
+            return str(frame.f_globals.get("__name__", "unknown")).rsplit(".", 1)[-1]
+        for suffix in ("RedisManager", "Manager"):
+            if owner.endswith(suffix) and owner != suffix:
+                owner = owner.removesuffix(suffix)
+                break
+        return "".join(f"_{c.lower()}" if c.isupper() else c for c in owner).lstrip("_")
+
+    # =========================================================================
+    # Export
+    # =========================================================================
+
+    def snapshot(self) -> dict[str, Any]:
+        """Снимок метрик: latency (count/avg_ms/buckets), pipeline_sizes, errors по (component, op)."""
+        return {
+            "latency": {
+                f"{component}:{op}": {
+                    "count": hist.count,
+                    "avg_ms": round(hist.total / hist.count, 3) if hist.count else 0.0,
+                    "buckets": dict(hist.cumulative()),
+                }
+                for (component, op), hist in sorted(self._latency.items())
+            },
+            "pipeline_sizes": {
+                component: {"count": hist.count, "avg": round(hist.total / hist.count, 2) if hist.count else 0.0}
+                for component, hist in sorted(self._pipeline_sizes.items())
+            },
+            "errors": {f"{component}:{op}": count for (component, op), count in sorted(self._errors.items())},
+        }
+
+    def render_prometheus(self) -> str:
+        """Метрики в текстовом формате Prometheus."""
+        lines = [
+            "# HELP redis_command_duration_ms RedisService call latency by component and command/script.",
+            "# TYPE redis_command_duration_ms histogram",
+        ]
+        for (component, op), hist in sorted(self._latency.items()):
+            labels = f'component="{component}",op="{op}"'
+            lines += [f'redis_command_duration_ms_bucket{{{labels},le="{le}"}} {n}' for le, n in hist.cumulative()]
+            lines.append(f"redis_command_duration_ms_sum{{{labels}}} {hist.total:.3f}")
+            lines.append(f"redis_command_duration_ms_count{{{labels}}} {hist.count}")
+
+        lines += [
+            "# HELP redis_pipeline_size Commands per RedisService pipeline by component.",
+            "# TYPE redis_pipeline_size histogram",
+        ]
+        for component, hist in sorted(self._pipeline_sizes.items()):
+            labels = f'component="{component}"'
+            lines += [f'redis_pipeline_size_bucket{{{labels},le="{le}"}} {n}' for le, n in hist.cumulative()]
+            lines.append(f"redis_pipeline_size_sum{{{labels}}} {hist.total:g}")
+            lines.append(f"redis_pipeline_size_count{{{labels}}} {hist.count}")
+
+        lines += [
+            "# HELP redis_swallowed_errors_total Redis errors caught by RedisService (default value returned).",
+            "# TYPE redis_swallowed_errors_total counter",
+        ]
+        for (component, op), count in sorted(self._errors.items()):
+            lines.append(f'redis_swallowed_errors_total{{component="{component}",op="{op}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+# Глобальные метрики процесса
+redis_metrics = RedisMetrics()
+
+
+def instrumented(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+    """Замеряет латентность метода RedisService (op — имя метода), если метрики включены."""
+    op = func.__name__
+
+    @wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        if not redis_metrics.enabled:
+            return await func(*args, **kwargs)
+        component = redis_metrics.caller_component()
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            redis_metrics.observe(component, op, (time.perf_counter() - start) * 1000)
+
+    return wrapper
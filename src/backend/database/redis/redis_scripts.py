@@ -0,0 +1,96 @@
+import hashlib
+from typing import Any
+
+from loguru import logger as log
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+
+class LuaScript:
+    """
+    Зарегистрированный Lua-скрипт.
+    SHA1 считается локально, поэтому EVALSHA можно вызывать без предварительного SCRIPT LOAD.
+    """
+
+    def __init__(self, name: str, source: str):
+        self.name = name
+        self.source = source
+        self.sha = hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+    def __repr__(self) -> str:
+        return f"LuaScript({self.name}, sha={self.sha[:8]})"
+
+
+class ScriptRegistry:
+    """
+    Реестр всех Lua-скриптов Redis-менеджеров (process-wide).
+
+    Менеджеры регистрируют скрипты при импорте модуля, воркеры и бэкенд
+    загружают их один раз на старте (`load_all` -> SCRIPT LOAD).
+    RedisService.run_script вызывает EVALSHA и прозрачно перезагружает скрипт при NOSCRIPT.
+    Реестр хранит счетчики вызовов и латентность по каждому скрипту.
+    """
+
+    def __init__(self):
+        self._scripts: dict[str, LuaScript] = {}
+        self._stats: dict[str, dict[str, float]] = {}
+
+    def register(self, name: str, source: str) -> LuaScript:
+        """Регистрирует скрипт под уникальным именем (идемпотентно для одинакового текста)."""
+        existing = self._scripts.get(name)
+        if existing and existing.source != source:
+            raise ValueError(f"Lua script '{name}' already registered with different source")
+
+        script = existing or LuaScript(name, source)
+        self._scripts[name] = script
+        self._stats.setdefault(name, {"calls": 0, "errors": 0, "reloads": 0, "total_ms": 0.0, "max_ms": 0.0})
+        return script
+
+    def get(self, name: str) -> LuaScript | None:
+        return self._scripts.get(name)
+
+    async def load_all(self, client: Redis) -> int:
+        """
+        Загружает все скрипты в Redis (SCRIPT LOAD).
+
+        Returns:
+            int: Количество загруженных скриптов.
+        """
+        loaded = 0
+        for script in self._scripts.values():
+            try:
+                await client.script_load(script.source)  # type: ignore
+                loaded += 1
+            except RedisError:
+                log.exception(f"RedisScripts | action=load status=failed script={script.name}")
+        log.info(f"RedisScripts | action=load_all status=success loaded={loaded} total={len(self._scripts)}")
+        return loaded
+
+    def record(self, name: str, elapsed_ms: float, error: bool = False, reloaded: bool = False) -> None:
+        """Фиксирует вызов скрипта (вызывается из RedisService.run_script)."""
+        stats = self._stats.setdefault(name, {"calls": 0, "errors": 0, "reloads": 0, "total_ms": 0.0, "max_ms": 0.0})
+        stats["calls"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        if error:
+            stats["errors"] += 1
+        if reloaded:
+            stats["reloads"] += 1
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Снимок статистики: calls, errors, reloads, avg_ms, max_ms по каждому скрипту."""
+        result: dict[str, dict[str, Any]] = {}
+        for name, stats in self._stats.items():
+            calls = int(stats["calls"])
+            result[name] = {
+                "calls": calls,
+                "errors": int(stats["errors"]),
+                "reloads": int(stats["reloads"]),
+                "avg_ms": round(stats["total_ms"] / calls, 3) if calls else 0.0,
+                "max_ms": round(stats["max_ms"], 3),
+            }
+        return result
+
+
+# Глобальный реестр процесса
+script_registry = ScriptRegistry()
@@ -1,11 +1,15 @@
 import json
+import time
 from collections.abc import Callable
 from typing import Any
 
 from loguru import logger as log
 from redis.asyncio import Redis
 from redis.asyncio.client import Pipeline  # Нужно для аннотации типов
-from redis.exceptions import RedisError
+from redis.exceptions import NoScriptError, RedisError, WatchError
+
+from src.backend.database.redis.redis_metrics import instrumented, redis_metrics
+from src.backend.database.redis.redis_scripts import LuaScript, script_registry
 
 
 class RedisService:
@@ -14,6 +18,8 @@ class RedisService:
     для работы с различными структурами данных Redis (хеши, множества, списки, ZSET, строки).
 
     Инкапсулирует логику обработки ошибок Redis и сериализации/десериализации JSON.
+    При включенных метриках (REDIS_METRICS_ENABLED) каждый вызов попадает в `redis_metrics`:
+    латентность по методу/скрипту, размер пайплайна и проглоченные ошибки с меткой менеджера.
     """
 
     def __init__(self, client: Redis):
@@ -38,10 +44,14 @@ class RedisService:
         Returns:
             Список результатов выполнения команд. Возвращает пустой список в случае ошибки.
         """
+        component = redis_metrics.caller_component() if redis_metrics.enabled else None
+        start = time.perf_counter()
         try:
             async with self.redis_client.pipeline() as pipe:
                 # Менеджер наполняет пайплайн
                 builder_func(pipe)
+                if component:
+                    redis_metrics.observe_pipeline_size(component, len(pipe.command_stack))
                 # Сервис выполняет пайплайн
                 results = await pipe.execute()
 
@@ -49,15 +59,58 @@ class RedisService:
             return results
 
         except RedisError:
+            redis_metrics.record_error("pipeline", component)
             log.exception("RedisPipeline | action=execute status=failed reason='Redis error'")
             return []
         except Exception as e:  # noqa: BLE001
+            redis_metrics.record_error("pipeline", component)
             # Ловим ошибки, которые могли возникнуть внутри builder_func (например, сериализация)
             log.exception(f"RedisPipeline | action=execute status=failed reason='Builder error' error='{e}'")
             return []
+        finally:
+            if component:
+                redis_metrics.observe(component, "pipeline", (time.perf_counter() - start) * 1000)
+
+    @instrumented
+    async def execute_watched(
+        self,
+        watch_keys: list[str],
+        builder_func: Callable[[Pipeline, list[str | None]], None],
+        max_attempts: int = 5,
+    ) -> list[Any]:
+        """
+        Оптимистичная транзакция: WATCH ключей -> чтение их значений -> MULTI/EXEC команд builder_func.
+        Если наблюдаемый ключ изменился до EXEC, транзакция повторяется с новыми значениями.
+
+        Args:
+            watch_keys: Ключи, от значений которых зависят команды (строковые значения).
+            builder_func: Функция (pipe, values) -> None, наполняющая транзакцию командами без await.
+            max_attempts: Сколько раз повторять при конкурентном изменении ключей.
+
+        Returns:
+            Список результатов команд транзакции. Пустой список при ошибке или исчерпании попыток.
+        """
+        try:
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                for _ in range(max_attempts):
+                    try:
+                        await pipe.watch(*watch_keys)
+                        values = [await pipe.get(key) for key in watch_keys]
+                        pipe.multi()
+                        builder_func(pipe, values)
+                        return await pipe.execute()
+                    except WatchError:
+                        log.debug(f"RedisTransaction | action=execute status=retry keys={watch_keys}")
+            log.warning(f"RedisTransaction | action=execute status=failed reason='Contention' keys={watch_keys}")
+            return []
+        except RedisError:
+            redis_metrics.record_error("execute_watched")
+            log.exception("RedisTransaction | action=execute status=failed reason='Redis error'")
+            return []
 
     # --- RedisJSON Methods ---
 
+    @instrumented
     async def json_set(self, key: str, path: str, obj: Any, nx: bool = False, xx: bool = False) -> bool:
         """
         Устанавливает значение JSON по указанному пути.
@@ -78,9 +131,11 @@ class RedisService:
             log.debug(f"RedisJSON | action=set status=success key='{key}' path='{path}'")
             return bool(result)
         except RedisError:
+            redis_metrics.record_error("json_set")
             log.exception(f"RedisJSON | action=set status=failed reason='Redis error' key='{key}'")
             return False
 
+    @instrumented
     async def json_get(self, key: str, path: str = "$") -> Any:
         """
         Получает значение JSON по указанному пути.
@@ -98,9 +153,11 @@ class RedisService:
             log.debug(f"RedisJSON | action=get status=found key='{key}' path='{path}'")
             return result
         except RedisError:
+            redis_metrics.record_error("json_get")
             log.exception(f"RedisJSON | action=get status=failed reason='Redis error' key='{key}'")
             return None
 
+    @instrumented
     async def json_arrappend(self, key: str, path: str, *args: Any) -> int:
         """
         Добавляет элементы в массив JSON.
@@ -119,9 +176,11 @@ class RedisService:
             log.debug(f"RedisJSON | action=arrappend status=success key='{key}' count={count}")
             return int(count) if count else 0
         except RedisError:
+            redis_metrics.record_error("json_arrappend")
             log.exception(f"RedisJSON | action=arrappend status=failed reason='Redis error' key='{key}'")
             return 0
 
+    @instrumented
     async def json_del(self, key: str, path: str = "$") -> int:
         """
         Удаляет значение JSON по указанному пути.
@@ -139,30 +198,49 @@ class RedisService:
             log.debug(f"RedisJSON | action=del status=success key='{key}' path='{path}' count={result}")
             return int(result)
         except RedisError:
+            redis_metrics.record_error("json_del")
             log.exception(f"RedisJSON | action=del status=failed reason='Redis error' key='{key}'")
             return 0
 
     # --- Standard Methods ---
 
-    async def eval_script(self, script: str, keys: list[str], args: list[Any]) -> Any:
+    async def run_script(self, script: LuaScript, keys: list[str], args: list[Any]) -> Any:
         """
-        Выполняет Lua-скрипт.
+        Выполняет зарегистрированный Lua-скрипт через EVALSHA.
+        При NOSCRIPT (рестарт/flush Redis) загружает скрипт и повторяет вызов.
 
         Args:
-            script: Текст скрипта.
+            script: Скрипт из ScriptRegistry.
             keys: Список ключей.
             args: Список аргументов.
 
         Returns:
-            Any: Результат выполнения скрипта.
-        """
-        try:
-            result = await self.redis_client.eval(script, len(keys), *keys, *args)  # type: ignore
-            return result
-        except RedisError:
-            log.exception("RedisService | action=eval status=failed reason='Redis error'")
+            Any: Результат выполнения скрипта или None при ошибке.
+        """
+        component = redis_metrics.caller_component() if redis_metrics.enabled else None
+        start = time.perf_counter()
+        reloaded = False
+        failed = False
+        try:
+            try:
+                return await self.redis_client.evalsha(script.sha, len(keys), *keys, *args)  # type: ignore
+            except NoScriptError:
+                reloaded = True
+                log.warning(f"RedisService | action=evalsha status=noscript script={script.name}")
+                await self.redis_client.script_load(script.source)  # type: ignore
+                return await self.redis_client.evalsha(script.sha, len(keys), *keys, *args)  # type: ignore
+        except RedisError:
+            redis_metrics.record_error(f"script:{script.name}", component)
+            failed = True
+            log.exception(f"RedisService | action=evalsha status=failed reason='Redis error' script={script.name}")
             return None
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            script_registry.record(script.name, elapsed_ms, error=failed, reloaded=reloaded)
+            if component:
+                redis_metrics.observe(component, f"script:{script.name}", elapsed_ms)
 
+    @instrumented
     async def expire(self, key: str, time: int) -> bool:
         """
         Устанавливает время жизни (TTL) для ключа.
@@ -179,9 +257,11 @@ class RedisService:
             log.debug(f"RedisKey | action=expire status=success key='{key}' ttl={time}")
             return bool(result)
         except RedisError:
+            redis_metrics.record_error("expire")
             log.exception(f"RedisKey | action=expire status=failed reason='Redis error' key='{key}'")
             return False
 
+    @instrumented
     async def set_hash_json(self, key: str, field: str, data: dict[str, Any]) -> None:
         """
         Сериализует словарь в JSON-строку и сохраняет её в указанное поле хеша Redis.
@@ -205,8 +285,10 @@ class RedisService:
                 exc_info=True,
             )
         except RedisError:
+            redis_metrics.record_error("set_hash_json")
             log.exception(f"RedisHash | action=set_json status=failed reason='Redis error' key='{key}' field='{field}'")
 
+    @instrumented
     async def set_hash_fields(self, key: str, data: dict[str, Any]) -> None:
         """
         Устанавливает несколько полей и их значений в хеше Redis за один вызов.
@@ -222,8 +304,10 @@ class RedisService:
             await self.redis_client.hset(key, mapping=data)  # type: ignore
             log.debug(f"RedisHash | action=set_fields status=success key='{key}' fields={list(data.keys())}")
         except RedisError:
+            redis_metrics.record_error("set_hash_fields")
             log.exception(f"RedisHash | action=set_fields status=failed reason='Redis error' key='{key}'")
 
+    @instrumented
     async def set_hash_field(self, key: str, field: str, value: str) -> None:
         """
         Устанавливает значение одного поля в хеше Redis.
@@ -237,10 +321,12 @@ class RedisService:
             await self.redis_client.hset(key, field, value)  # type: ignore
             log.debug(f"RedisHash | action=set_field status=success key='{key}' field='{field}'")
         except RedisError:
+            redis_metrics.record_error("set_hash_field")
             log.exception(
                 f"RedisHash | action=set_field status=failed reason='Redis error' key='{key}' field='{field}'"
             )
 
+    @instrumented
     async def get_hash_json(self, key: str, field: str) -> dict[str, Any] | None:
         """
         Получает JSON-строку из поля хеша Redis и десериализует её в словарь.
@@ -270,9 +356,11 @@ class RedisService:
             )
             return None
         except RedisError:
+            redis_metrics.record_error("get_hash_json")
             log.exception(f"RedisHash | action=get_json status=failed reason='Redis error' key='{key}' field='{field}'")
             return None
 
+    @instrumented
     async def get_hash_field(self, key: str, field: str) -> str | None:
         """
         Получает строковое значение одного поля из хеша Redis.
@@ -295,11 +383,36 @@ class RedisService:
             log.debug(f"RedisHash | action=get_field status=not_found key='{key}' field='{field}'")
             return None
         except RedisError:
+            redis_metrics.record_error("get_hash_field")
             log.exception(
                 f"RedisHash | action=get_field status=failed reason='Redis error' key='{key}' field='{field}'"
             )
             return None
 
+    @instrumented
+    async def get_hash_fields(self, key: str, fields: list[str]) -> list[str | None]:
+        """
+        Получает значения нескольких полей хеша Redis одним запросом (HMGET).
+
+        Args:
+            key: Ключ хеша Redis.
+            fields: Список полей.
+
+        Returns:
+            Значения в порядке fields (None — поля нет). При ошибке Redis — список из None.
+        """
+        if not fields:
+            return []
+        try:
+            values = await self.redis_client.hmget(key, fields)  # type: ignore
+            log.debug(f"RedisHash | action=get_fields status=success key='{key}' fields_count={len(fields)}")
+            return list(values)
+        except RedisError:
+            redis_metrics.record_error("get_hash_fields")
+            log.exception(f"RedisHash | action=get_fields status=failed reason='Redis error' key='{key}'")
+            return [None] * len(fields)
+
+    @instrumented
     async def get_all_hash(self, key: str) -> dict[str, str] | None:
         """
         Получает все поля и их строковые значения из хеша Redis.
@@ -321,9 +434,11 @@ class RedisService:
             log.debug(f"RedisHash | action=get_all status=not_found key='{key}'")
             return None
         except RedisError:
+            redis_metrics.record_error("get_all_hash")
             log.exception(f"RedisHash | action=get_all status=failed reason='Redis error' key='{key}'")
             return None
 
+    @instrumented
     async def delete_hash_key(self, key: str) -> None:
         """
         Удаляет весь хеш по указанному ключу Redis.
@@ -338,8 +453,10 @@ class RedisService:
             await self.redis_client.delete(key)  # type: ignore
             log.debug(f"RedisHash | action=delete_key status=success key='{key}'")
         except RedisError:
+            redis_metrics.record_error("delete_hash_key")
             log.exception(f"RedisHash | action=delete_key status=failed reason='Redis error' key='{key}'")
 
+    @instrumented
     async def delete_hash_field(self, key: str, field: str) -> None:
         """
         Удаляет одно поле из хеша Redis.
@@ -355,10 +472,12 @@ class RedisService:
             await self.redis_client.hdel(key, field)  # type: ignore
             log.debug(f"RedisHash | action=delete_field status=success key='{key}' field='{field}'")
         except RedisError:
+            redis_metrics.record_error("delete_hash_field")
             log.exception(
                 f"RedisHash | action=delete_field status=failed reason='Redis error' key='{key}' field='{field}'"
             )
 
+    @instrumented
     async def add_to_set(self, key: str, value: str | int) -> None:
         """
         Добавляет строковое или целочисленное значение в множество Redis.
@@ -374,8 +493,10 @@ class RedisService:
             await self.redis_client.sadd(key, str(value))  # type: ignore
             log.debug(f"RedisSet | action=add status=success key='{key}' value='{value}'")
         except RedisError:
+            redis_metrics.record_error("add_to_set")
             log.exception(f"RedisSet | action=add status=failed reason='Redis error' key='{key}' value='{value}'")
 
+    @instrumented
     async def get_set_members(self, key: str) -> set[str]:
         """
         Возвращает все элементы множества Redis.
@@ -394,9 +515,11 @@ class RedisService:
             log.debug(f"RedisSet | action=get_all status=success key='{key}' members_count={len(members)}")
             return members
         except RedisError:
+            redis_metrics.record_error("get_set_members")
             log.exception(f"RedisSet | action=get_all status=failed reason='Redis error' key='{key}'")
             return set()
 
+    @instrumented
     async def is_set_member(self, key: str, value: str | int) -> bool:
         """
         Проверяет, является ли указанное значение элементом множества Redis.
@@ -418,9 +541,11 @@ class RedisService:
             )
             return bool(is_member)
         except RedisError:
+            redis_metrics.record_error("is_set_member")
             log.exception(f"RedisSet | action=is_member status=failed reason='Redis error' key='{key}' value='{value}'")
             return False
 
+    @instrumented
     async def remove_from_set(self, key: str, value: str | int) -> None:
         """
         Удаляет указанное значение из множества Redis.
@@ -436,8 +561,10 @@ class RedisService:
             await self.redis_client.srem(key, str(value))  # type: ignore
             log.debug(f"RedisSet | action=remove status=success key='{key}' value='{value}'")
         except RedisError:
+            redis_metrics.record_error("remove_from_set")
             log.exception(f"RedisSet | action=remove status=failed reason='Redis error' key='{key}' value='{value}'")
 
+    @instrumented
     async def key_exists(self, key: str) -> bool:
         """
         Проверяет существование ключа в Redis.
@@ -456,9 +583,11 @@ class RedisService:
             log.debug(f"RedisKey | action=exists status=checked key='{key}' result={bool(exists)}")
             return bool(exists)
         except RedisError:
+            redis_metrics.record_error("key_exists")
             log.exception(f"RedisKey | action=exists status=failed reason='Redis error' key='{key}'")
             return False
 
+    @instrumented
     async def add_to_zset(self, key: str, mapping: dict[str, float]) -> int:
         """
         Добавляет или обновляет элементы в отсортированном множестве (ZSET) Redis.
@@ -478,9 +607,11 @@ class RedisService:
             log.debug(f"RedisZSet | action=add status=success key='{key}' count={count}")
             return int(count)
         except RedisError:
+            redis_metrics.record_error("add_to_zset")
             log.exception(f"RedisZSet | action=add status=failed reason='Redis error' key='{key}'")
             return 0
 
+    @instrumented
     async def get_zset_score(self, key: str, member: str) -> float | None:
         """
         Возвращает очки (score) указанного члена отсортированного множества Redis.
@@ -500,11 +631,13 @@ class RedisService:
             log.debug(f"RedisZSet | action=get_score status=success key='{key}' member='{member}' score={score}")
             return float(score) if score is not None else None
         except RedisError:
+            redis_metrics.record_error("get_zset_score")
             log.exception(
                 f"RedisZSet | action=get_score status=failed reason='Redis error' key='{key}' member='{member}'"
             )
             return None
 
+    @instrumented
     async def get_zset_range_by_score(self, key: str, min_score: float, max_score: float) -> list[str]:
         """
         Возвращает список членов отсортированного множества Redis, чьи очки находятся в заданном диапазоне.
@@ -527,9 +660,31 @@ class RedisService:
             )
             return res
         except RedisError:
+            redis_metrics.record_error("get_zset_range_by_score")
             log.exception(f"RedisZSet | action=get_range_by_score status=failed reason='Redis error' key='{key}'")
             return []
 
+    @instrumented
+    async def get_zset_with_scores(self, key: str) -> list[tuple[str, float]]:
+        """
+        Возвращает все члены отсортированного множества Redis вместе с очками (ZRANGE WITHSCORES).
+
+        Args:
+            key: Ключ ZSET Redis.
+
+        Returns:
+            Список пар (член, очки) по возрастанию очков. Возвращает пустой список в случае ошибки.
+        """
+        try:
+            res = await self.redis_client.zrange(key, 0, -1, withscores=True)  # type: ignore
+            log.debug(f"RedisZSet | action=get_with_scores status=success key='{key}' count={len(res)}")
+            return [(str(member), float(score)) for member, score in res]
+        except RedisError:
+            redis_metrics.record_error("get_zset_with_scores")
+            log.exception(f"RedisZSet | action=get_with_scores status=failed reason='Redis error' key='{key}'")
+            return []
+
+    @instrumented
     async def remove_from_zset(self, key: str, member: str) -> bool:
         """
         Удаляет указанный член из отсортированного множества Redis.
@@ -552,9 +707,11 @@ class RedisService:
             log.debug(f"RedisZSet | action=remove status=not_found key='{key}' member='{member}'")
             return False
         except RedisError:
+            redis_metrics.record_error("remove_from_zset")
             log.exception(f"RedisZSet | action=remove status=failed reason='Redis error' key='{key}' member='{member}'")
             return False
 
+    @instrumented
     async def set_value(self, key: str, value: str, ttl: int | None = None) -> None:
         """
         Устанавливает строковое значение для ключа Redis с опциональным временем жизни (TTL).
@@ -571,8 +728,10 @@ class RedisService:
             await self.redis_client.set(key, value, ex=ttl)  # type: ignore
             log.debug(f"RedisString | action=set status=success key='{key}' ttl={ttl}")
         except RedisError:
+            redis_metrics.record_error("set_value")
             log.exception(f"RedisString | action=set status=failed reason='Redis error' key='{key}'")
 
+    @instrumented
     async def get_value(self, key: str) -> str | None:
         """
         Получает строковое значение по ключу Redis.
@@ -594,9 +753,33 @@ class RedisService:
             log.debug(f"RedisString | action=get status=not_found key='{key}'")
             return None
         except RedisError:
+            redis_metrics.record_error("get_value")
             log.exception(f"RedisString | action=get status=failed reason='Redis error' key='{key}'")
             return None
 
+    @instrumented
+    async def get_values(self, keys: list[str]) -> list[str | None]:
+        """
+        Получает строковые значения нескольких ключей одним запросом (MGET).
+
+        Args:
+            keys: Список ключей Redis.
+
+        Returns:
+            Значения в порядке keys (None — ключа нет). При ошибке Redis — список из None.
+        """
+        if not keys:
+            return []
+        try:
+            values = await self.redis_client.mget(keys)  # type: ignore
+            log.debug(f"RedisString | action=mget status=success keys_count={len(keys)}")
+            return list(values)
+        except RedisError:
+            redis_metrics.record_error("get_values")
+            log.exception(f"RedisString | action=mget status=failed reason='Redis error' keys_count={len(keys)}")
+            return [None] * len(keys)
+
+    @instrumented
     async def delete_key(self, key: str) -> None:
         """
         Удаляет ключ любого типа из Redis.
@@ -611,8 +794,10 @@ class RedisService:
             await self.redis_client.delete(key)  # type: ignore
             log.debug(f"RedisKey | action=delete status=success key='{key}'")
         except RedisError:
+            redis_metrics.record_error("delete_key")
             log.exception(f"RedisKey | action=delete status=failed reason='Redis error' key='{key}'")
 
+    @instrumented
     async def push_to_list(self, key: str, value: str) -> None:
         """
         Добавляет элемент в конец списка Redis (RPUSH).
@@ -628,8 +813,10 @@ class RedisService:
             await self.redis_client.rpush(key, value)  # type: ignore
             log.debug(f"RedisList | action=push status=success key='{key}'")
         except RedisError:
+            redis_metrics.record_error("push_to_list")
             log.exception(f"RedisList | action=push status=failed reason='Redis error' key='{key}'")
 
+    @instrumented
     async def pop_from_list_left(self, key: str) -> str | None:
         """
         Удаляет и возвращает первый элемент списка Redis (LPOP).
@@ -650,9 +837,11 @@ class RedisService:
                 return str(value)
             return None
         except RedisError:
+            redis_metrics.record_error("pop_from_list_left")
             log.exception(f"RedisList | action=lpop status=failed reason='Redis error' key='{key}'")
             return None
 
+    @instrumented
     async def get_list_range(self, key: str, start: int = 0, end: int = -1) -> list[str]:
         """
         Возвращает диапазон элементов из списка Redis.
@@ -675,9 +864,11 @@ class RedisService:
             )
             return result
         except RedisError:
+            redis_metrics.record_error("get_list_range")
             log.exception(f"RedisList | action=get_range status=failed reason='Redis error' key='{key}'")
             return []
 
+    @instrumented
     async def get_list_length(self, key: str) -> int:
         """
         Возвращает длину списка Redis.
@@ -693,9 +884,11 @@ class RedisService:
             log.debug(f"RedisList | action=len status=success key='{key}' count={count}")
             return int(count)
         except RedisError:
+            redis_metrics.record_error("get_list_length")
             log.exception(f"RedisList | action=len status=failed reason='Redis error' key='{key}'")
             return 0
 
+    @instrumented
     async def delete_by_pattern(self, pattern: str) -> int:
         """
         Удаляет ключи из Redis, соответствующие заданному паттерну.
@@ -720,5 +913,54 @@ class RedisService:
             )
             return int(deleted_count)
         except RedisError:
+            redis_metrics.record_error("delete_by_pattern")
             log.exception(f"RedisKey | action=delete_by_pattern status=failed reason='Redis error' pattern='{pattern}'")
             return 0
+
+    @instrumented
+    async def expire_by_pattern(self, pattern: str, ttl: int) -> int:
+        """
+        Ставит TTL всем ключам, соответствующим паттерну (SCAN + пайплайн EXPIRE).
+        Используется для отложенного удаления больших наборов ключей, которые еще могут читаться.
+
+        Args:
+            pattern: Паттерн для поиска ключей (например, "prefix:*").
+            ttl: Время жизни в секундах.
+
+        Returns:
+            Количество ключей, получивших TTL. Возвращает 0 в случае ошибки.
+        """
+        try:
+            keys = [k async for k in self.redis_client.scan_iter(match=pattern, count=1000)]
+            if keys:
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for key in keys:
+                        pipe.expire(key, ttl)
+                    await pipe.execute()
+            log.debug(f"RedisKey | action=expire_by_pattern status=success pattern='{pattern}' count={len(keys)}")
+            return len(keys)
+        except RedisError:
+            redis_metrics.record_error("expire_by_pattern")
+            log.exception(f"RedisKey | action=expire_by_pattern status=failed reason='Redis error' pattern='{pattern}'")
+            return 0
+
+    @instrumented
+    async def publish(self, channel: str, message: str) -> int:
+        """
+        Публикует сообщение в канал Pub/Sub.
+
+        Args:
+            channel: Имя канала.
+            message: Сообщение.
+
+        Returns:
+            Количество подписчиков, получивших сообщение. Возвращает 0 в случае ошибки.
+        """
+        try:
+            receivers = await self.redis_client.publish(channel, message)  # type: ignore
+            log.debug(f"RedisPubSub | action=publish status=success channel='{channel}' receivers={receivers}")
+            return int(receivers)
+        except RedisError:
+            redis_metrics.record_error("publish")
+            log.exception(f"RedisPubSub | action=publish status=failed reason='Redis error' channel='{channel}'")
+            return 0
@@ -9,6 +9,7 @@ from src.backend.domains.user_features.exploration.engine.encounter_engine impor
 from src.backend.domains.user_features.exploration.gateway.exploration_gateway import ExplorationGateway
 from src.backend.domains.user_features.exploration.services.exploration_service import ExplorationService
 from src.backend.domains.user_features.exploration.services.exploration_session_service import ExplorationSessionService
+from src.backend.domains.user_features.exploration.services.route_service import RouteService
 
 # --- 0. Core Services (Session & Engine) ---
 
@@ -43,16 +44,31 @@ async def get_encounter_engine(bridge: ExplorationDispatcherBridgeDep) -> Encoun
 EncounterEngineDep = Annotated[EncounterEngine, Depends(get_encounter_engine)]
 
 
+async def get_route_service(container: RedisContainerDep) -> RouteService:
+    """
+    Создает RouteService (граф мира кэшируется на процесс).
+    """
+    return RouteService(world_manager=container.world)
+
+
+RouteServiceDep = Annotated[RouteService, Depends(get_route_service)]
+
+
 # --- 1. Domain Service ---
 
 
 async def get_exploration_service(
-    session: ExplorationSessionServiceDep, engine: EncounterEngineDep, bridge: ExplorationDispatcherBridgeDep
+    session: ExplorationSessionServiceDep,
+    engine: EncounterEngineDep,
+    bridge: ExplorationDispatcherBridgeDep,
+    routes: RouteServiceDep,
 ) -> ExplorationService:
     """
     Создает ExplorationService.
     """
-    return ExplorationService(session_service=session, encounter_engine=engine, dispatcher_bridge=bridge)
+    return ExplorationService(
+        session_service=session, encounter_engine=engine, dispatcher_bridge=bridge, route_service=routes
+    )
 
 
 ExplorationServiceDep = Annotated[ExplorationService, Depends(get_exploration_service)]
@@ -1,6 +1,7 @@
 # apps/game_core/system/context_assembler/logic/player_assembler.py
 import asyncio
-from typing import Any, cast
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar, cast
 
 from apps.common.schemas_dto.character_dto import CharacterAttributesReadDTO, CharacterReadDTO
 from apps.common.schemas_dto.skill import SkillProgressDTO
@@ -8,8 +9,9 @@ from loguru import logger as log
 from pydantic import ValidationError
 from redis.exceptions import RedisError
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from src.backend.database.postgres.models.inventory import ResourceWallet
 from src.backend.database.postgres.models.symbiote import CharacterSymbiote
 from src.backend.database.postgres.repositories import (
     get_character_attributes_repo,
@@ -17,6 +19,7 @@ from src.backend.database.postgres.repositories import (
     get_inventory_repo,
     get_skill_progress_repo,
     get_symbiote_repo,
+    get_wallet_repo,
 )
 from src.backend.database.redis.manager.account_manager import AccountManager
 from src.backend.database.redis.manager.context_manager import ContextRedisManager
@@ -29,6 +32,11 @@ from src.backend.domains.internal_systems.context_assembler.schemas.combat impor
 from src.backend.domains.internal_systems.context_assembler.schemas.inventory import InventoryTempContext
 from src.backend.domains.internal_systems.context_assembler.schemas.status import StatusTempContext
 
+T = TypeVar("T")
+
+# Инвентарь грузится целиком (equipped + inventory) одним запросом
+INVENTORY_LOCATIONS = ["equipped", "inventory"]
+
 
 class PlayerAssembler(BaseAssembler):
     """
@@ -38,20 +46,15 @@ class PlayerAssembler(BaseAssembler):
 
     def __init__(
         self,
-        session: AsyncSession,
+        session_factory: async_sessionmaker[AsyncSession],
         account_manager: AccountManager,
         context_manager: ContextRedisManager,
         inventory_manager: InventoryManager,  # Добавлено
     ):
-        self.session = session
+        self.session_factory = session_factory
         self.account_manager = account_manager
         # Используем новый фасад
         self.session_manager = ContextSessionManager(context_manager, inventory_manager)  # Передаем inventory_manager
-        self.char_repo = get_character_repo(session)
-        self.attributes_repo = get_character_attributes_repo(session)
-        self.inv_repo = get_inventory_repo(session)
-        self.skill_repo = get_skill_progress_repo(session)
-        self.symbiote_repo = get_symbiote_repo(session)
 
     async def process_batch(self, ids: list[Any], scope: str) -> tuple[dict[Any, str], list[Any]]:
         """
@@ -66,54 +69,44 @@ class PlayerAssembler(BaseAssembler):
         query_plan = get_query_plan(scope)
 
         # 1. Пакетный сбор данных (Conditional Loading)
-        tasks: list[Any] = []  # type: ignore[var-annotated]
-        task_mapping = []
-
-        # Всегда грузим базовую инфу о персонаже (для meta)
-        tasks.append(self.char_repo.get_characters_batch(int_ids))
-        task_mapping.append("char")
+        # Каждая таблица из плана — один запрос на весь батч (IN по ID): число обращений к БД не зависит
+        # от размера батча. Запросы идут параллельно, каждый в своей короткой сессии из пула —
+        # одна AsyncSession не допускает конкурентных запросов.
+        fetchers: dict[str, Awaitable[Any]] = {
+            # Всегда грузим базовую инфу о персонаже (для meta)
+            "char": self._read(lambda s: get_character_repo(s).get_characters_batch(int_ids)),
+        }
 
         if "attributes" in query_plan:
-            tasks.append(self.attributes_repo.get_attributes_batch(int_ids))
-            task_mapping.append("attributes")
+            fetchers["attributes"] = self._read(
+                lambda s: get_character_attributes_repo(s).get_attributes_batch(int_ids)
+            )
 
         if "inventory" in query_plan:
-            # Всегда грузим весь инвентарь (equipped + inventory)
-            t1 = self.inv_repo.get_items_by_location_batch(int_ids, "equipped")
-            t2 = self.inv_repo.get_items_by_location_batch(int_ids, "inventory")
-            tasks.append(asyncio.gather(t1, t2))
-            task_mapping.append("inventory_complex")
+            fetchers["inventory"] = self._read(
+                lambda s: get_inventory_repo(s).get_items_by_locations_batch(int_ids, INVENTORY_LOCATIONS)
+            )
 
         if "skills" in query_plan:
-            tasks.append(self.skill_repo.get_all_skills_progress_batch(int_ids))
-            task_mapping.append("skills")
+            fetchers["skills"] = self._read(lambda s: get_skill_progress_repo(s).get_all_skills_progress_batch(int_ids))
 
         if "vitals" in query_plan:
-            tasks.append(self.account_manager.get_accounts_json_batch(int_ids, "vitals"))
-            task_mapping.append("vitals")
+            fetchers["vitals"] = self.account_manager.get_accounts_json_batch(int_ids, "vitals")
 
         if "symbiote" in query_plan:
-            tasks.append(self.symbiote_repo.get_symbiotes_batch(int_ids))
-            task_mapping.append("symbiote")
+            fetchers["symbiote"] = self._read(lambda s: get_symbiote_repo(s).get_symbiotes_batch(int_ids))
+
+        if "wallet" in query_plan:
+            fetchers["wallet"] = self._read(lambda s: get_wallet_repo(s).get_wallets_batch(int_ids))
 
         # Ждем всех
         try:
-            results = await asyncio.gather(*tasks)
+            results = await asyncio.gather(*fetchers.values())
         except (SQLAlchemyError, RedisError, OSError) as e:
             log.exception(f"PlayerAssembler | DB fetch failed for batch. Error: {e}")
             return {}, int_ids
 
-        # Распаковка результатов
-        raw_data: dict[str, Any] = {}
-        for key, result in zip(task_mapping, results, strict=False):
-            if key == "inventory_complex":
-                equipped, inventory = result  # type: ignore[misc]
-                combined = {}
-                for cid in int_ids:
-                    combined[cid] = equipped.get(cid, []) + inventory.get(cid, [])  # type: ignore[attr-defined]
-                raw_data["inventory"] = combined
-            else:
-                raw_data[key] = result
+        raw_data: dict[str, Any] = dict(zip(fetchers, results, strict=True))
 
         # Преобразование в словари по ID
         chars_map = {char.character_id: char for char in cast(list[CharacterReadDTO], raw_data.get("char", []))}
@@ -123,6 +116,10 @@ class PlayerAssembler(BaseAssembler):
         skills_map = cast(dict[int, list[SkillProgressDTO]], raw_data.get("skills", {}))
         inventory_map = cast(dict[int, list[Any]], raw_data.get("inventory", {}))
         symbiotes_map = {s.character_id: s for s in cast(list[CharacterSymbiote], raw_data.get("symbiote", []))}
+        wallets_map = {
+            w.character_id: {"currency": w.currency, "resources": w.resources, "components": w.components}
+            for w in cast(list[ResourceWallet], raw_data.get("wallet", []))
+        }
 
         # Vitals приходят списком в порядке ID
         vitals_list = cast(list[dict | None], raw_data.get("vitals", []))
@@ -169,6 +166,7 @@ class PlayerAssembler(BaseAssembler):
                     core_skills=skills,
                     core_vitals=vitals,
                     core_symbiote=symbiote_data,
+                    core_wallet=wallets_map.get(char_id),
                 )
 
                 # Сериализация (exclude убирает core_* поля)
@@ -208,6 +206,11 @@ class PlayerAssembler(BaseAssembler):
         log.info(f"PlayerAssembler | batch processed. success={len(success_map)}, errors={len(error_list)}")
         return success_map, error_list
 
+    async def _read(self, query: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        """Выполняет запрос в отдельной короткой сессии из пула (только чтение, без commit)."""
+        async with self.session_factory() as session:
+            return await query(session)
+
     def _select_dto_class(self, scope: str) -> type[BaseTempContext]:
         if scope == "combats":
             return CombatTempContext
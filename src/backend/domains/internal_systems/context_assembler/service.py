@@ -3,7 +3,7 @@ import asyncio
 from loguru import logger as log
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.backend.core.database import get_session_context
+from src.backend.core.database import async_session_factory, get_session_context
 from src.backend.database.redis.manager.account_manager import AccountManager
 from src.backend.database.redis.manager.context_manager import ContextRedisManager
 from src.backend.database.redis.manager.inventory_manager import InventoryManager
@@ -50,7 +50,10 @@ class ContextAssemblerService:
         """
         # Инициализируем стратегии с текущей сессией и менеджерами
         strategies = {
-            "player": PlayerAssembler(session, self.account_manager, self.context_manager, self.inventory_manager),
+            # Игроки читают таблицы параллельно в собственных сессиях: общая сессия остается монстрам
+            "player": PlayerAssembler(
+                async_session_factory, self.account_manager, self.context_manager, self.inventory_manager
+            ),
             "monster": MonsterAssembler(session, self.account_manager, self.context_manager),
         }
 
@@ -1,5 +1,8 @@
 import asyncio
+import functools
 import json
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
 from typing import Any
 from uuid import uuid4
 
@@ -8,18 +11,20 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.backend.database.postgres.models import GeneratedClanORM, GeneratedMonsterORM
 from src.backend.database.postgres.repositories import MonsterRepository
+from src.backend.database.redis.manager.world_manager import WorldManager
 from src.backend.domains.internal_systems.factories.monster.clan_hashing import (
     compute_context_hash,
     compute_unique_clan_hash,
     normalize_tags,
 )
+from src.backend.domains.internal_systems.factories.monster.clan_registry import ClanGenerationRegistry
 from src.backend.resources.game_data.monsters import get_available_variants_for_tier, get_family_config
 from src.backend.resources.game_data.monsters.spawn_config import (
     BIOME_FAMILIES,
     TIER_AVAILABILITY,
     TIER_SCALING_CONFIG,
 )
-from src.backend.services.gemini_service.gemini_service import gemini_answer
+from src.backend.services.gemini_service.gemini_service import gemini_answer, is_json_object_response
 from src.shared.schemas.monster_dto import MonsterFamilyDTO, MonsterVariantDTO
 
 
@@ -29,12 +34,26 @@ class ClanFactory:
     Генерирует ВСЕ возможные варианты кланов для заданных условий.
     """
 
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        llm_semaphore: asyncio.Semaphore | None = None,
+        world_manager: WorldManager | None = None,
+        session_factory: Callable[[], AbstractAsyncContextManager[AsyncSession]] | None = None,
+    ):
         self.session = session
         self.repo = MonsterRepository(session)
-        self._llm_semaphore = asyncio.Semaphore(3)
-        # Кэш: Key = hash_контекста_плюс_семья, Value = ClanORM
-        self.context_cache: dict[str, GeneratedClanORM] = {}
+        # С фабрикой сессий каждый клан коммитится своей транзакцией до публикации в реестре:
+        # откат транзакции вызывающего (чанк прегенерации) не удаляет клан, который другие уже считают готовым
+        self.session_factory = session_factory
+        # Общий семафор передает пайплайн прегенерации (глобальный лимит запросов к LLM)
+        self._llm_semaphore = llm_semaphore or asyncio.Semaphore(3)
+        # Генерации семейств идут параллельно, а сессия одна: запись в БД — по очереди
+        self._session_lock = asyncio.Lock()
+        # Дедупликация генераций между фабриками процесса (и процессами — при переданном world_manager)
+        self.registry = ClanGenerationRegistry(world_manager)
+        # unique_hash кланов, которые уже есть в БД (или созданы этой фабрикой)
+        self.known_hashes: set[str] = set()
         log.debug("ClanFactoryInit")
 
     async def ensure_population_for_zone(self, tier: int, biome_id: str, location_tags: list[str], zone_id: str):
@@ -53,54 +72,53 @@ class ClanFactory:
         # zone_id здесь НЕ участвует, так как кланы общие для всех зон с таким климатом.
         context_hash_base = compute_context_hash(tier, biome_id, clean_tags)
 
-        # 3. ЦИКЛ ПО ВСЕМ КАНДИДАТАМ (Генерируем пул)
+        # 3. Хеш для БД на каждое семейство: md5(family_id + context_hash)
         # Мы не выбираем одного. Мы должны убедиться, что существуют ВСЕ.
-        for family_id in candidates:
-            await self._ensure_specific_family_exists(
-                family_id=family_id,
-                tier=tier,
-                clean_tags=clean_tags,
-                context_hash_base=context_hash_base,
-                zone_id=zone_id,  # Используется только как "место рождения" для логов
-            )
-
-    async def _ensure_specific_family_exists(
-        self, family_id: str, tier: int, clean_tags: list[str], context_hash_base: str, zone_id: str
-    ):
-        # Формируем уникальный ключ для кэша/проверки: "Контекст + Семейство"
-        # Пример: "ruins_t1_tags_HASH_bandits"
-        specific_cache_key = f"{context_hash_base}_{family_id}"
-
-        # 1. Быстрая проверка в кэше сессии
-        if specific_cache_key in self.context_cache:
+        missing = {
+            unique_hash: family_id
+            for family_id in sorted(candidates)
+            if (unique_hash := compute_unique_clan_hash(family_id, context_hash_base)) not in self.known_hashes
+        }
+        if not missing:
             return
 
-        # 2. Проверка в БД (через глобальный хеш)
-        # Хеш для БД: md5(family_id + context_hash)
-        unique_db_hash = compute_unique_clan_hash(family_id, context_hash_base)
-
-        # Этот метод должен быть быстрым (SELECT id FROM clans WHERE unique_hash = ...)
-        # Мы проверяем: есть ли уже "Бандиты для Руин Т1"?
-        existing_clan = await self.repo.get_clan_by_unique_hash(unique_db_hash)
-
-        if existing_clan:
-            # Уже есть в базе -> кладем в кэш и идем дальше
-            self.context_cache[specific_cache_key] = existing_clan
+        # 4. Одна проверка в БД на всех кандидатов (unique_hash IN (...))
+        existing = await self.repo.get_existing_unique_hashes(list(missing))
+        self.known_hashes.update(existing)
+        to_generate = {h: family_id for h, family_id in missing.items() if h not in existing}
+        if not to_generate:
             return
 
-        # 3. Если нет ни в кэше, ни в БД -> ГЕНЕРИРУЕМ
-        # Это произойдет только 1 раз для каждого типа врага в регионе
-        clan = await self._process_family_guarded(
-            family_id=family_id,
-            tier=tier,
-            clean_tags=clean_tags,
-            context_hash=context_hash_base,
-            unique_hash=unique_db_hash,
-            zone_id=zone_id,
+        # 5. Генерируем недостающие параллельно (LLM ограничен семафором, одинаковые хеши — через реестр)
+        results = await asyncio.gather(
+            *(
+                self.registry.run(
+                    unique_hash,
+                    functools.partial(
+                        self._generate_family,
+                        family_id=family_id,
+                        tier=tier,
+                        clean_tags=clean_tags,
+                        context_hash=context_hash_base,
+                        unique_hash=unique_hash,
+                        zone_id=zone_id,  # Используется только как "место рождения" для логов
+                    ),
+                )
+                for unique_hash, family_id in to_generate.items()
+            ),
+            return_exceptions=True,
         )
 
-        if clan:
-            self.context_cache[specific_cache_key] = clan
+        errors = [r for r in results if isinstance(r, BaseException)]
+        for unique_hash, result in zip(to_generate, results, strict=True):
+            if result is True:
+                self.known_hashes.add(unique_hash)
+        if errors:
+            # Остальные генерации уже завершены: сессия в согласованном состоянии для rollback у вызывающего
+            raise errors[0]
+
+    async def _generate_family(self, **kwargs: Any) -> bool:
+        return await self._process_family_guarded(**kwargs) is not None
 
     async def _process_family_guarded(self, *args: Any, **kwargs: Any) -> GeneratedClanORM | None:
         async with self._llm_semaphore:
@@ -139,7 +157,13 @@ class ClanFactory:
         flavor_data = await self._generate_flavor_with_llm(config, units, tier, tags)
         new_clan = self._build_clan_orm(config, tier, tags, ctx_hash, uniq_hash, flavor_data, zone_id)
         monsters = self._build_monster_list(new_clan, config, units, tier, flavor_data)
-        return await self.repo.create_clan_with_members(new_clan, monsters)
+        if self.session_factory is not None:
+            async with self.session_factory() as clan_session:
+                clan = await MonsterRepository(clan_session).create_clan_with_members(new_clan, monsters)
+                await clan_session.commit()
+                return clan
+        async with self._session_lock:
+            return await self.repo.create_clan_with_members(new_clan, monsters)
 
     async def _generate_flavor_with_llm(
         self, config: MonsterFamilyDTO, units: list[str], tier: int, tags: list[str]
@@ -159,7 +183,9 @@ class ClanFactory:
         }
         user_text = json.dumps(prompt_data, ensure_ascii=False)
         try:
-            raw_resp = await gemini_answer(mode="clan_generation", user_text=user_text)
+            raw_resp = await gemini_answer(
+                mode="clan_generation", user_text=user_text, validate=is_json_object_response
+            )
             clean_json = raw_resp.replace("```json", "").replace("```", "").strip()
             return json.loads(clean_json)
         except json.JSONDecodeError as e:
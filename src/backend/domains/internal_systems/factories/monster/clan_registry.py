@@ -0,0 +1,106 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import ClassVar
+from uuid import uuid4
+
+from loguru import logger as log
+from redis.exceptions import RedisError
+
+from src.backend.database.redis.manager.world_manager import WorldManager
+
+
+class ClanGenerationRegistry:
+    """
+    Реестр генераций кланов "в полете" по unique_hash.
+
+    Внутри процесса — общий словарь Future (ClassVar): все ClanFactory (разные зоны, сессии, стадии
+    пайплайна) ждут одну генерацию, а не запускают свою. Между процессами — опциональный лок в Redis
+    (WorldManager): владелец после успеха оставляет маркер "done" на done_ttl, остальные его дожидаются.
+    Пока владелец ждет семафор LLM и генерирует, лок продлевается каждые lock_ttl / 3.
+
+    generate() должен возвращать True только после коммита клана: результат сразу публикуется
+    ожидающим (Future и маркер "done"), и они считают клан существующим в БД.
+
+    run() возвращает True, если клан сгенерирован (этим вызовом или кем-то другим), False — если
+    генерация не удалась или ожидание превысило wait_timeout. Упавшую у владельца генерацию
+    подхватывает следующий ожидающий.
+    """
+
+    _inflight: ClassVar[dict[str, asyncio.Future[bool]]] = {}
+
+    def __init__(
+        self,
+        world_manager: WorldManager | None = None,
+        lock_ttl: int = 120,
+        done_ttl: int = 600,
+        poll_interval: float = 0.5,
+        wait_timeout: float = 600.0,
+    ):
+        self.world_mgr = world_manager
+        self.lock_ttl = lock_ttl
+        self.done_ttl = done_ttl
+        self.poll_interval = poll_interval
+        self.wait_timeout = wait_timeout
+
+    async def run(self, unique_hash: str, generate: Callable[[], Awaitable[bool]]) -> bool:
+        inflight = ClanGenerationRegistry._inflight
+        while (pending := inflight.get(unique_hash)) is not None:
+            # shield: отмена ожидающего не должна отменять чужую генерацию
+            if await asyncio.shield(pending):
+                log.debug(f"ClanRegistry | action=wait status=shared hash={unique_hash[:8]}")
+                return True
+
+        future: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        inflight[unique_hash] = future
+        result = False
+        try:
+            result = await self._run_locked(unique_hash, generate)
+            return result
+        finally:
+            inflight.pop(unique_hash, None)
+            future.set_result(result)
+
+    async def _run_locked(self, unique_hash: str, generate: Callable[[], Awaitable[bool]]) -> bool:
+        if self.world_mgr is None:
+            return await generate()
+
+        token = uuid4().hex
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            while not await self.world_mgr.acquire_clan_gen_lock(unique_hash, token, self.lock_ttl):
+                if await self.world_mgr.get_clan_gen_state(unique_hash) == WorldManager.CLAN_GEN_DONE:
+                    log.debug(f"ClanRegistry | action=wait status=shared_remote hash={unique_hash[:8]}")
+                    return True
+                if loop.time() - started > self.wait_timeout:
+                    # Владелец жив (лок продлевается), но не успел: клан не создан, вызывающий решает, что делать
+                    log.warning(
+                        f"ClanRegistry | action=wait status=timeout hash={unique_hash[:8]} "
+                        f"waited={loop.time() - started:.1f}s"
+                    )
+                    return False
+                await asyncio.sleep(self.poll_interval)
+        except RedisError as e:
+            # Redis — только дедупликация между процессами: без него генерируем под локальным реестром
+            log.warning(f"ClanRegistry | action=lock status=redis_unavailable hash={unique_hash[:8]} error='{e}'")
+            return await generate()
+
+        heartbeat = asyncio.create_task(self._heartbeat(self.world_mgr, unique_hash, token))
+        done = False
+        try:
+            done = await generate()
+            return done
+        finally:
+            heartbeat.cancel()
+            await self.world_mgr.finish_clan_gen(unique_hash, token, done=done, done_ttl=self.done_ttl)
+
+    async def _heartbeat(self, world_mgr: WorldManager, unique_hash: str, token: str) -> None:
+        """Продлевает лок владельца, пока идет generate(): ожидание семафора LLM не ограничено lock_ttl."""
+        while True:
+            await asyncio.sleep(self.lock_ttl / 3)
+            try:
+                if not await world_mgr.extend_clan_gen_lock(unique_hash, token, self.lock_ttl):
+                    log.warning(f"ClanRegistry | action=heartbeat status=lost hash={unique_hash[:8]}")
+                    return
+            except RedisError as e:
+                log.warning(f"ClanRegistry | action=heartbeat status=redis_error hash={unique_hash[:8]} error='{e}'")
@@ -1,37 +1,82 @@
 import asyncio
 import json
 import traceback
+from typing import Any
 
 from loguru import logger as log
 
+from src.backend.database.postgres.models import WorldGrid
 from src.backend.database.postgres.repositories import IWorldRepo
-from src.backend.services.gemini_service.gemini_service import gemini_answer
+from src.backend.services.gemini_service.gemini_service import gemini_answer, is_json_object_response
 
 
 class ContentGenerationService:
-    def __init__(self, world_repo: IWorldRepo):
+    def __init__(
+        self, world_repo: IWorldRepo, llm_concurrency: int = 3, llm_semaphore: asyncio.Semaphore | None = None
+    ):
         self.repo = world_repo
         self.batch_size = 5
+        # Сколько запросов одновременно ждут LLM (общий семафор передает пайплайн прегенерации)
+        self._llm_semaphore = llm_semaphore or asyncio.Semaphore(llm_concurrency)
+        self.llm_concurrency = llm_concurrency
 
     async def generate_content_for_path(self, path_coords: list[tuple[int, int]]):
+        """
+        Генерирует описания для клеток пути.
+        БД: одно чтение прямоугольника пути (+1 клетка на соседей) и один bulk upsert в конце.
+        LLM: батчи идут параллельно, не более llm_concurrency одновременно.
+        """
         total_nodes = len(path_coords)
-        log.info(f"ContentGen | task=started nodes={total_nodes} batch_size={self.batch_size} mode=sequential")
-
-        chunks = [path_coords[i : i + self.batch_size] for i in range(0, total_nodes, self.batch_size)]
-        log.info(f"ContentGen | action=batching total_batches={len(chunks)}")
+        if not total_nodes:
+            return
 
-        for i, chunk in enumerate(chunks):
-            log.info(f"ContentGen | processing_batch {i + 1}/{len(chunks)}...")
-            await self._process_batch(chunk, batch_id=i + 1)
-            await asyncio.sleep(1.0)
+        log.info(
+            f"ContentGen | task=started nodes={total_nodes} batch_size={self.batch_size} "
+            f"mode=concurrent concurrency={self.llm_concurrency}"
+        )
 
-        log.info("ContentGen | task=finished")
+        node_map = await self._load_path_nodes(path_coords)
 
-    async def _process_batch(self, chunk: list[tuple[int, int]], batch_id: int):
+        chunks = [path_coords[i : i + self.batch_size] for i in range(0, total_nodes, self.batch_size)]
+        log.info(f"ContentGen | action=batching total_batches={len(chunks)} prefetched={len(node_map)}")
+
+        # Сессия одна на всех: параллельно идут только запросы в LLM, БД не трогается до общего upsert
+        results = await asyncio.gather(
+            *(self._process_batch(chunk, node_map, batch_id=i + 1) for i, chunk in enumerate(chunks))
+        )
+        # Клетка могла попасть в путь (и в батчи) дважды: одна строка на координаты,
+        # иначе Postgres отвергнет весь upsert ("ON CONFLICT ... cannot affect row a second time")
+        rows: dict[tuple[int, int], dict[str, Any]] = {}
+        for batch_rows in results:
+            rows.update(batch_rows)
+
+        if rows:
+            await self.repo.bulk_upsert_nodes(list(rows.values()))
+        log.info(f"ContentGen | task=finished saved={len(rows)}/{total_nodes}")
+
+    async def _load_path_nodes(self, path_coords: list[tuple[int, int]]) -> dict[tuple[int, int], WorldGrid]:
+        """Один запрос на ограничивающий прямоугольник пути, расширенный на клетку (соседи)."""
+        min_x = min(x for x, _ in path_coords) - 1
+        min_y = min(y for _, y in path_coords) - 1
+        max_x = max(x for x, _ in path_coords) + 1
+        max_y = max(y for _, y in path_coords) + 1
+
+        nodes = await self.repo.get_nodes_in_rect(min_x, min_y, max_x - min_x + 1, max_y - min_y + 1)
+        return {(n.x, n.y): n for n in nodes}
+
+    async def _process_batch(
+        self, chunk: list[tuple[int, int]], node_map: dict[tuple[int, int], WorldGrid], batch_id: int
+    ) -> dict[tuple[int, int], dict[str, Any]]:
+        """
+        Запрос в LLM для одного батча.
+        Принимаются только id из payload батча: лишние id ответа LLM (чужие или выдуманные клетки) отбрасываются.
+        Returns:
+            Строки для bulk_upsert_nodes по координатам (полные колонки клетки с новым content).
+        """
         payload = []
 
         for x, y in chunk:
-            node = await self.repo.get_node(x, y)
+            node = node_map.get((x, y))
             if not node:
                 continue
 
@@ -39,17 +84,15 @@ class ContentGenerationService:
             if node.content and isinstance(node.content, dict):
                 my_tags = node.content.get("environment_tags", [])
 
-            surroundings = await self._get_surroundings_context(x, y)
-
             item = {
                 "id": f"{x}_{y}",
                 "internal_tags": my_tags,
-                "surroundings": surroundings,
+                "surroundings": self._get_surroundings_context(x, y, node_map),
             }
             payload.append(item)
 
         if not payload:
-            return
+            return {}
 
         response_text = ""
         try:
@@ -57,59 +100,78 @@ class ContentGenerationService:
             log.debug(
                 f"ContentGen | batch={batch_id} action=sending_request items={len(payload)} payload_preview:\n{user_text[:500]}"
             )
-            response_text = await gemini_answer(
-                mode="batch_location_desc",
-                user_text=user_text,
-                max_tokens=4000,
-            )
+            async with self._llm_semaphore:
+                response_text = await gemini_answer(
+                    mode="batch_location_desc",
+                    user_text=user_text,
+                    max_tokens=4000,
+                    validate=is_json_object_response,
+                )
             log.debug(f"ContentGen | batch={batch_id} action=received_response raw_response:\n{response_text}")
             clean_json = response_text.replace("```json", "").replace("```", "").strip()
             if not clean_json:
                 raise ValueError("Empty response from LLM")
             result_map = json.loads(clean_json)
+            if not isinstance(result_map, dict):
+                raise TypeError(f"Expected JSON object, got {type(result_map).__name__}")
 
         except (json.JSONDecodeError, ValueError, TypeError) as e:
             log.error(
                 f"ContentGen | batch={batch_id} status=llm_error exception='{e}' raw_preview='{response_text[:100]}'"
             )
             log.error(traceback.format_exc())
-            return
+            return {}
 
-        saved_count = 0
+        tags_by_id = {item["id"]: item["internal_tags"] for item in payload}
+        rows: dict[tuple[int, int], dict[str, Any]] = {}
         for loc_id, data in result_map.items():
+            if loc_id not in tags_by_id:
+                log.warning(f"ContentGen | batch={batch_id} status=unexpected_id id={loc_id}")
+                continue
             try:
                 content = data.get("content", {})
                 x, y = map(int, loc_id.split("_"))
 
-                original_item = next((i for i in payload if i["id"] == loc_id), None)
-                tags = original_item["internal_tags"] if original_item else []
+                node = node_map.get((x, y))
+                if node is None:
+                    continue
 
                 final_content = {
                     "title": content.get("title", "Пустошь"),
                     "description": content.get("description", "..."),
-                    "environment_tags": tags,
+                    "environment_tags": tags_by_id.get(loc_id, []),
                 }
 
-                await self.repo.update_content(x, y, final_content)
-                saved_count += 1
+                rows[(x, y)] = {
+                    "x": x,
+                    "y": y,
+                    "zone_id": node.zone_id,
+                    "terrain_type": node.terrain_type,
+                    "is_active": node.is_active,
+                    "flags": node.flags,
+                    "content": final_content,
+                    "services": node.services,
+                }
 
-            except (ValueError, TypeError, KeyError) as e:
+            except (ValueError, TypeError, KeyError, AttributeError) as e:
                 log.error(f"ContentGen | save_error id={loc_id} err={e}")
 
-        log.info(f"ContentGen | batch={batch_id} status=saved count={saved_count}/{len(chunk)}")
+        log.info(f"ContentGen | batch={batch_id} status=generated count={len(rows)}/{len(chunk)}")
+        return rows
 
-    async def _get_surroundings_context(self, x: int, y: int) -> dict[str, list[str]]:
+    @staticmethod
+    def _get_surroundings_context(x: int, y: int, node_map: dict[tuple[int, int], WorldGrid]) -> dict[str, list[str]]:
         directions = {"north": (0, -1), "south": (0, 1), "west": (-1, 0), "east": (1, 0)}
         result = {}
 
         for dir_name, (dx, dy) in directions.items():
-            nx, ny = x + dx, y + dy
-            node = await self.repo.get_node(nx, ny)
+            node = node_map.get((x + dx, y + dy))
 
             if node:
                 tags = []
                 if node.content and isinstance(node.content, dict):
-                    tags = node.content.get("environment_tags", [])
+                    # Копия: список принадлежит ORM-объекту
+                    tags = list(node.content.get("environment_tags", []))
 
                 if node.flags and node.flags.get("is_safe_zone"):
                     tags.append("safe_zone")
@@ -134,11 +196,13 @@ class ContentGenerationService:
             log.debug(
                 f"ContentGen | orchestrator_mode action=sending_request items={len(payload_items)} payload_preview:\n{user_text[:500]}"
             )
-            response_text = await gemini_answer(
-                mode="batch_location_desc",
-                user_text=user_text,
-                max_tokens=4000,
-            )
+            async with self._llm_semaphore:
+                response_text = await gemini_answer(
+                    mode="batch_location_desc",
+                    user_text=user_text,
+                    max_tokens=4000,
+                    validate=is_json_object_response,
+                )
             log.debug(f"ContentGen | orchestrator_mode action=received_response raw_response:\n{response_text}")
             clean_json = response_text.replace("```json", "").replace("```", "").strip()
             if not clean_json:
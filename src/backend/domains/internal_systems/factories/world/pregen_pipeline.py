@@ -0,0 +1,336 @@
+import asyncio
+import time
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from typing import Any
+
+from loguru import logger as log
+from pydantic import BaseModel, Field
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.database.db_contract.i_world_repo import IWorldRepo
+from src.backend.database.postgres.repositories import get_world_repo
+from src.backend.database.redis.manager.world_manager import WorldManager
+from src.backend.domains.internal_systems.factories.monster.clan_factory import ClanFactory
+from src.backend.domains.internal_systems.factories.world.content_gen_service import ContentGenerationService
+from src.backend.domains.internal_systems.factories.world.zone_orchestrator import ChunkPlan, ZoneOrchestrator
+from src.backend.resources.game_data.graf_data_world.world_config import (
+    HUB_CENTER,
+    WORLD_HEIGHT,
+    WORLD_WIDTH,
+    ZONE_SIZE,
+)
+
+# Статусы world_gen_progress
+STATUS_PENDING = "pending"
+STATUS_PERSISTED = "persisted"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+# Сигнал завершения стадии в очереди
+_STOP: Any = object()
+
+SessionFactory = Callable[[], AbstractAsyncContextManager[AsyncSession]]
+
+
+class PregenConfig(BaseModel):
+    """Параметры прегенерации мира."""
+
+    llm_concurrency: int = Field(default=4, ge=1, description="Глобальный лимит одновременных запросов к LLM")
+    queue_size: int = Field(default=8, ge=1, description="Емкость очередей между стадиями")
+    max_attempts: int = Field(default=3, ge=1, description="Попыток на чанк (между запусками)")
+    limit: int | None = Field(default=None, ge=1, description="Не больше N чанков за запуск")
+
+
+class PregenReport(BaseModel):
+    """Итог запуска прегенерации."""
+
+    planned: int = 0
+    skipped: int = 0
+    persisted: int = 0
+    populated: int = 0
+    failed: int = 0
+    elapsed_sec: float = 0.0
+    chunks_per_min: float = 0.0
+
+
+class WorldPregenPipeline:
+    """
+    Параллельная возобновляемая прегенерация мира по чанкам 5x5 (ZoneOrchestrator по стадиям).
+
+    Стадии связаны ограниченными очередями:
+        prepare (чтение БД) -> text (N воркеров, LLM) -> persist (запись БД) -> populate (ClanFactory).
+    У каждой стадии с БД своя сессия: параллельно идут только запросы к LLM, сессии не делятся между задачами.
+    Все обращения к LLM (описания и кланы) проходят через один семафор — llm_concurrency.
+    Одинаковые кланы соседних зон генерируются один раз (ClanGenerationRegistry).
+
+    Прогресс в world_gen_progress: persisted фиксируется в одной транзакции с клетками чанка,
+    поэтому после падения чанк не генерируется повторно, а persisted-чанки сразу уходят на заселение.
+
+    prepare читает теги соседних чанков (окрестности, входящие дороги), а persist их перезаписывает.
+    Чтобы результат не зависел от порядка ответов LLM, у чанков есть фазы (четность сетки зон, 4 цвета):
+    чанк готовится только после того, как все его соседи меньшей фазы из этого запуска сохранены (или упали).
+    Соседи большей фазы в этот момент гарантированно еще не сохранены — они ждут этот чанк.
+    """
+
+    def __init__(
+        self,
+        session_factory: SessionFactory,
+        config: PregenConfig | None = None,
+        repo_factory: Callable[[AsyncSession], IWorldRepo] = get_world_repo,
+        world_manager: WorldManager | None = None,
+    ):
+        self.session_factory = session_factory
+        self.config = config or PregenConfig()
+        self.repo_factory = repo_factory
+        # Redis-лок генерации кланов: нужен, только если прегенерация идет в нескольких процессах
+        self.world_manager = world_manager
+        self.llm_semaphore = asyncio.Semaphore(self.config.llm_concurrency)
+        self.report = PregenReport()
+        # Чанки запуска, прошедшие persist (успешно или нет), и сигнал prepare о новом таком чанке
+        self._settled: set[tuple[int, int]] = set()
+        self._settle_signal = asyncio.Event()
+
+    @staticmethod
+    def plan_chunks() -> list[tuple[int, int]]:
+        """Центры чанков, покрывающих карту (сетка зон), от хаба наружу."""
+        half = ZONE_SIZE // 2
+        centers = [(x, y) for x in range(half, WORLD_WIDTH, ZONE_SIZE) for y in range(half, WORLD_HEIGHT, ZONE_SIZE)]
+        hub_x, hub_y = HUB_CENTER["x"], HUB_CENTER["y"]
+        return sorted(centers, key=lambda c: (max(abs(c[0] - hub_x), abs(c[1] - hub_y)), c))
+
+    async def run(self) -> PregenReport:
+        started = time.perf_counter()
+        to_generate, to_populate = await self._load_work()
+        self.report.planned = len(to_generate) + len(to_populate)
+
+        log.info(
+            f"WorldPregen | action=start generate={len(to_generate)} populate={len(to_populate)} "
+            f"skipped={self.report.skipped} concurrency={self.config.llm_concurrency}"
+        )
+
+        text_q: asyncio.Queue = asyncio.Queue(self.config.queue_size)
+        persist_q: asyncio.Queue = asyncio.Queue(self.config.queue_size)
+        populate_q: asyncio.Queue = asyncio.Queue(self.config.queue_size)
+
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(self._prepare_stage(to_generate, text_q, persist_q))
+            tg.create_task(self._text_stage(text_q, persist_q))
+            tg.create_task(self._persist_stage(persist_q, populate_q))
+            tg.create_task(self._populate_stage(to_populate, populate_q))
+
+        report = self.report
+        report.elapsed_sec = round(time.perf_counter() - started, 3)
+        report.chunks_per_min = round(report.populated / report.elapsed_sec * 60, 1) if report.elapsed_sec else 0.0
+        log.info(
+            f"WorldPregen | action=finish persisted={report.persisted} populated={report.populated} "
+            f"failed={report.failed} elapsed={report.elapsed_sec}s chunks_per_min={report.chunks_per_min}"
+        )
+        return report
+
+    # =========================================================================
+    # Work planning
+    # =========================================================================
+
+    async def _load_work(self) -> tuple[list[tuple[int, int]], list[tuple[tuple[int, int], dict]]]:
+        """
+        Регистрирует все чанки и делит их по статусу:
+        pending/failed (попытки не исчерпаны) — генерировать; persisted — только заселить; done — пропустить.
+        """
+        chunks = self.plan_chunks()
+        async with self.session_factory() as session:
+            repo = self.repo_factory(session)
+            await repo.ensure_gen_chunks(chunks)
+            await session.commit()
+            progress = {
+                (p.chunk_x, p.chunk_y): (p.status, p.attempts, dict(p.zones or {}))
+                for p in await repo.get_gen_progress()
+            }
+
+        to_generate: list[tuple[int, int]] = []
+        to_populate: list[tuple[tuple[int, int], dict]] = []
+        for chunk in chunks:
+            status, attempts, zones = progress.get(chunk, (STATUS_PENDING, 0, {}))
+            if status == STATUS_PERSISTED:
+                to_populate.append((chunk, zones))
+            elif status == STATUS_PENDING or (status == STATUS_FAILED and attempts < self.config.max_attempts):
+                to_generate.append(chunk)
+            else:
+                self.report.skipped += 1
+
+        if self.config.limit is not None:
+            to_populate = to_populate[: self.config.limit]
+            to_generate = to_generate[: max(0, self.config.limit - len(to_populate))]
+        return to_generate, to_populate
+
+    @staticmethod
+    def chunk_phase(chunk: tuple[int, int]) -> int:
+        """Фаза чанка 0..3 по четности сетки зон: у всех 8 соседей чанка фаза другая."""
+        return (chunk[0] // ZONE_SIZE % 2) * 2 + chunk[1] // ZONE_SIZE % 2
+
+    @classmethod
+    def plan_dependencies(cls, chunks: list[tuple[int, int]]) -> dict[tuple[int, int], list[tuple[int, int]]]:
+        """Соседи каждого чанка из chunks с меньшей фазой: их клетки должны быть сохранены до prepare."""
+        planned = set(chunks)
+        deps: dict[tuple[int, int], list[tuple[int, int]]] = {}
+        for cx, cy in chunks:
+            phase = cls.chunk_phase((cx, cy))
+            neighbors = [
+                (cx + dx * ZONE_SIZE, cy + dy * ZONE_SIZE) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy
+            ]
+            deps[(cx, cy)] = [n for n in neighbors if n in planned and cls.chunk_phase(n) < phase]
+        return deps
+
+    def _settle(self, chunk: tuple[int, int]) -> None:
+        self._settled.add(chunk)
+        self._settle_signal.set()
+
+    def _build_orchestrator(self, session: AsyncSession) -> ZoneOrchestrator:
+        repo = self.repo_factory(session)
+        content_service = ContentGenerationService(
+            repo, llm_concurrency=self.config.llm_concurrency, llm_semaphore=self.llm_semaphore
+        )
+        clan_factory = ClanFactory(
+            session,
+            llm_semaphore=self.llm_semaphore,
+            world_manager=self.world_manager,
+            session_factory=self.session_factory,
+        )
+        return ZoneOrchestrator(session, repo, content_service, clan_factory=clan_factory)
+
+    # =========================================================================
+    # Stages
+    # =========================================================================
+
+    async def _prepare_stage(
+        self, chunks: list[tuple[int, int]], text_q: asyncio.Queue, persist_q: asyncio.Queue
+    ) -> None:
+        """
+        Чтение клеток и сборка payload. Пустые чанки (только статика) сразу идут на запись.
+        Первым готовится ближайший к хабу чанк, чьи соседи меньшей фазы уже сохранены (см. plan_dependencies).
+        """
+        deps = self.plan_dependencies(chunks)
+        pending = list(chunks)
+        async with self.session_factory() as session:
+            orchestrator = self._build_orchestrator(session)
+            while pending:
+                self._settle_signal.clear()
+                ready = next((c for c in pending if self._settled.issuperset(deps[c])), None)
+                if ready is None:
+                    # Все оставшиеся ждут соседей в полете (LLM / persist)
+                    await self._settle_signal.wait()
+                    continue
+
+                pending.remove(ready)
+                center_x, center_y = ready
+                plan = await orchestrator.prepare_chunk(center_x, center_y)
+                if plan is None:
+                    await persist_q.put(((center_x, center_y), None, None, "prepare_failed"))
+                elif not plan.payload_items:
+                    await persist_q.put(((center_x, center_y), plan, {}, None))
+                else:
+                    await text_q.put(plan)
+                # Снимок клеток больше не нужен сессии: identity map не растет на всю карту
+                session.expunge_all()
+
+        for _ in range(self.config.llm_concurrency):
+            await text_q.put(_STOP)
+
+    async def _text_stage(self, text_q: asyncio.Queue, persist_q: asyncio.Queue) -> None:
+        async def worker(content_service: ContentGenerationService) -> None:
+            while (plan := await text_q.get()) is not _STOP:
+                response = await content_service.generate_from_orchestrator(plan.payload_items)
+                error = None if response else "llm_failed"
+                await persist_q.put(((plan.center_x, plan.center_y), plan, response, error))
+
+        # generate_from_orchestrator не ходит в БД: сессия нужна только конструктору (соединение не открывается)
+        async with self.session_factory() as session:
+            content_service = ContentGenerationService(
+                self.repo_factory(session),
+                llm_concurrency=self.config.llm_concurrency,
+                llm_semaphore=self.llm_semaphore,
+            )
+            async with asyncio.TaskGroup() as tg:
+                for _ in range(self.config.llm_concurrency):
+                    tg.create_task(worker(content_service))
+
+        await persist_q.put(_STOP)
+
+    async def _persist_stage(self, persist_q: asyncio.Queue, populate_q: asyncio.Queue) -> None:
+        """Запись клеток и статуса persisted одной транзакцией на чанк."""
+        async with self.session_factory() as session:
+            orchestrator = self._build_orchestrator(session)
+            repo = orchestrator.repo
+
+            while (item := await persist_q.get()) is not _STOP:
+                chunk, plan, response, error = item
+                zones_context = None
+                if plan is not None and error is None:
+                    zones_context = await self._persist_plan(orchestrator, plan, response)
+                    error = None if zones_context is not None else "persist_failed"
+
+                try:
+                    if zones_context is not None:
+                        await repo.update_gen_chunk(chunk[0], chunk[1], status=STATUS_PERSISTED, zones=zones_context)
+                    else:
+                        # Частичные записи чанка (флаги дорог, упавший upsert) откатываются: чанк повторится целиком
+                        await session.rollback()
+                        await repo.update_gen_chunk(chunk[0], chunk[1], status=STATUS_FAILED, error=error, failed=True)
+                    await session.commit()
+                except SQLAlchemyError as e:
+                    await session.rollback()
+                    log.error(f"WorldPregen | stage=persist status=db_error chunk={chunk} error={e}")
+                    zones_context, error = None, "db_error"
+
+                session.expunge_all()
+                self._settle(chunk)
+                if zones_context is None:
+                    self.report.failed += 1
+                    log.warning(f"WorldPregen | stage=persist status=failed chunk={chunk} reason={error}")
+                    continue
+
+                self.report.persisted += 1
+                await populate_q.put((chunk, zones_context))
+
+        await populate_q.put(_STOP)
+
+    @staticmethod
+    async def _persist_plan(orchestrator: ZoneOrchestrator, plan: ChunkPlan, response: dict | None) -> dict | None:
+        if not plan.payload_items:
+            return {}
+        return await orchestrator.persist_chunk(plan, response)
+
+    async def _populate_stage(self, resumed: list[tuple[tuple[int, int], dict]], populate_q: asyncio.Queue) -> None:
+        """Заселение кланами. Чанки, сохраненные в прошлом запуске, идут первыми."""
+        async with self.session_factory() as session:
+            orchestrator = self._build_orchestrator(session)
+            repo = orchestrator.repo
+
+            async def populate(chunk: tuple[int, int], zones_context: dict) -> None:
+                try:
+                    await orchestrator.populate_zones(zones_context)
+                    await repo.update_gen_chunk(chunk[0], chunk[1], status=STATUS_DONE)
+                    await session.commit()
+                    self.report.populated += 1
+                except Exception as e:  # noqa: BLE001
+                    # Любая ошибка заселения (БД, LLM, фабрика) не останавливает пайплайн: чанк помечается
+                    # failed и повторится при следующем запуске, пока attempts < max_attempts
+                    await session.rollback()
+                    self.report.failed += 1
+                    log.error(f"WorldPregen | stage=populate status=failed chunk={chunk} error={e}")
+                    try:
+                        await repo.update_gen_chunk(
+                            chunk[0], chunk[1], status=STATUS_FAILED, error=f"populate_failed: {e}", failed=True
+                        )
+                        await session.commit()
+                    except SQLAlchemyError as db_e:
+                        # Статус не записан — чанк остается persisted и дозаселится при следующем запуске
+                        await session.rollback()
+                        log.error(f"WorldPregen | stage=populate status=db_error chunk={chunk} error={db_e}")
+
+            for chunk, zones_context in resumed:
+                await populate(chunk, zones_context)
+
+            while (item := await populate_q.get()) is not _STOP:
+                await populate(*item)
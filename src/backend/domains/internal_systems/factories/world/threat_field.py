@@ -0,0 +1,238 @@
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import ClassVar
+
+import numpy as np
+from loguru import logger as log
+
+from src.backend.domains.internal_systems.factories.world.threat_service import ThreatService
+from src.backend.resources.game_data.graf_data_world.world_config import (
+    ANCHORS,
+    HUB_CENTER,
+    HYBRID_TAGS,
+    PORTAL_PARAMS,
+    WORLD_HEIGHT,
+    WORLD_WIDTH,
+)
+from src.shared.core.config import ROOT_DIR
+
+# Версия формата/формул поля: поднять при изменении логики ThreatService
+FIELD_FORMAT_VERSION = 1
+
+DEFAULT_CACHE_DIR = ROOT_DIR / ".cache" / "threat_field"
+
+# Границы тиров ThreatService.get_tier_from_threat (threat < bound -> следующий тир)
+_TIER_BOUNDS = np.array([0.05, 0.20, 0.35, 0.55, 0.75, 0.90, 0.98])
+
+_NO_ANCHOR = -1
+
+
+class ThreatField:
+    """
+    Предрасчитанное поле угрозы/тиров/влияния стихий для всей сетки мира (numpy, [x, y]).
+
+    Формулы повторяют ThreatService поэлементно и в том же порядке операций (float64),
+    поэтому значения совпадают со скалярными функциями бит в бит — это проверяет дифференциальный тест.
+    Теги не хранятся: на клетку лежат индексы основной/вторичной стихии, список тегов собирается
+    из них (lru_cache по комбинации) — lookup O(1).
+
+    Поле кэшируется на диск (npz) по хэшу параметров world_config; координаты вне сетки
+    отдаются скалярным ThreatService.
+    """
+
+    _instance: ClassVar["ThreatField | None"] = None
+
+    def __init__(self, arrays: dict[str, np.ndarray]):
+        self.threat: np.ndarray = arrays["threat"]
+        self.tier: np.ndarray = arrays["tier"]
+        self.primary: np.ndarray = arrays["primary"]
+        self.secondary: np.ndarray = arrays["secondary"]
+        self.inside_city: np.ndarray = arrays["inside_city"]
+        self.width, self.height = self.threat.shape
+
+    # =========================================================================
+    # Construction
+    # =========================================================================
+
+    @classmethod
+    def get(cls) -> "ThreatField":
+        """Поле текущего world_config (process-wide): с диска или расчетом."""
+        if cls._instance is None:
+            cls._instance = cls.load_or_build()
+        return cls._instance
+
+    @classmethod
+    def load_or_build(cls, cache_dir: Path | None = None) -> "ThreatField":
+        cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        path = cache_dir / f"threat_field_{cls.config_hash()}.npz"
+
+        if path.exists():
+            try:
+                with np.load(path) as data:
+                    field = cls({name: data[name] for name in data.files})
+                log.debug(f"ThreatField | action=load status=success path={path}")
+                return field
+            except (OSError, ValueError, KeyError) as e:
+                log.warning(f"ThreatField | action=load status=failed path={path} error='{e}'")
+
+        field = cls(cls.build_arrays())
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp.npz")
+            np.savez(
+                tmp_path,
+                threat=field.threat,
+                tier=field.tier,
+                primary=field.primary,
+                secondary=field.secondary,
+                inside_city=field.inside_city,
+            )
+            tmp_path.replace(path)
+            log.info(f"ThreatField | action=save status=success path={path}")
+        except OSError as e:
+            # Кэш — оптимизация: без записи на диск поле просто живет в памяти
+            log.warning(f"ThreatField | action=save status=failed path={path} error='{e}'")
+        return field
+
+    @staticmethod
+    def config_hash() -> str:
+        """Хэш всех параметров world_config, от которых зависит поле."""
+        payload = {
+            "format": FIELD_FORMAT_VERSION,
+            "size": [WORLD_WIDTH, WORLD_HEIGHT],
+            "hub": HUB_CENTER,
+            "portal": PORTAL_PARAMS,
+            "city_radius": ThreatService.CITY_RADIUS,
+            "anchors": [{k: a[k] for k in ("x", "y", "power", "falloff", "type")} for a in ANCHORS],
+            "tiers": _TIER_BOUNDS.tolist(),
+        }
+        raw = json.dumps(payload, sort_keys=True).encode()
+        return hashlib.sha256(raw).hexdigest()[:16]
+
+    @staticmethod
+    def build_arrays(width: int = WORLD_WIDTH, height: int = WORLD_HEIGHT) -> dict[str, np.ndarray]:
+        """Векторный расчет поля по всей сетке (зеркало ThreatService.calculate_threat / get_narrative_tags)."""
+        xs = np.arange(width, dtype=np.float64)[:, None]
+        ys = np.arange(height, dtype=np.float64)[None, :]
+
+        def chebyshev(cx: int, cy: int) -> np.ndarray:
+            return np.maximum(np.abs(xs - cx), np.abs(ys - cy))
+
+        dist_hub = chebyshev(HUB_CENTER["x"], HUB_CENTER["y"])
+        inside_city = dist_hub <= ThreatService.CITY_RADIUS
+
+        # --- calculate_threat ---
+        stability = PORTAL_PARAMS["power"] / (1 + dist_hub * PORTAL_PARAMS["falloff"])
+        raw = np.stack(
+            [anchor["power"] / (1 + chebyshev(anchor["x"], anchor["y"]) * anchor["falloff"]) for anchor in ANCHORS]
+        )
+
+        danger = np.zeros((width, height))
+        for layer in raw:  # Суммирование в порядке ANCHORS, как в скалярной версии
+            danger = danger + layer
+        danger = np.where(inside_city, danger * 0.25, danger)
+        threat = np.maximum(0.0, np.minimum(1.0, danger - stability))
+        tier = np.searchsorted(_TIER_BOUNDS, threat, side="right").astype(np.int8)
+
+        # --- get_narrative_tags: щит, порог, основная и вторичная стихии ---
+        distance_from_wall = dist_hub - ThreatService.CITY_RADIUS
+        shield = np.where(
+            inside_city,
+            np.where(dist_hub <= 4, 0.0, 0.2),
+            np.where(distance_from_wall < 10, distance_from_wall / 10.0, 1.0),
+        )
+        influence = raw * shield
+        threshold = np.where(inside_city, 0.1, 0.05)
+        masked = np.where(influence > threshold, influence, -np.inf)
+
+        # argmax берет первый максимум — как стабильная сортировка по убыванию при равных значениях
+        has_primary = np.isfinite(masked).any(axis=0)
+        primary = np.argmax(masked, axis=0)
+        primary_val = np.take_along_axis(masked, primary[None], axis=0)[0]
+
+        rest = masked.copy()
+        np.put_along_axis(rest, primary[None], -np.inf, axis=0)
+        secondary = np.argmax(rest, axis=0)
+        secondary_val = np.take_along_axis(rest, secondary[None], axis=0)[0]
+        has_secondary = (
+            has_primary
+            & ~inside_city
+            & np.isfinite(secondary_val)
+            & (secondary_val > 0.15)
+            & (secondary_val > primary_val * 0.7)
+        )
+
+        return {
+            "threat": threat,
+            "tier": tier,
+            "primary": np.where(has_primary, primary, _NO_ANCHOR).astype(np.int8),
+            "secondary": np.where(has_secondary, secondary, _NO_ANCHOR).astype(np.int8),
+            "inside_city": inside_city,
+        }
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        return {
+            "threat": self.threat,
+            "tier": self.tier,
+            "primary": self.primary,
+            "secondary": self.secondary,
+            "inside_city": self.inside_city,
+        }
+
+    # =========================================================================
+    # Lookups
+    # =========================================================================
+
+    def contains(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def calculate_threat(self, x: int, y: int) -> float:
+        if not self.contains(x, y):
+            return ThreatService.calculate_threat(x, y)
+        return float(self.threat[x, y])
+
+    def get_tier(self, x: int, y: int) -> int:
+        if not self.contains(x, y):
+            return ThreatService.get_tier_from_threat(ThreatService.calculate_threat(x, y))
+        return int(self.tier[x, y])
+
+    def get_narrative_tags(self, x: int, y: int) -> list[str]:
+        if not self.contains(x, y):
+            return ThreatService.get_narrative_tags(x, y)
+        return list(
+            _compose_tags(
+                int(self.primary[x, y]),
+                int(self.secondary[x, y]),
+                int(self.tier[x, y]),
+                bool(self.inside_city[x, y]),
+            )
+        )
+
+
+@lru_cache(maxsize=1024)
+def _compose_tags(primary: int, secondary: int, tier: int, inside_city: bool) -> tuple[str, ...]:
+    """Сборка тегов из индексов стихий — те же шаги, что в ThreatService.get_narrative_tags."""
+    if primary == _NO_ANCHOR:
+        return ()
+
+    primary_anchor = ANCHORS[primary]
+    effective_tier = 1 if inside_city else tier
+    active_tags = list(
+        ThreatService._get_gradient_tags(primary_anchor["type"], effective_tier) or primary_anchor["narrative_tags"]
+    )
+
+    if secondary != _NO_ANCHOR:
+        secondary_anchor = ANCHORS[secondary]
+        sec_tier = max(0, tier - 2)
+        active_tags.extend(
+            ThreatService._get_gradient_tags(secondary_anchor["type"], sec_tier) or secondary_anchor["narrative_tags"]
+        )
+
+        key1 = ThreatService.TYPE_MAP.get(primary_anchor["type"])
+        key2 = ThreatService.TYPE_MAP.get(secondary_anchor["type"])
+        if key1 and key2:
+            active_tags.extend(HYBRID_TAGS.get(frozenset([key1, key2]), []))
+
+    return tuple(dict.fromkeys(active_tags))
@@ -1,4 +1,5 @@
 import json
+import time
 from typing import Any
 
 from loguru import logger as log
@@ -9,68 +10,162 @@ from src.backend.database.postgres.models import WorldGrid
 from src.backend.database.postgres.repositories import get_world_repo
 
 
+class _WarmupWriteError(Exception):
+    """Пайплайн записи чанка в Redis не выполнился — версия не активируется."""
+
+
 class WorldLoaderService:
     """
     Сервис загрузки активной части мира (Active Grid) из SQL в кэш Redis.
-    Архитектура: Iterator -> WorldManager.write_location_meta
+    Архитектура: SQL (чанки по x) -> окно колонок -> пайплайн HSET в новую версию -> переключение указателя.
+
+    Карта пишется в отдельное пространство ключей версии, читатели видят ее только после
+    WorldManager.activate_version — наполовину записанная карта никогда не отдается.
     """
 
+    # Нод на SQL-запрос и на один пайплайн записи
+    CHUNK_SIZE = 1000
+
     def __init__(self, world_manager):
         self.world_manager = world_manager
         log.debug("WorldLoaderService | status=initialized")
 
     async def init_world_cache(self) -> int:
         """
-        Читает все активные клетки (nodes) из SQL, рассчитывает выходы и загружает их в Redis.
+        Стримит активные клетки (nodes) из SQL, рассчитывает выходы и загружает их в Redis новой версией.
+
+        Ноды идут по (x, y): когда начинается колонка X, все колонки < X прочитаны полностью,
+        и колонке X-2 уже известны оба соседа — ее можно считать и писать. В памяти живет окно из ~3 колонок.
         """
         log.info("WorldLoaderService | event=start_loading_active_nodes")
+        started = time.perf_counter()
+        version = str(int(time.time() * 1000))
+
+        node_map: dict[str, WorldGrid] = {}  # Окно колонок для поиска соседей
+        columns: dict[int, list[WorldGrid]] = {}
+        pending: list[int] = []  # Колонки, ожидающие соседа справа
+        batch: dict[str, dict[str, str]] = {}
+        graph: dict[str, dict[str, Any]] = {}  # Снапшот графа переходов для авто-навигации
+        count = 0
 
         async with get_session_context() as session:
             repo = get_world_repo(session)
-
             try:
-                active_nodes = await repo.get_active_nodes()
+                async for chunk in repo.iter_active_nodes(self.CHUNK_SIZE):
+                    for node in chunk:
+                        if node.x not in columns:
+                            # Все колонки левее node.x прочитаны: готовы те, чей правый сосед не node.x
+                            ready = [x for x in pending if x + 1 < node.x]
+                            pending = [x for x in pending if x + 1 >= node.x]
+                            count += await self._emit_columns(ready, columns, node_map, batch, graph, version)
+                            self._drop_columns(min([*pending, node.x]) - 1, columns, node_map)
+                            columns[node.x] = []
+                            pending.append(node.x)
+
+                        columns[node.x].append(node)
+                        node_map[f"{node.x}_{node.y}"] = node
+
+                count += await self._emit_columns(pending, columns, node_map, batch, graph, version)
+                if batch and not await self.world_manager.write_location_meta_batch(version, batch):
+                    raise _WarmupWriteError
+                await self.world_manager.write_world_graph(version, graph)
             except SQLAlchemyError as e:
                 log.exception(f"WorldLoaderService | status=failed reason='SQL fetch error' error='{e}'")
+                await self.world_manager.retire_version(version)
+                return 0
+            except _WarmupWriteError:
+                log.error(f"WorldLoaderService | status=failed reason='Redis pipeline error' version={version}")
+                await self.world_manager.retire_version(version)
                 return 0
 
-            # Создаем карту для быстрого поиска соседей
-            node_map: dict[str, WorldGrid] = {f"{node.x}_{node.y}": node for node in active_nodes}
-
-            count = 0
-            for node in active_nodes:
+        # Переключение: указатель -> новая версия, старая доживает RETIRED_VERSION_TTL
+        previous = await self.world_manager.activate_version(version)
+        if previous != version:
+            await self.world_manager.retire_version(previous)
+
+        elapsed = time.perf_counter() - started
+        nodes_per_sec = count / elapsed if elapsed > 0 else 0.0
+        log.info(
+            f"WorldLoaderService | status=finished loaded_count={count} version={version} "
+            f"elapsed={elapsed:.2f}s nodes_per_sec={nodes_per_sec:.0f}"
+        )
+        return count
+
+    async def _emit_columns(
+        self,
+        xs: list[int],
+        columns: dict[int, list[WorldGrid]],
+        node_map: dict[str, WorldGrid],
+        batch: dict[str, dict[str, str]],
+        graph: dict[str, dict[str, Any]],
+        version: str,
+    ) -> int:
+        """
+        Считает выходы нод готовых колонок и сбрасывает batch пайплайном по заполнении CHUNK_SIZE.
+        Параллельно наполняет снапшот графа переходов (graph).
+        """
+        count = 0
+        for x in xs:
+            for node in columns[x]:
                 loc_id = f"{node.x}_{node.y}"
-
-                # 1. Расчет выходов
                 exits_data = self._calculate_exits_for_node(node, node_map)
+                batch[loc_id] = self._build_redis_data(loc_id, node, exits_data)
+                graph[loc_id] = self._build_graph_node(loc_id, node, exits_data)
+                count += 1
 
-                content_data: dict[str, Any] = node.content or {}
-                flags_data: dict[str, Any] = node.flags or {}
-
-                # 2. Обработка сервисов (Адаптация под List в новой БД)
-                # Если services это список ["svc_portal"], берем первый.
-                service_val = ""
-                if node.services and isinstance(node.services, list) and len(node.services) > 0:
-                    service_val = node.services[0]
-
-                # 3. Подготовка данных для Redis
-                redis_data = {
-                    "name": content_data.get("title", f"Узел {loc_id}"),
-                    "description": content_data.get("description", "..."),
-                    "exits": json.dumps(exits_data, ensure_ascii=False),  # Важно: False для русского языка
-                    "tags": json.dumps(content_data.get("environment_tags", []), ensure_ascii=False),
-                    "service": service_val,
-                    "flags": json.dumps(flags_data, ensure_ascii=False),
-                    "zone_id": str(node.zone_id),
-                    "terrain": str(node.terrain_type),
-                }
+                if len(batch) >= self.CHUNK_SIZE:
+                    if not await self.world_manager.write_location_meta_batch(version, batch):
+                        raise _WarmupWriteError
+                    batch.clear()
+        return count
 
-                # 4. Вызов твоего менеджера (как было раньше)
-                await self.world_manager.write_location_meta(loc_id, redis_data)
-                count += 1
+    @staticmethod
+    def _drop_columns(keep_from: int, columns: dict[int, list[WorldGrid]], node_map: dict[str, WorldGrid]) -> None:
+        """Выкидывает из окна колонки левее keep_from (они больше никому не соседи)."""
+        for x in [x for x in columns if x < keep_from]:
+            for node in columns.pop(x):
+                node_map.pop(f"{node.x}_{node.y}", None)
 
-            log.info(f"WorldLoaderService | status=finished loaded_count={count}")
-            return count
+    def _build_redis_data(self, loc_id: str, node: WorldGrid, exits_data: dict[str, Any]) -> dict[str, str]:
+        """
+        Подготовка HASH локации для Redis.
+        """
+        content_data: dict[str, Any] = node.content or {}
+        flags_data: dict[str, Any] = node.flags or {}
+
+        # Сервисы (Адаптация под List в новой БД): если services это список ["svc_portal"], берем первый.
+        service_val = ""
+        if node.services and isinstance(node.services, list) and len(node.services) > 0:
+            service_val = node.services[0]
+
+        return {
+            "name": content_data.get("title", f"Узел {loc_id}"),
+            "description": content_data.get("description", "..."),
+            "exits": json.dumps(exits_data, ensure_ascii=False),  # Важно: False для русского языка
+            "tags": json.dumps(content_data.get("environment_tags", []), ensure_ascii=False),
+            "service": service_val,
+            "flags": json.dumps(flags_data, ensure_ascii=False),
+            "zone_id": str(node.zone_id),
+            "terrain": str(node.terrain_type),
+        }
+
+    @staticmethod
+    def _build_graph_node(loc_id: str, node: WorldGrid, exits_data: dict[str, Any]) -> dict[str, Any]:
+        """
+        Узел графа переходов: те же nav-выходы (с правилами регионов/дорог), что получит игрок.
+        """
+        content_data: dict[str, Any] = node.content or {}
+        flags_data: dict[str, Any] = node.flags if isinstance(node.flags, dict) else {}
+        return {
+            "name": content_data.get("title", f"Узел {loc_id}"),
+            "nav": {
+                key.removeprefix("nav:"): exit_data["time_duration"]
+                for key, exit_data in exits_data.items()
+                if key.startswith("nav:")
+            },
+            "services": list(node.services) if isinstance(node.services, list) else [],
+            "hub": bool(flags_data.get("is_hub", False)),
+        }
 
     def _get_region_id_from_zone_id(self, zone_id: str) -> str:
         """
@@ -1,16 +1,18 @@
 import json
 import math
+from dataclasses import dataclass, field
 
 from loguru import logger as log
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.backend.database.db_contract.i_world_repo import IWorldRepo
+from src.backend.database.postgres.models import WorldGrid, WorldZone
 from src.backend.domains.internal_systems.factories.monster.clan_factory import ClanFactory
 from src.backend.domains.internal_systems.factories.world.content_gen_service import (
     ContentGenerationService,
 )
-from src.backend.domains.internal_systems.factories.world.threat_service import ThreatService
+from src.backend.domains.internal_systems.factories.world.threat_field import ThreatField
 from src.backend.resources.game_data.graf_data_world.world_config import (
     ANCHORS,
     HUB_CENTER,
@@ -22,12 +24,31 @@ from src.backend.resources.game_data.graf_data_world.world_config import (
 )
 
 
+@dataclass(slots=True)
+class ChunkPlan:
+    """Подготовленный чанк (результат prepare_chunk): клетки с соседями и payload для LLM."""
+
+    center_x: int
+    center_y: int
+    node_map: dict[tuple[int, int], WorldGrid]
+    payload_items: list[dict] = field(default_factory=list)
+    # Клетки, куда пришла дорога от соседа: флаг has_road пишется вместе с чанком
+    road_cells: set[tuple[int, int]] = field(default_factory=set)
+    save_errors: int = 0
+
+
 class ZoneOrchestrator:
-    def __init__(self, session: AsyncSession, repo: IWorldRepo, content_service: ContentGenerationService):
+    def __init__(
+        self,
+        session: AsyncSession,
+        repo: IWorldRepo,
+        content_service: ContentGenerationService,
+        clan_factory: ClanFactory | None = None,
+    ):
         self.session = session
         self.repo = repo
         self.content_service = content_service
-        self.clan_factory = ClanFactory(session)
+        self.clan_factory = clan_factory or ClanFactory(session)
         self.chunk_size = 5
 
     def _get_zone_id(self, x: int, y: int) -> str:
@@ -56,8 +77,37 @@ class ZoneOrchestrator:
         return structural_tags
 
     async def generate_chunk(self, center_x: int, center_y: int) -> bool:
+        """
+        Полный цикл чанка: подготовка -> LLM -> сохранение -> заселение кланами.
+        Стадии доступны по отдельности для WorldPregenPipeline.
+        """
         log.info(f"ZoneOrchestrator | start_chunk center={center_x}:{center_y}")
 
+        plan = await self.prepare_chunk(center_x, center_y)
+        if plan is None:
+            return False
+        if not plan.payload_items:
+            return True
+
+        log.info(f"ZoneOrchestrator | sending_to_llm items={len(plan.payload_items)}")
+        raw_response = await self.content_service.generate_from_orchestrator(plan.payload_items)
+
+        zones_context = await self.persist_chunk(plan, raw_response)
+        if zones_context is None:
+            return False
+
+        await self.populate_zones(zones_context)
+
+        if plan.save_errors > 0:
+            return False
+        log.info("ZoneOrchestrator | chunk_complete")
+        return True
+
+    async def prepare_chunk(self, center_x: int, center_y: int) -> ChunkPlan | None:
+        """
+        Стадия 1 (чтение БД): клетки чанка с соседями и payload для LLM.
+        None — ошибка БД.
+        """
         half = self.chunk_size // 2
         start_x = center_x - half
         start_y = center_y - half
@@ -68,10 +118,11 @@ class ZoneOrchestrator:
             grid_nodes = await self.repo.get_nodes_in_rect(start_x - 1, start_y - 1, scan_width, scan_height)
         except SQLAlchemyError as e:
             log.error(f"ZoneOrchestrator | db_error: {e}")
-            return False
+            return None
 
-        node_map = {(n.x, n.y): n for n in grid_nodes}
-        payload_items = []
+        plan = ChunkPlan(center_x=center_x, center_y=center_y, node_map={(n.x, n.y): n for n in grid_nodes})
+        node_map = plan.node_map
+        threat_field = ThreatField.get()
 
         for x in range(start_x, start_x + self.chunk_size):
             for y in range(start_y, start_y + self.chunk_size):
@@ -86,36 +137,51 @@ class ZoneOrchestrator:
 
                 main_biome = base_tags[0] if base_tags else "wasteland"
                 structural_tags = self._get_structural_tags(x, y, start_x, start_y, main_biome)
-                influence_tags = ThreatService.get_narrative_tags(x, y)
+                influence_tags = threat_field.get_narrative_tags(x, y)
                 narrative_tags = list(set(base_tags + structural_tags + influence_tags))
 
                 context_hints = self._scan_surroundings(x, y, node_map) + self._scan_global_landmarks(x, y)
 
                 if self._check_incoming_roads(x, y, node_map) and "road" not in narrative_tags:
                     narrative_tags.append("road")
-                    try:
-                        await self.repo.update_flags(x, y, {"has_road": True})
-                    except SQLAlchemyError as e:
-                        log.warning(f"Failed to update road flag for ({x},{y}): {e}")
+                    if current_node:
+                        plan.road_cells.add((x, y))
 
-                payload_items.append({"id": f"{x}_{y}", "tags": narrative_tags, "context": context_hints})
+                plan.payload_items.append({"id": f"{x}_{y}", "tags": narrative_tags, "context": context_hints})
 
-        if not payload_items:
-            return True
+        return plan
+
+    async def persist_chunk(self, plan: ChunkPlan, raw_response: dict | None) -> dict[str, dict] | None:
+        """
+        Стадия 3 (запись БД): весь чанк одним INSERT ... ON CONFLICT.
+
+        Returns:
+            Контексты зон для populate_zones или None (нет ответа LLM / ошибка БД).
+            Транзакцией управляет вызывающий код.
+        """
+        node_map = plan.node_map
+        road_cells = plan.road_cells
 
-        log.info(f"ZoneOrchestrator | sending_to_llm items={len(payload_items)}")
-        raw_response = await self.content_service.generate_from_orchestrator(payload_items)
         if not raw_response:
-            return False
+            # Дороги не зависят от ответа LLM — флаги сохраняем и при ошибке генерации
+            await self._save_rows([self._road_row(x, y, node_map) for x, y in road_cells])
+            return None
 
-        unique_zones_context = {}
-        save_errors = 0
+        items_by_id = {item["id"]: item for item in plan.payload_items}
+        zones = await self._prefetch_zones({self._get_zone_id(x, y) for x, y in self._response_coords(raw_response)})
+
+        # По координатам: одна строка на клетку (повтор ключа в ON CONFLICT — ошибка Postgres)
+        rows: dict[tuple[int, int], dict] = {}
+        unique_zones_context: dict[str, dict] = {}
         for loc_id, text_data in raw_response.items():
+            if loc_id not in items_by_id:
+                # Клетки, которых не было в payload (LLM дописал соседей), не трогаем
+                log.warning(f"ZoneOrchestrator | status=unexpected_id id={loc_id}")
+                continue
             try:
                 x, y = map(int, loc_id.split("_"))
 
-                original_item = next((i for i in payload_items if i["id"] == loc_id), None)
-                final_tags = original_item["tags"] if original_item else []
+                final_tags = items_by_id[loc_id]["tags"]
 
                 final_content = {
                     "title": text_data.get("title", "Пустошь"),
@@ -124,19 +190,29 @@ class ZoneOrchestrator:
                 }
 
                 node_to_update = node_map.get((x, y))
-                flags = node_to_update.flags if node_to_update else {}
+                flags = dict(node_to_update.flags or {}) if node_to_update else {}
                 terrain = node_to_update.terrain_type if node_to_update else "flat"
                 zone_id = self._get_zone_id(x, y)
 
                 if terrain == "static_structure":
                     continue
 
-                await self.repo.create_or_update_node(
-                    x=x, y=y, zone_id=zone_id, terrain_type=terrain, is_active=True, content=final_content, flags=flags
-                )
+                if (x, y) in road_cells:
+                    flags["has_road"] = True
+
+                rows[(x, y)] = {
+                    "x": x,
+                    "y": y,
+                    "zone_id": zone_id,
+                    "terrain_type": terrain,
+                    "is_active": True,
+                    "flags": flags,
+                    "content": final_content,
+                    "services": node_to_update.services if node_to_update else [],
+                }
 
                 if zone_id not in unique_zones_context:
-                    zone_db = await self.repo.get_zone(zone_id)
+                    zone_db = zones.get(zone_id)
                     if zone_db:
                         true_biome = zone_db.biome_id
                         true_tier = zone_db.tier
@@ -154,11 +230,21 @@ class ZoneOrchestrator:
                         "is_safe": is_safe,
                     }
 
-            except (ValueError, SQLAlchemyError) as e:
+            except (ValueError, AttributeError) as e:
                 log.error(f"ZoneOrchestrator | save_error id={loc_id} error={e}")
-                save_errors += 1
+                plan.save_errors += 1
+
+        # Дорожные клетки, которых не оказалось в ответе LLM
+        for x, y in road_cells - rows.keys():
+            rows[(x, y)] = self._road_row(x, y, node_map)
 
-        for z_id, ctx in unique_zones_context.items():
+        if not await self._save_rows(list(rows.values())):
+            return None
+        return unique_zones_context
+
+    async def populate_zones(self, zones_context: dict[str, dict]) -> None:
+        """Стадия 4: кланы для зон чанка (безопасные зоны пропускаются)."""
+        for z_id, ctx in zones_context.items():
             if ctx.get("is_safe", False):
                 log.info(f"ZoneOrchestrator | Zone {z_id} is SAFE ZONE. Skipping population.")
                 continue
@@ -169,9 +255,47 @@ class ZoneOrchestrator:
                 tier=ctx["tier"], biome_id=ctx["biome"], location_tags=ctx["tags"], zone_id=z_id
             )
 
-        if save_errors > 0:
+    @staticmethod
+    def _response_coords(raw_response: dict) -> list[tuple[int, int]]:
+        coords = []
+        for loc_id in raw_response:
+            try:
+                x, y = map(int, loc_id.split("_"))
+            except ValueError:
+                continue
+            coords.append((x, y))
+        return coords
+
+    async def _prefetch_zones(self, zone_ids: set[str]) -> dict[str, WorldZone]:
+        """Все зоны чанка одним запросом. При ошибке БД зоны считаются неизвестными (как отсутствующие)."""
+        try:
+            zones = await self.repo.get_zones(sorted(zone_ids))
+        except SQLAlchemyError as e:
+            log.error(f"ZoneOrchestrator | zones_prefetch_error count={len(zone_ids)} error={e}")
+            return {}
+        return {zone.id: zone for zone in zones}
+
+    @staticmethod
+    def _road_row(x: int, y: int, node_map: dict) -> dict:
+        """Строка upsert для клетки, у которой меняется только флаг дороги."""
+        node = node_map[(x, y)]
+        return {
+            "x": x,
+            "y": y,
+            "zone_id": node.zone_id,
+            "terrain_type": node.terrain_type,
+            "is_active": node.is_active,
+            "flags": {**(node.flags or {}), "has_road": True},
+            "content": node.content,
+            "services": node.services,
+        }
+
+    async def _save_rows(self, rows: list[dict]) -> bool:
+        try:
+            await self.repo.bulk_upsert_nodes(rows)
+        except SQLAlchemyError as e:
+            log.error(f"ZoneOrchestrator | save_error rows={len(rows)} error={e}")
             return False
-        log.info("ZoneOrchestrator | chunk_complete")
         return True
 
     def _scan_surroundings(self, x: int, y: int, node_map: dict) -> list[str]:
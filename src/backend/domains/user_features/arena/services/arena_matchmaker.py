@@ -0,0 +1,121 @@
+import time
+from dataclasses import dataclass
+
+from loguru import logger as log
+
+from src.backend.database.redis.manager.arena_manager import ArenaManager
+
+
+@dataclass(slots=True)
+class QueueEntry:
+    """Игрок в очереди на момент прохода матчмейкера."""
+
+    char_id: int
+    gs: float
+    wait_time: float
+
+
+class ArenaMatchmaker:
+    """
+    Серверный подбор пар для арены (один проход по очереди за тик воркера).
+
+    Окно допустимой разницы GS растет со временем ожидания: ±15% на старте, +1% в секунду,
+    не больше ±60%. Пара допустима, только если каждый игрок попадает в окно другого.
+    Первыми подбираются самые долго ждущие, каждому — ближайший по GS свободный игрок.
+
+    Найденная пара захватывается атомарно (Lua): оба снимаются из очереди, каждому в слот матча
+    записывается соперник. Игрок забирает матч при следующем обращении к арене (ArenaService.check_match).
+    """
+
+    BASE_WINDOW = 0.15
+    WINDOW_GROWTH_PER_SEC = 0.01
+    MAX_WINDOW = 0.6
+    # Слот матча живет дольше интервала опроса клиента; истекший незабранным — игрок возвращается
+    # в очередь при следующем опросе (ArenaService.check_match)
+    MATCH_TTL = 60
+
+    def __init__(self, arena_manager: ArenaManager):
+        self.arena_manager = arena_manager
+
+    @classmethod
+    def window(cls, wait_time: float) -> float:
+        """Допустимая относительная разница GS для игрока, ждущего wait_time секунд."""
+        return min(cls.MAX_WINDOW, cls.BASE_WINDOW + cls.WINDOW_GROWTH_PER_SEC * max(wait_time, 0.0))
+
+    @classmethod
+    def accepts(cls, entry: QueueEntry, other: QueueEntry) -> bool:
+        """Попадает ли other в окно entry."""
+        return abs(entry.gs - other.gs) <= abs(entry.gs) * cls.window(entry.wait_time)
+
+    @classmethod
+    def pair_players(cls, entries: list[QueueEntry]) -> list[tuple[int, int]]:
+        """
+        Подбирает пары из снимка очереди.
+
+        Args:
+            entries: Игроки в очереди.
+
+        Returns:
+            Список пар (char_id ждущего дольше, char_id соперника).
+        """
+        by_gs = sorted(entries, key=lambda e: e.gs)
+        position = {e.char_id: i for i, e in enumerate(by_gs)}
+        paired: set[int] = set()
+        pairs: list[tuple[int, int]] = []
+
+        for entry in sorted(entries, key=lambda e: -e.wait_time):
+            if entry.char_id in paired:
+                continue
+
+            best: QueueEntry | None = None
+            # Расходимся от игрока в обе стороны по GS, пока соседи в пределах его окна
+            for step in (-1, 1):
+                i = position[entry.char_id] + step
+                while 0 <= i < len(by_gs) and cls.accepts(entry, by_gs[i]):
+                    other = by_gs[i]
+                    i += step
+                    if other.char_id in paired or not cls.accepts(other, entry):
+                        continue
+                    if best is None or abs(other.gs - entry.gs) < abs(best.gs - entry.gs):
+                        best = other
+                    break
+
+            if best is not None:
+                paired.update((entry.char_id, best.char_id))
+                pairs.append((entry.char_id, best.char_id))
+
+        return pairs
+
+    async def sweep(self, mode: str, now: float | None = None) -> int:
+        """
+        Один проход матчмейкера по очереди режима.
+
+        Args:
+            mode: Режим арены.
+            now: Текущее время (для тестов).
+
+        Returns:
+            Количество созданных пар.
+        """
+        queue = await self.arena_manager.get_queue(mode)
+        if len(queue) < 2:
+            return 0
+
+        now = time.time() if now is None else now
+        requests = await self.arena_manager.get_requests([char_id for char_id, _ in queue])
+
+        entries: list[QueueEntry] = []
+        for (char_id, gs), request in zip(queue, requests, strict=True):
+            if request is None:
+                # Заявка истекла (игрок ушел, не отменив поиск) — чистим очередь
+                await self.arena_manager.remove_from_queue(mode, char_id)
+                continue
+            entries.append(QueueEntry(char_id, gs, now - float(request.get("start_time", now))))
+
+        matched = 0
+        for char_a, char_b in self.pair_players(entries):
+            if await self.arena_manager.claim_pair(mode, char_a, char_b, self.MATCH_TTL):
+                matched += 1
+
+        log.debug(f"ArenaMatchmaker | action=sweep mode={mode} queue={len(entries)} matched={matched}")
+        return matched
@@ -59,6 +59,9 @@ class ArenaService:
     async def check_match(self, char_id: int, mode: str) -> ArenaUIPayloadDTO | str:
         """
         Проверяет статус матча.
+        Пары подбирает матчмейкер (ArenaMatchmaker, ARQ cron) и кладет соперника в слот матча игрока:
+        здесь только забор матча, без поиска по очереди.
+
         Returns:
             ArenaUIPayloadDTO — если ещё ищем
             str "combat" — если матч найден (редирект)
@@ -67,22 +70,30 @@ class ArenaService:
         if not request:
             return await self.get_main_menu()
 
-        # 1. Поиск противника
-        opponent_id = await self.session.find_opponent(char_id, mode)
+        # 1. Матч, найденный матчмейкером (бой создает тот из пары, кто забрал матч первым)
+        opponent_id = await self.session.claim_match(char_id)
 
         if opponent_id:
-            # Матч найден — создаём PvP бой
             await self._create_battle(char_id, opponent_id, mode, battle_type="pvp")
             return "combat"
 
+        # Матч истек незабранным (MATCH_TTL) — игрок снова в очереди, ожидание продолжается с прежнего start_time
+        await self.session.requeue_unmatched(char_id, mode)
+
         # 2. Проверка таймаута
         start_time = float(request.get("start_time", 0))
         wait_time = time.time() - start_time
 
         if wait_time > MATCHMAKING_TIMEOUT:
-            # Таймаут — создаём бой с Тенью
-            await self._create_battle(char_id, None, mode, battle_type="shadow")
-            return "combat"
+            # Сначала снимаем себя из очереди: если не вышло — матчмейкер уже нашел пару
+            if await self.session.withdraw_from_queue(char_id, mode):
+                await self._create_battle(char_id, None, mode, battle_type="shadow")
+                return "combat"
+
+            opponent_id = await self.session.claim_match(char_id)
+            if opponent_id:
+                await self._create_battle(char_id, opponent_id, mode, battle_type="pvp")
+                return "combat"
 
         # 3. Продолжаем ждать
         return ArenaUIPayloadDTO(
@@ -11,7 +11,6 @@ class ArenaSessionService:
     Объединяет ArenaManager и AccountManager.
     """
 
-    GS_RANGE_PERCENT = 0.15
     REQUEST_TTL = 300
     DEFAULT_GS = 100
 
@@ -38,8 +37,9 @@ class ArenaSessionService:
         return gs
 
     async def leave_queue(self, char_id: int, mode: str) -> None:
-        """Удаляет игрока из очереди и очищает заявку."""
+        """Удаляет игрока из очереди, освобождает незабранный матч и очищает заявку."""
         await self.arena_manager.remove_from_queue(mode, char_id)
+        await self.arena_manager.release_match(mode, char_id)
         await self.arena_manager.delete_request(char_id)
 
     async def get_request_meta(self, char_id: int) -> dict[str, Any] | None:
@@ -48,31 +48,26 @@ class ArenaSessionService:
 
     # --- Match Operations ---
 
-    async def find_opponent(self, char_id: int, mode: str) -> int | None:
+    async def claim_match(self, char_id: int) -> int | None:
         """
-        Ищет подходящего противника в очереди.
-        Атомарно извлекает его, если найден.
+        Забирает матч, назначенный матчмейкером.
+        Возвращает ID противника, если бой должен создать этот вызов.
         """
-        request = await self.get_request_meta(char_id)
-        if not request:
-            return None
+        return await self.arena_manager.claim_match(char_id)
 
-        my_gs = int(request.get("gs", self.DEFAULT_GS))
-        min_gs = my_gs * (1 - self.GS_RANGE_PERCENT)
-        max_gs = my_gs * (1 + self.GS_RANGE_PERCENT)
-
-        # Получаем кандидатов
-        candidates = await self.arena_manager.get_candidates(mode, min_gs, max_gs)
-
-        for candidate_id_str in candidates:
-            candidate_id = int(candidate_id_str)
-            if candidate_id != char_id:
-                # Пытаемся забрать кандидата из очереди (атомарно)
-                removed = await self.arena_manager.remove_from_queue(mode, candidate_id)
-                if removed:
-                    return candidate_id
+    async def requeue_unmatched(self, char_id: int, mode: str) -> bool:
+        """
+        Возвращает игрока в очередь, если найденный для него матч истек незабранным
+        (иначе он остался бы в поиске без места в очереди до истечения заявки).
+        """
+        return await self.arena_manager.requeue_unmatched(mode, char_id)
 
-        return None
+    async def withdraw_from_queue(self, char_id: int, mode: str) -> bool:
+        """
+        Снимает игрока из очереди без удаления заявки (таймаут поиска).
+        False — игрока в очереди уже нет: матчмейкер успел найти ему пару.
+        """
+        return await self.arena_manager.remove_from_queue(mode, char_id)
 
     async def prepare_match(self, char_id: int, opponent_id: int | None, mode: str) -> None:
         """
@@ -83,7 +78,7 @@ class ArenaSessionService:
 
         # Удаляем противника
         if opponent_id:
-            # Заявку противника тоже нужно удалить (из очереди он уже удален в find_opponent)
+            # Заявку противника тоже нужно удалить (из очереди его снял матчмейкер)
             await self.arena_manager.delete_request(opponent_id)
 
     # --- Data Operations ---
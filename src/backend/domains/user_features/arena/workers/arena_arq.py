@@ -0,0 +1,53 @@
+from arq import cron
+from loguru import logger as log
+
+from src.backend.core.base_arq import BaseArqSettings, base_shutdown, base_startup
+from src.backend.database.redis.manager.arena_manager import ArenaManager
+from src.backend.database.redis.redis_scripts import script_registry
+from src.backend.domains.user_features.arena.services.arena_matchmaker import ArenaMatchmaker
+
+from .tasks.matchmaker_task import arena_matchmaker_task
+
+# Период тика матчмейкера (секунды)
+MATCHMAKER_TICK_SEC = 2
+
+
+async def arena_startup(ctx: dict) -> None:
+    """
+    Выполняет инициализацию контекста воркера арены (ARQ).
+
+    Args:
+        ctx: Словарь контекста ARQ, передаваемый между задачами.
+    """
+    log.info("WorkerInit | stage=start worker_type=arena")
+
+    await base_startup(ctx)
+    redis_service = ctx["redis_service"]
+
+    # Lua-скрипты загружаются один раз (дальше только EVALSHA)
+    await script_registry.load_all(redis_service.redis_client)
+    ctx["arena_matchmaker"] = ArenaMatchmaker(ArenaManager(redis_service))
+
+    log.info("WorkerInit | stage=complete services_loaded=true")
+
+
+class ArenaArqSettings(BaseArqSettings):
+    """
+    Конфигурация воркера ARQ для матчмейкинга арены.
+
+    Attributes:
+        queue_name (str): Своя очередь — воркер не забирает задачи боевого воркера из очереди по умолчанию.
+        cron_jobs (list): Тик матчмейкера каждые MATCHMAKER_TICK_SEC секунд.
+    """
+
+    queue_name: str = "arq:queue:arena"
+    max_jobs: int = 5
+    job_timeout: int = 10
+    keep_result: int = 0
+
+    on_startup = arena_startup
+    on_shutdown = base_shutdown
+
+    cron_jobs = [
+        cron(arena_matchmaker_task, second=set(range(0, 60, MATCHMAKER_TICK_SEC)), timeout=MATCHMAKER_TICK_SEC * 5)
+    ]
@@ -0,0 +1,29 @@
+from loguru import logger as log
+
+from src.backend.domains.user_features.arena.services.arena_matchmaker import ArenaMatchmaker
+from src.shared.schemas.arena import ArenaModeEnum
+
+# Режимы, которые подбирает матчмейкер (групповые режимы собираются иначе)
+MATCHMAKING_MODES = (ArenaModeEnum.ONE_VS_ONE,)
+
+
+async def arena_matchmaker_task(ctx: dict) -> None:
+    """
+    Тик матчмейкера арены (ARQ cron).
+
+    Один проход по очереди каждого режима: подбор пар с расширяющимся окном GS
+    и атомарный захват пар. Cron-задача уникальна на тик — очередь разбирает один воркер.
+
+    Args:
+        ctx: Контекст ARQ.
+    """
+    matchmaker: ArenaMatchmaker | None = ctx.get("arena_matchmaker")
+    if not matchmaker:
+        log.error("ArenaMatchmakerTask | reason=service_not_found")
+        return
+
+    for mode in MATCHMAKING_MODES:
+        try:
+            await matchmaker.sweep(mode.value)
+        except Exception:  # noqa: BLE001
+            log.exception(f"ArenaMatchmakerTask | action=sweep status=failed mode={mode.value}")
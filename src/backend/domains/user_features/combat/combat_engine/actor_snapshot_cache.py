@@ -0,0 +1,61 @@
+import pickle
+from collections import OrderedDict
+from typing import Any
+
+
+class ActorSnapshotCache:
+    """
+    Локальный кэш данных акторов воркера (RBC v3.0).
+
+    Хранит последние загруженные секции unified JSON актора вместе с его `version`.
+    CombatManager.commit_battle_results инкрементирует версию при каждом коммите,
+    поэтому запись валидна, пока версия в Redis совпадает с версией в кэше.
+
+    Данные хранятся в сериализованном (pickle) виде: Executor мутирует снапшоты in-place,
+    и мутации не должны протекать в кэш, если коммит не состоялся.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], tuple[int, bytes]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, session_id: str, char_id: int | str, version: int | None) -> dict[str, Any] | None:
+        """
+        Возвращает копию данных актора, если версия в кэше совпадает с версией в Redis.
+        """
+        key = (session_id, str(char_id))
+        entry = self._entries.get(key)
+
+        if version is None or entry is None or entry[0] != version:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return pickle.loads(entry[1])
+
+    def put(self, session_id: str, char_id: int | str, version: int | None, data: dict[str, Any]) -> None:
+        """
+        Сохраняет данные актора под указанной версией.
+        Акторы без версии (legacy-сессии) не кэшируются.
+        """
+        if version is None:
+            return
+
+        key = (session_id, str(char_id))
+        self._entries[key] = (version, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_session(self, session_id: str) -> None:
+        """Удаляет все записи сессии (например, после завершения боя)."""
+        for key in [k for k in self._entries if k[0] == session_id]:
+            del self._entries[key]
+
+    def stats(self) -> dict[str, int]:
+        """Счетчики попаданий/промахов для метрик и логов."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
@@ -1,8 +1,11 @@
 import json
 from typing import Any
 
+from loguru import logger as log
+
 # Инфраструктура
 from src.backend.database.redis.manager.combat_manager import CombatManager
+from src.backend.domains.user_features.combat.combat_engine.actor_snapshot_cache import ActorSnapshotCache
 from src.backend.domains.user_features.combat.dto.combat_action_dto import (
     CombatActionDTO,
 )
@@ -30,8 +33,10 @@ class CombatDataService:
     Использует CombatManager для низкоуровневых операций.
     """
 
-    def __init__(self, combat_manager: CombatManager):
+    def __init__(self, combat_manager: CombatManager, snapshot_cache: ActorSnapshotCache | None = None):
         self.combat_manager = combat_manager
+        # Локальный кэш воркера: перезагружаем только акторов, чья version изменилась
+        self.snapshot_cache = snapshot_cache or ActorSnapshotCache()
 
     # ==========================================================================
     # 1. МЕТОДЫ ДЛЯ КОЛЛЕКТОРА (LIGHTWEIGHT)
@@ -108,12 +113,16 @@ class CombatDataService:
 
     async def load_battle_context(self, session_id: str) -> BattleContext | None:
         """
-        Полная пакетная загрузка контекста и всей очереди задач.
-        Использует CombatManager.load_full_context_data.
+        Пакетная загрузка контекста и всей очереди задач.
+
+        Инкрементальная: сначала читаются версии акторов (+ moves и очередь),
+        полный JSON загружается только для акторов, чья версия не совпала с кэшем воркера.
         """
         # 1. Meta
         meta_raw = await self.combat_manager.get_rbc_session_meta(session_id)
         if not meta_raw:
+            # Сессия уже удалена: снапшоты ее акторов больше не понадобятся
+            self.release_session(session_id)
             return None
         meta = self._parse_meta(meta_raw)
 
@@ -122,8 +131,31 @@ class CombatDataService:
         for team_ids in meta.teams.values():
             all_actor_ids.extend(team_ids)
 
-        # 3. Full Load via Manager
-        structured_data = await self.combat_manager.load_full_context_data(session_id, all_actor_ids)
+        # 3. Versions + Moves + Queue (Lightweight)
+        versions_data = await self.combat_manager.load_actor_versions_batch(session_id, all_actor_ids)
+
+        # 4. Cache Lookup -> Full Load only for stale actors
+        actors_data: dict[str, dict[str, Any]] = {}
+        stale_ids: list[int | str] = []
+        for actor_id in all_actor_ids:
+            cid = str(actor_id)
+            version = versions_data.get(cid, {}).get("version")
+            cached = self.snapshot_cache.get(session_id, cid, version)
+            if cached is None:
+                stale_ids.append(actor_id)
+            else:
+                actors_data[cid] = cached
+
+        fresh_data = await self.combat_manager.load_actors_json_batch(session_id, stale_ids)
+        for cid, data in fresh_data.items():
+            if data.get("meta"):
+                self.snapshot_cache.put(session_id, cid, data.get("version"), data)
+            actors_data[cid] = data
+
+        log.debug(
+            f"CombatDataService | action=load_context session_id={session_id} "
+            f"actors={len(all_actor_ids)} reloaded={len(stale_ids)} cache={self.snapshot_cache.stats()}"
+        )
 
         actors_map = {}
         moves_cache = {}
@@ -133,10 +165,7 @@ class CombatDataService:
             str(actor_id): team_name for team_name, actor_ids in meta.teams.items() for actor_id in actor_ids
         }
 
-        for cid, data in structured_data.items():
-            if cid == "global_queue":
-                continue
-
+        for cid, data in actors_data.items():
             if not data.get("meta"):
                 continue
 
@@ -154,13 +183,18 @@ class CombatDataService:
             )
 
             # Cache Move
-            if data.get("move"):
-                moves_cache[cid] = data["move"]
+            move = versions_data.get(cid, {}).get("move")
+            if move:
+                moves_cache[cid] = move
 
         return BattleContext(
             session_id=session_id, meta=meta, actors=actors_map, moves_cache=moves_cache, pending_logs=[]
         )
 
+    def release_session(self, session_id: str) -> None:
+        """Выгружает снапшоты акторов завершенной сессии из локального кэша воркера."""
+        self.snapshot_cache.invalidate_session(session_id)
+
     async def load_snapshot_context(self, session_id: str) -> BattleContext | None:
         """
         Легкая загрузка для UI (без XP и Queue).
@@ -171,13 +205,20 @@ class CombatDataService:
         """
         Атомарное сохранение изменений актёров, логов и возврат целей.
         ВСЕ операции выполняются в ОДНОЙ транзакции Redis.
+
+        Delta-коммит: пишутся только секции из `actor.dirty_sections`,
+        акторы без изменений в транзакцию не попадают (и не меняют version).
         """
         updates = {}
 
-        # 1. Prepare Updates (Actors State)
+        # 1. Prepare Updates (Only Dirty Actors & Sections)
         for cid, actor in ctx.actors.items():
-            actor_updates = {
-                "state": {
+            if not actor.dirty_sections:
+                continue
+
+            actor_updates: dict[str, Any] = {}
+            if "state" in actor.dirty_sections:
+                actor_updates["state"] = {
                     "hp": actor.meta.hp,
                     "max_hp": actor.meta.max_hp,
                     "en": actor.meta.en,
@@ -185,11 +226,14 @@ class CombatDataService:
                     "tactics": actor.meta.tactics,
                     "is_dead": actor.meta.is_dead,
                     "tokens": actor.meta.tokens,
-                },
-                "statuses": actor.statuses.model_dump(),
-                "xp": actor.xp_buffer,
-                "raw": actor.raw.model_dump(),
-            }
+                }
+            if "statuses" in actor.dirty_sections:
+                actor_updates["statuses"] = actor.statuses.model_dump()
+            if "xp" in actor.dirty_sections:
+                actor_updates["xp"] = actor.xp_buffer
+            if "raw" in actor.dirty_sections:
+                actor_updates["raw"] = actor.raw.model_dump()
+
             updates[cid] = actor_updates
 
         # 2. Prepare Logs
@@ -212,6 +256,9 @@ class CombatDataService:
             dead_actors=dead_actors_update,
         )
 
+        for actor in ctx.actors.values():
+            actor.dirty_sections.clear()
+
     # ==========================================================================
     # 3. HELPERS
     # ==========================================================================
@@ -231,6 +231,7 @@ class AbilityService:
             payload={"effects": payload_effects},
         )
         actor.statuses.abilities.append(active_ability)
+        actor.mark_dirty("statuses")
 
         if config.pipeline_mutations:
             if hasattr(config.pipeline_mutations, "preset") and config.pipeline_mutations.preset:
@@ -271,9 +272,11 @@ class AbilityService:
                         if ability.uid in source.raw.attributes[stat_key]["temp"]:
                             del source.raw.attributes[stat_key]["temp"][ability.uid]
                             source.dirty_stats.add(stat_key)
+                            source.mark_dirty("raw")
                     elif stat_key in source.raw.modifiers and ability.uid in source.raw.modifiers[stat_key]["temp"]:
                         del source.raw.modifiers[stat_key]["temp"][ability.uid]
                         source.dirty_stats.add(stat_key)
+                        source.mark_dirty("raw")
 
                 effects_map = ability.payload.get("effects", {})
                 if effects_map:
@@ -295,6 +298,8 @@ class AbilityService:
 
         for ability in to_remove:
             source.statuses.abilities.remove(ability)
+        if to_remove:
+            source.mark_dirty("statuses")
 
     @staticmethod
     def _queue_effect(
@@ -368,6 +373,7 @@ class AbilityService:
                 AbilityService._apply_raw_mutations(effect_target, mutations, source_key=active_effect.uid)
 
             effect_target.statuses.effects.append(active_effect)
+            effect_target.mark_dirty("statuses")
 
             # [EVENT] APPLY_EFFECT
             ctx.result.events.append(
@@ -391,14 +397,18 @@ class AbilityService:
                         if effect.uid in actor.raw.attributes[stat_key]["temp"]:
                             del actor.raw.attributes[stat_key]["temp"][effect.uid]
                             actor.dirty_stats.add(stat_key)
+                            actor.mark_dirty("raw")
                     elif stat_key in actor.raw.modifiers and effect.uid in actor.raw.modifiers[stat_key]["temp"]:
                         del actor.raw.modifiers[stat_key]["temp"][effect.uid]
                         actor.dirty_stats.add(stat_key)
+                        actor.mark_dirty("raw")
 
                 to_remove.append(effect)
 
         for effect in to_remove:
             actor.statuses.effects.remove(effect)
+        if to_remove:
+            actor.mark_dirty("statuses")
 
     # ==============================================================================
     # HELPERS
@@ -440,3 +450,4 @@ class AbilityService:
 
             target_dict[stat]["temp"][source_key] = value
             actor.dirty_stats.add(stat)
+            actor.mark_dirty("raw")
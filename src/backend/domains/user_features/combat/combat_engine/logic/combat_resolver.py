@@ -1,3 +1,4 @@
+from dataclasses import fields
 from typing import Any
 
 from src.backend.domains.user_features.combat.combat_engine.logic.math_core import MathCore
@@ -7,8 +8,49 @@ from src.backend.domains.user_features.combat.dto.combat_pipeline_dto import (
     InteractionResultDTO,
     PipelineContextDTO,
 )
+from src.backend.domains.user_features.combat.dto.trigger_rules_flags_dto import TriggerRulesFlagsDTO
 from src.backend.resources.game_data.triggers.definitions.rules import TRIGGER_RULES_DICT
 
+# Событие резолвера -> секция TriggerRulesFlagsDTO
+_EVENT_SECTIONS: dict[str, str] = {
+    "ON_ACCURACY_CHECK": "accuracy",
+    "ON_MISS": "accuracy",
+    "ON_CRIT": "crit",
+    "ON_CRIT_FAIL": "crit",
+    "ON_DODGE": "dodge",
+    "ON_DODGE_FAIL": "dodge",
+    "ON_PARRY": "parry",
+    "ON_PARRY_FAIL": "parry",
+    "ON_BLOCK": "block",
+    "ON_BLOCK_FAIL": "block",
+    "ON_CHECK_CONTROL": "control",
+    "ON_DAMAGE": "damage",
+}
+
+
+def _compile_trigger_dispatch() -> dict[str, tuple[str, tuple[tuple[str, float, tuple[tuple[str, Any], ...]], ...]]]:
+    """
+    Таблица диспетчеризации триггеров (собирается один раз при импорте).
+    Структура: { event: (section, ((rule_id, chance, mutations), ...)) }
+    Порядок правил — порядок полей секции (как при прежнем обходе полей).
+    """
+    section_models = {f.name: f.type for f in fields(TriggerRulesFlagsDTO)}
+    table = {}
+    for event, section in _EVENT_SECTIONS.items():
+        rules = []
+        for rule_id in section_models[section].flag_names():  # type: ignore[union-attr]
+            rule_data = TRIGGER_RULES_DICT.get(rule_id)
+            if not rule_data or rule_data.get("event") != event:
+                continue
+            raw_chance = rule_data.get("chance", 0.0)
+            chance = float(raw_chance) if isinstance(raw_chance, (int, float)) else 0.0
+            rules.append((rule_id, chance, tuple(rule_data.get("mutations", {}).items())))
+        table[event] = (section, tuple(rules))
+    return table
+
+
+_TRIGGER_DISPATCH = _compile_trigger_dispatch()
+
 
 class CombatResolver:
     """
@@ -553,53 +595,28 @@ class CombatResolver:
     @staticmethod
     def _resolve_triggers(ctx: PipelineContextDTO, res: InteractionResultDTO, step_key: str):
         """
-        Обрабатывает триггеры, используя глобальную библиотеку правил.
-        Использует вложенный поиск по TriggerRulesFlagsDTO.
+        Обрабатывает триггеры по таблице диспетчеризации (_TRIGGER_DISPATCH).
+        Секция хранит множество активных флагов — без активных флагов выход сразу.
         """
-        # 1. Определяем секцию DTO
-        dto_section: Any = None
-        if step_key == "ON_ACCURACY_CHECK" or step_key == "ON_MISS":
-            dto_section = ctx.triggers.accuracy
-        elif step_key == "ON_CRIT" or step_key == "ON_CRIT_FAIL":
-            dto_section = ctx.triggers.crit
-        elif step_key == "ON_DODGE" or step_key == "ON_DODGE_FAIL":
-            dto_section = ctx.triggers.dodge
-        elif step_key == "ON_PARRY" or step_key == "ON_PARRY_FAIL":
-            dto_section = ctx.triggers.parry
-        elif step_key == "ON_BLOCK" or step_key == "ON_BLOCK_FAIL":
-            dto_section = ctx.triggers.block
-        elif step_key == "ON_CHECK_CONTROL":
-            dto_section = ctx.triggers.control
-        elif step_key == "ON_DAMAGE":
-            dto_section = ctx.triggers.damage
-
-        if not dto_section:
+        entry = _TRIGGER_DISPATCH.get(step_key)
+        if not entry:
             return
 
-        # 2. Находим активные флаги (True)
-        active_rule_ids = [k for k, v in dto_section.model_dump().items() if v is True]
-
-        if not active_rule_ids:
+        section_name, rules = entry
+        active = getattr(ctx.triggers, section_name).active_flags
+        if not active:
             return
 
-        # 3. Ищем правила
-        for rule_id in active_rule_ids:
-            rule_data = TRIGGER_RULES_DICT.get(rule_id)
-            if not rule_data:
-                continue
-
-            if rule_data.get("event") != step_key:
+        for rule_id, chance, mutations in rules:
+            if rule_id not in active:
                 continue
 
-            # 4. Шанс
-            raw_chance = rule_data.get("chance", 0.0)
-            chance = float(raw_chance) if isinstance(raw_chance, (int, float)) else 0.0
-
+            # Шанс
             if not MathCore.check_chance(chance):
                 continue
 
-            # 5. Мутации (с поддержкой точек и add_effect)
-            for key, value in rule_data.get("mutations", {}).items():
+            # Мутации (с поддержкой точек и add_effect)
+            for key, value in mutations:
                 CombatResolver._apply_mutation(ctx, res, key, value)
 
     @staticmethod
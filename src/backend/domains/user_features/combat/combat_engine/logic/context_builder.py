@@ -1,3 +1,4 @@
+from dataclasses import fields
 from typing import Any, Literal
 
 from loguru import logger as log
@@ -167,8 +168,9 @@ class ContextBuilder:
                         return
 
         # 2. Если это просто имя (ищем везде)
-        for _section_name, section_model in ctx.triggers:
-            if hasattr(section_model, trigger_id):
+        for section_field in fields(ctx.triggers):
+            section_model = getattr(ctx.triggers, section_field.name)
+            if trigger_id in section_model.flag_names():
                 setattr(section_model, trigger_id, True)
                 return
 
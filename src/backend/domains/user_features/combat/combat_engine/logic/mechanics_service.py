@@ -71,9 +71,9 @@ class MechanicsService:
         # === НОВАЯ ИНТЕГРАЦИЯ: Пополнение руки финтов ===
         # 4. [FEINTS] Refill Hand (только для exchange, не для insta_skill)
         if ctx.flags.mechanics.generate_feints:
-            FeintService.refill_hand(source.meta)
+            self._refill_feints(source)
             if target:
-                FeintService.refill_hand(target.meta)
+                self._refill_feints(target)
 
     # ==============================================================================
     # INTERNAL LOGIC
@@ -109,6 +109,7 @@ class MechanicsService:
         if result.tokens_awarded_attacker:
             for token, amount in result.tokens_awarded_attacker.items():
                 source.meta.tokens[token] = source.meta.tokens.get(token, 0) + amount
+            source.mark_dirty("state")
 
     def _apply_target_changes(
         self, ctx: PipelineContextDTO, target: ActorSnapshot, result: InteractionResultDTO
@@ -129,6 +130,7 @@ class MechanicsService:
         # B. Death Check
         if ctx.flags.mechanics.check_death and target.meta.hp <= 0:
             target.meta.is_dead = True
+            target.mark_dirty("state")
 
             # Log Death Event
             ctx.result.events.append(
@@ -145,7 +147,7 @@ class MechanicsService:
         Универсальный метод изменения ресурса через StatsWaterfallCalculator.
         """
         # 1. Calculate Delta
-        delta, _ = StatsWaterfallCalculator.evaluate_sources(sources, base_value=0.0)
+        delta, _ = StatsWaterfallCalculator.evaluate_sources(sources, base_value=0.0, explain=False)
         delta_int = int(delta)
 
         if delta_int == 0:
@@ -159,6 +161,17 @@ class MechanicsService:
             new_val = actor.meta.en + delta_int
             actor.meta.en = max(0, min(new_val, actor.meta.max_en))
 
+        actor.mark_dirty("state")
+
+    def _refill_feints(self, actor: ActorSnapshot) -> None:
+        """
+        Пополнение руки финтов. Списывает токены, поэтому помечает state.
+        """
+        hand_size = actor.meta.feints.get_hand_size()
+        FeintService.refill_hand(actor.meta)
+        if actor.meta.feints.get_hand_size() != hand_size:
+            actor.mark_dirty("state")
+
     def _register_xp_events(
         self,
         ctx: PipelineContextDTO,
@@ -198,6 +211,7 @@ class MechanicsService:
 
     def _inc_xp(self, actor: ActorSnapshot, key: str, amount: int = 1) -> None:
         actor.xp_buffer[key] = actor.xp_buffer.get(key, 0) + amount
+        actor.mark_dirty("xp")
 
     def _log_effect_tick(
         self, ctx: PipelineContextDTO, actor: ActorSnapshot, effect_id: str, value: int, resource: str
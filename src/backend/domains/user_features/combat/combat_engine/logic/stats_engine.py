@@ -1,9 +1,14 @@
+from collections.abc import Iterable
+
 from pydantic import ValidationError
 
 from src.backend.domains.user_features.combat.dto.combat_actor_dto import ActorSnapshot, ActorStats
 from src.backend.services.calculators.stats_waterfall_calculator import StatsWaterfallCalculator
 from src.shared.schemas.modifier_dto import CombatModifiersDTO, CombatSkillsDTO
 
+# Сборка строк формул (actor.explanation) — только для отладки, в бою считаем по числовому пути
+EXPLAIN_STATS = False
+
 
 class StatsEngine:
     """
@@ -28,6 +33,34 @@ class StatsEngine:
 
         # Если stats есть и dirty_stats пуст -> ничего не делаем (используем кэш)
 
+    @staticmethod
+    def ensure_stats_many(actors: Iterable[ActorSnapshot]) -> None:
+        """
+        Батчевый вариант ensure_stats для ростера (монстры клановых боев, world-boss).
+        Все актеры без stats или с dirty_stats считаются одним проходом
+        (StatsWaterfallCalculator.calculate_waterfall_many: мост MODIFIER_RULES через NumPy).
+        """
+        pending = [actor for actor in actors if actor.stats is None or actor.dirty_stats]
+        if not pending:
+            return
+
+        if EXPLAIN_STATS:
+            # Формулы собирает только скалярный путь
+            for actor in pending:
+                StatsEngine._recalculate_full(actor)
+            return
+
+        # raw читаем напрямую (калькулятор его не мутирует) — без model_dump на каждого актера
+        raw_list = [{"attributes": actor.raw.attributes, "modifiers": actor.raw.modifiers} for actor in pending]
+        results = StatsWaterfallCalculator.calculate_waterfall_many(raw_list)
+
+        for actor, calculated_mods in zip(pending, results, strict=True):
+            if calculated_mods is None:
+                # Нечисловые команды -> скалярный путь через simpleeval
+                StatsEngine._recalculate_full(actor)
+            else:
+                StatsEngine._apply_stats(actor, calculated_mods, {})
+
     @staticmethod
     def _recalculate_full(actor: ActorSnapshot) -> None:
         """
@@ -38,8 +71,15 @@ class StatsEngine:
 
         # 2. Расчет (Waterfall)
         # Возвращает плоский словарь модификаторов и словарь формул
-        calculated_mods, explanation = StatsWaterfallCalculator.calculate_waterfall(raw_data)
+        calculated_mods, explanation = StatsWaterfallCalculator.calculate_waterfall(raw_data, explain=EXPLAIN_STATS)
+
+        StatsEngine._apply_stats(actor, calculated_mods, explanation)
 
+    @staticmethod
+    def _apply_stats(actor: ActorSnapshot, calculated_mods: dict[str, float], explanation: dict[str, str]) -> None:
+        """
+        Сборка ActorStats из плоского словаря модификаторов.
+        """
         # 3. Сборка ActorStats
         # Берем скиллы из Snapshot (они не считаются в Waterfall, а просто копируются)
         skills_data = actor.skills
@@ -64,7 +104,7 @@ class StatsEngine:
 
         actor.stats = ActorStats(mods=mods_dto, skills=skills_dto)
 
-        # 4. Сохраняем объяснения (для дебага/логов)
+        # 4. Сохраняем объяснения (для дебага/логов, пусто при EXPLAIN_STATS=False)
         actor.explanation = explanation
 
         # 5. Сбрасываем флаги
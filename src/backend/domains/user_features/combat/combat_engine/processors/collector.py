@@ -1,3 +1,4 @@
+from collections import deque
 from typing import Any, Literal, cast
 
 from loguru import logger as log
@@ -21,10 +22,11 @@ class CombatCollector:
         self.target_resolver = TargetResolver()
 
     async def collect_actions(
-        self, session_id: str, signal: CollectorSignalDTO | None = None
+        self, session_id: str, signal: CollectorSignalDTO | None = None, expired_timers: list[str] | None = None
     ) -> tuple[int, list[AiTurnRequestDTO], str | None]:
         """
         Основной метод коллектора.
+        expired_timers — сработавшие таймеры колеса сессии ("{char_id}:{move_id}"), по ним делается Force Attack.
         Возвращает:
         - batch_size (int): Рекомендуемый размер батча для Исполнителя (0, если действий нет).
         - ai_tasks (List[AiTurnRequestDTO]): Список задач для AI агентов.
@@ -50,15 +52,18 @@ class CombatCollector:
         actions_to_queue: list[CombatActionDTO] = []
         ai_tasks: list[AiTurnRequestDTO] = []
 
+        # Парсим мувы один раз за прогон (дальше все стадии работают с DTO)
+        parsed_moves = self._parse_moves(moves_map)
+
         # A. AI Check (с учетом целей)
-        ai_tasks = self._check_ai_turns(session_id, meta, moves_map, targets_map)
+        ai_tasks = self._check_ai_turns(session_id, meta, parsed_moves, targets_map)
 
         # B. Instant Harvesting (Items/Skills)
-        instants, del_inst = self._harvest_instant(moves_map, meta)
+        instants, del_inst = self._harvest_instant(parsed_moves, meta)
         actions_to_queue.extend(instants)
 
         # C. Exchange Matchmaking (Combat + Force Attack)
-        exchanges, del_exch = self._matchmake_exchange(moves_map, signal)
+        exchanges, del_exch = self._matchmake_exchange(parsed_moves, signal, expired_timers)
         actions_to_queue.extend(exchanges)
 
         # 3. Batch Save (Push Actions + Delete Moves)
@@ -87,8 +92,43 @@ class CombatCollector:
 
         return batch_size, ai_tasks, victory_result
 
+    @staticmethod
+    def _parse_moves(moves_map: dict[str, Any]) -> dict[str, dict[str, list[CombatMoveDTO]]]:
+        """
+        Однократный парсинг сырых мувов из Redis в DTO.
+        Результат: {char_id: {strategy: [CombatMoveDTO, ...]}}.
+        Битые мувы пропускаются с логом (как и раньше в каждой стадии).
+        """
+        parsed: dict[str, dict[str, list[CombatMoveDTO]]] = {}
+
+        for char_id, moves_data in moves_map.items():
+            if not moves_data:
+                continue
+
+            actor_moves: dict[str, list[CombatMoveDTO]] = {}
+            for strategy in ("exchange", "item", "instant"):
+                moves_dict = moves_data.get(strategy) or {}
+                if not moves_dict:
+                    continue
+
+                bucket = []
+                for move_id, move_json in moves_dict.items():
+                    try:
+                        bucket.append(CombatMoveDTO(**move_json))
+                    except Exception as e:  # noqa: BLE001
+                        log.error(f"Collector | Failed to parse {strategy} move {move_id}: {e}")
+                actor_moves[strategy] = bucket
+
+            parsed[str(char_id)] = actor_moves
+
+        return parsed
+
     def _check_ai_turns(
-        self, session_id: str, meta: BattleMeta, moves_map: dict[str, Any], targets_map: dict[str, list[int]]
+        self,
+        session_id: str,
+        meta: BattleMeta,
+        parsed_moves: dict[str, dict[str, list[CombatMoveDTO]]],
+        targets_map: dict[str, list[int]],
     ) -> list[AiTurnRequestDTO]:
         """
         Проверяет, кто из AI еще не сделал ход.
@@ -117,20 +157,14 @@ class CombatCollector:
                 continue  # Нет целей - нет проблем (или бот спит)
 
             # 2. Получаем заявленные Exchange мувы
-            actor_moves = moves_map.get(actor_id_str, {})
-            exchange_moves = actor_moves.get("exchange", {})
+            exchange_moves = parsed_moves.get(actor_id_str, {}).get("exchange", [])
 
             covered_targets = set()
-            for move_json in exchange_moves.values():
-                try:
-                    # Парсим JSON, чтобы достать target_id
-                    move = CombatMoveDTO(**move_json)
-                    # payload теперь объект, используем getattr
-                    tid = getattr(move.payload, "target_id", None)
-                    if tid:
-                        covered_targets.add(int(tid))
-                except Exception:  # noqa: BLE001
-                    pass
+            for move in exchange_moves:
+                # payload теперь объект, используем getattr
+                tid = getattr(move.payload, "target_id", None)
+                if tid:
+                    covered_targets.add(int(tid))
 
             # 3. Сравниваем и фильтруем мертвых из целей
             missing_targets_raw = list(set(my_targets) - covered_targets)
@@ -143,23 +177,18 @@ class CombatCollector:
 
         return tasks
 
-    def _harvest_instant(self, moves_map: dict[str, Any], meta: BattleMeta) -> tuple[list[CombatActionDTO], list[str]]:
+    def _harvest_instant(
+        self, parsed_moves: dict[str, dict[str, list[CombatMoveDTO]]], meta: BattleMeta
+    ) -> tuple[list[CombatActionDTO], list[str]]:
         """Собирает Instant и Item мувы, резолвит цели."""
         actions = []
         to_delete = []
 
-        for char_id, moves_data in moves_map.items():
-            if not moves_data:
-                continue
-
+        for char_id, actor_moves in parsed_moves.items():
             # Объединяем обработку Item и Instant, так как логика таргетинга похожа
-            for strategy in ["item", "instant"]:
-                moves_dict = moves_data.get(strategy, {})
-
-                for move_id, move_json in moves_dict.items():
+            for strategy in ("item", "instant"):
+                for move in actor_moves.get(strategy, []):
                     try:
-                        move = CombatMoveDTO(**move_json)
-
                         # Резолвинг целей через TargetResolver
                         # payload теперь объект, используем getattr
                         raw_target = getattr(move.payload, "target_id", None)
@@ -174,38 +203,46 @@ class CombatCollector:
                         action = CombatActionDTO(action_type=action_type, move=move, is_forced=False)
 
                         actions.append(action)
-                        to_delete.append(move_id)  # Удаляем мув после обработки
+                        to_delete.append(move.move_id)  # Удаляем мув после обработки
 
                     except Exception as e:  # noqa: BLE001
-                        log.error(f"Collector | Failed to parse {strategy} move {move_id}: {e}")
+                        log.error(f"Collector | Failed to resolve {strategy} move {move.move_id}: {e}")
 
         return actions, to_delete
 
     def _matchmake_exchange(
-        self, moves_map: dict[str, Any], signal: CollectorSignalDTO | None = None
+        self,
+        parsed_moves: dict[str, dict[str, list[CombatMoveDTO]]],
+        signal: CollectorSignalDTO | None = None,
+        expired_timers: list[str] | None = None,
     ) -> tuple[list[CombatActionDTO], list[str]]:
-        """Ищет пары для обмена ударами. Обрабатывает Force Attack по таймауту."""
+        """
+        Ищет пары для обмена ударами. Обрабатывает Force Attack по таймауту.
+
+        Матчмейкинг через индекс `(char_id, target_id) -> FIFO-очередь мувов`:
+        индекс строится за один проход, поиск ответного мува (B -> A) — O(1),
+        итого O(N log N) на сортировку + O(N) на сам матчинг (вместо O(N^2)).
+        """
         actions = []
         to_delete = []
 
-        # Простой перебор (O(N^2) в худшем случае, но N мал)
         # Собираем пул всех exchange заявок
-        pool = []
-        for _char_id, moves_data in moves_map.items():
-            exchanges = moves_data.get("exchange", {})
-            for _move_id, move_json in exchanges.items():
-                try:
-                    move = CombatMoveDTO(**move_json)
-                    # created_at removed from DTO, assume order is not critical or use move_id/timestamp if added back
-                    # For now, just append
-                    pool.append(move)
-                except Exception:  # noqa: BLE001
-                    pass
-
-        # Сортируем по времени (FIFO) - removed as created_at is missing
-        # pool.sort(key=lambda x: x.created_at)
-
-        matched_ids = set()
+        pool: list[CombatMoveDTO] = []
+        for actor_moves in parsed_moves.values():
+            pool.extend(actor_moves.get("exchange", []))
+
+        # Сортируем по времени (FIFO). sort стабилен: мувы без created_at сохраняют порядок из Redis
+        pool.sort(key=lambda x: x.created_at)
+
+        # Индекс: (кто бьет, кого бьет) -> очередь мувов в порядке FIFO
+        index: dict[tuple[str, str], deque[CombatMoveDTO]] = {}
+        for move in pool:
+            target_id = getattr(move.payload, "target_id", None)
+            if not target_id:
+                continue
+            index.setdefault((str(move.char_id), str(target_id)), deque()).append(move)
+
+        matched_ids: set[str] = set()
 
         # 1. Normal Matchmaking
         for move_a in pool:
@@ -216,52 +253,56 @@ class CombatCollector:
             target_id = getattr(move_a.payload, "target_id", None)
             if not target_id:
                 continue
-            target_id = int(target_id)
 
-            # Ищем ответный мув (B -> A)
-            for move_b in pool:
-                if move_b.move_id in matched_ids:
-                    continue
-                if int(move_b.char_id) != target_id:
-                    continue
+            # Ищем ответный мув (B -> A) в индексе
+            candidates = index.get((str(target_id), str(move_a.char_id)))
+            if not candidates:
+                continue
 
-                # Проверяем, бьет ли B игрока A
-                target_b = getattr(move_b.payload, "target_id", 0)
-                if int(target_b) == int(move_a.char_id):
-                    # ПАРА НАЙДЕНА!
-                    action = CombatActionDTO(action_type="exchange", move=move_a, partner_move=move_b, is_forced=False)
-                    actions.append(action)
-                    matched_ids.add(move_a.move_id)
-                    matched_ids.add(move_b.move_id)
-                    to_delete.append(move_a.move_id)
-                    to_delete.append(move_b.move_id)
-                    break
+            # Выкидываем из головы очереди уже сматченные мувы (ленивое удаление)
+            while candidates and candidates[0].move_id in matched_ids:
+                candidates.popleft()
+            if not candidates:
+                continue
 
-        # 2. Force Attack Check (Timeout)
-        if signal and signal.signal_type == "check_timeout" and signal.move_id:
-            # Ищем мув, который вызвал таймаут
-            # Если он еще в пуле (не сматчился выше) -> Force Attack
+            move_b = candidates.popleft()
 
-            # Если move_id="batch", мы не знаем конкретный ID.
-            # Но для AI мы ставим "batch".
-            # Значит, если "batch", мы должны проверить ВСЕ мувы AI?
-            # Или просто пройтись по всем оставшимся в пуле и проверить их возраст?
-            # Давайте пока поддержим конкретный ID и "batch" (как Force All Old).
+            # ПАРА НАЙДЕНА!
+            action = CombatActionDTO(action_type="exchange", move=move_a, partner_move=move_b, is_forced=False)
+            actions.append(action)
+            matched_ids.add(move_a.move_id)
+            matched_ids.add(move_b.move_id)
+            to_delete.append(move_a.move_id)
+            to_delete.append(move_b.move_id)
 
+        # 2. Force Attack Check (Timeout)
+        # Таймеры приходят из колеса сессии ("{char_id}:{move_id}").
+        # Одиночный check_timeout сигнал с конкретным move_id (задачи старого формата) обрабатывается так же.
+        expired: list[tuple[str, str]] = []
+        for member in expired_timers or []:
+            char_id, _, move_id = member.partition(":")
+            expired.append((char_id, move_id))
+        if signal and signal.signal_type == "check_timeout" and signal.move_id and signal.move_id != "wheel":
+            expired.append((str(signal.char_id), signal.move_id))
+
+        if expired:
+            # Если мув еще в пуле (не сматчился выше) -> Force Attack
             force_candidates = []
-
-            if signal.move_id == "batch":
-                # Force all unmatched moves for this char_id (if provided)
-                # Signal содержит char_id.
-                for move in pool:
-                    if move.move_id not in matched_ids and int(move.char_id) == signal.char_id:
-                        force_candidates.append(move)
-            else:
-                # Specific move
-                for move in pool:
-                    if move.move_id == signal.move_id and move.move_id not in matched_ids:
-                        force_candidates.append(move)
-                        break
+            moves_by_id = {move.move_id: move for move in pool}
+
+            for char_id, move_id in expired:
+                if move_id == "batch":
+                    # Force all unmatched moves for this char_id (AI батч)
+                    for move in parsed_moves.get(char_id, {}).get("exchange", []):
+                        if move.move_id not in matched_ids:
+                            force_candidates.append(move)
+                            matched_ids.add(move.move_id)
+                else:
+                    # Specific move
+                    expired_move = moves_by_id.get(move_id)
+                    if expired_move and expired_move.move_id not in matched_ids:
+                        force_candidates.append(expired_move)
+                        matched_ids.add(expired_move.move_id)
 
             for move in force_candidates:
                 # Создаем Force Action (односторонний)
@@ -272,7 +313,6 @@ class CombatCollector:
                     is_forced=True,
                 )
                 actions.append(action)
-                matched_ids.add(move.move_id)
                 to_delete.append(move.move_id)
                 log.warning(f"Collector | Force Attack triggered for {move.move_id}")
 
@@ -3,7 +3,9 @@ import asyncio
 from loguru import logger as log
 
 from src.backend.domains.user_features.combat.combat_engine.logic.combat_pipeline import CombatPipeline
+from src.backend.domains.user_features.combat.combat_engine.logic.stats_engine import StatsEngine
 from src.backend.domains.user_features.combat.dto.combat_action_dto import CombatActionDTO
+from src.backend.domains.user_features.combat.dto.combat_actor_dto import ActorSnapshot
 from src.backend.domains.user_features.combat.dto.combat_session_dto import BattleContext
 
 
@@ -24,6 +26,9 @@ class CombatExecutor:
         """
         processed_ids = []
 
+        # Статы всех участников батча считаются одним проходом (вместо ensure_stats на каждый удар)
+        StatsEngine.ensure_stats_many(self._collect_batch_actors(ctx, actions))
+
         for action in actions:
             try:
                 await self._process_single_action(ctx, action)
@@ -37,6 +42,22 @@ class CombatExecutor:
 
         return processed_ids
 
+    @staticmethod
+    def _collect_batch_actors(ctx: BattleContext, actions: list[CombatActionDTO]) -> list[ActorSnapshot]:
+        """Уникальные участники батча (инициаторы, цели, партнеры по размену)."""
+        actor_ids: set[str] = set()
+        for action in actions:
+            for move in (action.move, action.partner_move):
+                if not move:
+                    continue
+                actor_ids.add(str(move.char_id))
+                target_id = getattr(move.payload, "target_id", None)
+                if target_id:
+                    actor_ids.add(str(target_id))
+                actor_ids.update(str(t) for t in move.targets or [])
+
+        return [actor for actor_id in actor_ids if (actor := ctx.actors.get(actor_id)) is not None]
+
     async def _process_single_action(self, ctx: BattleContext, action: CombatActionDTO) -> None:
         """
         Обработка одного действия.
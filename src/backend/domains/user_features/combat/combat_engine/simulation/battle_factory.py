@@ -0,0 +1,183 @@
+import copy
+from functools import lru_cache
+from typing import Any
+
+from src.backend.domains.internal_systems.context_assembler.schemas.monster_temp_context import (
+    MonsterTempContextSchema,
+)
+from src.backend.domains.user_features.combat.combat_engine.logic.stats_engine import StatsEngine
+from src.backend.domains.user_features.combat.dto.combat_actor_dto import (
+    ActorLoadoutDTO,
+    ActorMetaDTO,
+    ActorRawDTO,
+    ActorSnapshot,
+)
+from src.backend.domains.user_features.combat.dto.combat_session_dto import BattleContext, BattleMeta
+from src.backend.resources.game_data.items.bases import BASES_DB
+from src.backend.resources.game_data.monsters import get_monster_template
+from src.backend.resources.game_data.monsters.monster_equipment import MONSTER_EQUIPMENT_DB
+from src.backend.resources.game_data.monsters.spawn_config import TIER_SCALING_CONFIG
+from src.backend.services.calculators.stats_waterfall_calculator import StatsWaterfallCalculator
+
+# Модификаторы руки, которые читает CombatResolver -> общий стат от атрибутов, из которого они выводятся
+_MAIN_HAND_FROM_DERIVED = {
+    "main_hand_damage_base": "physical_damage",
+    "main_hand_accuracy": "accuracy",
+    "main_hand_crit_chance": "crit_chance",
+    "main_hand_penetration": "armor_penetration",
+}
+# Врожденные бонусы оружия, зависящие от руки
+_MAIN_HAND_FROM_IMPLICIT = {
+    "physical_accuracy": "main_hand_accuracy",
+    "physical_crit_chance": "main_hand_crit_chance",
+    "physical_penetration": "main_hand_penetration",
+}
+
+
+class SimulationBattleFactory:
+    """
+    Сборка BattleContext для офлайн-симуляции (без Redis/Postgres).
+
+    Повторяет боевой путь данных монстра:
+    вариант семьи -> scaled_base_stats (как ClanFactory) -> MonsterTempContextSchema (шмот из items)
+    -> ActorSnapshot (как CombatLifecycleService + CombatDataService).
+    """
+
+    def __init__(self, tier: int = 1, mod_overrides: dict[str, float] | None = None):
+        self.tier = tier
+        self.mod_overrides = mod_overrides or {}
+
+    def build_battle(self, session_id: str, blue: list[str], red: list[str]) -> BattleContext:
+        """
+        Создает свежий контекст боя. ID акторов числовые (1..N): Executor и Pipeline приводят char_id к int.
+        """
+        actors: dict[str, ActorSnapshot] = {}
+        teams: dict[str, list[str | int]] = {"blue": [], "red": []}
+
+        char_id = 0
+        for team, variant_ids in (("blue", blue), ("red", red)):
+            for variant_id in variant_ids:
+                char_id += 1
+                actors[str(char_id)] = self.build_actor(char_id, variant_id, team)
+                teams[team].append(str(char_id))
+
+        meta = BattleMeta(
+            active=1,
+            step_counter=0,
+            active_actors_count=len(actors),
+            teams=teams,
+            battle_type="simulation",
+            location_id="simulation",
+        )
+        return BattleContext(session_id=session_id, meta=meta, actors=actors)
+
+    def build_actor(self, char_id: int, variant_id: str, team: str) -> ActorSnapshot:
+        """
+        Актор с полным HP/EN от рассчитанных статов.
+        В Redis монстр приходит с vitals = -1 ("посчитай от максимума") — здесь это делается сразу.
+        """
+        template = self._get_template(variant_id, self.tier)
+        # Эффекты пишут в raw (temp-источники) — каждому актору своя копия
+        math_model = copy.deepcopy(template["math_model"])
+
+        modifiers = math_model.get("modifiers", {})
+        for key, value in self.mod_overrides.items():
+            modifiers[key] = {"source": {"sim:override": f"={value}"}}
+
+        actor = ActorSnapshot(
+            meta=ActorMetaDTO(
+                id=char_id,
+                name=template["meta"].get("name") or variant_id,
+                type="monster",
+                team=team,
+                template_id=variant_id,
+                is_ai=True,
+            ),
+            raw=ActorRawDTO(attributes=math_model.get("attributes", {}), modifiers=modifiers),
+            loadout=ActorLoadoutDTO(
+                known_abilities=list(template["loadout"].get("abilities", [])),
+                tags=math_model.get("tags", []),
+            ),
+        )
+
+        StatsEngine.ensure_stats(actor)
+        if not actor.stats:
+            raise ValueError(f"Stats calculation failed for monster variant: {variant_id}")
+
+        mods = actor.stats.mods
+        if mods.main_hand_accuracy <= 0 or mods.main_hand_damage_base <= 0:
+            # Такой монстр только промахивается: отчет был бы бессмысленным
+            raise ValueError(
+                f"Monster variant '{variant_id}' has no main hand attack "
+                f"(accuracy={mods.main_hand_accuracy}, damage_base={mods.main_hand_damage_base}); "
+                "set mod_overrides for main_hand_* modifiers"
+            )
+
+        actor.meta.hp = actor.meta.max_hp = max(1, int(mods.hp))
+        actor.meta.en = actor.meta.max_en = max(0, int(mods.en))
+        return actor
+
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _get_template(variant_id: str, tier: int) -> dict[str, Any]:
+        """
+        JSON-слепок монстра (как MonsterAssembler кладет в temp:setup), кэшируется на процесс.
+        Результат общий для всех боев процесса: build_actor работает только с копией.
+        """
+        variant = get_monster_template(variant_id)
+        if not variant:
+            raise ValueError(f"Unknown monster variant: {variant_id}")
+
+        multiplier = TIER_SCALING_CONFIG.get(tier, {"stat_mult": 1.0})["stat_mult"]
+        scaled_stats = {k: int(v * multiplier) for k, v in variant.base_stats.model_dump().items()}
+
+        schema = MonsterTempContextSchema(
+            core_stats=scaled_stats,
+            core_loadout=variant.fixed_loadout.model_dump(exclude_none=True),
+            core_skills=variant.skills,
+            core_meta={"id": variant_id, "name": variant_id, "role": variant.role},
+        )
+        template = schema.model_dump(by_alias=True, exclude={"core_stats", "core_loadout", "core_skills", "core_meta"})
+        template["math_model"]["modifiers"].update(
+            _main_hand_modifiers(template["math_model"], variant.fixed_loadout.main_hand)
+        )
+        return template
+
+
+def _main_hand_modifiers(math_model: dict[str, Any], weapon_id: str | None) -> dict[str, Any]:
+    """
+    Источники main_hand_* для монстра.
+
+    Шмот монстра дает только общие статы (physical_damage_min/max, physical_accuracy...),
+    а CombatResolver читает статы руки — без них все удары монстров промахиваются.
+    Здесь, как для игрока, стат руки = общий стат от атрибутов + оружие в main_hand (base_power,
+    damage_spread, врожденные бонусы руки). Общий стат фиксируется на момент сборки шаблона.
+    """
+    derived, _ = StatsWaterfallCalculator.calculate_waterfall(math_model, explain=False)
+    modifiers: dict[str, dict[str, dict[str, str]]] = {
+        key: {"source": {f"derived:{stat}": f"+{derived.get(stat, 0.0)}"}}
+        for key, stat in _MAIN_HAND_FROM_DERIVED.items()
+    }
+
+    weapon = _find_weapon(weapon_id) if weapon_id else None
+    if weapon is None:
+        return modifiers
+
+    source = f"item:{weapon_id}"
+    modifiers["main_hand_damage_base"]["source"][source] = f"+{float(weapon.get('base_power') or 0)}"
+    if weapon.get("damage_spread") is not None:
+        modifiers["main_hand_damage_spread"] = {"source": {source: f"={float(weapon['damage_spread'])}"}}
+    for bonus, value in (weapon.get("implicit_bonuses") or {}).items():
+        key = _MAIN_HAND_FROM_IMPLICIT.get(bonus)
+        if key:
+            modifiers[key]["source"][source] = f"+{float(value)}"
+    return modifiers
+
+
+def _find_weapon(item_id: str) -> dict[str, Any] | None:
+    """Оружие из баз предметов (как MonsterDataHelper): None, если предмет неизвестен."""
+    item = BASES_DB.get("weapon", {}).get(item_id) or MONSTER_EQUIPMENT_DB.get(item_id)
+    if item is None:
+        return None
+    data = item.model_dump() if hasattr(item, "model_dump") else dict(item)
+    return data if data.get("type") == "weapon" else None
@@ -0,0 +1,258 @@
+import asyncio
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from loguru import logger as log
+
+from src.backend.domains.user_features.combat.combat_engine.logic.combat_pipeline import CombatPipeline
+from src.backend.domains.user_features.combat.combat_engine.processors.executor import CombatExecutor
+from src.backend.domains.user_features.combat.combat_engine.simulation.battle_factory import SimulationBattleFactory
+from src.backend.domains.user_features.combat.dto.combat_action_dto import CombatActionDTO, CombatMoveDTO
+from src.backend.domains.user_features.combat.dto.combat_pipeline_dto import InteractionResultDTO
+from src.backend.domains.user_features.combat.dto.combat_session_dto import BattleContext
+from src.backend.domains.user_features.combat.dto.combat_simulation_dto import (
+    SimulationConfigDTO,
+    SimulationReportDTO,
+)
+
+# Движок логирует каждый удар — на миллионах разменов это и есть основная нагрузка
+_QUIET_LOGGERS = (
+    "src.backend.domains.user_features.combat",
+    "src.backend.domains.internal_systems",
+    "src.backend.services",
+)
+
+_OUTCOME_KEYS = ("hit", "crit", "miss", "dodge", "parry", "block")
+
+# Чанков на воркер: равномерная загрузка пула при разной длине боев
+_CHUNKS_PER_WORKER = 4
+
+
+class _RecordingPipeline(CombatPipeline):
+    """Pipeline, который считает исходы каждого удара для отчета симуляции."""
+
+    def __init__(self, outcomes: Counter):
+        super().__init__()
+        self.outcomes = outcomes
+
+    async def calculate(self, *args: Any, **kwargs: Any) -> InteractionResultDTO:
+        result = await super().calculate(*args, **kwargs)
+
+        outcomes = self.outcomes
+        outcomes["attacks"] += 1
+        if result.is_hit:
+            outcomes["hit"] += 1
+            if result.is_crit:
+                outcomes["crit"] += 1
+        elif result.is_dodged:
+            outcomes["dodge"] += 1
+        elif result.is_parried:
+            outcomes["parry"] += 1
+        elif result.is_blocked:
+            outcomes["block"] += 1
+        elif result.is_miss:
+            outcomes["miss"] += 1
+        else:
+            outcomes["skipped"] += 1  # Расчет не запускался (мертвый участник, контроль)
+        outcomes["damage"] += result.damage_final
+        return result
+
+
+class CombatSimulator:
+    """
+    Офлайн-симуляция боев (Monte Carlo) поверх CombatExecutor.process_batch.
+
+    Бои собираются из данных монстров (SimulationBattleFactory), ходы генерируются сидированным RNG,
+    Redis/ARQ не участвуют. Каждый бой сидируется своим (seed, index) — отчет не зависит от числа воркеров.
+    """
+
+    def __init__(self, config: SimulationConfigDTO):
+        self.config = config
+
+    def run(self) -> SimulationReportDTO:
+        """Прогон всех боев (при workers > 1 — в пуле процессов)."""
+        config = self.config
+        started = time.perf_counter()
+
+        if config.workers == 1:
+            partials = [run_battle_range(config, 0, config.battles)]
+        else:
+            bounds = self._split(config.battles, config.workers * _CHUNKS_PER_WORKER)
+            with ProcessPoolExecutor(max_workers=config.workers) as pool:
+                futures = [pool.submit(run_battle_range, config, start, stop) for start, stop in bounds]
+                partials = [future.result() for future in futures]
+
+        report = self._build_report(partials, time.perf_counter() - started)
+        log.info(
+            f"CombatSimulator | action=run status=success battles={report.battles} exchanges={report.exchanges} "
+            f"eps={report.exchanges_per_sec:.0f} workers={config.workers}"
+        )
+        return report
+
+    @staticmethod
+    def _split(total: int, parts: int) -> list[tuple[int, int]]:
+        parts = max(1, min(parts, total))
+        step, extra = divmod(total, parts)
+        bounds = []
+        start = 0
+        for i in range(parts):
+            stop = start + step + (1 if i < extra else 0)
+            bounds.append((start, stop))
+            start = stop
+        return bounds
+
+    @staticmethod
+    def _build_report(partials: list[dict[str, Any]], elapsed: float) -> SimulationReportDTO:
+        outcomes: Counter = Counter()
+        wins: Counter = Counter()
+        ttk: list[int] = []
+        battles = rounds = exchanges = 0
+
+        for partial in partials:
+            battles += partial["battles"]
+            rounds += partial["rounds"]
+            exchanges += partial["exchanges"]
+            outcomes.update(partial["outcomes"])
+            wins.update(partial["wins"])
+            ttk.extend(partial["ttk"])
+
+        attacks = outcomes.pop("attacks", 0)
+        resolved = attacks - outcomes.get("skipped", 0)
+        rates = {key: round(outcomes.get(key, 0) / resolved, 4) if resolved else 0.0 for key in _OUTCOME_KEYS}
+
+        ttk_rounds: dict[str, float] = {}
+        if ttk:
+            ttk.sort()
+            ttk_rounds = {
+                "mean": round(sum(ttk) / len(ttk), 2),
+                "p50": float(ttk[(len(ttk) - 1) // 2]),
+                "p90": float(ttk[min(len(ttk) - 1, int(len(ttk) * 0.9))]),
+                "max": float(ttk[-1]),
+            }
+
+        return SimulationReportDTO(
+            battles=battles,
+            rounds=rounds,
+            exchanges=exchanges,
+            attacks=attacks,
+            elapsed_sec=round(elapsed, 3),
+            exchanges_per_sec=round(exchanges / elapsed, 1) if elapsed > 0 else 0.0,
+            outcomes=dict(outcomes),
+            rates=rates,
+            wins=dict(wins),
+            ttk_rounds=ttk_rounds,
+        )
+
+
+def run_battle_range(config: SimulationConfigDTO, start: int, stop: int) -> dict[str, Any]:
+    """
+    Прогон боев [start, stop) в текущем процессе (точка входа воркера пула).
+    Возвращает частичные счетчики для CombatSimulator._build_report.
+    """
+    for name in _QUIET_LOGGERS:
+        log.disable(name)
+    # Бои сидируют глобальный random (его использует движок) — состояние вызывающего восстанавливается
+    rng_state = random.getstate()
+    try:
+        return asyncio.run(_simulate_range(config, start, stop))
+    finally:
+        random.setstate(rng_state)
+        for name in _QUIET_LOGGERS:
+            log.enable(name)
+
+
+async def _simulate_range(config: SimulationConfigDTO, start: int, stop: int) -> dict[str, Any]:
+    outcomes: Counter = Counter()
+    executor = CombatExecutor()
+    executor.pipeline = _RecordingPipeline(outcomes)
+    factory = SimulationBattleFactory(tier=config.tier, mod_overrides=config.mod_overrides)
+
+    wins: Counter = Counter()
+    ttk: list[int] = []
+    rounds_total = exchanges_total = 0
+
+    for index in range(start, stop):
+        seed = config.seed * 1_000_003 + index
+        random.seed(seed)  # Движок (MathCore, ContextBuilder) использует модуль random
+        rng = random.Random(f"moves:{seed}")
+
+        ctx = factory.build_battle(f"sim:{index}", config.blue, config.red)
+        winner, rounds, exchanges = await _simulate_battle(executor, ctx, rng, config.max_rounds)
+
+        wins[winner] += 1
+        if winner != "timeout":
+            ttk.append(rounds)
+        rounds_total += rounds
+        exchanges_total += exchanges
+
+    return {
+        "battles": stop - start,
+        "rounds": rounds_total,
+        "exchanges": exchanges_total,
+        "outcomes": dict(outcomes),
+        "wins": dict(wins),
+        "ttk": ttk,
+    }
+
+
+async def _simulate_battle(
+    executor: CombatExecutor, ctx: BattleContext, rng: random.Random, max_rounds: int
+) -> tuple[str, int, int]:
+    """Бой до гибели команды или max_rounds. Возвращает (winner, rounds, exchanges)."""
+    exchanges = 0
+    for round_no in range(1, max_rounds + 1):
+        actions = _build_round(ctx, rng, round_no)
+        if actions:
+            await executor.process_batch(ctx, actions)
+            exchanges += len(actions)
+
+        blue_alive = any(a.is_alive for a in ctx.actors.values() if a.team == "blue")
+        red_alive = any(a.is_alive for a in ctx.actors.values() if a.team == "red")
+        if not (blue_alive and red_alive):
+            winner = "blue" if blue_alive else "red" if red_alive else "draw"
+            return winner, round_no, exchanges
+
+    return "timeout", max_rounds, exchanges
+
+
+def _build_round(ctx: BattleContext, rng: random.Random, round_no: int) -> list[CombatActionDTO]:
+    """
+    Ходы раунда: живые акторы в случайном порядке встают в размен со свободным врагом
+    (move + partner_move). Если свободных врагов нет — безответный удар (is_forced) по случайному.
+    """
+    alive = [actor for actor in ctx.actors.values() if actor.is_alive]
+    rng.shuffle(alive)
+
+    busy: set[int] = set()
+    actions: list[CombatActionDTO] = []
+    for actor in alive:
+        if actor.char_id in busy:
+            continue
+        enemies = [enemy for enemy in alive if enemy.team != actor.team]
+        if not enemies:
+            break
+
+        free = [enemy for enemy in enemies if enemy.char_id not in busy]
+        target = rng.choice(free or enemies)
+        move = _exchange_move(actor.char_id, target.char_id, round_no)
+        busy.add(actor.char_id)
+
+        if free:
+            busy.add(target.char_id)
+            partner = _exchange_move(target.char_id, actor.char_id, round_no)
+            actions.append(CombatActionDTO(action_type="exchange", move=move, partner_move=partner))
+        else:
+            actions.append(CombatActionDTO(action_type="exchange", move=move, is_forced=True))
+    return actions
+
+
+def _exchange_move(char_id: int, target_id: int, round_no: int) -> CombatMoveDTO:
+    return CombatMoveDTO(
+        move_id=f"sim:{round_no}:{char_id}",
+        char_id=char_id,
+        strategy="exchange",
+        payload={"target_id": target_id},
+    )
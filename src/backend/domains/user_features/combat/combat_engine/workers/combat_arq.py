@@ -2,6 +2,7 @@ from loguru import logger as log
 
 from src.backend.core.base_arq import ArqService, BaseArqSettings, base_shutdown, base_startup
 from src.backend.database.redis.manager.combat_manager import CombatManager
+from src.backend.database.redis.redis_scripts import script_registry
 from src.backend.domains.user_features.combat.combat_engine.combat_data_service import CombatDataService
 from src.backend.domains.user_features.combat.combat_engine.processors.ai_processor import AiProcessor
 from src.backend.domains.user_features.combat.combat_engine.processors.collector import CombatCollector
@@ -35,6 +36,9 @@ async def combat_startup(ctx: dict) -> None:
     redis_service = ctx["redis_service"]
 
     combat_manager = CombatManager(redis_service)
+
+    # Lua-скрипты загружаются один раз (дальше только EVALSHA)
+    await script_registry.load_all(redis_service.redis_client)
     data_service = CombatDataService(combat_manager)
 
     # ArqService для TurnManager (внутренняя очередь)
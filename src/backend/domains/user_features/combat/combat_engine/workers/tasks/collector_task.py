@@ -3,6 +3,7 @@ from loguru import logger as log
 from src.backend.domains.user_features.combat.combat_engine.combat_data_service import CombatDataService
 from src.backend.domains.user_features.combat.combat_engine.processors.collector import CombatCollector
 from src.backend.domains.user_features.combat.dto.combat_arq_dto import CollectorSignalDTO, WorkerBatchJobDTO
+from src.backend.domains.user_features.combat.orchestrators.handler.runtime.combat_turn_manager import CombatTurnManager
 
 
 async def combat_collector_task(ctx: dict, signal_data: dict) -> None:
@@ -12,6 +13,10 @@ async def combat_collector_task(ctx: dict, signal_data: dict) -> None:
     Отвечает за сбор накопленных действий игроков и формирование пакета (Batch)
     для исполнителя (Executor). Также запускает AI, если пришло время.
 
+    Сигналы коалесцированы (см. CombatTurnManager.signal_collector): флаг pending снимается
+    в начале прохода, поэтому ходы, пришедшие во время прохода, поставят следующий.
+    Таймауты берутся из колеса сессии (ZSET) и подтверждаются после переноса действий.
+
     Args:
         ctx: Контекст ARQ с инъекциями сервисов.
         signal_data: Данные сигнала (CollectorSignalDTO).
@@ -25,14 +30,30 @@ async def combat_collector_task(ctx: dict, signal_data: dict) -> None:
         # ВАЖНО: collector уже инициализирован в combat_arq.py
         collector: CombatCollector = ctx["combat_collector"]
         data_service: CombatDataService = collector.data_service
+        turn_manager: CombatTurnManager = ctx["turn_manager"]
+        combat_manager = data_service.combat_manager
 
         log.debug(
             "CollectorStart | session_id={session_id} signal={signal}", session_id=session_id, signal=signal.signal_type
         )
 
+        # 0. Coalescing: снимаем флаг pending до чтения мувов
+        await combat_manager.clear_collector_pending(session_id)
+
+        # Сработавшие таймеры колеса сессии
+        due_timers = await combat_manager.get_due_timers(session_id)
+
         # 1. Logic Execution (Collect Actions & Check Timers)
         # Возвращает размер батча, список задач для AI и результат проверки победы
-        batch_size, ai_tasks, victory_result = await collector.collect_actions(signal.session_id, signal)
+        batch_size, ai_tasks, victory_result = await collector.collect_actions(
+            signal.session_id, signal, expired_timers=due_timers
+        )
+
+        # 1.1. Ack таймеров + перезавод задачи на следующий таймер колеса
+        if due_timers or signal.signal_type == "check_timeout":
+            next_due = await combat_manager.ack_timers(session_id, due_timers)
+            if next_due is not None:
+                await turn_manager.arm_timer(session_id, next_due)
 
         # 2. Dispatch AI Tasks (Non-blocking)
         if ai_tasks:
@@ -46,7 +67,7 @@ async def combat_collector_task(ctx: dict, signal_data: dict) -> None:
         # 3. Dispatch Executor Task (Critical Path)
         if batch_size > 0:
             # Atomic Check: Не работает ли уже Executor с этой сессией?
-            can_enqueue = await data_service.combat_manager.check_and_lock_busy_for_collector(signal.session_id)
+            can_enqueue = await combat_manager.check_and_lock_busy_for_collector(signal.session_id)
 
             if can_enqueue:
                 job_dto = WorkerBatchJobDTO(session_id=signal.session_id, batch_size=batch_size)
@@ -6,7 +6,7 @@ from loguru import logger as log
 from src.backend.domains.user_features.combat.combat_engine.combat_data_service import CombatDataService
 from src.backend.domains.user_features.combat.combat_engine.processors.executor import CombatExecutor
 from src.backend.domains.user_features.combat.dto.combat_action_dto import CombatActionDTO
-from src.backend.domains.user_features.combat.dto.combat_arq_dto import CollectorSignalDTO, WorkerBatchJobDTO
+from src.backend.domains.user_features.combat.dto.combat_arq_dto import WorkerBatchJobDTO
 
 
 async def execute_batch_task(ctx: dict, job_data: dict) -> None:
@@ -101,9 +101,8 @@ async def execute_batch_task(ctx: dict, job_data: dict) -> None:
             await data_service.combat_manager.release_worker_lock_safe(session_id, my_id)
 
             # 7. Heartbeat Signal
-            # Пинаем коллектор, чтобы он проверил, есть ли еще действия
-            signal = CollectorSignalDTO(session_id=session_id, char_id=0, signal_type="heartbeat", move_id="executor")
-            await ctx["redis"].enqueue_job("combat_collector_task", signal.model_dump())
+            # Пинаем коллектор, чтобы он проверил, есть ли еще действия (коалесцируется с сигналами ходов)
+            await ctx["turn_manager"].signal_collector(session_id, 0, "heartbeat", "executor")
 
     except Exception:
         # Ловим любые ошибки, чтобы воркер не упал насмерть
@@ -31,5 +31,9 @@ async def victory_finalizer_task(ctx: dict, data: dict) -> None:
         winner=winner,
     )
 
+    # Бой завершен: снапшоты акторов в кэше воркера больше не нужны
+    data_service = ctx.get("combat_data_service")
+    if data_service is not None:
+        data_service.release_session(session_id)
+
     # TODO: Реализовать логику финализации (см. список выше)
-    pass
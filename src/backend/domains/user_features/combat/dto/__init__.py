@@ -45,6 +45,10 @@ from .combat_session_dto import (
     CombatTeamDTO,
     SessionDataDTO,
 )
+from .combat_simulation_dto import (
+    SimulationConfigDTO,
+    SimulationReportDTO,
+)
 from .payloads import (
     ExchangePayload,
     InstantPayload,
@@ -103,6 +107,9 @@ __all__ = [
     "CombatInitContextDTO",
     "CombatTeamDTO",
     "SessionDataDTO",
+    # Simulation
+    "SimulationConfigDTO",
+    "SimulationReportDTO",
     # Triggers
     "TriggerRulesFlagsDTO",
     "AccuracyTriggersDTO",
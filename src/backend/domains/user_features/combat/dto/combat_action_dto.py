@@ -23,6 +23,7 @@ class CombatMoveDTO(BaseModel):
 
     # Вспомогательные поля
     targets: list[int] | None = None  # Резолвленные ID целей (заполняется сервером)
+    created_at: float = 0.0  # Время регистрации (FIFO в матчмейкинге)
 
 
 class CombatActionDTO(BaseModel):
@@ -237,6 +237,11 @@ class ActorSnapshot(BaseModel):
     stats: ActorStats | None = None
     dirty_stats: set[str] = Field(default_factory=set)
 
+    # --- Delta Commit (In-Memory only) ---
+    # Секции, измененные пайплайном: "state" (HP/EN/Tokens), "statuses", "xp", "raw".
+    # CombatDataService.commit_session пишет в Redis только их.
+    dirty_sections: set[str] = Field(default_factory=set)
+
     # --- Helpers ---
     @property
     def char_id(self) -> int:
@@ -264,3 +269,7 @@ class ActorSnapshot(BaseModel):
     def active_effects(self) -> list[ActiveEffectDTO]:
         """Helper для доступа к эффектам."""
         return self.statuses.effects
+
+    def mark_dirty(self, *sections: str) -> None:
+        """Помечает секции актора для delta-коммита."""
+        self.dirty_sections.update(sections)
@@ -1,8 +1,13 @@
 """
 DTO для управления Пайплайном Боя (Combat Pipeline).
 Содержит флаги, контексты и результаты расчетов.
+
+Контекст (флаги, моды, этапы, триггеры) — внутренняя структура одного удара:
+slotted dataclasses без валидации, создаются на каждый hit/контратаку/off-hand.
+Pydantic остается только на границе — InteractionResultDTO уходит в Executor и логи.
 """
 
+from dataclasses import dataclass, field
 from typing import Any, Literal
 
 from pydantic import BaseModel, Field
@@ -14,7 +19,8 @@ from src.backend.domains.user_features.combat.dto.trigger_rules_flags_dto import
 # ==============================================================================
 
 
-class PipelinePhasesDTO(BaseModel):
+@dataclass(slots=True)
+class PipelinePhasesDTO:
     """Управление глобальными фазами пайплайна."""
 
     run_pre_calc: bool = True
@@ -25,7 +31,8 @@ class PipelinePhasesDTO(BaseModel):
     is_target_dead: bool = False
 
 
-class ForceFlagsDTO(BaseModel):
+@dataclass(slots=True)
+class ForceFlagsDTO:
     """Абсолютные переключатели результата."""
 
     hit: bool = False
@@ -37,7 +44,8 @@ class ForceFlagsDTO(BaseModel):
     hit_evasion: bool = False
 
 
-class RestrictionFlagsDTO(BaseModel):
+@dataclass(slots=True)
+class RestrictionFlagsDTO:
     """Запреты."""
 
     cannot_crit: bool = False
@@ -45,7 +53,8 @@ class RestrictionFlagsDTO(BaseModel):
     ignore_block: bool = False
 
 
-class MasteryFlagsDTO(BaseModel):
+@dataclass(slots=True)
+class MasteryFlagsDTO:
     """Флаги мастерства."""
 
     light_armor: bool = False
@@ -54,7 +63,8 @@ class MasteryFlagsDTO(BaseModel):
     unarmed_combo: bool = False
 
 
-class FormulaFlagsDTO(BaseModel):
+@dataclass(slots=True)
+class FormulaFlagsDTO:
     """Переключатели формул."""
 
     # Evasion
@@ -79,7 +89,8 @@ class FormulaFlagsDTO(BaseModel):
     counter_chance_boost: bool = False  # Был enable_counter (+20% chance)
 
 
-class DamageTypeFlagsDTO(BaseModel):
+@dataclass(slots=True)
+class DamageTypeFlagsDTO:
     """Типы урона."""
 
     physical: bool = True
@@ -95,7 +106,8 @@ class DamageTypeFlagsDTO(BaseModel):
     healing: bool = False  # NEW: Тип урона "Лечение"
 
 
-class StateFlagsDTO(BaseModel):
+@dataclass(slots=True)
+class StateFlagsDTO:
     """Внутреннее состояние."""
 
     partial_absorb_reflect: bool = False
@@ -108,7 +120,8 @@ class StateFlagsDTO(BaseModel):
     check_counter: bool = False  # Сигнал для запуска этапа проверки контратаки
 
 
-class MetaFlagsDTO(BaseModel):
+@dataclass(slots=True)
+class MetaFlagsDTO:
     """Строковые мета-данные и счетчики."""
 
     source_type: Literal["main_hand", "off_hand", "magic", "item"] = "main_hand"
@@ -124,7 +137,8 @@ class MetaFlagsDTO(BaseModel):
     action_mode: Literal["exchange", "unidirectional"] = "exchange"
 
 
-class MechanicsFlagsDTO(BaseModel):
+@dataclass(slots=True)
+class MechanicsFlagsDTO:
     """
     Мутация стейта (Mechanics Service).
     Управляет тем, какие изменения применяются к акторам.
@@ -139,17 +153,18 @@ class MechanicsFlagsDTO(BaseModel):
     generate_feints: bool = True  # NEW: Генерировать ли финты (отключать для insta_skill)
 
 
-class PipelineFlagsDTO(BaseModel):
+@dataclass(slots=True)
+class PipelineFlagsDTO:
     """Группировка всех флагов."""
 
-    force: ForceFlagsDTO = Field(default_factory=ForceFlagsDTO)
-    restriction: RestrictionFlagsDTO = Field(default_factory=RestrictionFlagsDTO)
-    mastery: MasteryFlagsDTO = Field(default_factory=MasteryFlagsDTO)
-    formula: FormulaFlagsDTO = Field(default_factory=FormulaFlagsDTO)
-    damage: DamageTypeFlagsDTO = Field(default_factory=DamageTypeFlagsDTO)
-    state: StateFlagsDTO = Field(default_factory=StateFlagsDTO)
-    meta: MetaFlagsDTO = Field(default_factory=MetaFlagsDTO)
-    mechanics: MechanicsFlagsDTO = Field(default_factory=MechanicsFlagsDTO)  # NEW
+    force: ForceFlagsDTO = field(default_factory=ForceFlagsDTO)
+    restriction: RestrictionFlagsDTO = field(default_factory=RestrictionFlagsDTO)
+    mastery: MasteryFlagsDTO = field(default_factory=MasteryFlagsDTO)
+    formula: FormulaFlagsDTO = field(default_factory=FormulaFlagsDTO)
+    damage: DamageTypeFlagsDTO = field(default_factory=DamageTypeFlagsDTO)
+    state: StateFlagsDTO = field(default_factory=StateFlagsDTO)
+    meta: MetaFlagsDTO = field(default_factory=MetaFlagsDTO)
+    mechanics: MechanicsFlagsDTO = field(default_factory=MechanicsFlagsDTO)  # NEW
 
 
 # ==============================================================================
@@ -157,14 +172,16 @@ class PipelineFlagsDTO(BaseModel):
 # ==============================================================================
 
 
-class PipelineModsDTO(BaseModel):
+@dataclass(slots=True)
+class PipelineModsDTO:
     """Числовые модификаторы."""
 
     accuracy_mult: float = 1.0
     weapon_effect_value: float = 2.0  # Универсальный бонус оружия (Crit Mult / Pierce %)
 
 
-class PipelineStagesDTO(BaseModel):
+@dataclass(slots=True)
+class PipelineStagesDTO:
     """Управление этапами."""
 
     check_accuracy: bool = True
@@ -276,17 +293,18 @@ class InteractionResultDTO(BaseModel):
 # ==============================================================================
 
 
-class PipelineContextDTO(BaseModel):
+@dataclass(slots=True)
+class PipelineContextDTO:
     """Пульт управления боем."""
 
-    phases: PipelinePhasesDTO = Field(default_factory=PipelinePhasesDTO)
-    flags: PipelineFlagsDTO = Field(default_factory=PipelineFlagsDTO)
-    mods: PipelineModsDTO = Field(default_factory=PipelineModsDTO)
+    phases: PipelinePhasesDTO = field(default_factory=PipelinePhasesDTO)
+    flags: PipelineFlagsDTO = field(default_factory=PipelineFlagsDTO)
+    mods: PipelineModsDTO = field(default_factory=PipelineModsDTO)
 
     # Заменили PipelineTriggersDTO на TriggerRulesFlagsDTO
-    triggers: TriggerRulesFlagsDTO = Field(default_factory=TriggerRulesFlagsDTO)
+    triggers: TriggerRulesFlagsDTO = field(default_factory=TriggerRulesFlagsDTO)
 
-    stages: PipelineStagesDTO = Field(default_factory=PipelineStagesDTO)
+    stages: PipelineStagesDTO = field(default_factory=PipelineStagesDTO)
 
     # Meta
     override_damage: tuple[float, float] | None = None
@@ -295,4 +313,9 @@ class PipelineContextDTO(BaseModel):
     can_counter: bool = True
 
     # Result (Всегда инициализирован)
-    result: InteractionResultDTO = Field(default_factory=InteractionResultDTO)
+    result: InteractionResultDTO = field(default_factory=InteractionResultDTO)
+
+    @property
+    def active_triggers(self) -> frozenset[str]:
+        """Активные флаги триггеров ("section.flag"). Пустой frozenset — резолвер триггеры пропускает."""
+        return self.triggers.active
@@ -0,0 +1,48 @@
+"""
+DTO офлайн-симуляции боя (Monte Carlo).
+"""
+
+from pydantic import BaseModel, Field
+
+
+class SimulationConfigDTO(BaseModel):
+    """
+    Конфигурация прогона.
+    Команды задаются ID вариантов монстров из resources/game_data/monsters (например "goblin_sneak").
+    """
+
+    blue: list[str]
+    red: list[str]
+    tier: int = 1
+
+    battles: int = Field(default=100, gt=0)
+    max_rounds: int = Field(default=100, gt=0)  # Раундов на бой до ничьей (timeout)
+    seed: int = 0
+    workers: int = Field(default=1, ge=1)
+
+    # Принудительные модификаторы {stat_key: value} — кладутся в raw как Override ("=value"),
+    # поэтому переживают пересчет статов внутри боя. Для "что если" экспериментов баланса.
+    mod_overrides: dict[str, float] = Field(default_factory=dict)
+
+
+class SimulationReportDTO(BaseModel):
+    """
+    Итог прогона: производительность + распределения исходов.
+    Не зависит от числа воркеров (сид на каждый бой), поэтому пригоден для регресс-сравнения.
+    """
+
+    battles: int = 0
+    rounds: int = 0
+    exchanges: int = 0  # Действия, прошедшие через CombatExecutor.process_batch
+    attacks: int = 0  # Вызовы CombatPipeline.calculate (включая контратаки и off-hand)
+    elapsed_sec: float = 0.0
+    exchanges_per_sec: float = 0.0
+
+    # hit / crit / miss / dodge / parry / block / skipped / damage
+    outcomes: dict[str, int] = Field(default_factory=dict)
+    # Доли от attacks (без skipped)
+    rates: dict[str, float] = Field(default_factory=dict)
+
+    wins: dict[str, int] = Field(default_factory=dict)  # blue / red / timeout
+    # Time-to-kill в раундах по завершенным боям: mean / p50 / p90 / max
+    ttk_rounds: dict[str, float] = Field(default_factory=dict)
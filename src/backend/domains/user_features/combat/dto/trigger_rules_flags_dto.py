@@ -3,83 +3,174 @@ DTO для флагов активации правил триггеров (Trig
 Структурировано по этапам резолвера для оптимизации поиска.
 """
 
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, field, fields
+from typing import Any, overload
 
 
-class AccuracyTriggersDTO(BaseModel):
+class TriggerFlag:
+    """
+    Флаг триггера (дескриптор).
+    Значение не хранится в инстансе: флаг True <=> имя флага есть в `active_flags` секции.
+    """
+
+    __slots__ = ("name",)
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    @overload
+    def __get__(self, instance: None, owner: type) -> "TriggerFlag": ...
+
+    @overload
+    def __get__(self, instance: "TriggerSectionDTO", owner: type) -> bool: ...
+
+    def __get__(self, instance: "TriggerSectionDTO | None", owner: type) -> "TriggerFlag | bool":
+        if instance is None:
+            return self
+        return self.name in instance._active
+
+    def __set__(self, instance: "TriggerSectionDTO", value: Any) -> None:
+        if value is True:
+            instance._active.add(self.name)
+        else:
+            instance._active.discard(self.name)
+
+
+class TriggerSectionDTO:
+    """
+    База секции триггеров.
+    Секция — это множество активных флагов (`active_flags`): создание стоит одну аллокацию set,
+    резолверу не нужно сканировать поля.
+    """
+
+    __slots__ = ("_active",)
+
+    _flag_names: tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._flag_names = tuple(name for name, value in vars(cls).items() if isinstance(value, TriggerFlag))
+
+    def __init__(self, **flags: bool) -> None:
+        self._active: set[str] = set()
+        for name, value in flags.items():
+            if name not in self._flag_names:
+                raise TypeError(f"{type(self).__name__} has no trigger flag '{name}'")
+            setattr(self, name, value)
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._active == other._active  # type: ignore[attr-defined]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{name}=True' for name in sorted(self._active))})"
+
+    @classmethod
+    def flag_names(cls) -> tuple[str, ...]:
+        """Имена флагов секции в порядке объявления."""
+        return cls._flag_names
+
+    @property
+    def active_flags(self) -> set[str]:
+        """Активные (True) флаги секции. Только для чтения."""
+        return self._active
+
+
+class AccuracyTriggersDTO(TriggerSectionDTO):
     """Триггеры этапа Точности (ON_ACCURACY_CHECK, ON_MISS)."""
 
-    true_strike: bool = False  # Игнор уворота
-    rage_on_miss: bool = False  # Бонус при промахе
+    __slots__ = ()
+
+    true_strike = TriggerFlag()  # Игнор уворота
+    rage_on_miss = TriggerFlag()  # Бонус при промахе
 
     # Styles
-    style_1h_flow: bool = False  # Возврат токенов
-    style_2h_ignore: bool = False  # Игнор брони + Дебафф
-    style_dual_extra: bool = False  # Доп. атака
+    style_1h_flow = TriggerFlag()  # Возврат токенов
+    style_2h_ignore = TriggerFlag()  # Игнор брони + Дебафф
+    style_dual_extra = TriggerFlag()  # Доп. атака
 
 
-class CritTriggersDTO(BaseModel):
+class CritTriggersDTO(TriggerSectionDTO):
     """Триггеры этапа Крита (ON_CRIT, ON_CRIT_FAIL)."""
 
-    bleed_on_crit: bool = False
-    stun_on_crit: bool = False
-    heavy_strike_on_crit: bool = False
+    __slots__ = ()
+
+    bleed_on_crit = TriggerFlag()
+    stun_on_crit = TriggerFlag()
+    heavy_strike_on_crit = TriggerFlag()
 
     # Новые тактические триггеры
-    true_crit: bool = False  # Игнор уворота при крите
-    unblockable_crit: bool = False  # Игнор блока при крите
-    piercing_crit: bool = False  # Игнор брони при крите
+    true_crit = TriggerFlag()  # Игнор уворота при крите
+    unblockable_crit = TriggerFlag()  # Игнор блока при крите
+    piercing_crit = TriggerFlag()  # Игнор брони при крите
 
 
-class DodgeTriggersDTO(BaseModel):
+class DodgeTriggersDTO(TriggerSectionDTO):
     """Триггеры этапа Уклонения (ON_DODGE, ON_DODGE_FAIL)."""
 
-    counter_on_dodge: bool = False
+    __slots__ = ()
+
+    counter_on_dodge = TriggerFlag()
 
 
-class ParryTriggersDTO(BaseModel):
+class ParryTriggersDTO(TriggerSectionDTO):
     """Триггеры этапа Парирования (ON_PARRY, ON_PARRY_FAIL)."""
 
-    disarm_on_parry: bool = False
-    counter_on_parry: bool = False
+    __slots__ = ()
 
+    disarm_on_parry = TriggerFlag()
+    counter_on_parry = TriggerFlag()
 
-class BlockTriggersDTO(BaseModel):
+
+class BlockTriggersDTO(TriggerSectionDTO):
     """Триггеры этапа Блока (ON_BLOCK, ON_BLOCK_FAIL)."""
 
-    bash_on_block: bool = False
+    __slots__ = ()
+
+    bash_on_block = TriggerFlag()
 
     # Styles
-    style_shield_reflect: bool = False  # Отражение урона
+    style_shield_reflect = TriggerFlag()  # Отражение урона
 
 
-class ControlTriggersDTO(BaseModel):
+class ControlTriggersDTO(TriggerSectionDTO):
     """Триггеры финального этапа (ON_CHECK_CONTROL)."""
 
-    stun_on_hit: bool = False
-    bleed_on_hit: bool = False
-    knockdown_on_hit: bool = False
-    evasive_shot: bool = False  # Добавили для луков
+    __slots__ = ()
 
+    stun_on_hit = TriggerFlag()
+    bleed_on_hit = TriggerFlag()
+    knockdown_on_hit = TriggerFlag()
+    evasive_shot = TriggerFlag()  # Добавили для луков
 
-class DamageTriggersDTO(BaseModel):
+
+class DamageTriggersDTO(TriggerSectionDTO):
     """Триггеры этапа расчета урона (ON_DAMAGE)."""
 
-    execute_low_hp: bool = False
+    __slots__ = ()
+
+    execute_low_hp = TriggerFlag()
 
 
-class TriggerRulesFlagsDTO(BaseModel):
+@dataclass(slots=True)
+class TriggerRulesFlagsDTO:
     """
     Корневой DTO для флагов триггеров.
     Используется в PipelineContextDTO.
     """
 
-    accuracy: AccuracyTriggersDTO = Field(default_factory=AccuracyTriggersDTO)
-    crit: CritTriggersDTO = Field(default_factory=CritTriggersDTO)
+    accuracy: AccuracyTriggersDTO = field(default_factory=AccuracyTriggersDTO)
+    crit: CritTriggersDTO = field(default_factory=CritTriggersDTO)
+
+    dodge: DodgeTriggersDTO = field(default_factory=DodgeTriggersDTO)
+    parry: ParryTriggersDTO = field(default_factory=ParryTriggersDTO)
+    block: BlockTriggersDTO = field(default_factory=BlockTriggersDTO)
 
-    dodge: DodgeTriggersDTO = Field(default_factory=DodgeTriggersDTO)
-    parry: ParryTriggersDTO = Field(default_factory=ParryTriggersDTO)
-    block: BlockTriggersDTO = Field(default_factory=BlockTriggersDTO)
+    control: ControlTriggersDTO = field(default_factory=ControlTriggersDTO)
+    damage: DamageTriggersDTO = field(default_factory=DamageTriggersDTO)
 
-    control: ControlTriggersDTO = Field(default_factory=ControlTriggersDTO)
-    damage: DamageTriggersDTO = Field(default_factory=DamageTriggersDTO)
+    @property
+    def active(self) -> frozenset[str]:
+        """Все активные флаги в виде "section.flag" (для логов/тестов)."""
+        return frozenset(f"{f.name}.{flag}" for f in fields(self) for flag in getattr(self, f.name).active_flags)
@@ -21,11 +21,17 @@ AFK_TIMEOUTS = {
 }
 MIN_TIMEOUT = 20
 
+# Окно дебаунса коллектора: пачка ходов за это время дает один проход
+COLLECTOR_DEBOUNCE_SEC = 0.05
+
 
 class CombatTurnManager:
     """
     Постановщик задач (RBC v3.0).
     Управляет буфером намерений и очередями ARQ (Immediate + Delayed).
+
+    Сигналы коллектору коалесцируются по сессии (флаг pending + дебаунс),
+    таймауты Force Attack живут в одном ZSET-колесе сессии, а не в отложенной задаче на каждый ход.
     """
 
     def __init__(self, combat_manager: CombatManager, arq_service: ArqService):
@@ -95,18 +101,9 @@ class CombatTurnManager:
         # 5. РАСЧЕТ ТАЙМЕРА (Force Attack)
         timeout = AFK_TIMEOUTS.get(afk_level, MIN_TIMEOUT)
 
-        # 6. СТАВИМ ДВЕ ЗАДАЧИ В ARQ
-        signal_immediate = CollectorSignalDTO(
-            session_id=session_id, char_id=char_id, signal_type="check_immediate", move_id=move_dto.move_id
-        )
-        await self.arq.enqueue_job("combat_collector_task", signal_immediate.model_dump())
-
-        signal_timeout = CollectorSignalDTO(
-            session_id=session_id, char_id=char_id, signal_type="check_timeout", move_id=move_dto.move_id
-        )
-        await self.arq.enqueue_job(
-            "combat_collector_task", signal_timeout.model_dump(), _defer_until=int(time.time() + timeout)
-        )
+        # 6. СИГНАЛЫ: проход коллектора (коалесцированный) + таймер в колесе сессии
+        await self.signal_collector(session_id, char_id, "check_immediate", move_dto.move_id)
+        await self.schedule_timeout(session_id, char_id, move_dto.move_id, timeout)
 
         log.info(f"TurnManager | Move {action_type} registered. Strategy: {move_dto.strategy}. Timeout: {timeout}s")
 
@@ -172,24 +169,61 @@ class CombatTurnManager:
         # 4. Signals (Immediate + Timeout)
         if success_count > 0:
             # A. Immediate
-            signal_immediate = CollectorSignalDTO(
-                session_id=session_id, char_id=char_id, signal_type="check_immediate", move_id="batch"
-            )
-            await self.arq.enqueue_job("combat_collector_task", signal_immediate.model_dump())
+            await self.signal_collector(session_id, char_id, "check_immediate", "batch")
 
             # B. Timeout (Force Attack)
             timeout = 60
-            signal_timeout = CollectorSignalDTO(
-                session_id=session_id, char_id=char_id, signal_type="check_timeout", move_id="batch"
-            )
-            await self.arq.enqueue_job(
-                "combat_collector_task", signal_timeout.model_dump(), _defer_until=int(time.time() + timeout)
-            )
+            await self.schedule_timeout(session_id, char_id, "batch", timeout)
 
             log.info(f"TurnManager | Batch registered {success_count} moves for {char_id}. Timeout: {timeout}s")
         else:
             log.warning(f"TurnManager | Batch failed or empty for {char_id}")
 
+    async def signal_collector(self, session_id: str, char_id: int, signal_type: str, move_id: str | None) -> None:
+        """
+        Ставит проход коллектора, если он еще не запланирован для сессии.
+        Все сигналы в пределах окна дебаунса сливаются в один проход.
+        """
+        if not await self.combat_manager.mark_collector_pending(session_id):
+            log.debug(f"TurnManager | action=signal_collector status=coalesced session_id={session_id}")
+            return
+
+        signal = CollectorSignalDTO(session_id=session_id, char_id=char_id, signal_type=signal_type, move_id=move_id)
+        job = await self.arq.enqueue_job("combat_collector_task", signal.model_dump(), _defer_by=COLLECTOR_DEBOUNCE_SEC)
+        if job is None:
+            # Задача не поставлена -> снимаем флаг, чтобы следующий сигнал не потерялся
+            await self.combat_manager.clear_collector_pending(session_id)
+
+    async def schedule_timeout(self, session_id: str, char_id: int, move_id: str, timeout: float) -> None:
+        """
+        Регистрирует таймаут Force Attack в колесе сессии.
+        move_id="batch" означает "все несматченные мувы актора" (AI).
+        """
+        arm_at = await self.combat_manager.schedule_timers(session_id, [f"{char_id}:{move_id}"], time.time() + timeout)
+        if arm_at is not None:
+            await self.arm_timer(session_id, arm_at)
+
+    async def arm_timer(self, session_id: str, due_at: float) -> None:
+        """
+        Заводит одну отложенную задачу коллектора на ближайший таймер колеса.
+        _job_id дедуплицирует повторный завод на то же время.
+        Если задача не поставлена (ошибка или None), отметка колеса снимается — иначе таймауты сессии
+        ждали бы ее истечения.
+        """
+        signal = CollectorSignalDTO(session_id=session_id, char_id=0, signal_type="check_timeout", move_id="wheel")
+        job = None
+        try:
+            job = await self.arq.enqueue_job(
+                "combat_collector_task",
+                signal.model_dump(),
+                _defer_by=max(0.0, due_at - time.time()),
+                _job_id=f"combat_timer:{session_id}:{round(due_at * 1000)}",
+            )
+        finally:
+            if job is None:
+                log.warning(f"TurnManager | action=arm_timer status=failed session_id={session_id} due_at={due_at}")
+                await self.combat_manager.disarm_timers(session_id, due_at)
+
     def _build_move_dto(self, char_id: int, action: str, data: dict) -> CombatMoveDTO:
         """
         Маппинг входящих данных в правильную стратегию и Payload.
@@ -223,4 +257,5 @@ class CombatTurnManager:
             char_id=char_id,
             strategy=strategy,
             payload=validated_payload,
+            created_at=time.time(),
         )
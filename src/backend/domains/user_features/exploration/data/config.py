@@ -9,6 +9,10 @@ class ExplorationConfig:
     # --- World Constants ---
     DEFAULT_SPAWN_POINT = "52_52"  # Стартовая локация (Fallback)
 
+    # --- Auto-Navigator ---
+    NAVIGATOR_MAX_STEPS = 40  # Переходов за один авто-маршрут (дальше — повторный запрос)
+    NAVIGATOR_MAX_TRAVEL_TIME = 40.0  # Суммарное time_duration переходов за один авто-маршрут (сек)
+
     # --- Encounter Chances (Global) ---
     CHANCE_MERCHANT = 0.01  # 1%
     CHANCE_QUEST = 0.02  # 2%
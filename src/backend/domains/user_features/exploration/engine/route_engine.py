@@ -0,0 +1,188 @@
+# backend/domains/user_features/exploration/engine/route_engine.py
+"""
+Engine авто-навигации.
+Чистая логика без обращений к БД/Redis: граф собирается из снапшота WorldLoaderService.
+"""
+
+import heapq
+import math
+from array import array
+from collections import OrderedDict
+from typing import Any
+
+# Цель "ближайший хаб" (узлы с flags.is_hub)
+HUB_TARGET = "hub"
+
+
+class WorldGraph:
+    """
+    Компактный граф переходов мира (CSR: offsets/targets/weights в array).
+
+    Ребра — nav-выходы локаций с их time_duration, т.е. уже с учетом правил регионов, дорог
+    и restricted_exits из WorldLoaderService._calculate_exits_for_node.
+
+    Маршрут строится по полю расстояний до цели (обратный Дейкстра от всех узлов цели):
+    поле считается один раз и кэшируется, после чего любой маршрут — проход по next_hop за O(длины пути).
+    """
+
+    def __init__(self, snapshot: dict[str, dict[str, Any]], max_fields: int = 32):
+        self.ids: list[str] = list(snapshot)
+        self.index: dict[str, int] = {loc_id: i for i, loc_id in enumerate(self.ids)}
+        self.names: list[str] = [node.get("name", loc_id) for loc_id, node in snapshot.items()]
+
+        # Прямые и обратные списки смежности в CSR
+        forward: list[list[tuple[int, float]]] = [[] for _ in self.ids]
+        reverse: list[list[tuple[int, float]]] = [[] for _ in self.ids]
+        self.hubs: list[int] = []
+        self.services: dict[str, list[int]] = {}
+
+        for i, node in enumerate(snapshot.values()):
+            for target_id, duration in node.get("nav", {}).items():
+                j = self.index.get(target_id)
+                if j is None:
+                    continue
+                forward[i].append((j, float(duration)))
+                reverse[j].append((i, float(duration)))
+            if node.get("hub"):
+                self.hubs.append(i)
+            for service_id in node.get("services", []):
+                self.services.setdefault(service_id, []).append(i)
+
+        self.offsets, self.targets, self.weights = self._to_csr(forward)
+        self.r_offsets, self.r_targets, self.r_weights = self._to_csr(reverse)
+
+        self.max_fields = max_fields
+        self._fields: OrderedDict[str, tuple[array, array]] = OrderedDict()
+
+    @staticmethod
+    def _to_csr(adjacency: list[list[tuple[int, float]]]) -> tuple[array, array, array]:
+        offsets = array("l", [0])
+        targets = array("l")
+        weights = array("d")
+        for edges in adjacency:
+            for j, w in edges:
+                targets.append(j)
+                weights.append(w)
+            offsets.append(len(targets))
+        return offsets, targets, weights
+
+    # =========================================================================
+    # Public API
+    # =========================================================================
+
+    @property
+    def edges_count(self) -> int:
+        return len(self.targets)
+
+    def destinations(self) -> list[str]:
+        """Доступные цели навигатора: хаб и сервисы."""
+        keys = [HUB_TARGET] if self.hubs else []
+        return keys + sorted(self.services)
+
+    def route(self, from_loc_id: str, target: str) -> tuple[float, list[str]] | None:
+        """
+        Кратчайший маршрут до цели.
+
+        Args:
+            from_loc_id: Текущая локация.
+            target: HUB_TARGET, ID сервиса ("svc_tavern_hub") или ID локации ("52_52").
+
+        Returns:
+            (суммарное time_duration, [loc_id шагов без стартовой]) или None, если цель недостижима.
+        """
+        start = self.index.get(from_loc_id)
+        if start is None:
+            return None
+
+        field = self.distance_field(target)
+        if field is None:
+            return None
+
+        dist, next_hop = field
+        if math.isinf(dist[start]):
+            return None
+
+        # Цепочка next_hop заканчивается на узле цели (у источников next_hop = -1)
+        steps: list[str] = []
+        node = next_hop[start]
+        while node != -1:
+            steps.append(self.ids[node])
+            node = next_hop[node]
+        return dist[start], steps
+
+    def step_times(self, from_loc_id: str, steps: list[str]) -> list[float] | None:
+        """
+        Время каждого перехода маршрута (веса ребер). None — какого-то перехода в графе нет.
+        """
+        times: list[float] = []
+        node = self.index.get(from_loc_id)
+        for step in steps:
+            j = self.index.get(step)
+            if node is None or j is None:
+                return None
+            for k in range(self.offsets[node], self.offsets[node + 1]):
+                if self.targets[k] == j:
+                    times.append(self.weights[k])
+                    break
+            else:
+                return None
+            node = j
+        return times
+
+    def distance_field(self, target: str) -> tuple[array, array] | None:
+        """
+        Поле (dist, next_hop) до цели: dist[v] — время до ближайшего узла цели, next_hop[v] — следующий шаг.
+        Кэшируется (LRU max_fields) — поля хабов/сервисов строятся один раз на граф.
+        """
+        cached = self._fields.get(target)
+        if cached is not None:
+            self._fields.move_to_end(target)
+            return cached
+
+        sources = self._resolve_target(target)
+        if not sources:
+            return None
+
+        field = self._reverse_dijkstra(sources)
+        self._fields[target] = field
+        while len(self._fields) > self.max_fields:
+            self._fields.popitem(last=False)
+        return field
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    def _resolve_target(self, target: str) -> list[int]:
+        if target == HUB_TARGET:
+            return self.hubs
+        if target in self.services:
+            return self.services[target]
+        i = self.index.get(target)
+        return [i] if i is not None else []
+
+    def _reverse_dijkstra(self, sources: list[int]) -> tuple[array, array]:
+        """Мульти-источниковый Дейкстра по обратным ребрам: расстояния ДО множества источников."""
+        n = len(self.ids)
+        dist = array("d", [math.inf]) * n
+        next_hop = array("l", [-1]) * n
+
+        heap: list[tuple[float, int]] = []
+        for s in sources:
+            dist[s] = 0.0
+            heap.append((0.0, s))
+        heapq.heapify(heap)
+
+        r_offsets, r_targets, r_weights = self.r_offsets, self.r_targets, self.r_weights
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            for k in range(r_offsets[u], r_offsets[u + 1]):
+                v = r_targets[k]  # Прямое ребро v -> u
+                nd = d + r_weights[k]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    next_hop[v] = u
+                    heapq.heappush(heap, (nd, v))
+        return dist, next_hop
@@ -1,12 +1,16 @@
 # backend/domains/user_features/exploration/services/exploration_service.py
+import math
 from typing import TYPE_CHECKING
 
 from loguru import logger as log
 
+from src.backend.domains.user_features.exploration.data.config import ExplorationConfig
 from src.backend.domains.user_features.exploration.engine.dispatcher_bridge import ExplorationDispatcherBridge
 from src.backend.domains.user_features.exploration.engine.encounter_engine import EncounterEngine
 from src.backend.domains.user_features.exploration.engine.navigation_engine import NavigationEngine
+from src.backend.domains.user_features.exploration.engine.route_engine import HUB_TARGET
 from src.backend.domains.user_features.exploration.services.exploration_session_service import ExplorationSessionService
+from src.backend.domains.user_features.exploration.services.route_service import RouteService
 from src.shared.enums.domain_enums import CoreDomain
 from src.shared.schemas.exploration import (
     AlertHudDTO,
@@ -28,15 +32,20 @@ class ExplorationService:
     Координирует перемещение, генерацию событий и сборку UI.
     """
 
+    # Короткие направления legacy-клиента -> поле direction выхода
+    _DIRECTIONS = {"n": "north", "s": "south", "w": "west", "e": "east"}
+
     def __init__(
         self,
         session_service: ExplorationSessionService,
         encounter_engine: EncounterEngine,
         dispatcher_bridge: ExplorationDispatcherBridge,
+        route_service: RouteService | None = None,
     ):
         self._session = session_service
         self._encounter_engine = encounter_engine
         self._bridge = dispatcher_bridge
+        self._routes = route_service
 
     # =========================================================================
     # CORE ACTIONS
@@ -48,70 +57,71 @@ class ExplorationService:
         """
         Попытка перемещения.
         Принимает либо direction (n, s, w, e), либо target_id (52_51).
+
+        Валидация выхода, перенос игрока и снимок новой локации — один Lua-вызов (ExplorationSessionService.move_player).
+        Legacy direction переводится в target_id по полю direction выходов текущей локации.
         """
-        current_loc_id = await self._session.get_player_location_id(char_id)
-        loc_data = await self._session.get_location_data(current_loc_id)
-
-        if not loc_data:
-            log.error(f"ExplorationService | loc_not_found char_id={char_id} loc={current_loc_id}")
-            return await self._build_navigation_dto(char_id, current_loc_id, {})
-
-        exits = loc_data.get("exits", {})
-        target_loc_id = None
-
-        # 1. Resolve Target ID
-        if target_id:
-            # Проверяем, есть ли такой выход
-            # Ключ в exits может быть "nav:52_51" или просто "52_51"
-            # Или мы должны искать по target_id внутри ключа
-
-            # Простой поиск по ключу
-            if f"nav:{target_id}" in exits or target_id in exits:
-                target_loc_id = target_id
-            else:
-                # Если не нашли по ключу, ищем по target_id внутри ключа (если ключ сложный)
-                # Но обычно ключ это nav:ID
-                pass
-
-        elif direction:
-            # Legacy: поиск по направлению (если вдруг кто-то вызывает по-старому)
-            # Но мы переходим на target_id
-            # Для совместимости можно оставить логику поиска, но она сложная и ненадежная
-            pass
-
-        if not target_loc_id:
-            # Если не удалось определить цель, остаемся на месте
-            log.warning(f"ExplorationService | invalid_move char_id={char_id} target={target_id} dir={direction}")
-            return await self._build_navigation_dto(char_id, current_loc_id, loc_data)
+        current_loc_id = None
+        if not target_id and direction:
+            current_loc_id = await self._session.get_player_location_id(char_id)
+            target_id = await self._resolve_direction(current_loc_id, direction)
+            if target_id is None:
+                log.warning(f"ExplorationService | invalid_move char_id={char_id} target=None dir={direction}")
+                return await self.look_around(char_id)
+
+        moved = await self._session.move_player(char_id, target_id or None, current_loc_id)
+        if moved is None:
+            return await self.look_around(char_id)
 
-        # 2. Проверка Энкаунтера
-        target_loc_data = await self._session.get_location_data(target_loc_id)
-        if target_loc_data:
-            scouting = await self._session.get_actor_skill(char_id, "survival")
+        loc_id, loc_data = moved["loc_id"], moved["loc_data"]
 
+        if moved["status"] == "location_not_found":
+            log.error(f"ExplorationService | loc_not_found char_id={char_id} loc={loc_id}")
+        elif moved["status"] != "moved":
+            # Если не удалось определить цель, остаемся на месте
+            log.warning(f"ExplorationService | invalid_move char_id={char_id} target={target_id} dir={direction}")
+        elif loc_data:
+            # Проверка Энкаунтера в новой локации
             encounter = await self._encounter_engine.try_generate_encounter(
                 char_id=char_id,
-                location_data=target_loc_data,
-                scouting_skill=scouting,
+                location_data=loc_data,
+                scouting_skill=moved["survival"],
                 trigger="move",
-                loc_id=target_loc_id,
+                loc_id=loc_id,
             )
-
             if encounter:
-                await self._session.move_player(char_id, target_loc_id)
                 return encounter
 
-        await self._session.move_player(char_id, target_loc_id)
-        return await self.look_around(char_id)
+        return self._navigation_dto(loc_id, loc_data, moved["players_count"], moved["battles_count"])
 
-    async def look_around(self, char_id: int) -> WorldNavigationDTO:
+    async def _resolve_direction(self, loc_id: str, direction: str) -> str | None:
         """
-        Обновление данных текущей локации (без движения).
+        Находит выход текущей локации по направлению (n/s/w/e или north/south/west/east).
         """
-        loc_id = await self._session.get_player_location_id(char_id)
+        direction = self._DIRECTIONS.get(direction, direction)
         loc_data = await self._session.get_location_data(loc_id) or {}
+        for key, exit_data in loc_data.get("exits", {}).items():
+            if (
+                isinstance(exit_data, dict)
+                and exit_data.get("type") == "move"
+                and exit_data.get("direction") == direction
+            ):
+                return key.removeprefix("nav:")
+        return None
 
-        return await self._build_navigation_dto(char_id, loc_id, loc_data)
+    async def look_around(self, char_id: int) -> WorldNavigationDTO:
+        """
+        Обновление данных текущей локации (без движения).
+        """
+        snapshot = await self._session.move_player(char_id, None)
+        if snapshot is None:
+            loc_id = await self._session.get_player_location_id(char_id)
+            loc_data = await self._session.get_location_data(loc_id) or {}
+            return await self._build_navigation_dto(char_id, loc_id, loc_data)
+
+        return self._navigation_dto(
+            snapshot["loc_id"], snapshot["loc_data"], snapshot["players_count"], snapshot["battles_count"]
+        )
 
     async def interact(
         self, char_id: int, action: str, target_id: str | None = None
@@ -149,6 +159,13 @@ class ExplorationService:
         if action == "scan_battles":
             return await self._scan_battles(char_id, loc_id, loc_data)
 
+        # --- Auto-Navigator ---
+        if action == "navigator":
+            return await self._navigator_menu(char_id, loc_id, loc_data)
+
+        if action == "navigate" and target_id:
+            return await self._auto_travel(char_id, loc_id, loc_data, target_id)
+
         # Default fallback
         return await self._build_navigation_dto(char_id, loc_id, loc_data)
 
@@ -182,6 +199,96 @@ class ExplorationService:
             back_action="look_around",
         )
 
+    # =========================================================================
+    # LOGIC: Auto-Navigator
+    # =========================================================================
+
+    async def _navigator_menu(
+        self, char_id: int, loc_id: str, loc_data: dict
+    ) -> WorldNavigationDTO | ExplorationListDTO:
+        """
+        Список целей навигатора (хаб, сервисы) с длиной и временем маршрута.
+        """
+        graph = await self._routes.get_graph() if self._routes else None
+        if graph is None:
+            dto = await self._build_navigation_dto(char_id, loc_id, loc_data)
+            dto.hud = AlertHudDTO(message="Навигатор недоступен.", style="info")
+            return dto
+
+        items = []
+        for target in graph.destinations():
+            route = graph.route(loc_id, target)
+            if not route or not route[1]:
+                continue  # Недостижимо или мы уже на месте
+            total_time, steps = route
+            label = "🏛 Хаб" if target == HUB_TARGET else target
+            dest_name = graph.names[graph.index[steps[-1]]]
+            items.append(
+                ListItemDTO(
+                    id=f"route:{target}",
+                    text=f"{label}: {dest_name} — {len(steps)} пер., ~{total_time:.0f} сек.",
+                    action=f"navigate:{target}",
+                )
+            )
+
+        return ExplorationListDTO(title="🧭 Навигатор", items=items, page=1, total_pages=1, back_action="look_around")
+
+    async def _auto_travel(
+        self, char_id: int, loc_id: str, loc_data: dict, target: str
+    ) -> WorldNavigationDTO | EncounterDTO:
+        """
+        Авто-перемещение по маршруту за один запрос.
+        Каждый шаг — обычный move (валидация, энкаунтер), маршрут прерывается на первом энкаунтере.
+
+        За запрос проходится не больше NAVIGATOR_MAX_STEPS переходов и NAVIGATOR_MAX_TRAVEL_TIME секунд пути
+        (сумма time_duration). Пройденное время держится на сервере (WorldManager.start_travel):
+        пока оно не истекло, следующий авто-маршрут не начинается.
+        """
+        graph = await self._routes.get_graph() if self._routes else None
+        route = graph.route(loc_id, target) if graph else None
+        times = graph.step_times(loc_id, route[1]) if graph and route else None
+        if not route or not route[1] or not times or any(not 0 < t < math.inf for t in times):
+            dto = await self._build_navigation_dto(char_id, loc_id, loc_data)
+            dto.hud = AlertHudDTO(message="Маршрут не найден.", style="info")
+            return dto
+
+        # Первый переход проходится всегда, дальше — пока хватает бюджета времени и шагов
+        travel_time = times[0]
+        steps = route[1][:1]
+        for step, step_time in zip(route[1][1 : ExplorationConfig.NAVIGATOR_MAX_STEPS], times[1:], strict=False):
+            if travel_time + step_time > ExplorationConfig.NAVIGATOR_MAX_TRAVEL_TIME:
+                break
+            travel_time += step_time
+            steps.append(step)
+
+        remaining = await self._session.start_travel(char_id, travel_time)
+        if remaining > 0:
+            dto = await self._build_navigation_dto(char_id, loc_id, loc_data)
+            dto.hud = AlertHudDTO(message=f"🧭 Вы еще в пути: {math.ceil(remaining)} с.", style="warning")
+            return dto
+
+        result: WorldNavigationDTO | None = None
+        for passed, step in enumerate(steps, 1):
+            moved = await self.move(char_id, target_id=step)
+            if isinstance(moved, EncounterDTO):
+                log.info(f"ExplorationService | auto_travel_interrupted char_id={char_id} at={step} step={passed}")
+                return moved
+            result = moved
+            if result.loc_id != step:
+                result.hud = AlertHudDTO(message="Маршрут прерван.", style="warning")
+                return result
+
+        if result is None:
+            return await self.look_around(char_id)
+
+        arrived = len(steps) == len(route[1])
+        message = "🧭 Вы прибыли." if arrived else "🧭 Часть пути пройдена, продолжите маршрут."
+        result.hud = AlertHudDTO(message=f"{message} Переходов: {len(steps)}, в пути: {travel_time:g} с.", style="info")
+        log.info(
+            f"ExplorationService | auto_travel char_id={char_id} target={target} steps={len(steps)} time={travel_time}"
+        )
+        return result
+
     # =========================================================================
     # HELPERS: DTO Builder
     # =========================================================================
@@ -192,6 +299,13 @@ class ExplorationService:
         """
         players_count = await self._session.get_players_count_in_location(loc_id, exclude_char_id=char_id)
         battles_count = await self._session.get_active_battles_count(loc_id)
+        return self._navigation_dto(loc_id, loc_data, players_count, battles_count)
+
+    @staticmethod
+    def _navigation_dto(loc_id: str, loc_data: dict, players_count: int, battles_count: int) -> WorldNavigationDTO:
+        """
+        Сборка DTO карты из уже полученных данных локации и счетчиков.
+        """
         flags = loc_data.get("flags", {})
 
         # Используем NavigationEngine для сборки сетки
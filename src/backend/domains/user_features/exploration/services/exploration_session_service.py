@@ -9,6 +9,7 @@ from typing import Any
 
 from loguru import logger as log
 
+from src.backend.database.redis.location_meta_cache import location_meta_cache
 from src.backend.database.redis.manager.account_manager import AccountManager
 from src.backend.database.redis.manager.world_manager import WorldManager
 from src.backend.domains.user_features.exploration.data.config import ExplorationConfig
@@ -59,6 +60,10 @@ class ExplorationSessionService:
         """
         # Путь к скиллу в JSON: $.skills.survival
         val = await self._account_mgr.get_account_field(char_id, f"$.skills.{skill_name}")
+        return self._scale_skill(val)
+
+    @staticmethod
+    def _scale_skill(val: Any) -> int:
         try:
             if val is None:
                 return 0
@@ -84,16 +89,33 @@ class ExplorationSessionService:
         Получает полные данные локации из Redis.
         Парсит JSON-поля (exits, flags, tags).
 
+        Данные статичны и читаются через LocationMetaCache (инвалидация — WorldManager, Pub/Sub).
+        Результат из кэша общий — не мутировать.
+
         Returns:
             dict с ключами: name, description, exits, flags, tags, service, zone_id, terrain
             или None если локация не найдена.
         """
+        version = await self._world_mgr.get_active_version()
+        cached = location_meta_cache.get(version, loc_id)
+        if cached is not None:
+            return cached
+
+        token = location_meta_cache.token()
         raw_data = await self._world_mgr.get_location_meta(loc_id)
         if not raw_data:
             log.warning(f"ExplorationSession | location_not_found loc_id={loc_id}")
             return None
 
-        return self._parse_location_data(loc_id, raw_data)
+        return self._cache_location_data(version, loc_id, raw_data, token)
+
+    def _cache_location_data(
+        self, version: str | None, loc_id: str, raw_data: dict[str, str], token: int
+    ) -> dict[str, Any] | None:
+        loc_data = self._parse_location_data(loc_id, raw_data)
+        if loc_data is not None:
+            location_meta_cache.put(version, loc_id, loc_data, token)
+        return loc_data
 
     async def get_location_exists(self, loc_id: str) -> bool:
         """
@@ -134,50 +156,63 @@ class ExplorationSessionService:
     # WRITING: Movement
     # =========================================================================
 
-    async def move_player(self, char_id: int, to_loc_id: str) -> bool:
+    async def move_player(
+        self, char_id: int, to_loc_id: str | None, current_loc_id: str | None = None
+    ) -> dict[str, Any] | None:
         """
-        Перемещает игрока в новую локацию.
-        Автоматически сохраняет текущую локацию как previous.
-
-        1. Получает текущую локацию
-        2. Удаляет игрока из старой локации (SET)
-        3. Добавляет игрока в новую локацию (SET)
-        4. Обновляет account (current -> previous, new -> current)
+        Перемещает игрока в соседнюю локацию одним Lua-вызовом (WorldManager.move_player).
+        Выход должен быть в exits текущей локации, previous сохраняется автоматически.
+        to_loc_id=None — без перемещения, только снимок текущей локации (look).
+        current_loc_id — уже прочитанная вызывающим текущая локация (иначе читается из аккаунта).
 
         Returns:
-            True если перемещение успешно.
+            dict: status, loc_id, loc_data (распарсенная, {} если нет), players_count (без себя),
+            battles_count, survival (0-100) — для локации, где игрок оказался.
+            None при ошибке Redis.
         """
-        # 1. Получаем текущую локацию
-        current_loc_id = await self.get_player_location_id(char_id)
-
-        # 2. Проверяем существование целевой локации
-        if not await self.get_location_exists(to_loc_id):
-            log.warning(f"ExplorationSession | move_failed reason=target_not_found char_id={char_id} to={to_loc_id}")
-            return False
-
-        # 3. Обновляем SET'ы игроков в локациях
-        if current_loc_id and current_loc_id != ExplorationConfig.DEFAULT_SPAWN_POINT:
-            await self._world_mgr.remove_player_from_location(current_loc_id, char_id)
-
-        await self._world_mgr.add_player_to_location(to_loc_id, char_id)
-
-        # 4. Обновляем account (location.current и location.previous)
-        await self._update_player_location(char_id, current_loc_id, to_loc_id)
+        # Метаданные цели из кэша процесса: скрипт не будет их возвращать
+        version = await self._world_mgr.get_active_version()
+        cached_target = location_meta_cache.get(version, to_loc_id) if to_loc_id else None
+        token = location_meta_cache.token()
+
+        res = await self._world_mgr.move_player(
+            char_id,
+            to_loc_id,
+            ExplorationConfig.DEFAULT_SPAWN_POINT,
+            cached_loc_id=to_loc_id if cached_target is not None else None,
+            current_loc_id=current_loc_id,
+        )
+        if res is None:
+            log.error(f"ExplorationSession | move_failed reason=redis_error char_id={char_id} to={to_loc_id}")
+            return None
 
-        log.info(f"ExplorationSession | move_success char_id={char_id} from={current_loc_id} to={to_loc_id}")
-        return True
+        loc_id = res["loc_id"]
+        if res["status"] == "moved":
+            log.info(f"ExplorationSession | move_success char_id={char_id} from={res['previous_loc_id']} to={loc_id}")
+        elif res["status"] != "look":
+            log.warning(f"ExplorationSession | move_failed reason={res['status']} char_id={char_id} to={to_loc_id}")
+
+        if res["meta"]:
+            loc_data = self._cache_location_data(version, loc_id, res["meta"], token)
+        elif cached_target is not None and loc_id == to_loc_id:
+            loc_data = cached_target
+        else:
+            loc_data = None
+        return {
+            "status": res["status"],
+            "loc_id": loc_id,
+            "loc_data": loc_data or {},
+            "players_count": res["players_count"],
+            "battles_count": res["battles_count"],
+            "survival": self._scale_skill(res["survival"]),
+        }
 
-    async def _update_player_location(self, char_id: int, from_loc: str | None, to_loc: str) -> None:
+    async def start_travel(self, char_id: int, duration: float) -> float:
         """
-        Обновляет location в account.
-        Паттерн аналогичен transition_to_state — сохраняем историю.
+        Начинает авто-перемещение на duration секунд.
+        Возвращает 0.0 или сколько секунд игрок еще в пути после предыдущего маршрута.
         """
-        # Формируем новый объект location
-        new_location = {
-            "current": to_loc,
-            "previous": from_loc,
-        }
-        await self._account_mgr.update_account_fields(char_id, {"location": new_location})
+        return await self._world_mgr.start_travel(char_id, duration)
 
     # =========================================================================
     # HELPERS: Parsing
@@ -0,0 +1,58 @@
+# backend/domains/user_features/exploration/services/route_service.py
+"""
+Сервис авто-навигации (маршруты до хаба и сервисов).
+"""
+
+from typing import ClassVar
+
+from loguru import logger as log
+
+from src.backend.database.redis.manager.world_manager import WorldManager
+from src.backend.domains.user_features.exploration.engine.route_engine import WorldGraph
+
+
+class RouteService:
+    """
+    Держит скомпилированный WorldGraph активной версии карты (process-wide) и отвечает на запросы маршрутов.
+    Граф читается из Redis один раз на версию (снапшот пишет WorldLoaderService при прогреве).
+    """
+
+    # {version: graph} — только актуальная версия
+    _graphs: ClassVar[dict[str, WorldGraph]] = {}
+
+    def __init__(self, world_manager: WorldManager):
+        self._world_mgr = world_manager
+
+    async def get_graph(self) -> WorldGraph | None:
+        """
+        Граф активной версии карты. None — карта загружена без версии (legacy) или снапшота нет.
+        """
+        version = await self._world_mgr.get_active_version()
+        if not version:
+            return None
+
+        graph = RouteService._graphs.get(version)
+        if graph is not None:
+            return graph
+
+        snapshot = await self._world_mgr.get_world_graph(version)
+        if not snapshot:
+            log.warning(f"RouteService | action=load_graph status=not_found version={version}")
+            return None
+
+        graph = WorldGraph(snapshot)
+        RouteService._graphs = {version: graph}
+        log.info(
+            f"RouteService | action=load_graph status=success version={version} "
+            f"nodes={len(graph.ids)} edges={graph.edges_count}"
+        )
+        return graph
+
+    async def get_route(self, from_loc_id: str, target: str) -> tuple[float, list[str]] | None:
+        """
+        Маршрут до цели (см. WorldGraph.route): (время, [шаги]) или None.
+        """
+        graph = await self.get_graph()
+        if graph is None:
+            return None
+        return graph.route(from_loc_id, target)
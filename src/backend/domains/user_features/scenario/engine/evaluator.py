@@ -1,18 +1,95 @@
 # backend/domains/user_features/scenario/engine/evaluator.py
+import ast
 import random
 import re
 import time
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
 from loguru import logger as log
 from simpleeval import SimpleEval
 
+# Регулярное выражение для поиска кубиков (напр., 1d6, 2d10)
+DICE_PATTERN = re.compile(r"(\d+)d(\d+)")
+
+# Имя, под которым бросок кубика подставляется в скомпилированное выражение
+_DICE_NAME = "__dice_{}"
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledInstruction:
+    """
+    Математическая инструкция, разобранная один раз (кэш по исходному тексту).
+
+    Кубики заранее выделены: parts — текст между ними, dice — (count, sides) с ограничениями.
+    inline — кубики стоят отдельными токенами, поэтому выражение разбирается один раз с именами
+    __dice_N вместо чисел; иначе (кубик склеен с именем/числом/строкой) выражение после броска
+    собирается текстом и разбирается заново — как при regex-подстановке.
+    """
+
+    op: str  # "+", "-", "=" или "" (формула целиком)
+    fragment: str  # Выражение без префикса (кубики — именами __dice_N)
+    parts: tuple[str, ...]
+    dice: tuple[tuple[int, int], ...]
+    inline: bool
+
+    def render(self, rolls: tuple[int, ...]) -> str:
+        """Текст инструкции после подстановки бросков (как результат regex-подстановки)."""
+        chunks = [self.parts[0]]
+        for roll, part in zip(rolls, self.parts[1:], strict=True):
+            chunks.append(str(roll))
+            chunks.append(part)
+        return "".join(chunks)
+
+
+@lru_cache(maxsize=4096)
+def parse_expression(expression: str) -> ast.AST:
+    """AST выражения (SimpleEval.parse), process-wide кэш по исходному тексту. Ошибки разбора не кэшируются."""
+    return SimpleEval.parse(expression)
+
+
+@lru_cache(maxsize=4096)
+def compile_instruction(instruction: str) -> CompiledInstruction:
+    """Разбирает инструкцию apply_math: префикс (+, -, =), кубики и шаблон выражения."""
+    parts: list[str] = []
+    dice: list[tuple[int, int]] = []
+    # Кубик внутри строкового литерала regex тоже заменяет — такие инструкции не компилируем
+    inline = "'" not in instruction and '"' not in instruction
+    pos = 0
+    for match in DICE_PATTERN.finditer(instruction):
+        start, end = match.span()
+        parts.append(instruction[pos:start])
+        # Защита от безумных значений
+        dice.append((min(int(match.group(1)), 100), min(int(match.group(2)), 1000)))
+        before = instruction[start - 1 : start]
+        after = instruction[end : end + 1]
+        if any(ch.isalnum() or ch in "_." for ch in before + after):
+            inline = False
+        pos = end
+    parts.append(instruction[pos:])
+
+    # Кубик заменяется числом, поэтому префикс определяется по исходному тексту
+    template = parts[0] + "".join(_DICE_NAME.format(i) + part for i, part in enumerate(parts[1:]))
+    template = template.strip()
+    op = template[0] if template[:1] in ("+", "-", "=") else ""
+    return CompiledInstruction(
+        op=op,
+        fragment=template[1:] if op else template,
+        parts=tuple(parts),
+        dice=tuple(dice),
+        inline=inline,
+    )
+
 
 class ScenarioEvaluator:
     """
     Математический движок.
     Вычисляет условия и применяет изменения к контексту.
     Поддерживает арифметику, кубики (1d6) и операции со списками (push/pop).
+
+    Каждое выражение разбирается один раз (кэш AST и инструкций по исходному тексту, общий на процесс);
+    на вычислении только подставляются переменные. Проверки безопасности — те же, что у SimpleEval.eval.
     """
 
     def __init__(self, seed: int | float | str | None = None):
@@ -30,8 +107,7 @@ class ScenarioEvaluator:
             "has_skill": self._has_skill_func,
         }
 
-        # Регулярное выражение для поиска кубиков (напр., 1d6, 2d10)
-        self.dice_pattern = re.compile(r"(\d+)d(\d+)")
+        self.dice_pattern = DICE_PATTERN
 
     def set_seed(self, seed: int | float | str | None) -> None:
         """Устанавливает зерно для генератора случайных чисел."""
@@ -61,7 +137,7 @@ class ScenarioEvaluator:
         self.s_eval.names = context
         try:
             # Вычисляем логическое значение
-            result = self.s_eval.eval(expression)
+            result = self.s_eval.eval(expression, previously_parsed=parse_expression(expression))
             return bool(result)
         except Exception as e:  # noqa: BLE001
             log.error(f"Evaluator | condition_error expr='{expression}' err='{e}'")
@@ -97,14 +173,15 @@ class ScenarioEvaluator:
                 continue
 
             # 3. Арифметика и формулы (только для строк)
-            # Сначала обрабатываем кубики
-            processed_instr = self._process_dice(instruction)
+            # Инструкция скомпилирована один раз; кубики бросаются до вычисления, слева направо
+            compiled = compile_instruction(instruction)
+            rolls = tuple(self._roll(count, sides) for count, sides in compiled.dice)
 
             # Получаем текущее значение
             current_val = new_context.get(var_name, 0)
 
             # Вычисляем новое значение
-            new_context[var_name] = self._calculate_step(current_val, processed_instr, new_context)
+            new_context[var_name] = self._calculate_step(current_val, compiled, rolls, new_context)
 
             # Обновляем рабочие имена для следующей итерации цикла
             self.s_eval.names = new_context
@@ -132,53 +209,51 @@ class ScenarioEvaluator:
 
         return target_list
 
-    def _calculate_step(self, current_val: Any, instr: str, context: dict[str, Any]) -> Any:
+    def _calculate_step(
+        self, current_val: Any, compiled: CompiledInstruction, rolls: tuple[int, ...], context: dict[str, Any]
+    ) -> Any:
         """
-        Разбирает арифметические префиксы (+, -, =) или выполняет сложную формулу.
+        Применяет арифметический префикс (+, -, =) или выполняет сложную формулу.
         """
-        instr = instr.strip()
-
         try:
+            value = self._evaluate_instruction(compiled, rolls, context)
+
             # Арифметический префикс: Инкремент
-            if instr.startswith("+"):
-                delta = self._evaluate_fragment(instr[1:], context)
-                return current_val + delta
+            if compiled.op == "+":
+                return current_val + value
 
             # Арифметический префикс: Декремент
-            elif instr.startswith("-"):
-                delta = self._evaluate_fragment(instr[1:], context)
-                return current_val - delta
-
-            # Арифметический префикс: Прямое присваивание
-            elif instr.startswith("="):
-                return self._evaluate_fragment(instr[1:], context)
+            elif compiled.op == "-":
+                return current_val - value
 
-            # Если префиксов нет, вычисляем как полноценную формулу
-            return self._evaluate_fragment(instr, context)
+            # Прямое присваивание или формула без префикса
+            return value
 
         except Exception as e:  # noqa: BLE001
+            instr = compiled.render(rolls).strip()
             log.warning(f"Evaluator | math_fallback instr='{instr}' err='{e}'")
             return self._to_numeric(instr)
 
+    def _evaluate_instruction(
+        self, compiled: CompiledInstruction, rolls: tuple[int, ...], context: dict[str, Any]
+    ) -> Any:
+        """Вычисляет выражение инструкции через SimpleEval (по закэшированному AST)."""
+        if not compiled.inline:
+            instr = compiled.render(rolls).strip()
+            return self._evaluate_fragment(instr[1:] if compiled.op else instr, context)
+
+        if rolls:
+            context = {**context, **{_DICE_NAME.format(i): roll for i, roll in enumerate(rolls)}}
+        self.s_eval.names = context
+        return self.s_eval.eval(compiled.fragment, previously_parsed=parse_expression(compiled.fragment))
+
     def _evaluate_fragment(self, fragment: str, context: dict[str, Any]) -> Any:
         """Вычисляет фрагмент строки через SimpleEval."""
         self.s_eval.names = context
         return self.s_eval.eval(fragment)
 
-    def _process_dice(self, text: str) -> str:
-        """
-        Находит все вхождения типа '1d6' и заменяет их на результат броска.
-        """
-
-        def roll_replacer(match):
-            count = int(match.group(1))
-            sides = int(match.group(2))
-            # Защита от безумных значений
-            count = min(count, 100)
-            sides = min(sides, 1000)
-            return str(sum(self._rng.randint(1, sides) for _ in range(count)))
-
-        return self.dice_pattern.sub(roll_replacer, text)
+    def _roll(self, count: int, sides: int) -> int:
+        return sum(self._rng.randint(1, sides) for _ in range(count))
 
     def _to_numeric(self, val: str) -> int | float | str:
         """Приводит строку к числу, если это возможно."""
@@ -1,5 +1,4 @@
 # backend/domains/user_features/scenario/service/session_service.py
-import json
 import uuid
 from typing import Any
 
@@ -112,24 +111,20 @@ class ScenarioSessionService:
         return await self.repo.get_master(quest_key)
 
     async def get_nodes_by_pool(self, quest_key: str, pool_tag: str) -> list[dict[str, Any]]:
-        """Получает ноды по тегу."""
-        if not await self._ensure_static_cache(quest_key):
-            return await self.repo.get_nodes_by_pool(quest_key, pool_tag)
-
-        all_data = await self.sm.get_all_cached_data(quest_key)
-        candidates = []
-        if all_data:
-            for k, v in all_data.items():
-                if not k.startswith("node:"):
-                    continue
-                try:
-                    node_data = json.loads(v)
-                    tags = node_data.get("tags")
-                    if tags and isinstance(tags, list) and pool_tag in tags:
-                        candidates.append(node_data)
-                except (json.JSONDecodeError, TypeError):
-                    continue
-        return candidates
+        """Получает ноды по тегу (индекс пулов в кэше -> DB)."""
+        # 1. Cache (индекс пула)
+        nodes = await self.sm.get_cached_pool_nodes(quest_key, pool_tag)
+        if nodes is not None:
+            return nodes
+
+        # 2. Ensure Cache & Retry (кэш без индекса пулов — из старой версии — отдаст None до истечения TTL)
+        if await self._ensure_static_cache(quest_key):
+            nodes = await self.sm.get_cached_pool_nodes(quest_key, pool_tag)
+            if nodes is not None:
+                return nodes
+
+        # 3. DB Direct (Fallback)
+        return await self.repo.get_nodes_by_pool(quest_key, pool_tag)
 
     async def _ensure_static_cache(self, quest_key: str) -> bool:
         """Загружает квест из БД в Redis."""
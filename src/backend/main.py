@@ -1,18 +1,24 @@
 # backend/main.py
+import asyncio
+import contextlib
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from typing import Any
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from loguru import logger
 
 from src.backend.core.config import settings
 from src.backend.core.database import async_engine, get_session_context, run_alembic_migrations
 from src.backend.core.exceptions import BaseAPIException, api_exception_handler
+from src.backend.database.redis.location_meta_cache import location_meta_cache
+from src.backend.database.redis.redis_metrics import redis_metrics
+from src.backend.database.redis.redis_scripts import script_registry
 from src.backend.domains.user_features.scenario.resources.loaders.scenario_loader import ScenarioLoader
 from src.backend.router import api_router, tags_metadata
+from src.shared.core.client import get_redis_client
 from src.shared.core.logger import setup_logging
 from src.shared.schemas.errors import ErrorResponse
 
@@ -44,8 +50,36 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:  # noqa: BLE001
         logger.error(f"Failed to load scenarios on startup: {e}")
 
+    redis_metrics.enabled = settings.redis_metrics_enabled
+
+    # --- REDIS LUA SCRIPTS ---
+    # Загружаем один раз, менеджеры дальше вызывают только EVALSHA
+    try:
+        redis_client = await get_redis_client(settings)
+        await script_registry.load_all(redis_client)
+        await redis_client.aclose()
+    except Exception as e:  # noqa: BLE001
+        logger.error(f"Failed to preload Redis scripts on startup: {e}")
+
+    # --- LOCATION META CACHE ---
+    # Слушатель инвалидации; без подписки кэш локаций выключен
+    cache_client = None
+    cache_listener: asyncio.Task | None = None
+    try:
+        cache_client = await get_redis_client(settings)
+        cache_listener = asyncio.create_task(location_meta_cache.listen(cache_client))
+    except Exception as e:  # noqa: BLE001
+        logger.error(f"Failed to start location cache listener: {e}")
+
     yield
 
+    if cache_listener:
+        cache_listener.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await cache_listener
+    if cache_client:
+        await cache_client.aclose()
+
     logger.info("🛑 Server shutting down... Closing DB connections...")
     await async_engine.dispose()
     logger.info("👋 Bye!")
@@ -130,6 +164,12 @@ async def health_check() -> dict[str, str]:
     return {"status": "ok", "app": settings.project_name}
 
 
+@app.get("/metrics", tags=["System"], response_class=PlainTextResponse)
+async def metrics() -> str:
+    """Метрики RedisService в формате Prometheus (пусто, если REDIS_METRICS_ENABLED=False)."""
+    return redis_metrics.render_prometheus()
+
+
 @app.get("/", tags=["System"])
 async def root() -> dict[str, str]:
     if settings.debug:
@@ -30,6 +30,8 @@ Return ONLY the JSON object.""",
         "temperature": 0.9,
         "max_tokens": 256,
         "model_alias": "fast",
+        # Живой диалог: одинаковая реплика игрока не должна получать один и тот же ответ
+        "cache": False,
     },
     "batch_location_desc": {
         "system_instruction": """ROLE: Narrative Designer for 'Echo of Ancients' (Post-Apocalyptic Techno-Fantasy RPG).
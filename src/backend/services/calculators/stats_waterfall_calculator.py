@@ -1,10 +1,43 @@
+import re
+from functools import lru_cache
 from typing import Any
 
+import numpy as np
 from loguru import logger
 from simpleeval import simple_eval
 
 from src.backend.services.calculators.data.stats_formulas import MODIFIER_RULES
 
+# Числовой литерал, который simpleeval разберет так же, как int()/float().
+# Все, что не проходит (пустые значения, "--5", "inf", выражения), уходит в медленный путь через simpleeval.
+_NUMBER_RE = re.compile(r"[+-]?(?:0|[1-9]\d*)(?:\.\d*)?(?:[eE][+-]?\d+)?|[+-]?\.\d+(?:[eE][+-]?\d+)?")
+
+
+@lru_cache(maxsize=4096)
+def _parse_command(cmd: str) -> tuple[str, int | float] | None:
+    """
+    Разбирает одну команду источника ("+10", "-2.5", "*1.1", "=0", "10") в (оператор, число).
+    Результат кэшируется: одни и те же строки источников повторяются у всех акторов.
+
+    Returns:
+        ("+" | "*" | "=", число) или None, если команда не является простым числом (нужен simpleeval).
+    """
+    operator = cmd[0]
+    if operator in "+-*=":
+        val_str = cmd[1:]
+    else:
+        # Число без оператора считается как flat
+        operator, val_str = "+", cmd
+
+    if not _NUMBER_RE.fullmatch(val_str):
+        return None
+
+    # Как в Python-литерале: без точки и экспоненты — int (точная сумма), иначе float
+    value: int | float = float(val_str) if any(c in val_str for c in ".eE") else int(val_str)
+    if operator == "-":
+        return "+", -value
+    return operator, value
+
 
 class StatsWaterfallCalculator:
     """
@@ -22,6 +55,9 @@ class StatsWaterfallCalculator:
     # Кеш для трансформированных правил (Source -> [Target, Factor])
     _SOURCE_TO_TARGET_RULES: dict[str, list[dict[str, Any]]] = {}
 
+    # Кеш матрицы моста для батчевого расчета: (атрибуты, модификаторы, factors[attr x mod])
+    _BRIDGE_MATRIX: tuple[list[str], list[str], np.ndarray] | None = None
+
     @classmethod
     def _get_rules(cls) -> dict[str, list[dict[str, Any]]]:
         """
@@ -37,21 +73,39 @@ class StatsWaterfallCalculator:
             cls._SOURCE_TO_TARGET_RULES = transformed
         return cls._SOURCE_TO_TARGET_RULES
 
+    @classmethod
+    def _get_bridge_matrix(cls) -> tuple[list[str], list[str], np.ndarray]:
+        """
+        MODIFIER_RULES в виде матрицы factors[attribute, modifier] (для батчевого моста A @ R).
+        """
+        if cls._BRIDGE_MATRIX is None:
+            mod_keys = [str(getattr(k, "value", k)) for k in MODIFIER_RULES]
+            attr_keys = sorted({str(getattr(a, "value", a)) for sources in MODIFIER_RULES.values() for a in sources})
+            attr_index = {a: i for i, a in enumerate(attr_keys)}
+
+            matrix = np.zeros((len(attr_keys), len(mod_keys)), dtype=np.float64)
+            for j, sources in enumerate(MODIFIER_RULES.values()):
+                for source_attr, factor in sources.items():
+                    matrix[attr_index[str(getattr(source_attr, "value", source_attr))], j] = factor
+            cls._BRIDGE_MATRIX = (attr_keys, mod_keys, matrix)
+        return cls._BRIDGE_MATRIX
+
     @staticmethod
-    def calculate_waterfall(raw_data: dict[str, Any]) -> tuple[dict[str, float], dict[str, str]]:
+    def calculate_waterfall(raw_data: dict[str, Any], explain: bool = True) -> tuple[dict[str, float], dict[str, str]]:
         """
         Полный цикл расчета характеристик.
 
         Args:
             raw_data: Структура v:raw (attributes, modifiers).
                       Каждый стат имеет структуру: {"base": X, "source": {...}, "temp": {...}}
+            explain: Собирать ли строки формул (v:explanation). Без них расчет идет по числовому пути.
 
         Returns:
-            Tuple: (v:cache (values), v:explanation (formulas))
+            Tuple: (v:cache (values), v:explanation (formulas); пустой dict при explain=False)
         """
         # 1. Расчет Атрибутов (Primary Stats)
         raw_attributes = raw_data.get("attributes", {})
-        final_attributes, attr_explanations = StatsWaterfallCalculator._calculate_attributes(raw_attributes)
+        final_attributes, attr_explanations = StatsWaterfallCalculator._calculate_attributes(raw_attributes, explain)
 
         # 2. Конвертация (Derivation Bridge)
         derived_bonuses = StatsWaterfallCalculator._derive_bonuses(final_attributes)
@@ -59,7 +113,7 @@ class StatsWaterfallCalculator:
         # 3. Расчет Модификаторов (Secondary Stats)
         raw_modifiers = raw_data.get("modifiers", {})
         final_modifiers, mod_explanations = StatsWaterfallCalculator._calculate_modifiers(
-            raw_modifiers, derived_bonuses
+            raw_modifiers, derived_bonuses, explain
         )
 
         # Объединяем все в плоские словари
@@ -69,7 +123,125 @@ class StatsWaterfallCalculator:
         return cache_result, explanation_result
 
     @staticmethod
-    def evaluate_sources(sources: dict[str, Any] | list[str] | None, base_value: float = 0.0) -> tuple[float, str]:
+    def calculate_waterfall_many(raw_list: list[dict[str, Any]]) -> list[dict[str, float] | None]:
+        """
+        Батчевый расчет v:cache для ростера (без explanation).
+
+        Атрибуты считаются числовым путем по каждому актору и пакуются в матрицу A[actor, attribute].
+        Мост MODIFIER_RULES применяется одним матричным умножением A @ R, модификаторы собираются
+        из массивов Flat/Mult/Override: (Derived * !Override + Flat) * Mult.
+
+        Значения совпадают с calculate_waterfall после округления до 4 знаков (порядок сложения
+        внутри моста другой). Для актора с нечисловыми командами возвращается None — его нужно
+        считать через calculate_waterfall.
+        """
+        attr_keys, bridge_mod_keys, bridge = StatsWaterfallCalculator._get_bridge_matrix()
+        attr_index = {a: i for i, a in enumerate(attr_keys)}
+        n = len(raw_list)
+
+        # 1. Атрибуты (скалярно, числовой путь) -> матрица A
+        attributes_list: list[dict[str, float]] = []
+        attr_matrix = np.zeros((n, len(attr_keys)), dtype=np.float64)
+        for i, raw_data in enumerate(raw_list):
+            attributes, _ = StatsWaterfallCalculator._calculate_attributes(raw_data.get("attributes", {}), False)
+            attributes_list.append(attributes)
+            for name, value in attributes.items():
+                col = attr_index.get(str(name))
+                if col is not None:
+                    attr_matrix[i, col] = value
+
+        # 2. Мост: A @ R (+ маска "есть ненулевой бонус" — как фильтр bonus_val != 0 в скалярном пути)
+        derived = attr_matrix @ bridge
+        derived_mask = ((attr_matrix != 0).astype(np.float64) @ (bridge != 0).astype(np.float64)) > 0
+
+        # 3. Модификаторы: пакуем Flat / Mult / Override по всем ключам ростера
+        mod_keys = list(bridge_mod_keys)
+        mod_index = {m: j for j, m in enumerate(mod_keys)}
+        for raw_data in raw_list:
+            for name in raw_data.get("modifiers", {}):
+                if str(name) not in mod_index:
+                    mod_index[str(name)] = len(mod_keys)
+                    mod_keys.append(str(name))
+
+        flats = np.zeros((n, len(mod_keys)), dtype=np.float64)
+        mults = np.ones((n, len(mod_keys)), dtype=np.float64)
+        overrides = np.zeros((n, len(mod_keys)), dtype=bool)
+        present = np.zeros((n, len(mod_keys)), dtype=bool)
+        present[:, : len(bridge_mod_keys)] = derived_mask
+
+        fallback: set[int] = set()
+        for i, raw_data in enumerate(raw_list):
+            for name, data in raw_data.get("modifiers", {}).items():
+                folded = StatsWaterfallCalculator._fold_commands(StatsWaterfallCalculator._collect_commands(data))
+                if folded is None:
+                    fallback.add(i)
+                    break
+                j = mod_index[str(name)]
+                flats[i, j], mults[i, j], overrides[i, j] = folded
+                present[i, j] = True
+
+        full_derived = np.zeros((n, len(mod_keys)), dtype=np.float64)
+        full_derived[:, : len(bridge_mod_keys)] = derived
+        values = (np.where(overrides, 0.0, full_derived) + flats) * mults
+
+        # 4. Распаковка (round — питоновский, как в скалярном пути)
+        results: list[dict[str, float] | None] = []
+        for i in range(n):
+            if i in fallback:
+                results.append(None)
+                continue
+            row = values[i].tolist()
+            modifiers = {mod_keys[j]: round(row[j], 4) for j in np.flatnonzero(present[i]).tolist()}
+            results.append({**attributes_list[i], **modifiers})
+
+        return results
+
+    @staticmethod
+    def _collect_commands(data: dict[str, Any]) -> list[Any]:
+        """Команды raw-модификатора в порядке скалярного пути: Base, Source, Temp."""
+        commands: list[Any] = []
+        base_raw = data.get("base", 0.0)
+        if base_raw:
+            commands.append(f"+{base_raw}")
+        commands.extend((data.get("source") or {}).values())
+        commands.extend((data.get("temp") or {}).values())
+        return commands
+
+    @staticmethod
+    def _fold_commands(commands: list[Any]) -> tuple[float, float, bool] | None:
+        """
+        Сворачивает команды в (Sum(Flats), Product(Mults), был ли Override).
+        None — есть нечисловая команда (нужен simpleeval).
+        """
+        flat: int | float = 0
+        mult: int | float = 1
+        override = False
+
+        for cmd in commands:
+            if not cmd:
+                continue
+            cmd = str(cmd).strip()
+            if not cmd:
+                continue
+
+            parsed = _parse_command(cmd)
+            if parsed is None:
+                return None
+
+            operator, value = parsed
+            if operator == "=":
+                flat, mult, override = value, 1, True
+            elif operator == "*":
+                mult = mult * value
+            else:
+                flat = flat + value
+
+        return float(flat), float(mult), override
+
+    @staticmethod
+    def evaluate_sources(
+        sources: dict[str, Any] | list[str] | None, base_value: float = 0.0, explain: bool = True
+    ) -> tuple[float, str]:
         """
         Публичный метод для расчета значения из набора источников.
         Может использоваться для HP, Energy, XP и любых других ресурсов.
@@ -77,6 +249,7 @@ class StatsWaterfallCalculator:
         Args:
             sources: Словарь {source_id: value_str} или список строк ["+10", "*1.1"].
             base_value: Базовое значение (если есть).
+            explain: Собирать ли строку формулы (иначе вернется пустая строка).
 
         Returns:
             (final_value, formula_string)
@@ -91,10 +264,12 @@ class StatsWaterfallCalculator:
         elif isinstance(sources, list):
             commands = [str(v) for v in sources]
 
-        return StatsWaterfallCalculator._evaluate_pipeline(commands, base_value)
+        return StatsWaterfallCalculator._evaluate_pipeline(commands, base_value, explain)
 
     @staticmethod
-    def _calculate_attributes(raw_attributes: dict[str, Any]) -> tuple[dict[str, float], dict[str, str]]:
+    def _calculate_attributes(
+        raw_attributes: dict[str, Any], explain: bool = True
+    ) -> tuple[dict[str, float], dict[str, str]]:
         """
         Фаза 1: Расчет атрибутов.
         """
@@ -120,10 +295,11 @@ class StatsWaterfallCalculator:
                 sources_list.extend(temp_dict.values())
 
             # Расчет
-            val, expr = StatsWaterfallCalculator.evaluate_sources(sources_list, base)
+            val, expr = StatsWaterfallCalculator.evaluate_sources(sources_list, base, explain)
 
             results[attr_name] = val
-            explanations[attr_name] = expr
+            if explain:
+                explanations[attr_name] = expr
 
         return results, explanations
 
@@ -153,7 +329,7 @@ class StatsWaterfallCalculator:
 
     @staticmethod
     def _calculate_modifiers(
-        raw_modifiers: dict[str, Any], derived_bonuses: dict[str, list[str]]
+        raw_modifiers: dict[str, Any], derived_bonuses: dict[str, list[str]], explain: bool = True
     ) -> tuple[dict[str, float], dict[str, str]]:
         """
         Фаза 3: Расчет модификаторов.
@@ -194,17 +370,68 @@ class StatsWaterfallCalculator:
 
             # 3. Расчет
             # base_value=0.0, так как база уже внутри sources_list (Derived или Base из raw)
-            val, expr = StatsWaterfallCalculator.evaluate_sources(sources_list, 0.0)
+            val, expr = StatsWaterfallCalculator.evaluate_sources(sources_list, 0.0, explain)
 
             results_values[mod_name] = val
-            results_explanations[mod_name] = expr
+            if explain:
+                results_explanations[mod_name] = expr
 
         return results_values, results_explanations
 
     @staticmethod
-    def _evaluate_pipeline(commands: list[str], base_value: float = 0.0) -> tuple[float, str]:
+    def _evaluate_pipeline(commands: list[str], base_value: float = 0.0, explain: bool = True) -> tuple[float, str]:
         """
-        Вычисляет значение, собирая строковую формулу и выполняя её через simpleeval.
+        Вычисляет значение пайплайна команд: (Sum(Flats)) * Product(Multipliers).
+
+        Числовой путь: команды разбираются в числа (с кэшем) и считаются в том же порядке операций,
+        что и строковая формула в simpleeval, поэтому результат совпадает бит-в-бит.
+        Строка формулы собирается только при explain=True; нечисловые команды уходят в simpleeval.
+        """
+        flats: list[int | float] = [base_value] if base_value != 0 else []
+        mults: list[int | float] = []
+
+        for cmd in commands:
+            if not cmd:
+                continue
+
+            # Очистка от пробелов
+            cmd = str(cmd).strip()
+            if not cmd:
+                continue
+
+            parsed = _parse_command(cmd)
+            if parsed is None:
+                # Выражение/мусор -> строковый путь (точная семантика simpleeval, включая ошибки)
+                return StatsWaterfallCalculator._evaluate_expression(commands, base_value)
+
+            operator, value = parsed
+            if operator == "=":
+                # Override полностью сбрасывает базу и мультипликаторы (обычно override это финал)
+                flats = [value]
+                mults = []
+            elif operator == "*":
+                mults.append(value)
+            else:
+                flats.append(value)
+
+        # Тот же порядок операций, что и в "(a + b + c) * m1 * m2"
+        result: int | float = 0
+        if flats:
+            result = flats[0]
+            for value in flats[1:]:
+                result = result + value
+        for value in mults:
+            result = result * value
+        final_value = round(float(result), 4)
+
+        if not explain:
+            return final_value, ""
+        return final_value, StatsWaterfallCalculator._evaluate_expression(commands, base_value, evaluate=False)[1]
+
+    @staticmethod
+    def _evaluate_expression(commands: list[str], base_value: float = 0.0, evaluate: bool = True) -> tuple[float, str]:
+        """
+        Строковый путь: собирает формулу (Explanation) и при evaluate=True выполняет её через simpleeval.
         """
         flats = [str(base_value)] if base_value != 0 else []
         mults: list[str] = []
@@ -251,6 +478,9 @@ class StatsWaterfallCalculator:
         mult_expr = f" * {' * '.join(mults)}" if mults else ""
         full_expression = f"{base_expr}{mult_expr}"
 
+        if not evaluate:
+            return 0.0, full_expression
+
         # 2. Вычисление ЧИСЛА (Cache) через SimpleEval
         try:
             raw_result = simple_eval(full_expression)
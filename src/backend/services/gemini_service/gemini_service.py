@@ -1,3 +1,5 @@
+import json
+from collections.abc import Callable
 from typing import Any
 
 from apps.common.core.settings import settings
@@ -13,6 +15,7 @@ from src.backend.services.gemini_service.gemini_service_build import (
 from src.backend.services.gemini_service.gemini_service_build import (
     build_simple_gemini,
 )
+from src.backend.services.gemini_service.response_cache import LLMResponseCache
 
 # 🔥 FIX 1: Точные названия моделей. SDK требует полные ID.
 GEMINI_MODEL_ALIASES = {
@@ -32,23 +35,31 @@ else:
         log.exception(f"GeminiClient | status=failed reason='Initialization error' error='{e}'")
 
 
-async def gemini_answer(mode: ChatMode, user_text: str, **kw: Any) -> str:
+def is_json_object_response(text: str) -> bool:
+    """Ответ — JSON-объект (допускаются ```json-ограждения). Обрезанный/битый JSON не проходит."""
+    clean = text.replace("```json", "").replace("```", "").strip()
+    try:
+        return isinstance(json.loads(clean), dict)
+    except ValueError:
+        return False
+
+
+async def gemini_answer(
+    mode: ChatMode, user_text: str, *, validate: Callable[[str], bool] | None = None, **kw: Any
+) -> str:
     """
     Генерирует ответ с помощью модели Gemini, используя заданный режим и текст пользователя.
 
     Args:
         mode: Режим чата, определяющий пресет настроек и функцию-сборщик промпта.
         user_text: Основной текст пользователя, который будет включен в промпт.
+        validate: Проверка ответа вызывающим (например, is_json_object_response). В кэш пишутся только
+            прошедшие ее ответы, а не прошедшая запись из кэша удаляется и запрос уходит в API.
         **kw: Дополнительные параметры (temperature, max_tokens, model_alias).
 
     Returns:
         Сгенерированный текстовый ответ.
     """
-    if not _client:
-        error_msg = "GeminiAnswer | status=failed reason='Client not initialized'"
-        log.error(error_msg)
-        return f"Ошибка: {error_msg}"
-
     preset = MODE_PRESETS.get(mode)
     if not preset:
         error_msg = f"GeminiAnswer | status=failed reason='Preset not found' mode='{mode}'"
@@ -66,6 +77,30 @@ async def gemini_answer(mode: ChatMode, user_text: str, **kw: Any) -> str:
     model_name = GEMINI_MODEL_ALIASES.get(model_alias, DEFAULT_MODEL_NAME)
     model_name = kw.get("model", model_name)
 
+    # Кэш ответов: одинаковый собранный промпт с теми же параметрами не уходит в API повторно
+    cache = LLMResponseCache.get()
+    use_cache = cache.enabled and preset.get("cache", True)
+    cache_key = ""
+    if use_cache:
+        cache_key = LLMResponseCache.make_key(mode, model_name, contents, system_instruction, temperature, max_tokens)
+        cached = await cache.lookup(cache_key)
+        if cached is not None and validate is not None and not validate(cached):
+            log.warning(f"GeminiAnswer | status=cache_invalid mode='{mode}' key={cache_key[:12]}")
+            await cache.invalidate(cache_key)
+            cached = None
+        if cached is not None:
+            log.info(f"GeminiAnswer | status=cache_hit mode='{mode}' key={cache_key[:12]}")
+            return cached
+        if cache.replay:
+            error_msg = f"GeminiAnswer | status=failed reason='Replay cache miss' mode='{mode}' key={cache_key[:12]}"
+            log.error(error_msg)
+            return f"Ошибка: {error_msg}"
+
+    if not _client:
+        error_msg = "GeminiAnswer | status=failed reason='Client not initialized'"
+        log.error(error_msg)
+        return f"Ошибка: {error_msg}"
+
     config = types.GenerateContentConfig(
         temperature=temperature, max_output_tokens=max_tokens, system_instruction=system_instruction
     )
@@ -74,6 +109,8 @@ async def gemini_answer(mode: ChatMode, user_text: str, **kw: Any) -> str:
         resp = await _client.aio.models.generate_content(model=model_name, contents=contents, config=config)
         response_text = resp.text.strip() if resp.text else ""
         log.info(f"GeminiAnswer | status=success mode='{mode}' response_length={len(response_text)}")
+        if use_cache and response_text and (validate is None or validate(response_text)):
+            await cache.store(cache_key, response_text, mode=mode, model=model_name)
         return response_text
 
     except errors.ClientError as e:
@@ -0,0 +1,179 @@
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, ClassVar, Literal
+
+from loguru import logger as log
+
+from src.backend.core.config import settings
+from src.shared.core.config import ROOT_DIR
+
+CacheMode = Literal["on", "replay", "off"]
+
+DEFAULT_CACHE_DIR = ROOT_DIR / ".cache" / "llm_responses"
+
+# Версия формата ключа/записи: поднять, если меняется состав ключа
+CACHE_FORMAT_VERSION = 1
+
+
+class LLMResponseCache:
+    """
+    Контентно-адресуемый кэш ответов LLM на диске.
+
+    Ключ — sha256 от (mode, model, contents, system_instruction, temperature, max_tokens): одинаковый
+    собранный промпт с одинаковыми параметрами дает тот же ответ без запроса к API
+    (повторный сидинг, перегенерация чанка после ошибки БД).
+
+    Запись — JSON-файл `{key[:2]}/{key}.json`. TTL (от записи) проверяется при чтении; размер ограничивается
+    периодической чисткой: сначала записи, не использованные дольше TTL, затем самые давно использованные (mtime).
+
+    Режим replay отдает только кэш (TTL не учитывается): генерация мира без сети, в том числе в тестах.
+    """
+
+    _instance: ClassVar["LLMResponseCache | None"] = None
+
+    # Чистка раз в N записей (и при первой записи процесса)
+    PRUNE_EVERY = 256
+
+    def __init__(
+        self,
+        cache_dir: Path | None = None,
+        mode: CacheMode = "on",
+        ttl_sec: float = 30 * 86400,
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.mode = mode
+        self.ttl_sec = ttl_sec
+        self.max_bytes = max_bytes
+        self._writes = 0
+
+    @classmethod
+    def get(cls) -> "LLMResponseCache":
+        """Кэш процесса с параметрами из настроек (LLM_CACHE_MODE / LLM_CACHE_TTL_DAYS / LLM_CACHE_MAX_MB)."""
+        if cls._instance is None:
+            cls._instance = cls(
+                mode=settings.llm_cache_mode,
+                ttl_sec=settings.llm_cache_ttl_days * 86400,
+                max_bytes=settings.llm_cache_max_mb * 1024 * 1024,
+            )
+        return cls._instance
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    @property
+    def replay(self) -> bool:
+        return self.mode == "replay"
+
+    @staticmethod
+    def make_key(
+        mode: str, model: str, contents: Any, system_instruction: str, temperature: float, max_tokens: int
+    ) -> str:
+        payload = {
+            "v": CACHE_FORMAT_VERSION,
+            "mode": mode,
+            "model": model,
+            "contents": contents,
+            "system_instruction": system_instruction,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+        raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode()
+        return hashlib.sha256(raw).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    # =========================================================================
+    # Public API
+    # =========================================================================
+
+    async def lookup(self, key: str) -> str | None:
+        if not self.enabled:
+            return None
+        return await asyncio.to_thread(self._read, key)
+
+    async def store(self, key: str, response: str, mode: str, model: str) -> None:
+        if self.mode != "on":
+            return
+        entry = {"created_at": time.time(), "mode": mode, "model": model, "response": response}
+        await asyncio.to_thread(self._write, key, entry)
+
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 1:
+            await asyncio.to_thread(self.prune)
+
+    async def invalidate(self, key: str) -> None:
+        """Удаляет запись (ответ не прошел проверку вызывающего). В replay записи не трогаются."""
+        if self.mode != "on":
+            return
+        await asyncio.to_thread(self._path(key).unlink, True)
+
+    # =========================================================================
+    # Disk IO (в потоке)
+    # =========================================================================
+
+    def _read(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            log.warning(f"LLMCache | action=read status=corrupted key={key[:12]} error='{e}'")
+            path.unlink(missing_ok=True)
+            return None
+
+        if not self.replay and time.time() - entry.get("created_at", 0) > self.ttl_sec:
+            path.unlink(missing_ok=True)
+            return None
+
+        # mtime — время последнего использования: по нему вытесняются записи при превышении размера
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return entry.get("response")
+
+    def _write(self, key: str, entry: dict) -> None:
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+            tmp_path.replace(path)
+        except OSError as e:
+            # Кэш — оптимизация: ошибка записи не влияет на ответ
+            log.warning(f"LLMCache | action=write status=failed key={key[:12]} error='{e}'")
+
+    def prune(self) -> int:
+        """Удаляет просроченные записи и самые давно использованные сверх max_bytes. Возвращает число удаленных."""
+        now = time.time()
+        entries: list[tuple[float, int, Path]] = []
+        removed = 0
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+                if now - stat.st_mtime > self.ttl_sec:
+                    path.unlink()
+                    removed += 1
+                    continue
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+
+        if removed:
+            log.info(f"LLMCache | action=prune removed={removed} size_bytes={total}")
+        return removed
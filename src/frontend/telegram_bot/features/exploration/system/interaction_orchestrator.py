@@ -166,6 +166,7 @@ class InteractionOrchestrator(BaseBotOrchestrator):
         """Маппинг типа элемента на action для interact."""
         mapping = {
             "battle": "spectate",
+            "route": "navigate",
             "char": "inspect",
             "npc": "talk",
         }
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from src.backend.database.redis.location_meta_cache import INVALIDATE_ALL, LocationMetaCache
+from src.backend.database.redis.redis_key import RedisKeys as Rk
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+def _enabled_cache() -> LocationMetaCache:
+    cache = LocationMetaCache(max_entries=2)
+    cache.enabled = True
+    return cache
+
+
+async def _wait_for(predicate, timeout: float = 2.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+def test_disabled_without_subscription():
+    cache = LocationMetaCache()
+    cache.put("v1", "0_0", {"name": "A"}, cache.token())
+
+    assert cache.get("v1", "0_0") is None
+    assert cache.stats() == {"hits": 0, "misses": 0, "size": 0}
+
+
+def test_stale_put_after_invalidate_is_ignored():
+    cache = _enabled_cache()
+
+    # Чтение из Redis началось до записи генератора: токен взят до invalidate
+    token = cache.token()
+    cache.invalidate("0_0")
+    cache.put("v1", "0_0", {"name": "old"}, token)
+    assert cache.get("v1", "0_0") is None
+
+    cache.put("v1", "0_0", {"name": "new"}, cache.token())
+    assert cache.get("v1", "0_0") == {"name": "new"}
+
+
+def test_invalidate_drops_all_versions_and_lru_evicts():
+    cache = _enabled_cache()
+    cache.put("v1", "0_0", {"name": "A"}, cache.token())
+    cache.put("v2", "0_0", {"name": "A2"}, cache.token())
+
+    cache.invalidate("0_0")
+    assert cache.stats()["size"] == 0
+
+    for loc_id in ("0_0", "1_0", "2_0"):
+        cache.put("v1", loc_id, {"name": loc_id}, cache.token())
+    assert cache.get("v1", "0_0") is None
+    assert cache.get("v1", "2_0") == {"name": "2_0"}
+
+
+async def test_listener_invalidates_on_message_and_disables_on_stop():
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    cache = LocationMetaCache()
+    listener = asyncio.create_task(cache.listen(client))
+    try:
+        await _wait_for(lambda: cache.enabled)
+        cache.put("v1", "0_0", {"name": "A"}, cache.token())
+        cache.put("v1", "1_0", {"name": "B"}, cache.token())
+
+        await client.publish(Rk.get_world_location_invalidate_channel(), "0_0")
+        await _wait_for(lambda: cache.get("v1", "0_0") is None)
+        assert cache.get("v1", "1_0") == {"name": "B"}
+
+        await client.publish(Rk.get_world_location_invalidate_channel(), INVALIDATE_ALL)
+        await _wait_for(lambda: cache.stats()["size"] == 0)
+    finally:
+        listener.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await listener
+
+    # Без подписки кэш выключен и пуст
+    assert not cache.enabled
+    cache.put("v1", "0_0", {"name": "A"}, cache.token())
+    assert cache.get("v1", "0_0") is None
@@ -0,0 +1,58 @@
+import pytest
+
+from src.backend.database.redis.redis_metrics import redis_metrics
+from src.backend.database.redis.redis_scripts import script_registry
+from src.backend.database.redis.redis_service import RedisService
+
+fakeredis = pytest.importorskip("fakeredis")
+
+_INCR_SCRIPT = script_registry.register("tests.metrics_incr", "return redis.call('INCR', KEYS[1])")
+
+
+class CombatManager:
+    """Менеджер-заглушка: метка компонента берется из имени класса вызывающего."""
+
+    def __init__(self, redis_service: RedisService):
+        self.redis_service = redis_service
+
+    async def tick(self) -> None:
+        await self.redis_service.set_value("combat:k", "v")
+        await self.redis_service.get_value("combat:k")
+        await self.redis_service.run_script(_INCR_SCRIPT, keys=["combat:n"], args=[])
+        await self.redis_service.execute_pipeline(lambda pipe: [pipe.set(f"combat:p{i}", i) for i in range(3)])
+        # WRONGTYPE: RedisService проглатывает ошибку и возвращает None
+        assert await self.redis_service.get_all_hash("combat:k") is None
+
+
+@pytest.fixture
+def metrics():
+    redis_metrics.reset()
+    redis_metrics.enabled = True
+    yield redis_metrics
+    redis_metrics.enabled = False
+    redis_metrics.reset()
+
+
+async def test_metrics_labelled_by_manager(metrics):
+    manager = CombatManager(RedisService(fakeredis.FakeAsyncRedis(decode_responses=True)))
+    await manager.tick()
+    await manager.tick()
+
+    snapshot = metrics.snapshot()
+    latency = snapshot["latency"]
+    for op in ("set_value", "get_value", "get_all_hash", "pipeline", "script:tests.metrics_incr"):
+        assert latency[f"combat:{op}"]["count"] == 2
+        assert latency[f"combat:{op}"]["buckets"]["+Inf"] == 2
+    assert snapshot["pipeline_sizes"]["combat"] == {"count": 2, "avg": 3.0}
+    assert snapshot["errors"] == {"combat:get_all_hash": 2}
+
+    text = metrics.render_prometheus()
+    assert 'redis_command_duration_ms_count{component="combat",op="get_value"} 2' in text
+    assert 'redis_swallowed_errors_total{component="combat",op="get_all_hash"} 2' in text
+
+
+async def test_metrics_disabled_records_nothing():
+    redis_metrics.reset()
+    assert not redis_metrics.enabled
+    await CombatManager(RedisService(fakeredis.FakeAsyncRedis(decode_responses=True))).tick()
+    assert redis_metrics.snapshot() == {"latency": {}, "pipeline_sizes": {}, "errors": {}}
@@ -0,0 +1,63 @@
+import pytest
+
+from src.backend.database.redis.redis_scripts import ScriptRegistry, script_registry
+from src.backend.database.redis.redis_service import RedisService
+
+fakeredis = pytest.importorskip("fakeredis")
+
+_SOURCE = "return redis.call('INCRBY', KEYS[1], ARGV[1])"
+_INCRBY_SCRIPT = script_registry.register("tests.scripts_incrby", _SOURCE)
+
+
+def test_register_dedupes_same_source():
+    registry = ScriptRegistry()
+    first = registry.register("incr", _SOURCE)
+
+    assert registry.register("incr", _SOURCE) is first
+    assert registry.get("incr") is first
+    assert len(first.sha) == 40
+
+
+def test_register_rejects_conflicting_source():
+    registry = ScriptRegistry()
+    registry.register("incr", _SOURCE)
+
+    with pytest.raises(ValueError):
+        registry.register("incr", "return 1")
+
+
+async def test_load_all_then_evalsha():
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    registry = ScriptRegistry()
+    script = registry.register("incr", _SOURCE)
+
+    assert await registry.load_all(client) == 1
+    assert await client.script_exists(script.sha) == [True]
+
+
+async def test_run_script_reloads_on_noscript():
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    service = RedisService(client)
+    before = script_registry.stats()["tests.scripts_incrby"]
+
+    # Скрипт не загружен (как после рестарта/flush Redis): EVALSHA -> NOSCRIPT -> SCRIPT LOAD -> повтор
+    assert await client.script_exists(_INCRBY_SCRIPT.sha) == [False]
+    assert await service.run_script(_INCRBY_SCRIPT, keys=["counter"], args=[5]) == 5
+    assert await client.script_exists(_INCRBY_SCRIPT.sha) == [True]
+
+    # Повторный вызов идет напрямую через EVALSHA
+    assert await service.run_script(_INCRBY_SCRIPT, keys=["counter"], args=[2]) == 7
+
+    stats = script_registry.stats()["tests.scripts_incrby"]
+    assert stats["calls"] - before["calls"] == 2
+    assert stats["reloads"] - before["reloads"] == 1
+    assert stats["errors"] == before["errors"]
+
+
+async def test_run_script_swallows_script_errors():
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    await client.set("counter", "not-a-number")
+    before = script_registry.stats()["tests.scripts_incrby"]["errors"]
+
+    assert await RedisService(client).run_script(_INCRBY_SCRIPT, keys=["counter"], args=[1]) is None
+    assert script_registry.stats()["tests.scripts_incrby"]["errors"] == before + 1
@@ -0,0 +1,96 @@
+import pytest
+
+from src.backend.database.redis.manager.arena_manager import ArenaManager
+from src.backend.database.redis.redis_key import RedisKeys as Rk
+from src.backend.database.redis.redis_service import RedisService
+from src.backend.domains.user_features.arena.services.arena_matchmaker import ArenaMatchmaker, QueueEntry
+
+
+def test_window_widens_with_wait_time():
+    far = [QueueEntry(1, 100, 0), QueueEntry(2, 140, 0)]
+    assert ArenaMatchmaker.pair_players(far) == []
+
+    # 100 <-> 140: окно 100 должно быть >= 40%, окно 140 — >= ~29%
+    far = [QueueEntry(1, 100, 30), QueueEntry(2, 140, 10)]
+    assert ArenaMatchmaker.pair_players(far) == []
+    far = [QueueEntry(1, 100, 30), QueueEntry(2, 140, 15)]
+    assert ArenaMatchmaker.pair_players(far) == [(1, 2)]
+
+    assert ArenaMatchmaker.window(10_000) == ArenaMatchmaker.MAX_WINDOW
+
+
+def test_longest_waiter_gets_closest_opponent():
+    entries = [
+        QueueEntry(1, 100, 1),
+        QueueEntry(2, 110, 40),
+        QueueEntry(3, 112, 2),
+        QueueEntry(4, 95, 3),
+        QueueEntry(5, 500, 60),
+    ]
+    pairs = ArenaMatchmaker.pair_players(entries)
+    assert pairs == [(2, 3), (4, 1)]
+
+
+class _MemoryArenaManager:
+    """ArenaManager в памяти: очередь, заявки и захват пары."""
+
+    def __init__(self, queue: dict[int, float], requests: dict[int, dict]):
+        self.queue = queue
+        self.requests = requests
+        self.matches: dict[int, int] = {}
+
+    async def get_queue(self, mode):
+        return sorted(self.queue.items(), key=lambda item: item[1])
+
+    async def get_requests(self, char_ids):
+        return [self.requests.get(cid) for cid in char_ids]
+
+    async def remove_from_queue(self, mode, char_id):
+        return self.queue.pop(char_id, None) is not None
+
+    async def claim_pair(self, mode, char_a, char_b, ttl):
+        if char_a not in self.queue or char_b not in self.queue:
+            return False
+        del self.queue[char_a], self.queue[char_b]
+        self.matches[char_a], self.matches[char_b] = char_b, char_a
+        return True
+
+
+async def test_sweep_claims_pairs_and_drops_expired_requests():
+    now = 1000.0
+    manager = _MemoryArenaManager(
+        queue={1: 100, 2: 105, 3: 300, 4: 101},
+        requests={1: {"start_time": now - 5}, 2: {"start_time": now - 20}, 3: {"start_time": now}},
+    )
+    matchmaker = ArenaMatchmaker(manager)  # type: ignore[arg-type]
+
+    assert await matchmaker.sweep("1v1", now=now) == 1
+    assert manager.matches == {2: 1, 1: 2}
+    # 4 без заявки снят из очереди, 3 ждет дальше
+    assert manager.queue == {3: 300}
+    assert await matchmaker.sweep("1v1", now=now) == 0
+
+
+async def test_expired_match_slot_requeues_player():
+    fakeredis = pytest.importorskip("fakeredis")
+    manager = ArenaManager(RedisService(fakeredis.FakeAsyncRedis(decode_responses=True)))
+    for char_id, gs in ((1, 100), (2, 105), (3, 110), (4, 112)):
+        await manager.add_to_queue("1v1", char_id, gs)
+        await manager.create_request(char_id, {"start_time": 0, "gs": gs, "mode": "1v1"})
+    assert await manager.claim_pair("1v1", 1, 2, ttl=60)
+    assert await manager.claim_pair("1v1", 3, 4, ttl=60)
+
+    # Пока слот жив, игрок ждет забора матча, а не возвращается в очередь
+    assert not await manager.requeue_unmatched("1v1", 1)
+
+    # Слоты 1 и 2 истекли незабранными: оба снова в очереди со своим GS
+    await manager.redis_service.redis_client.delete(Rk.get_arena_match_key(1), Rk.get_arena_match_key(2))
+    assert await manager.requeue_unmatched("1v1", 1)
+    assert await manager.requeue_unmatched("1v1", 2)
+    assert not await manager.requeue_unmatched("1v1", 2)
+    assert await manager.get_queue("1v1") == [(1, 100.0), (2, 105.0)]
+
+    # Забранный матч снимает заявки пары: соперника, которого переводят в бой, не вернуть в очередь
+    assert await manager.claim_match(3) == 4
+    assert await manager.get_requests([3, 4]) == [None, None]
+    assert not await manager.requeue_unmatched("1v1", 4)
@@ -0,0 +1,174 @@
+import random
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.backend.domains.user_features.combat.combat_engine.processors.collector import CombatCollector
+from src.backend.domains.user_features.combat.dto.combat_arq_dto import CollectorSignalDTO
+
+
+def _exchange_move(move_id: str, char_id: int, target_id: int, created_at: float) -> dict:
+    return {
+        "move_id": move_id,
+        "char_id": char_id,
+        "strategy": "exchange",
+        "payload": {"target_id": target_id},
+        "created_at": created_at,
+    }
+
+
+def _build_moves_map(team_size: int, moves_per_actor: int, seed: int = 42) -> dict:
+    """
+    Пул exchange-мувов для боя team_size x team_size.
+    Каждый актор бьет случайных врагов; created_at перемешан, чтобы проверять FIFO.
+    """
+    rng = random.Random(seed)
+    team_a = list(range(1, team_size + 1))
+    team_b = list(range(1001, 1001 + team_size))
+
+    moves_map: dict = {}
+    counter = 0
+    for own, enemies in ((team_a, team_b), (team_b, team_a)):
+        for char_id in own:
+            exchange = {}
+            for _ in range(moves_per_actor):
+                counter += 1
+                move_id = f"m{counter}"
+                exchange[move_id] = _exchange_move(move_id, char_id, rng.choice(enemies), rng.random())
+            moves_map[str(char_id)] = {"exchange": exchange}
+    return moves_map
+
+
+def _naive_matchmake(moves_map: dict) -> list[tuple[str, str]]:
+    """Эталон: полный перебор O(N^2) по FIFO-пулу (прежняя логика коллектора)."""
+    pool = [m for data in moves_map.values() for m in data.get("exchange", {}).values()]
+    pool.sort(key=lambda x: x["created_at"])
+
+    matched: set[str] = set()
+    pairs = []
+    for move_a in pool:
+        if move_a["move_id"] in matched:
+            continue
+        for move_b in pool:
+            if move_b["move_id"] in matched or move_b is move_a:
+                continue
+            if (
+                move_b["char_id"] == move_a["payload"]["target_id"]
+                and move_b["payload"]["target_id"] == move_a["char_id"]
+            ):
+                pairs.append((move_a["move_id"], move_b["move_id"]))
+                matched.update((move_a["move_id"], move_b["move_id"]))
+                break
+    return pairs
+
+
+class _CountingPayload:
+    """Обертка payload мува: считает чтения target_id."""
+
+    def __init__(self, payload, reads: list[int]):
+        self._payload = payload
+        self._reads = reads
+
+    @property
+    def target_id(self):
+        self._reads[0] += 1
+        return self._payload.target_id
+
+
+@pytest.mark.combat
+class TestCollectorMatchmaking:
+    @pytest.fixture
+    def collector(self):
+        return CombatCollector(data_service=MagicMock())
+
+    def _matchmake(self, collector, moves_map, signal=None):
+        parsed = collector._parse_moves(moves_map)
+        return collector._matchmake_exchange(parsed, signal)
+
+    def test_pairs_match_naive_reference(self, collector):
+        """
+        Индексный матчмейкинг дает те же пары (и в том же FIFO-порядке), что и полный перебор.
+        """
+        moves_map = _build_moves_map(team_size=20, moves_per_actor=3)
+
+        actions, to_delete = self._matchmake(collector, moves_map)
+
+        pairs = [(a.move.move_id, a.partner_move.move_id) for a in actions]
+        assert pairs == _naive_matchmake(moves_map)
+        assert len(to_delete) == 2 * len(pairs)
+
+    def test_fifo_picks_oldest_partner(self, collector):
+        """
+        Из двух ответных мувов выбирается более ранний.
+        """
+        moves_map = {
+            "1": {"exchange": {"a": _exchange_move("a", 1, 2, 2.0)}},
+            "2": {
+                "exchange": {
+                    "late": _exchange_move("late", 2, 1, 3.0),
+                    "early": _exchange_move("early", 2, 1, 1.0),
+                }
+            },
+        }
+
+        actions, _ = self._matchmake(collector, moves_map)
+
+        assert len(actions) == 1
+        assert {actions[0].move.move_id, actions[0].partner_move.move_id} == {"a", "early"}
+
+    def test_force_attack_batch_only_unmatched(self, collector):
+        """
+        Timeout-сигнал "batch" форсит только несматченные мувы актора.
+        """
+        moves_map = {
+            "1": {
+                "exchange": {
+                    "a": _exchange_move("a", 1, 2, 1.0),
+                    "b": _exchange_move("b", 1, 3, 2.0),
+                }
+            },
+            "2": {"exchange": {"c": _exchange_move("c", 2, 1, 1.5)}},
+        }
+        signal = CollectorSignalDTO(session_id="s1", char_id=1, signal_type="check_timeout", move_id="batch")
+
+        actions, to_delete = self._matchmake(collector, moves_map, signal)
+
+        forced = [a.move.move_id for a in actions if a.is_forced]
+        assert forced == ["b"]
+        assert sorted(to_delete) == ["a", "b", "c"]
+
+    def test_matchmaking_does_not_scan_pool(self, collector):
+        """
+        Каждый мув читается константное число раз (индекс + один проход), а не O(N) раз на мув.
+        Пары при этом совпадают с полным перебором.
+        """
+        moves_map = _build_moves_map(team_size=50, moves_per_actor=4)
+        parsed = collector._parse_moves(moves_map)
+
+        reads = [0]
+        for actor_moves in parsed.values():
+            for move in actor_moves["exchange"]:
+                move.payload = _CountingPayload(move.payload, reads)
+
+        actions, _ = collector._matchmake_exchange(parsed)
+
+        pool_size = 50 * 2 * 4
+        # Полный перебор читал бы target_id ~N^2/2 раз (десятки тысяч для пула 400)
+        assert reads[0] <= 2 * pool_size
+        assert [(a.move.move_id, a.partner_move.move_id) for a in actions] == _naive_matchmake(moves_map)
+
+    def test_force_attack_from_timer_wheel(self, collector):
+        """
+        Сработавшие таймеры колеса ("{char_id}:{move_id}") форсят только еще не сматченные мувы.
+        """
+        moves_map = {
+            "1": {"exchange": {"a": _exchange_move("a", 1, 2, 1.0)}},
+            "2": {"exchange": {"c": _exchange_move("c", 2, 1, 1.5)}},
+            "3": {"exchange": {"d": _exchange_move("d", 3, 4, 2.0)}},
+        }
+
+        parsed = collector._parse_moves(moves_map)
+        actions, _ = collector._matchmake_exchange(parsed, expired_timers=["1:a", "3:d", "5:gone"])
+
+        forced = [a.move.move_id for a in actions if a.is_forced]
+        assert forced == ["d"]
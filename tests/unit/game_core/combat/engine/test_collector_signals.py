@@ -0,0 +1,116 @@
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.backend.database.redis.manager.combat_manager import CombatManager
+from src.backend.database.redis.redis_key import RedisKeys
+from src.backend.database.redis.redis_service import RedisService
+from src.backend.domains.user_features.combat.orchestrators.handler.runtime.combat_turn_manager import (
+    COLLECTOR_DEBOUNCE_SEC,
+    CombatTurnManager,
+)
+
+fakeredis = pytest.importorskip("fakeredis")
+
+SESSION = "s1"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Управляемые часы: время таймеров считается от time.time()."""
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.FakeAsyncRedis(decode_responses=True)
+
+
+@pytest.fixture
+def turn_manager(redis):
+    arq = MagicMock()
+    arq.enqueue_job = AsyncMock(return_value=object())
+    return CombatTurnManager(CombatManager(RedisService(redis)), arq)
+
+
+def _timer_jobs(turn_manager) -> list[str]:
+    return [c.kwargs["_job_id"] for c in turn_manager.arq.enqueue_job.await_args_list if "_job_id" in c.kwargs]
+
+
+async def test_repeated_signals_coalesce_into_one_pass(turn_manager):
+    for move_id in ("m1", "m2", "batch"):
+        await turn_manager.signal_collector(SESSION, 1, "check_immediate", move_id)
+
+    turn_manager.arq.enqueue_job.assert_awaited_once()
+    assert turn_manager.arq.enqueue_job.await_args.kwargs["_defer_by"] == COLLECTOR_DEBOUNCE_SEC
+
+    # Коллектор снял флаг в начале прохода -> следующий сигнал ставит новый проход
+    await turn_manager.combat_manager.clear_collector_pending(SESSION)
+    await turn_manager.signal_collector(SESSION, 1, "check_immediate", "m3")
+    assert turn_manager.arq.enqueue_job.await_count == 2
+
+
+async def test_failed_enqueue_releases_pending_flag(turn_manager, redis):
+    turn_manager.arq.enqueue_job.return_value = None
+
+    await turn_manager.signal_collector(SESSION, 1, "check_immediate", "m1")
+
+    assert await redis.exists(RedisKeys.get_rbc_collector_pending_key(SESSION)) == 0
+
+
+async def test_timer_wheel_arms_only_for_earliest_timer(turn_manager, clock):
+    await turn_manager.schedule_timeout(SESSION, 1, "m1", 20)
+    await turn_manager.schedule_timeout(SESSION, 2, "m2", 30)
+    # Повторный таймер того же мува не сдвигает первый (ZADD NX)
+    await turn_manager.schedule_timeout(SESSION, 1, "m1", 60)
+
+    assert _timer_jobs(turn_manager) == [f"combat_timer:{SESSION}:1020000"]
+
+    # Более ранний таймер перезаводит задачу
+    await turn_manager.schedule_timeout(SESSION, 3, "m3", 10)
+    assert _timer_jobs(turn_manager)[-1] == f"combat_timer:{SESSION}:1010000"
+
+
+async def test_timer_wheel_expiry_and_rearm(turn_manager, redis, clock):
+    combat_manager = turn_manager.combat_manager
+    await turn_manager.schedule_timeout(SESSION, 1, "m1", 20)
+    await turn_manager.schedule_timeout(SESSION, 2, "m2", 30)
+
+    clock[0] = 1019.9
+    assert await combat_manager.get_due_timers(SESSION) == []
+
+    # Первый таймер сработал: после ack задача заводится на следующий
+    clock[0] = 1020.5
+    due = await combat_manager.get_due_timers(SESSION)
+    assert due == ["1:m1"]
+    assert await combat_manager.ack_timers(SESSION, due) == 1030.0
+
+    clock[0] = 1031.0
+    due = await combat_manager.get_due_timers(SESSION)
+    assert due == ["2:m2"]
+    # Колесо пусто: заводить нечего, метка "armed" удалена
+    assert await combat_manager.ack_timers(SESSION, due) is None
+    assert await redis.exists(RedisKeys.get_rbc_timers_armed_key(SESSION)) == 0
+
+
+@pytest.mark.parametrize("failure", [None, ConnectionError("arq down")])
+async def test_failed_timer_enqueue_disarms_wheel(turn_manager, redis, clock, failure):
+    enqueue = turn_manager.arq.enqueue_job
+    if failure is None:
+        enqueue.return_value = None
+        await turn_manager.schedule_timeout(SESSION, 1, "m1", 20)
+    else:
+        enqueue.side_effect = failure
+        with pytest.raises(ConnectionError):
+            await turn_manager.schedule_timeout(SESSION, 1, "m1", 20)
+
+    assert await redis.exists(RedisKeys.get_rbc_timers_armed_key(SESSION)) == 0
+
+    # Следующий таймер заводит задачу сразу, не дожидаясь истечения отметки
+    enqueue.side_effect, enqueue.return_value = None, object()
+    await turn_manager.schedule_timeout(SESSION, 2, "m2", 30)
+    assert _timer_jobs(turn_manager)[-1] == f"combat_timer:{SESSION}:1020000"
+    assert await redis.get(RedisKeys.get_rbc_timers_armed_key(SESSION)) == "1020000"
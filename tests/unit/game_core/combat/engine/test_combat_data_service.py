@@ -0,0 +1,124 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+from src.backend.domains.user_features.combat.combat_engine.actor_snapshot_cache import ActorSnapshotCache
+from src.backend.domains.user_features.combat.combat_engine.combat_data_service import CombatDataService
+from src.backend.domains.user_features.combat.combat_engine.workers.tasks.victory_finalizer_task import (
+    victory_finalizer_task,
+)
+
+SESSION = "s1"
+
+
+def _actor_json(hp: int, version: int) -> dict:
+    return {
+        "version": version,
+        "meta": {"name": "Hero", "type": "player"},
+        "state": {"hp": hp, "max_hp": 100, "en": 10, "max_en": 10, "tactics": 0, "is_dead": False},
+        "raw": {"attributes": {}, "modifiers": {}},
+        "loadout": {},
+        "statuses": {"abilities": [], "effects": []},
+        "xp": {},
+    }
+
+
+def _service(versions: dict[str, int]) -> tuple[CombatDataService, MagicMock]:
+    """Сервис с фейковым CombatManager: версии акторов задаются словарем versions."""
+    manager = MagicMock()
+    manager.get_rbc_session_meta = AsyncMock(return_value={"teams": json.dumps({"blue": [1], "red": [2]})})
+    manager.load_actor_versions_batch = AsyncMock(
+        side_effect=lambda _sid, ids: {str(i): {"version": versions[str(i)]} for i in ids}
+    )
+    manager.load_actors_json_batch = AsyncMock(
+        side_effect=lambda _sid, ids: {
+            str(i): _actor_json(hp=50 + versions[str(i)], version=versions[str(i)]) for i in ids
+        }
+    )
+    return CombatDataService(manager, ActorSnapshotCache()), manager
+
+
+def test_cache_hit_requires_matching_version():
+    cache = ActorSnapshotCache()
+    cache.put(SESSION, 1, 3, {"hp": 10})
+
+    assert cache.get(SESSION, 1, 3) == {"hp": 10}
+    assert cache.get(SESSION, 1, 4) is None
+    assert cache.get(SESSION, 1, None) is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "size": 1}
+
+
+def test_cache_returns_copies_and_skips_unversioned():
+    cache = ActorSnapshotCache()
+    cache.put(SESSION, 1, 1, {"state": {"hp": 10}})
+    cache.put(SESSION, 2, None, {"state": {"hp": 20}})
+
+    cache.get(SESSION, 1, 1)["state"]["hp"] = 0
+    assert cache.get(SESSION, 1, 1) == {"state": {"hp": 10}}
+    assert cache.get(SESSION, 2, None) is None
+
+
+def test_load_context_reloads_only_stale_versions():
+    versions = {"1": 1, "2": 1}
+    service, manager = _service(versions)
+
+    asyncio.run(service.load_battle_context(SESSION))
+    assert manager.load_actors_json_batch.await_args.args[1] == [1, 2]
+
+    # Совпадающие версии — оба актора из кэша, JSON не читается
+    ctx = asyncio.run(service.load_battle_context(SESSION))
+    assert manager.load_actors_json_batch.await_args.args[1] == []
+    assert ctx.actors["1"].meta.hp == 51
+
+    # Актор 2 закоммичен другим исполнителем — перечитывается только он
+    versions["2"] = 2
+    ctx = asyncio.run(service.load_battle_context(SESSION))
+    assert manager.load_actors_json_batch.await_args.args[1] == [2]
+    assert ctx.actors["2"].meta.hp == 52
+    assert ctx.actors["1"].meta.hp == 51
+
+
+def test_finished_session_is_evicted():
+    service, manager = _service({"1": 1, "2": 1})
+    asyncio.run(service.load_battle_context(SESSION))
+    assert service.snapshot_cache.stats()["size"] == 2
+
+    # Сессия удалена из Redis — при следующей загрузке кэш сессии очищается
+    manager.get_rbc_session_meta.return_value = None
+    assert asyncio.run(service.load_battle_context(SESSION)) is None
+    assert service.snapshot_cache.stats()["size"] == 0
+
+
+def test_victory_finalizer_releases_session():
+    service, _ = _service({"1": 1, "2": 1})
+    asyncio.run(service.load_battle_context(SESSION))
+    service.snapshot_cache.put("other", 1, 1, {})
+
+    asyncio.run(victory_finalizer_task({"combat_data_service": service}, {"session_id": SESSION, "winner": "blue"}))
+
+    assert service.snapshot_cache.stats()["size"] == 1
+    assert service.snapshot_cache.get("other", 1, 1) == {}
+
+
+def test_delta_commit_writes_only_dirty_sections():
+    service, manager = _service({"1": 1, "2": 1})
+    manager.commit_battle_results = AsyncMock()
+    ctx = asyncio.run(service.load_battle_context(SESSION))
+
+    hero = ctx.actors["1"]
+    hero.meta.hp = 7
+    hero.statuses.effects.clear()
+    hero.mark_dirty("state")
+
+    asyncio.run(service.commit_session(ctx, ["a1"]))
+
+    updates = manager.commit_battle_results.await_args.args[1]
+    # Чистый актор 2 и чистые секции актора 1 в транзакцию не попадают
+    assert set(updates) == {"1"}
+    assert set(updates["1"]) == {"state"}
+    assert updates["1"]["state"]["hp"] == 7
+    assert not hero.dirty_sections
+
+    # После коммита без новых изменений писать нечего
+    asyncio.run(service.commit_session(ctx, []))
+    assert manager.commit_battle_results.await_args.args[1] == {}
@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from src.backend.domains.user_features.combat.combat_engine.simulation.simulator import CombatSimulator
+from src.backend.domains.user_features.combat.dto.combat_simulation_dto import SimulationConfigDTO
+
+# Фиксированные статы руки: исходы не зависят от баланса атрибутов и шмота
+OVERRIDES = {"main_hand_accuracy": 0.8, "main_hand_damage_base": 8.0}
+
+
+def _config(**kwargs) -> SimulationConfigDTO:
+    params = {
+        "blue": ["goblin_sneak", "goblin_spearman"],
+        "red": ["goblin_slinger", "goblin_scavenger"],
+        "battles": 12,
+        "seed": 7,
+        "mod_overrides": OVERRIDES,
+    }
+    params.update(kwargs)
+    return SimulationConfigDTO(**params)
+
+
+@pytest.mark.combat
+class TestCombatSimulator:
+    def test_seeded_run_is_reproducible(self):
+        """
+        Один seed — одинаковый отчет, независимо от числа воркеров (каждый бой сидируется своим индексом).
+        """
+        first = CombatSimulator(_config()).run()
+        second = CombatSimulator(_config()).run()
+        pooled = CombatSimulator(_config(workers=2)).run()
+
+        for report in (second, pooled):
+            assert report.outcomes == first.outcomes
+            assert report.wins == first.wins
+            assert report.ttk_rounds == first.ttk_rounds
+
+    def test_report_counts(self):
+        report = CombatSimulator(_config()).run()
+
+        assert report.battles == 12
+        assert sum(report.wins.values()) == 12
+        assert report.exchanges > 0
+        assert report.attacks >= report.exchanges
+        assert report.outcomes["hit"] > 0
+        assert report.outcomes["damage"] > 0
+
+        decided = report.battles - report.wins.get("timeout", 0)
+        if decided:
+            assert 1 <= report.ttk_rounds["p50"] <= report.ttk_rounds["max"] <= 100
+
+    def test_monster_weapons_give_main_hand_stats(self):
+        """
+        Без оверрайдов статы руки выводятся из атрибутов и оружия — удары попадают.
+        """
+        report = CombatSimulator(_config(mod_overrides={}, battles=4)).run()
+
+        assert report.outcomes["hit"] > 0
+        assert report.outcomes["damage"] > 0
+
+    def test_monster_without_attack_fails_loudly(self):
+        with pytest.raises(ValueError, match="main hand"):
+            CombatSimulator(_config(mod_overrides={"main_hand_accuracy": 0.0}, battles=1)).run()
+
+    def test_global_random_state_is_restored(self):
+        random.seed(123)
+        expected = random.random()
+
+        random.seed(123)
+        CombatSimulator(_config(battles=2)).run()
+
+        assert random.random() == expected
@@ -0,0 +1,61 @@
+import tracemalloc
+
+import pytest
+
+from src.backend.domains.user_features.combat.combat_engine.logic.context_builder import ContextBuilder
+from src.backend.domains.user_features.combat.dto.combat_action_dto import CombatMoveDTO
+from src.backend.domains.user_features.combat.dto.combat_actor_dto import (
+    ActorLoadoutDTO,
+    ActorMetaDTO,
+    ActorRawDTO,
+    ActorSnapshot,
+    ActorStats,
+)
+from src.shared.schemas.modifier_dto import CombatModifiersDTO
+
+
+def _actor(char_id: int) -> ActorSnapshot:
+    """Актор с "бесконечным" HP/EN, чтобы размены не заканчивались смертью."""
+    mods = CombatModifiersDTO(
+        main_hand_accuracy=0.9,
+        main_hand_damage_base=100.0,
+        main_hand_crit_chance=0.2,
+        dodge_chance=0.1,
+        parry_chance=0.1,
+    )
+    meta = ActorMetaDTO(
+        id=char_id,
+        name=f"Actor {char_id}",
+        type="player",
+        team="blue" if char_id == 1 else "red",
+        hp=10**9,
+        max_hp=10**9,
+        en=10**6,
+        max_en=10**6,
+    )
+    return ActorSnapshot(
+        meta=meta,
+        raw=ActorRawDTO(),
+        stats=ActorStats(mods=mods),
+        loadout=ActorLoadoutDTO(layout={"main_hand": "skill_swords"}),
+    )
+
+
+@pytest.mark.combat
+class TestPipelineAllocations:
+    def test_hit_context_allocation(self):
+        """
+        Аллокации на контекст удара (ContextBuilder.build_context) остаются в пределах бюджета.
+        """
+        source, target = _actor(1), _actor(2)
+        move_a = CombatMoveDTO(move_id="a", char_id=1, strategy="exchange", payload={"target_id": 2})
+
+        tracemalloc.start()
+        try:
+            contexts = [ContextBuilder.build_context(source, target, move_a) for _ in range(100)]
+            ctx_bytes = tracemalloc.get_traced_memory()[0] / len(contexts)
+        finally:
+            tracemalloc.stop()
+
+        # Pydantic-контекст занимал ~16.5 KiB на удар
+        assert ctx_bytes < 8 * 1024
@@ -0,0 +1,102 @@
+import random
+import struct
+
+import pytest
+
+from src.backend.services.calculators.stats_waterfall_calculator import StatsWaterfallCalculator
+from src.shared.enums.stats_enums import StatKey
+
+
+def _bits(value: float) -> bytes:
+    return struct.pack("<d", value)
+
+
+def _random_command(rng: random.Random) -> str:
+    """Команда источника: числа разных форм + редкие нечисловые значения (медленный путь)."""
+    number = rng.choice(
+        [
+            str(rng.randint(-50, 200)),
+            repr(rng.uniform(-5, 5)),
+            f"{rng.uniform(0, 2):.3f}",
+            repr(rng.random() * 1e-6),
+            "0",
+            "-0.0",
+            ".5",
+            "3.",
+            "1e3",
+        ]
+    )
+    op = rng.choice(["+", "+", "+", "-", "*", "*", "=", ""])
+    cmd = f"{op}{number}"
+    if rng.random() < 0.03:
+        cmd = rng.choice(["+2*3", "--5", "*inf", "+abc", "+", " +7 ", "+1_0"])
+    return cmd
+
+
+def _build_raw_data(rng: random.Random) -> dict:
+    def stat() -> dict:
+        return {
+            "base": rng.choice([0, 0.0, rng.randint(1, 30), rng.uniform(0, 10)]),
+            "source": {f"s{i}": _random_command(rng) for i in range(rng.randint(0, 4))},
+            "temp": {f"t{i}": _random_command(rng) for i in range(rng.randint(0, 2))},
+        }
+
+    attributes = [StatKey.STRENGTH, StatKey.AGILITY, StatKey.PERCEPTION, StatKey.PREDICTION, StatKey.ENDURANCE]
+    modifiers = [StatKey.PHYSICAL_DAMAGE, StatKey.ACCURACY, StatKey.EVASION, StatKey.ARMOR, StatKey.PARRY]
+    return {
+        "attributes": {str(k): stat() for k in attributes},
+        "modifiers": {str(k): stat() for k in modifiers},
+    }
+
+
+@pytest.mark.combat
+class TestStatsWaterfallCalculator:
+    def test_fast_path_is_bit_exact_with_simpleeval(self):
+        """
+        Дифференциальный тест: числовой путь == строковая формула через simpleeval (значение бит-в-бит + формула).
+        """
+        rng = random.Random(1337)
+
+        for _ in range(5000):
+            commands = [_random_command(rng) for _ in range(rng.randint(0, 8))]
+            base = rng.choice([0.0, float(rng.randint(1, 50)), rng.uniform(-10, 10)])
+
+            fast_val, fast_expr = StatsWaterfallCalculator._evaluate_pipeline(commands, base)
+            ref_val, ref_expr = StatsWaterfallCalculator._evaluate_expression(commands, base)
+
+            assert _bits(fast_val) == _bits(ref_val), (commands, base, fast_val, ref_val)
+            assert fast_expr == ref_expr
+
+    def test_explain_flag_does_not_change_values(self):
+        """
+        explain=False не собирает формулы и дает те же значения.
+        """
+        rng = random.Random(7)
+
+        for _ in range(200):
+            raw_data = _build_raw_data(rng)
+            values, explanation = StatsWaterfallCalculator.calculate_waterfall(raw_data)
+            fast_values, fast_explanation = StatsWaterfallCalculator.calculate_waterfall(raw_data, explain=False)
+
+            assert fast_explanation == {}
+            assert {k: _bits(v) for k, v in fast_values.items()} == {k: _bits(v) for k, v in values.items()}
+
+    def test_waterfall_many_matches_scalar(self):
+        """
+        Батчевый расчет (мост через NumPy) дает те же значения, что и calculate_waterfall.
+        Акторы с нечисловыми командами модификаторов возвращаются как None (скалярный fallback).
+        """
+        rng = random.Random(2024)
+        raw_list = [_build_raw_data(rng) for _ in range(300)]
+
+        batch = StatsWaterfallCalculator.calculate_waterfall_many(raw_list)
+
+        compared = 0
+        for raw_data, batch_values in zip(raw_list, batch, strict=True):
+            if batch_values is None:
+                continue
+            values, _ = StatsWaterfallCalculator.calculate_waterfall(raw_data, explain=False)
+            assert batch_values == {str(k): v for k, v in values.items()}
+            compared += 1
+
+        assert compared > 200
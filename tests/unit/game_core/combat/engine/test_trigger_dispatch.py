@@ -0,0 +1,84 @@
+import random
+from dataclasses import fields
+
+import pytest
+
+from src.backend.domains.user_features.combat.combat_engine.logic.combat_resolver import (
+    _EVENT_SECTIONS,
+    CombatResolver,
+)
+from src.backend.domains.user_features.combat.combat_engine.logic.math_core import MathCore
+from src.backend.domains.user_features.combat.dto.combat_pipeline_dto import PipelineContextDTO
+from src.backend.domains.user_features.combat.dto.trigger_rules_flags_dto import (
+    ControlTriggersDTO,
+    CritTriggersDTO,
+    TriggerRulesFlagsDTO,
+)
+from src.backend.resources.game_data.triggers.definitions.rules import TRIGGER_RULES_DICT
+
+ALL_FLAGS = [(section.name, flag) for section in fields(TriggerRulesFlagsDTO) for flag in section.type.flag_names()]
+
+
+def _legacy_resolve_triggers(ctx: PipelineContextDTO, res, step_key: str):
+    """Эталон: прежний резолв полным обходом полей секции и поиском по TRIGGER_RULES_DICT."""
+    section_name = _EVENT_SECTIONS.get(step_key)
+    if not section_name:
+        return
+
+    section = getattr(ctx.triggers, section_name)
+    active_rule_ids = [k for k in section.flag_names() if getattr(section, k) is True]
+    for rule_id in active_rule_ids:
+        rule_data = TRIGGER_RULES_DICT.get(rule_id)
+        if not rule_data or rule_data.get("event") != step_key:
+            continue
+
+        raw_chance = rule_data.get("chance", 0.0)
+        chance = float(raw_chance) if isinstance(raw_chance, (int, float)) else 0.0
+        if not MathCore.check_chance(chance):
+            continue
+
+        for key, value in rule_data.get("mutations", {}).items():
+            CombatResolver._apply_mutation(ctx, res, key, value)
+
+
+def _build_ctx(flags: list[tuple[str, str]]) -> PipelineContextDTO:
+    ctx = PipelineContextDTO()
+    for section, flag in flags:
+        setattr(getattr(ctx.triggers, section), flag, True)
+    return ctx
+
+
+@pytest.mark.combat
+class TestTriggerDispatch:
+    def test_active_flags_follow_assignment(self):
+        """
+        Секция поддерживает множество активных флагов: конструктор, присваивание, сброс.
+        """
+        section = CritTriggersDTO(true_crit=True)
+        assert section.active_flags == {"true_crit"}
+
+        section.bleed_on_crit = True
+        section.true_crit = False
+        assert section.active_flags == {"bleed_on_crit"}
+
+        triggers = TriggerRulesFlagsDTO(control=ControlTriggersDTO(stun_on_hit=True))
+        assert triggers.active == frozenset({"control.stun_on_hit"})
+
+    def test_dispatch_matches_legacy_resolver(self):
+        """
+        Дифференциальный тест: таблица диспетчеризации дает те же мутации (и тот же порядок бросков RNG),
+        что и прежний обход полей секции.
+        """
+        rng = random.Random(99)
+
+        for case in range(500):
+            flags = rng.sample(ALL_FLAGS, rng.randint(0, 6))
+            for step_key in _EVENT_SECTIONS:
+                legacy_ctx, new_ctx = _build_ctx(flags), _build_ctx(flags)
+
+                random.seed(case)
+                _legacy_resolve_triggers(legacy_ctx, legacy_ctx.result, step_key)
+                random.seed(case)
+                CombatResolver._resolve_triggers(new_ctx, new_ctx.result, step_key)
+
+                assert new_ctx == legacy_ctx, (flags, step_key)
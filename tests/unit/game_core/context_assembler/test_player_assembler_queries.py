@@ -0,0 +1,110 @@
+import asyncio
+
+from src.backend.domains.internal_systems.context_assembler.logic import player_assembler
+from src.backend.domains.internal_systems.context_assembler.logic.player_assembler import PlayerAssembler
+
+
+class _Session:
+    """AsyncSession-заглушка: ловит конкурентное использование одной сессии."""
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+        self.busy = False
+        self.queries = 0
+
+    async def run(self, table: str, ids: list[int]):
+        assert not self.busy, "concurrent operations on one session"
+        self.busy = True
+        self.queries += 1
+        self.stats["in_flight"] += 1
+        self.stats["peak"] = max(self.stats["peak"], self.stats["in_flight"])
+        self.stats["queries"].append((table, len(ids)))
+        await asyncio.sleep(0.001)
+        self.stats["in_flight"] -= 1
+        self.busy = False
+        return {} if table in ("inventory", "skills") else []
+
+
+class _SessionFactory:
+    def __init__(self):
+        self.stats: dict = {"in_flight": 0, "peak": 0, "queries": []}
+        self.sessions: list[_Session] = []
+
+    def __call__(self):
+        factory = self
+
+        class _Ctx:
+            async def __aenter__(self):
+                session = _Session(factory.stats)
+                factory.sessions.append(session)
+                return session
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Ctx()
+
+
+class _Repo:
+    def __init__(self, session: _Session):
+        self.session = session
+
+    async def get_characters_batch(self, ids):
+        return await self.session.run("char", ids)
+
+    async def get_attributes_batch(self, ids):
+        return await self.session.run("attributes", ids)
+
+    async def get_items_by_locations_batch(self, ids, locations):
+        return await self.session.run("inventory", ids)
+
+    async def get_all_skills_progress_batch(self, ids):
+        return await self.session.run("skills", ids)
+
+    async def get_symbiotes_batch(self, ids):
+        return await self.session.run("symbiote", ids)
+
+    async def get_wallets_batch(self, ids):
+        return await self.session.run("wallet", ids)
+
+
+class _AccountManager:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_accounts_json_batch(self, ids, path):
+        self.calls += 1
+        return [None] * len(ids)
+
+
+async def test_raid_batch_uses_fixed_queries_in_separate_sessions(monkeypatch):
+    for getter in (
+        "get_character_repo",
+        "get_character_attributes_repo",
+        "get_inventory_repo",
+        "get_skill_progress_repo",
+        "get_symbiote_repo",
+        "get_wallet_repo",
+    ):
+        monkeypatch.setattr(player_assembler, getter, _Repo)
+
+    factory = _SessionFactory()
+    accounts = _AccountManager()
+    assembler = PlayerAssembler(factory, accounts, None, None)  # type: ignore[arg-type]
+
+    raid = list(range(1, 41))
+    success, errors = await assembler.process_batch(raid, "full")
+
+    # 40 игроков: по одному запросу на таблицу плана "full", каждый в своей сессии
+    tables = sorted(table for table, _ in factory.stats["queries"])
+    assert tables == ["attributes", "char", "inventory", "skills", "symbiote", "wallet"]
+    assert all(count == 40 for _, count in factory.stats["queries"])
+    assert all(s.queries == 1 for s in factory.sessions)
+    assert factory.stats["peak"] > 1
+    assert accounts.calls == 1
+    # Персонажей нет в БД — все в ошибках, без сохранения
+    assert success == {} and errors == raid
+
+    factory.stats["queries"].clear()
+    await assembler.process_batch(raid, "status")
+    assert sorted(table for table, _ in factory.stats["queries"]) == ["attributes", "char", "symbiote"]
@@ -0,0 +1,150 @@
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.backend.database.redis.location_meta_cache import INVALIDATE_ALL, location_meta_cache
+from src.backend.database.redis.manager.account_manager import AccountManager
+from src.backend.database.redis.manager.world_manager import WorldManager
+from src.backend.database.redis.redis_key import RedisKeys as Rk
+from src.backend.database.redis.redis_service import RedisService
+from src.backend.domains.user_features.exploration.data.config import ExplorationConfig
+from src.backend.domains.user_features.exploration.services.exploration_service import ExplorationService
+from src.backend.domains.user_features.exploration.services.exploration_session_service import ExplorationSessionService
+from src.backend.domains.user_features.exploration.services.route_service import RouteService
+
+fakeredis = pytest.importorskip("fakeredis")
+
+CHAR_ID = 7
+
+
+def _exit(direction: str) -> dict:
+    return {"desc_next_room": "", "time_duration": 2.0, "text_button": "", "type": "move", "direction": direction}
+
+
+@pytest.fixture
+def redis():
+    """Две соседние локации (0_0 -> 1_0 на восток) и 5_5 без прохода; игрок в 0_0."""
+    server = fakeredis.FakeServer()
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    client.hset(
+        Rk.get_world_location_meta_key("0_0"), mapping={"name": "A", "exits": json.dumps({"nav:1_0": _exit("east")})}
+    )
+    client.hset(
+        Rk.get_world_location_meta_key("1_0"), mapping={"name": "B", "exits": json.dumps({"nav:0_0": _exit("west")})}
+    )
+    client.hset(Rk.get_world_location_meta_key("5_5"), mapping={"name": "Far", "exits": "{}"})
+    client.json().set(
+        Rk.get_account_key(CHAR_ID),
+        "$",
+        {"location": {"current": "0_0", "previous": None}, "skills": {"survival": 0.4}},
+    )
+    client.sadd(Rk.get_world_location_players_key("0_0"), CHAR_ID, 8)
+    return fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+
+
+@pytest.fixture
+def world_manager(redis):
+    WorldManager._active_version = None
+    WorldManager._version_expires_at = 0.0
+    location_meta_cache.invalidate(INVALIDATE_ALL)
+    yield WorldManager(RedisService(redis))
+    WorldManager._active_version = None
+    WorldManager._version_expires_at = 0.0
+
+
+def _service(world_manager: WorldManager, route_service: RouteService | None = None) -> ExplorationService:
+    session = ExplorationSessionService(AccountManager(world_manager.redis_service), world_manager)
+    encounters = MagicMock()
+    encounters.try_generate_encounter = AsyncMock(return_value=None)
+    return ExplorationService(session, encounters, MagicMock(), route_service)
+
+
+async def _location(redis) -> dict:
+    return (await redis.json().get(Rk.get_account_key(CHAR_ID), "$.location"))[0]
+
+
+async def test_move_transfers_player_between_locations(redis, world_manager):
+    res = await world_manager.move_player(CHAR_ID, "1_0", "0_0")
+
+    assert res["status"] == "moved"
+    assert (res["loc_id"], res["previous_loc_id"]) == ("1_0", "0_0")
+    assert res["meta"]["name"] == "B"
+    assert res["survival"] == 0.4
+    assert await _location(redis) == {"current": "1_0", "previous": "0_0"}
+    assert await redis.smembers(Rk.get_world_location_players_key("0_0")) == {"8"}
+    assert await redis.smembers(Rk.get_world_location_players_key("1_0")) == {str(CHAR_ID)}
+
+
+async def test_blocked_move_changes_nothing(redis, world_manager):
+    # 5_5 существует, но выхода туда из 0_0 нет
+    res = await world_manager.move_player(CHAR_ID, "5_5", "0_0")
+
+    assert res["status"] == "invalid_exit"
+    assert res["loc_id"] == "0_0"
+    assert res["players_count"] == 1
+    assert await _location(redis) == {"current": "0_0", "previous": None}
+    assert await redis.sismember(Rk.get_world_location_players_key("0_0"), CHAR_ID)
+    assert not await redis.exists(Rk.get_world_location_players_key("5_5"))
+
+
+async def test_move_during_battle_reports_target_battles(redis, world_manager):
+    await redis.hset(Rk.get_world_location_battles_key("0_0"), "b0", "Бой у входа")
+    await redis.hset(Rk.get_world_location_battles_key("1_0"), mapping={"b1": "Бой 1", "b2": "Бой 2"})
+
+    res = await world_manager.move_player(CHAR_ID, "1_0", "0_0")
+
+    assert res["status"] == "moved"
+    assert res["battles_count"] == 2
+    # Бои локаций перемещение не трогает
+    assert await redis.hlen(Rk.get_world_location_battles_key("0_0")) == 1
+
+
+async def test_stale_current_location_is_retried(redis, world_manager):
+    # Вызывающий считает, что игрок в 1_0, а аккаунт уже в 0_0
+    res = await world_manager.move_player(CHAR_ID, "1_0", "0_0", current_loc_id="1_0")
+
+    assert res["status"] == "moved"
+    assert await _location(redis) == {"current": "1_0", "previous": "0_0"}
+
+
+async def test_legacy_direction_moves_player(redis, world_manager):
+    service = _service(world_manager)
+
+    await service.move(CHAR_ID, direction="e")
+    assert (await _location(redis))["current"] == "1_0"
+
+    # Направления без выхода — игрок остается на месте
+    await service.move(CHAR_ID, direction="north")
+    assert (await _location(redis))["current"] == "1_0"
+
+
+async def test_auto_travel_is_capped_by_travel_time(redis, world_manager, monkeypatch):
+    # Коридор 0_0 -> 29_0 (по 2 с на переход) до хаба в конце, версия карты "1"
+    length = 30
+    graph = {}
+    for x in range(length):
+        nav = {f"{nx}_0": 2.0 for nx in (x - 1, x + 1) if 0 <= nx < length}
+        graph[f"{x}_0"] = {"name": f"C{x}", "nav": nav, "services": [], "hub": x == length - 1}
+        exits = {f"nav:{target}": {**_exit("east"), "time_duration": t} for target, t in nav.items()}
+        await redis.hset(
+            Rk.get_world_location_meta_key(f"{x}_0", "1"), mapping={"name": f"C{x}", "exits": json.dumps(exits)}
+        )
+    await redis.set(Rk.get_world_version_key(), "1")
+    await world_manager.write_world_graph("1", graph)
+    monkeypatch.setattr(RouteService, "_graphs", {})
+    service = _service(world_manager, RouteService(world_manager))
+
+    dto = await service.interact(CHAR_ID, "navigate", target_id="hub")
+
+    # 40 с бюджета = 20 переходов из 29
+    assert ExplorationConfig.NAVIGATOR_MAX_TRAVEL_TIME == 40.0
+    assert dto.loc_id == "20_0"
+    assert "Часть пути" in dto.hud.message
+    assert 0 < await redis.pttl(Rk.get_world_travel_key(CHAR_ID)) <= 40_000
+
+    # Пока игрок в пути, следующий отрезок маршрута не начинается
+    dto = await service.interact(CHAR_ID, "navigate", target_id="hub")
+    assert dto.loc_id == "20_0"
+    assert "в пути" in dto.hud.message
+    assert (await _location(redis))["current"] == "20_0"
@@ -0,0 +1,91 @@
+import heapq
+import random
+
+import pytest
+
+from src.backend.domains.user_features.exploration.engine.route_engine import HUB_TARGET, WorldGraph
+
+SIZE = 105
+HUB = "52_52"
+
+
+def _snapshot(seed: int = 3) -> dict[str, dict]:
+    """Сетка SIZE x SIZE с дырами, дорогами (2.0 / 4.0) и односторонними выходами."""
+    rng = random.Random(seed)
+    cells = {(x, y) for x in range(SIZE) for y in range(SIZE) if rng.random() > 0.15 or (x, y) == (52, 52)}
+    roads = {cell for cell in cells if rng.random() < 0.3}
+
+    snapshot: dict[str, dict] = {}
+    for x, y in cells:
+        nav = {}
+        for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+            neighbor = (x + dx, y + dy)
+            if neighbor in cells and rng.random() > 0.05:
+                nav[f"{neighbor[0]}_{neighbor[1]}"] = 2.0 if {(x, y), neighbor} <= roads else 4.0
+        services = ["svc_tavern_hub"] if (x, y) in ((10, 10), (90, 95)) else []
+        snapshot[f"{x}_{y}"] = {"name": f"Node {x}:{y}", "nav": nav, "services": services, "hub": f"{x}_{y}" == HUB}
+    return snapshot
+
+
+def _dijkstra(snapshot: dict[str, dict], start: str, goals: set[str]) -> float | None:
+    """Эталон: прямой Дейкстра по снапшоту (dict-of-dicts)."""
+    dist = {start: 0.0}
+    heap = [(0.0, start)]
+    while heap:
+        d, node = heapq.heappop(heap)
+        if node in goals:
+            return d
+        if d > dist[node]:
+            continue
+        for neighbor, w in snapshot[node]["nav"].items():
+            nd = d + w
+            if nd < dist.get(neighbor, float("inf")):
+                dist[neighbor] = nd
+                heapq.heappush(heap, (nd, neighbor))
+    return None
+
+
+@pytest.mark.unit
+class TestRouteEngine:
+    def test_routes_match_reference_dijkstra(self):
+        """
+        Дифференциальный тест: стоимость маршрута по полю расстояний совпадает с прямым Дейкстрой,
+        а шаги маршрута идут только по существующим выходам.
+        """
+        snapshot = _snapshot()
+        graph = WorldGraph(snapshot)
+        rng = random.Random(11)
+        taverns = {"10_10", "90_95"} & set(snapshot)
+
+        for start in rng.sample(sorted(snapshot), 200):
+            for target, goals in ((HUB_TARGET, {HUB}), ("svc_tavern_hub", taverns)):
+                expected = _dijkstra(snapshot, start, goals)
+                route = graph.route(start, target)
+                if expected is None:
+                    assert route is None
+                    continue
+
+                assert route is not None
+                cost, steps = route
+                assert cost == pytest.approx(expected)
+
+                walked, node = 0.0, start
+                for step in steps:
+                    walked += snapshot[node]["nav"][step]
+                    node = step
+                assert node in goals
+                assert walked == pytest.approx(cost)
+
+    def test_step_times_follow_route_edges(self):
+        snapshot = {
+            "0_0": {"nav": {"1_0": 4.0}},
+            "1_0": {"nav": {"0_0": 4.0, "2_0": 2.0}},
+            "2_0": {"nav": {"1_0": 2.0}, "hub": True},
+        }
+        graph = WorldGraph(snapshot)
+
+        assert graph.route("0_0", HUB_TARGET) == (6.0, ["1_0", "2_0"])
+        assert graph.step_times("0_0", ["1_0", "2_0"]) == [4.0, 2.0]
+        # Переход не по выходу (0_0 -> 2_0) и неизвестная локация
+        assert graph.step_times("0_0", ["2_0"]) is None
+        assert graph.step_times("0_0", ["9_9"]) is None
@@ -0,0 +1,150 @@
+import json
+import random
+from pathlib import Path
+from typing import Any
+
+from src.backend.domains.user_features.scenario.engine.evaluator import ScenarioEvaluator
+
+SCENARIO_DIR = Path(__file__).resolve().parents[4] / "src/backend/domains/user_features/scenario/resources/json"
+
+# Синтетика поверх сценариев: кубики, функции, лимиты SimpleEval, ошибки разбора и вычисления
+EXTRA_CONDITIONS = [
+    "rand(1, 20) > 10",
+    "has_item('sword') and not has_skill('focus')",
+    "len(loot_queue) >= 2",
+    "min(w_strength, w_agility) * 2 > max(w_luck, 3)",
+    "9 ** 9 ** 9",
+    "'a' * 200000",
+    "unknown_var > 1",
+    "w_strength >",
+    "w_strength.__class__",
+    "",
+    "1; 2",
+]
+EXTRA_MATH: list[dict[str, Any]] = [
+    {"hp": "+1d6", "gold": "-2d10 + 1", "luck": "=3d4 * 2"},
+    {"roll": "1d6 + 1d6 + rand(1, 4)", "big": "200d2000", "zero": "0d6"},
+    {"hp": "+ 1d6 ", "x": "  = 2 ** 1d4", "y": "abs(-1d8) + w_strength"},
+    {"glued": "x1d6", "dot": "1d6.5", "quoted": "'1d6'", "tail": "1d6d6"},
+    {"bad": "+", "name": "=unknown_var", "text": "hello", "num": "12.5"},
+    {"limit": "=9 ** 9 ** 9", "str": "='a' * 200000", "hp": "-w_strength"},
+    {"loot_queue": ["push:sword", "push:key"], "flag": "=has_item('key')"},
+    {"loot_queue": "pop:sword", "n": "=len(loot_queue)", "cnt": 5, "dict": {"a": 1}},
+]
+
+
+class _LegacyEvaluator(ScenarioEvaluator):
+    """Эталон: вычисление до компиляции (regex-подстановка кубиков + SimpleEval.eval по тексту)."""
+
+    def check_condition(self, expression: str, context: dict[str, Any]) -> bool:
+        if not expression or not isinstance(expression, str) or expression.strip() == "":
+            return True
+        self.s_eval.names = context
+        try:
+            return bool(self.s_eval.eval(expression))
+        except Exception:  # noqa: BLE001
+            return False
+
+    def apply_math(self, math_instructions: dict[str, Any], context: dict[str, Any]) -> dict[str, Any]:
+        new_context = context.copy()
+        self.s_eval.names = new_context
+        for var_name, instruction in math_instructions.items():
+            if isinstance(instruction, (list, str)):
+                instr_list = instruction if isinstance(instruction, list) else [instruction]
+                if any(str(instr).startswith(("push:", "pop:")) for instr in instr_list if isinstance(instr, str)):
+                    new_context[var_name] = self._handle_list_ops(new_context.get(var_name, []), instr_list)
+                    self.s_eval.names = new_context
+                    continue
+            if not isinstance(instruction, str):
+                new_context[var_name] = instruction
+                self.s_eval.names = new_context
+                continue
+            processed_instr = self._legacy_dice(instruction)
+            current_val = new_context.get(var_name, 0)
+            new_context[var_name] = self._legacy_step(current_val, processed_instr, new_context)
+            self.s_eval.names = new_context
+        return new_context
+
+    def _legacy_step(self, current_val: Any, instr: str, context: dict[str, Any]) -> Any:
+        instr = instr.strip()
+        try:
+            if instr.startswith("+"):
+                return current_val + self._evaluate_fragment(instr[1:], context)
+            elif instr.startswith("-"):
+                return current_val - self._evaluate_fragment(instr[1:], context)
+            elif instr.startswith("="):
+                return self._evaluate_fragment(instr[1:], context)
+            return self._evaluate_fragment(instr, context)
+        except Exception:  # noqa: BLE001
+            return self._to_numeric(instr)
+
+    def _legacy_dice(self, text: str) -> str:
+        def roll_replacer(match):
+            count = min(int(match.group(1)), 100)
+            sides = min(int(match.group(2)), 1000)
+            return str(sum(self._rng.randint(1, sides) for _ in range(count)))
+
+        return self.dice_pattern.sub(roll_replacer, text)
+
+
+def _scenario_expressions() -> tuple[list[str], list[dict[str, Any]]]:
+    conditions: list[str] = []
+    maths: list[dict[str, Any]] = []
+
+    def walk(obj: Any) -> None:
+        if isinstance(obj, dict):
+            for key, value in obj.items():
+                if key in ("condition", "selection_requirements") and isinstance(value, str):
+                    conditions.append(value)
+                elif key == "math" and isinstance(value, dict):
+                    maths.append(value)
+                walk(value)
+        elif isinstance(obj, list):
+            for item in obj:
+                walk(item)
+
+    for path in sorted(SCENARIO_DIR.glob("*.json")):
+        walk(json.loads(path.read_text(encoding="utf-8")))
+    return conditions, maths
+
+
+def _contexts(count: int) -> list[dict[str, Any]]:
+    rng = random.Random(7)
+    stats = ("w_strength", "w_agility", "w_intelligence", "w_endurance", "w_luck")
+    contexts = []
+    for _ in range(count):
+        ctx: dict[str, Any] = {stat: rng.randint(5, 20) for stat in stats}
+        ctx["step_counter"] = rng.randint(0, 10)
+        ctx["is_two_handed"] = rng.randint(0, 1)
+        ctx["loot_queue"] = rng.sample(["sword", "key", "shield", "amulet"], rng.randint(0, 3))
+        ctx["skills_queue"] = rng.sample(["focus", "reflexes"], rng.randint(0, 2))
+        contexts.append(ctx)
+    return contexts
+
+
+def _outcome(func, *args) -> Any:
+    try:
+        return func(*args)
+    except Exception as e:  # noqa: BLE001
+        return type(e)
+
+
+def test_compiled_evaluator_matches_simpleeval():
+    conditions, maths = _scenario_expressions()
+    assert conditions and maths
+
+    conditions += EXTRA_CONDITIONS
+    maths += EXTRA_MATH + [{"bad_dice": "1d0"}]
+
+    for seed, ctx in enumerate(_contexts(40)):
+        legacy, compiled = _LegacyEvaluator(seed), ScenarioEvaluator(seed)
+        for expression in conditions:
+            assert compiled.check_condition(expression, ctx) == legacy.check_condition(expression, ctx), expression
+
+        legacy_ctx = compiled_ctx = ctx
+        for math in maths:
+            legacy_ctx = _outcome(legacy.apply_math, math, legacy_ctx)
+            compiled_ctx = _outcome(compiled.apply_math, math, compiled_ctx)
+            assert compiled_ctx == legacy_ctx, math
+            if isinstance(legacy_ctx, type):
+                legacy_ctx = compiled_ctx = ctx
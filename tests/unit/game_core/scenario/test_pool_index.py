@@ -0,0 +1,41 @@
+from src.backend.database.redis.manager.scenario_manager import ScenarioManager
+
+
+class _MemoryRedis:
+    """RedisService в памяти: только хэш-операции кэша квеста."""
+
+    def __init__(self):
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.fields_read = 0
+
+    async def set_hash_fields(self, key, data):
+        self.hashes.setdefault(key, {}).update(data)
+
+    async def expire(self, key, time):
+        return True
+
+    async def get_hash_fields(self, key, fields):
+        self.fields_read += len(fields)
+        data = self.hashes.get(key, {})
+        return [data.get(f) for f in fields]
+
+
+async def test_pool_lookup_reads_only_pool_nodes():
+    redis = _MemoryRedis()
+    manager = ScenarioManager(redis)  # type: ignore[arg-type]
+    nodes = [{"node_key": f"filler_{i}", "tags": ["filler"]} for i in range(500)]
+    nodes += [
+        {"node_key": "fight_1", "tags": ["combat", "combat"]},
+        {"node_key": "fight_2", "tags": ["combat", "elite"]},
+        {"node_key": "plain", "tags": None},
+    ]
+    await manager.cache_quest_static_data("q", {"quest_key": "q"}, nodes)
+
+    pool = await manager.get_cached_pool_nodes("q", "combat")
+    assert [n["node_key"] for n in pool] == ["fight_1", "fight_2"]
+    # Индекс + 2 ноды пула, а не 500+ нод квеста
+    assert redis.fields_read == 4
+
+    assert await manager.get_cached_pool_nodes("q", "missing") == []
+    # Нет кэша (или он записан без индекса) — сервис уходит в БД
+    assert await manager.get_cached_pool_nodes("other", "combat") is None
@@ -0,0 +1,173 @@
+import asyncio
+import json
+
+import pytest
+
+from src.backend.database.redis.manager.world_manager import WorldManager
+from src.backend.database.redis.redis_service import RedisService
+from src.backend.domains.internal_systems.factories.monster import clan_factory
+from src.backend.domains.internal_systems.factories.monster.clan_factory import ClanFactory
+from src.backend.domains.internal_systems.factories.monster.clan_registry import ClanGenerationRegistry
+
+
+class _MemoryMonsterRepo:
+    """Общая "БД" кланов для нескольких фабрик; ловит параллельную запись в одну сессию."""
+
+    def __init__(self, db: set[str]):
+        self.db = db
+        self.lookups = 0
+        self.writing = False
+
+    async def get_existing_unique_hashes(self, unique_hashes):
+        self.lookups += 1
+        return {h for h in unique_hashes if h in self.db}
+
+    async def create_clan_with_members(self, clan, monsters):
+        assert not self.writing, "concurrent flush in one session"
+        self.writing = True
+        await asyncio.sleep(0)
+        assert clan.unique_hash not in self.db, "duplicate clan"
+        self.db.add(clan.unique_hash)
+        self.writing = False
+        return clan
+
+
+def _factory(db: set[str], semaphore: asyncio.Semaphore) -> ClanFactory:
+    factory = ClanFactory(session=None, llm_semaphore=semaphore)  # type: ignore[arg-type]
+    factory.repo = _MemoryMonsterRepo(db)  # type: ignore[assignment]
+    return factory
+
+
+async def test_neighbour_zones_share_clan_generation(monkeypatch):
+    llm_calls: list[str] = []
+    in_flight = peak = 0
+
+    async def fake_gemini(mode, user_text, **kwargs):
+        nonlocal in_flight, peak
+        llm_calls.append(json.loads(user_text)["family_id"])
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "{}"
+
+    monkeypatch.setattr(clan_factory, "gemini_answer", fake_gemini)
+
+    db: set[str] = set()
+    semaphore = asyncio.Semaphore(3)
+    factories = [_factory(db, semaphore) for _ in range(4)]
+    # Четыре соседние зоны с одинаковым контекстом заселяются одновременно
+    await asyncio.gather(
+        *(f.ensure_population_for_zone(2, "forest", ["forest", "dark"], f"zone_{i}") for i, f in enumerate(factories))
+    )
+
+    families = factories[0]._select_candidates(2, "forest")
+    assert len(families) > 1
+    assert sorted(llm_calls) == sorted(families)
+    assert len(db) == len(families)
+    assert 1 < peak <= 3
+    assert all(f.repo.lookups == 1 for f in factories)  # type: ignore[attr-defined]
+    assert not ClanGenerationRegistry._inflight
+
+    # Повторный вызов — из known_hashes, без запросов к БД
+    await factories[0].ensure_population_for_zone(2, "forest", ["dark", "forest"], "zone_x")
+    assert factories[0].repo.lookups == 1  # type: ignore[attr-defined]
+
+
+class _RemoteLockManager:
+    """WorldManager, где лок уже держит другой процесс и затем помечает клан готовым."""
+
+    def __init__(self):
+        self.polls = 0
+
+    async def acquire_clan_gen_lock(self, unique_hash, token, ttl):
+        return False
+
+    async def get_clan_gen_state(self, unique_hash):
+        self.polls += 1
+        return WorldManager.CLAN_GEN_DONE if self.polls >= 3 else "other-process-token"
+
+
+async def test_registry_waits_for_remote_generation():
+    manager = _RemoteLockManager()
+    registry = ClanGenerationRegistry(manager, poll_interval=0.001)  # type: ignore[arg-type]
+
+    async def generate() -> bool:
+        raise AssertionError("must not generate while another process holds the lock")
+
+    assert await registry.run("remote_hash", generate) is True
+    assert manager.polls == 3
+
+
+class _RecordingLockManager:
+    """WorldManager одного процесса: пишет порядок событий генерации."""
+
+    def __init__(self, events: list[str]):
+        self.events = events
+
+    async def acquire_clan_gen_lock(self, unique_hash, token, ttl):
+        return True
+
+    async def extend_clan_gen_lock(self, unique_hash, token, ttl):
+        return True
+
+    async def finish_clan_gen(self, unique_hash, token, done, done_ttl):
+        self.events.append(f"finish:{done}")
+
+
+class _RecordingSession:
+    def __init__(self, events: list[str]):
+        self.events = events
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def commit(self):
+        self.events.append("commit")
+
+
+async def test_clan_is_committed_before_done_is_published(monkeypatch):
+    events: list[str] = []
+
+    async def fake_gemini(mode, user_text, **kwargs):
+        return "{}"
+
+    class _Repo(_MemoryMonsterRepo):
+        async def create_clan_with_members(self, clan, monsters):
+            events.append("flush")
+            return await super().create_clan_with_members(clan, monsters)
+
+    db: set[str] = set()
+    monkeypatch.setattr(clan_factory, "gemini_answer", fake_gemini)
+    monkeypatch.setattr(clan_factory, "MonsterRepository", lambda _session: _Repo(db))
+    factory = ClanFactory(
+        session=None,  # type: ignore[arg-type]
+        world_manager=_RecordingLockManager(events),  # type: ignore[arg-type]
+        session_factory=lambda: _RecordingSession(events),  # type: ignore[arg-type,return-value]
+    )
+    family_id = sorted(factory._select_candidates(2, "forest"))[0]
+    monkeypatch.setattr(ClanFactory, "_select_candidates", lambda self, tier, biome_id: {family_id})
+
+    await factory.ensure_population_for_zone(2, "forest", ["forest"], "zone_0")
+
+    # Маркер "done" виден другим процессам только после коммита клана
+    assert events == ["flush", "commit", "finish:True"]
+    assert len(db) == 1
+
+
+async def test_owner_lock_is_extended_while_generating():
+    fakeredis = pytest.importorskip("fakeredis")
+    manager = WorldManager(RedisService(fakeredis.FakeAsyncRedis(decode_responses=True)))
+    registry = ClanGenerationRegistry(manager, lock_ttl=1)
+
+    async def generate() -> bool:
+        # Дольше lock_ttl: без продления лок истек бы и генерацию начал бы другой процесс
+        await asyncio.sleep(1.5)
+        assert await manager.get_clan_gen_state("slow_hash") not in (None, WorldManager.CLAN_GEN_DONE)
+        return True
+
+    assert await registry.run("slow_hash", generate) is True
+    assert await manager.get_clan_gen_state("slow_hash") == WorldManager.CLAN_GEN_DONE
@@ -0,0 +1,64 @@
+import json
+from types import SimpleNamespace
+
+from src.backend.domains.internal_systems.factories.world import content_gen_service
+from src.backend.domains.internal_systems.factories.world.content_gen_service import ContentGenerationService
+
+
+class _Repo:
+    def __init__(self, coords: list[tuple[int, int]]):
+        self.nodes = [
+            SimpleNamespace(
+                x=x,
+                y=y,
+                zone_id="z",
+                terrain_type="flat",
+                is_active=True,
+                flags={},
+                services=[],
+                content={"environment_tags": [f"tag_{x}_{y}"]},
+            )
+            for x, y in coords
+        ]
+        self.upserts: list[list[dict]] = []
+
+    async def get_nodes_in_rect(self, x, y, width, height):
+        return [n for n in self.nodes if x <= n.x < x + width and y <= n.y < y + height]
+
+    async def bulk_upsert_nodes(self, rows):
+        self.upserts.append(rows)
+
+
+async def test_batches_accept_only_own_ids_and_upsert_unique_rows(monkeypatch):
+    async def fake_gemini(mode, user_text, **kwargs):
+        items = json.loads(user_text)
+        response = {item["id"]: {"content": {"title": f"T{item['id']}"}} for item in items}
+        # LLM дописал соседнюю клетку, которой не было в батче
+        response["2_0"] = {"content": {"title": "Чужая"}}
+        return json.dumps(response)
+
+    monkeypatch.setattr(content_gen_service, "gemini_answer", fake_gemini)
+    repo = _Repo([(x, 0) for x in range(4)])
+    service = ContentGenerationService(repo)
+    service.batch_size = 2
+
+    # 0_0 попадает в два батча; 2_0 не входит в путь, но есть в прямоугольнике
+    await service.generate_content_for_path([(0, 0), (1, 0), (0, 0), (3, 0)])
+
+    assert len(repo.upserts) == 1
+    rows = repo.upserts[0]
+    assert sorted((row["x"], row["y"]) for row in rows) == [(0, 0), (1, 0), (3, 0)]
+    assert {row["content"]["title"] for row in rows} == {"T0_0", "T1_0", "T3_0"}
+    assert all(row["content"]["environment_tags"] == [f"tag_{row['x']}_0"] for row in rows)
+
+
+async def test_non_object_response_skips_batch(monkeypatch):
+    async def fake_gemini(mode, user_text, **kwargs):
+        return '["0_0"]'
+
+    monkeypatch.setattr(content_gen_service, "gemini_answer", fake_gemini)
+    repo = _Repo([(0, 0)])
+
+    await ContentGenerationService(repo).generate_content_for_path([(0, 0)])
+
+    assert repo.upserts == []
@@ -0,0 +1,98 @@
+import os
+import time
+from types import SimpleNamespace
+
+from src.backend.services.gemini_service import gemini_service
+from src.backend.services.gemini_service.response_cache import LLMResponseCache
+
+
+def _key(contents: str = '[{"id": "1_1"}]', temperature: float = 0.7) -> str:
+    return LLMResponseCache.make_key("batch_location_desc", "gemini-2.0-flash", contents, "SYS", temperature, 500)
+
+
+async def test_cache_roundtrip_and_replay(tmp_path):
+    cache = LLMResponseCache(tmp_path)
+    key = _key()
+
+    assert key == _key()
+    assert key != _key(temperature=0.8)
+    assert key != _key(contents="[]")
+
+    assert await cache.lookup(key) is None
+    await cache.store(key, "response", mode="batch_location_desc", model="gemini-2.0-flash")
+    assert await cache.lookup(key) == "response"
+
+    # Офлайн: replay отдает записанное и ничего не пишет
+    replay = LLMResponseCache(tmp_path, mode="replay")
+    assert await replay.lookup(key) == "response"
+    await replay.store(_key(contents="new"), "x", mode="m", model="m")
+    assert await replay.lookup(_key(contents="new")) is None
+
+    assert await LLMResponseCache(tmp_path, mode="off").lookup(key) is None
+
+
+async def test_cache_ttl_and_size_limit(tmp_path):
+    cache = LLMResponseCache(tmp_path, ttl_sec=0.0)
+    key = _key()
+    await cache.store(key, "stale", mode="m", model="m")
+    time.sleep(0.01)
+    assert await cache.lookup(key) is None
+    # Просроченная запись отдается только в replay
+    await cache.store(key, "stale", mode="m", model="m")
+    assert await LLMResponseCache(tmp_path, mode="replay", ttl_sec=0.0).lookup(key) == "stale"
+
+    cache = LLMResponseCache(tmp_path / "sized", max_bytes=500)
+    keys = [_key(contents=str(i)) for i in range(10)]
+    now = time.time()
+    for i, k in enumerate(keys):
+        await cache.store(k, "x" * 100, mode="m", model="m")
+        path = cache._path(k)
+        os.utime(path, (now, now - 100 + i))
+
+    cache.prune()
+    kept = [k for k in keys if cache._path(k).exists()]
+    assert kept == keys[-len(kept) :]
+    assert sum(cache._path(k).stat().st_size for k in kept) <= 500
+
+
+def _fake_client(monkeypatch, tmp_path, responses: list[str]) -> list[str]:
+    """Подменяет клиент Gemini (ответы по очереди, последний повторяется) и кэш процесса. Возвращает журнал вызовов."""
+    calls: list[str] = []
+
+    async def generate_content(**kwargs):
+        calls.append(kwargs["model"])
+        return SimpleNamespace(text=responses[min(len(calls), len(responses)) - 1])
+
+    client = SimpleNamespace(aio=SimpleNamespace(models=SimpleNamespace(generate_content=generate_content)))
+    monkeypatch.setattr(gemini_service, "_client", client)
+    monkeypatch.setattr(LLMResponseCache, "_instance", LLMResponseCache(tmp_path))
+    return calls
+
+
+async def _answer(validate=gemini_service.is_json_object_response) -> str:
+    return await gemini_service.gemini_answer("batch_location_desc", "[]", validate=validate)
+
+
+async def test_invalid_response_is_not_cached(tmp_path, monkeypatch):
+    truncated, valid = '{"1_1": {"title": "Обрез', '```json\n{"1_1": {"title": "Руины"}}\n```'
+    calls = _fake_client(monkeypatch, tmp_path, [truncated, valid])
+
+    # Обрезанный JSON возвращается вызывающему, но не кэшируется: следующий вызов идет в API
+    assert await _answer() == truncated
+    assert await _answer() == valid
+    assert await _answer() == valid
+    assert len(calls) == 2
+
+
+async def test_cached_entry_failing_validation_is_invalidated(tmp_path, monkeypatch):
+    calls = _fake_client(monkeypatch, tmp_path, ['{"broken":', '{"ok": true}'])
+
+    # Без проверки битый ответ попадает в кэш
+    assert await _answer(validate=None) == '{"broken":'
+    assert await _answer(validate=None) == '{"broken":'
+    assert len(calls) == 1
+
+    # С проверкой запись удаляется, свежий ответ заменяет ее в кэше
+    assert await _answer() == '{"ok": true}'
+    assert await _answer(validate=None) == '{"ok": true}'
+    assert len(calls) == 2
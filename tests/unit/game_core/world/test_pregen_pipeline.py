@@ -0,0 +1,202 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from src.backend.domains.internal_systems.factories.monster.clan_factory import ClanFactory
+from src.backend.domains.internal_systems.factories.world import content_gen_service
+from src.backend.domains.internal_systems.factories.world.pregen_pipeline import (
+    STATUS_DONE,
+    STATUS_FAILED,
+    STATUS_PERSISTED,
+    PregenConfig,
+    WorldPregenPipeline,
+)
+from src.backend.domains.internal_systems.factories.world.threat_field import ThreatField
+from src.backend.resources.game_data.graf_data_world.world_config import WORLD_HEIGHT, WORLD_WIDTH, ZONE_SIZE
+
+LLM_LATENCY = 0.01
+
+
+class _FakeSession:
+    """Сессия без БД: пайплайн управляет транзакциями, репозиторий пишет в память."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+    def expunge_all(self):
+        pass
+
+
+class _MemoryWorldRepo:
+    """IWorldRepo в памяти — только методы, которые нужны пайплайну."""
+
+    def __init__(self):
+        self.nodes = {
+            (x, y): SimpleNamespace(
+                x=x,
+                y=y,
+                zone_id="z",
+                terrain_type="flat",
+                is_active=False,
+                flags={"threat_tier": 1},
+                services=[],
+                # Дорога внутри каждого чанка: через persist она доходит до края соседнего чанка
+                content={"environment_tags": ["forest", "road"] if x % ZONE_SIZE == 3 else ["forest"]},
+            )
+            for x in range(WORLD_WIDTH)
+            for y in range(WORLD_HEIGHT)
+        }
+        self.progress: dict[tuple[int, int], SimpleNamespace] = {}
+        self.upserts = 0
+
+    async def get_nodes_in_rect(self, x, y, width, height):
+        return [n for (nx, ny), n in self.nodes.items() if x <= nx < x + width and y <= ny < y + height]
+
+    async def get_zones(self, zone_ids):
+        return [SimpleNamespace(id=z, biome_id="forest", tier=2, flags={}) for z in zone_ids]
+
+    async def bulk_upsert_nodes(self, rows):
+        self.upserts += 1
+        for row in rows:
+            self.nodes[(row["x"], row["y"])] = SimpleNamespace(**row)
+
+    async def ensure_gen_chunks(self, chunks):
+        for x, y in chunks:
+            self.progress.setdefault(
+                (x, y), SimpleNamespace(chunk_x=x, chunk_y=y, status="pending", attempts=0, zones={})
+            )
+
+    async def get_gen_progress(self):
+        return list(self.progress.values())
+
+    async def update_gen_chunk(self, chunk_x, chunk_y, status, zones=None, error=None, failed=False):
+        row = self.progress[(chunk_x, chunk_y)]
+        row.status = status
+        if zones is not None:
+            row.zones = zones
+        if failed:
+            row.attempts += 1
+
+
+class _Harness:
+    def __init__(self, monkeypatch):
+        self.repo = _MemoryWorldRepo()
+        self.llm_calls: list[str] = []
+        self.payloads: dict[str, dict] = {}
+        self.in_flight = 0
+        self.peak = 0
+        self.populated: list[str] = []
+        self.crash_after: int | None = None
+        self.foreign_id: str | None = None
+
+        async def fake_gemini(mode, user_text, **kwargs):
+            items = json.loads(user_text)
+            self.llm_calls.extend(item["id"] for item in items)
+            self.payloads.update({item["id"]: item for item in items})
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            # Разная задержка по чанкам: ответы приходят не в порядке запросов
+            await asyncio.sleep(LLM_LATENCY * (1 + len(self.llm_calls) % 3))
+            self.in_flight -= 1
+            response = {item["id"]: {"title": f"T{item['id']}", "description": "d"} for item in items}
+            if self.foreign_id:
+                # LLM дописал клетку, которой не было в payload
+                response[self.foreign_id] = {"title": "Чужая", "description": "d"}
+            return json.dumps(response)
+
+        async def fake_population(_factory, tier, biome_id, location_tags, zone_id):
+            if self.crash_after is not None and len(self.populated) >= self.crash_after:
+                raise RuntimeError("worker crashed")
+            self.populated.append(zone_id)
+
+        monkeypatch.setattr(content_gen_service, "gemini_answer", fake_gemini)
+        monkeypatch.setattr(ClanFactory, "ensure_population_for_zone", fake_population)
+        monkeypatch.setattr(ThreatField, "_instance", ThreatField(ThreatField.build_arrays()))
+
+    def pipeline(self, **config) -> WorldPregenPipeline:
+        return WorldPregenPipeline(_FakeSession, PregenConfig(**config), repo_factory=lambda _session: self.repo)
+
+
+async def test_pregen_resumes_after_crash(monkeypatch):
+    h = _Harness(monkeypatch)
+    chunks = WorldPregenPipeline.plan_chunks()
+    assert len(chunks) == (WORLD_WIDTH // 5) * (WORLD_HEIGHT // 5)
+
+    # Первый запуск: заселение ломается после 3-го чанка — чанки помечаются failed, пайплайн доходит до конца
+    h.crash_after = 3
+    report = await h.pipeline(llm_concurrency=4, limit=8).run()
+
+    statuses = {chunk: h.repo.progress[chunk].status for chunk in chunks[:8]}
+    done = [chunk for chunk, status in statuses.items() if status == STATUS_DONE]
+    failed = [chunk for chunk, status in statuses.items() if status == STATUS_FAILED]
+    assert len(done) == 3
+    assert len(failed) == 5
+    assert (report.populated, report.failed) == (3, 5)
+    assert all(h.repo.progress[chunk].attempts == 1 for chunk in failed)
+    assert h.peak <= 4
+
+    # Процесс умер между persist и populate: чанк остался persisted
+    resumed = done.pop()
+    h.repo.progress[resumed].status = STATUS_PERSISTED
+    calls_before = list(h.llm_calls)
+
+    # Второй запуск: persisted дозаселяется без повторного LLM, failed генерируются заново, done пропускаются
+    h.crash_after = None
+    report = await h.pipeline(llm_concurrency=4, limit=12).run()
+
+    assert all(h.repo.progress[chunk].status == STATUS_DONE for chunk in [resumed, *failed])
+    assert report.skipped == len(done)
+    assert report.failed == 0
+    cx, cy = resumed
+    cells = [f"{x}_{y}" for x in range(cx - 2, cx + 3) for y in range(cy - 2, cy + 3)]
+    assert all(h.llm_calls.count(cell) == calls_before.count(cell) for cell in cells)
+
+
+async def test_pregen_payloads_do_not_depend_on_llm_concurrency(monkeypatch):
+    """Теги и подсказки соседей в payload одинаковы при любом порядке ответов LLM."""
+    payloads = {}
+    # concurrency=1 с очередью 1 — почти последовательно; 8 — prepare уходит далеко вперед persist
+    for concurrency in (1, 8):
+        h = _Harness(monkeypatch)
+        report = await h.pipeline(llm_concurrency=concurrency, queue_size=concurrency, limit=40).run()
+        payloads[concurrency] = h.payloads
+        assert report.populated == 40
+        assert h.peak <= concurrency
+        assert h.repo.upserts == 40
+
+    assert payloads[8] == payloads[1]
+
+
+def test_chunk_dependencies_follow_phases():
+    chunks = WorldPregenPipeline.plan_chunks()
+    deps = WorldPregenPipeline.plan_dependencies(chunks)
+
+    for chunk in chunks:
+        phase = WorldPregenPipeline.chunk_phase(chunk)
+        assert all(WorldPregenPipeline.chunk_phase(dep) < phase for dep in deps[chunk])
+        # Сосед с меньшей фазой — зависимость, с большей — ждет этот чанк
+        for dep in deps[chunk]:
+            assert chunk not in deps[dep]
+
+
+async def test_pregen_ignores_cells_outside_payload(monkeypatch):
+    h = _Harness(monkeypatch)
+    first, second = WorldPregenPipeline.plan_chunks()[:2]
+    foreign = (second[0], second[1])
+    h.foreign_id = f"{foreign[0]}_{foreign[1]}"
+
+    report = await h.pipeline(llm_concurrency=1, limit=1).run()
+
+    assert report.populated == 1
+    assert h.repo.progress[first].status == STATUS_DONE
+    assert h.repo.nodes[foreign].content["environment_tags"] == ["forest"]
+    assert "title" not in h.repo.nodes[foreign].content
@@ -0,0 +1,33 @@
+import numpy as np
+
+from src.backend.domains.internal_systems.factories.world.threat_field import ThreatField
+from src.backend.domains.internal_systems.factories.world.threat_service import ThreatService
+from src.backend.resources.game_data.graf_data_world.world_config import WORLD_HEIGHT, WORLD_WIDTH
+
+
+def test_field_matches_scalar_threat_service_on_whole_grid():
+    """Дифференциальный тест: поле совпадает со скалярными функциями в каждой клетке (без допусков)."""
+    field = ThreatField(ThreatField.build_arrays())
+
+    for x in range(WORLD_WIDTH):
+        for y in range(WORLD_HEIGHT):
+            threat = ThreatService.calculate_threat(x, y)
+            assert field.calculate_threat(x, y) == threat, (x, y)
+            assert field.get_tier(x, y) == ThreatService.get_tier_from_threat(threat), (x, y)
+            assert field.get_narrative_tags(x, y) == ThreatService.get_narrative_tags(x, y), (x, y)
+
+    # Вне сетки — фолбэк на скалярный расчет
+    for x, y in ((-3, 10), (WORLD_WIDTH, 52), (200, -1)):
+        assert field.get_narrative_tags(x, y) == ThreatService.get_narrative_tags(x, y)
+        assert field.calculate_threat(x, y) == ThreatService.calculate_threat(x, y)
+
+
+def test_field_disk_cache_roundtrip(tmp_path):
+    built = ThreatField.load_or_build(cache_dir=tmp_path)
+    files = list(tmp_path.glob("threat_field_*.npz"))
+    assert [f.name for f in files] == [f"threat_field_{ThreatField.config_hash()}.npz"]
+
+    loaded = ThreatField.load_or_build(cache_dir=tmp_path)
+    for name, array in built.arrays().items():
+        assert np.array_equal(loaded.arrays()[name], array), name
+        assert loaded.arrays()[name].dtype == array.dtype, name
@@ -0,0 +1,122 @@
+import json
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from src.backend.database.redis.manager.world_manager import WorldManager
+from src.backend.database.redis.redis_key import RedisKeys as Rk
+from src.backend.database.redis.redis_service import RedisService
+from src.backend.domains.internal_systems.factories.world import world_loader_service
+from src.backend.domains.internal_systems.factories.world.world_loader_service import WorldLoaderService
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+def _node(x: int, y: int, title: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        x=x,
+        y=y,
+        is_active=True,
+        content={"title": title},
+        flags={},
+        services=[],
+        zone_id="r1_z1",
+        terrain_type="plains",
+    )
+
+
+class _FakeWorldRepo:
+    def __init__(self, nodes: list[SimpleNamespace]):
+        self.nodes = nodes
+
+    async def iter_active_nodes(self, chunk_size: int):
+        nodes = sorted(self.nodes, key=lambda n: (n.x, n.y))
+        for i in range(0, len(nodes), chunk_size):
+            yield nodes[i : i + chunk_size]
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.FakeAsyncRedis(decode_responses=True)
+
+
+@pytest.fixture
+def world_manager(redis):
+    WorldManager._active_version = None
+    WorldManager._version_expires_at = 0.0
+    yield WorldManager(RedisService(redis))
+    WorldManager._active_version = None
+    WorldManager._version_expires_at = 0.0
+
+
+@pytest.fixture
+def warmup(monkeypatch, world_manager):
+    """Прогрев карты из nodes с фиксированной версией (время прогрева = now)."""
+
+    @asynccontextmanager
+    async def _session():
+        yield None
+
+    monkeypatch.setattr(world_loader_service, "get_session_context", _session)
+
+    async def _run(nodes: list[SimpleNamespace], now: float) -> int:
+        monkeypatch.setattr(world_loader_service, "get_world_repo", lambda _session: _FakeWorldRepo(nodes))
+        # Версия карты = время прогрева (часы подменяются только загрузчику: fakeredis считает TTL по time)
+        monkeypatch.setattr(
+            world_loader_service, "time", SimpleNamespace(time=lambda: now, perf_counter=time.perf_counter)
+        )
+        return await WorldLoaderService(world_manager).init_world_cache()
+
+    return _run
+
+
+async def test_warmup_writes_new_version_and_retires_legacy(redis, world_manager, warmup):
+    await redis.hset(Rk.get_world_location_meta_key("9_9"), mapping={"name": "legacy"})
+
+    loaded = await warmup([_node(0, 0, "A"), _node(1, 0, "B"), _node(0, 1, "C")], now=1000.0)
+
+    assert loaded == 3
+    assert await redis.get(Rk.get_world_version_key()) == "1000000"
+    assert await world_manager.get_active_version() == "1000000"
+
+    meta = await world_manager.get_location_meta("0_0")
+    assert meta["name"] == "A"
+    assert set(json.loads(meta["exits"])) == {"nav:1_0", "nav:0_1"}
+
+    graph = await world_manager.get_world_graph("1000000")
+    assert graph["1_0"]["nav"] == {"0_0": 4.0}
+
+    # Legacy-ключи доживают TTL, а не удаляются сразу
+    ttl = await redis.ttl(Rk.get_world_location_meta_key("9_9"))
+    assert 0 < ttl <= WorldManager.RETIRED_VERSION_TTL
+
+
+async def test_version_switch_retires_previous_namespace(redis, world_manager, warmup):
+    await warmup([_node(0, 0, "Old")], now=1000.0)
+    await warmup([_node(0, 0, "New")], now=2000.0)
+
+    assert await world_manager.get_active_version() == "2000000"
+    assert (await world_manager.get_location_meta("0_0"))["name"] == "New"
+
+    old_key = Rk.get_world_location_meta_key("0_0", "1000000")
+    assert await redis.hget(old_key, "name") == "Old"
+    assert 0 < await redis.ttl(old_key) <= WorldManager.RETIRED_VERSION_TTL
+    assert await redis.ttl(Rk.get_world_location_meta_key("0_0", "2000000")) == -1
+
+
+async def test_write_with_stale_pointer_goes_to_active_version(redis, world_manager, warmup):
+    await warmup([_node(0, 0, "A")], now=1000.0)
+    assert await world_manager.get_active_version() == "1000000"
+
+    # Другой процесс переключил версию: указатель в кэше этого процесса еще 1000000
+    await redis.set(Rk.get_world_version_key(), "2000000")
+    assert await world_manager.get_active_version() == "1000000"
+
+    await world_manager.write_location_meta("0_0", {"name": "Edited"})
+
+    assert await redis.hget(Rk.get_world_location_meta_key("0_0", "2000000"), "name") == "Edited"
+    assert await redis.hget(Rk.get_world_location_meta_key("0_0", "1000000"), "name") == "A"
+    # Запись заодно обновила указатель процесса
+    assert await world_manager.get_active_version() == "2000000"